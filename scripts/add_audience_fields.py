@@ -17,12 +17,14 @@ This script scans eligibility, notes, names, and programs to detect audience pat
 Run with --preview to see what would be changed without modifying files.
 """
 
-import re
 import sys
 import argparse
+from collections.abc import Mapping
 from pathlib import Path
 import yaml
 
+from generate_calendar import AudienceMatcher
+from sources_patch import Patch, apply_patches
 from utils import load_sources as _load_sources_shared
 
 # Pattern definitions for each audience tag
@@ -98,6 +100,8 @@ AUDIENCE_PATTERNS = {
     ],
 }
 
+AUDIENCE_MATCHER = AudienceMatcher(AUDIENCE_PATTERNS)
+
 # Entries with known audience mappings (for manual overrides or complex cases)
 MANUAL_MAPPINGS = {
     # Entry-level audience (applies to whole resource)
@@ -143,19 +147,7 @@ MANUAL_MAPPINGS = {
 
 def detect_audience_from_text(text: str) -> list:
     """Detect audience tags from a text string using pattern matching."""
-    if not text:
-        return []
-
-    text_lower = text.lower()
-    detected = set()
-
-    for audience_tag, patterns in AUDIENCE_PATTERNS.items():
-        for pattern in patterns:
-            if re.search(pattern, text_lower, re.IGNORECASE):
-                detected.add(audience_tag)
-                break  # Found match for this tag, move to next
-
-    return sorted(list(detected))
+    return AUDIENCE_MATCHER(text)
 
 
 def analyze_entry(entry: dict) -> dict:
@@ -196,7 +188,7 @@ def analyze_entry(entry: dict) -> dict:
     # Check programs for program-level audiences
     programs = entry.get('programs', [])
     for program in programs:
-        if isinstance(program, dict):
+        if isinstance(program, Mapping):
             program_name = program.get('name', '')
             program_text = ' '.join([
                 program_name,
@@ -215,78 +207,36 @@ def load_sources(path: Path) -> list:
     return _load_sources_shared(path)
 
 
+def audience_patches(results: list) -> list:
+    """Patches setting each detected entry- and program-level audience."""
+    patches = []
+    for result in results:
+        if result['entry_level_audience']:
+            patches.append(Patch(result['id'], 'audience', list(result['entry_level_audience']),
+                                 after=('good_for',), if_missing=True))
+        for program_name, program_audience in result.get('program_audiences', {}).items():
+            if program_audience:
+                patches.append(Patch(result['id'], 'audience', list(program_audience),
+                                     program=program_name, after=('format', 'eligibility'),
+                                     if_missing=True))
+    return patches
+
+
 def apply_audience_to_yaml(input_path: Path, results: list, output_path: Path = None) -> int:
-    """Apply audience fields to YAML file by text manipulation."""
-    if output_path is None:
-        output_path = input_path
-
-    with open(input_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    lines = content.split('\n')
-    new_lines = []
-    current_id = None
-    current_program_name = None
-    results_by_id = {r['id']: r for r in results}
-    modified_count = 0
-    i = 0
-
-    while i < len(lines):
-        line = lines[i]
-
-        # Track current entry ID
-        id_match = re.match(r'^- id: (.+)$', line)
-        if id_match:
-            current_id = id_match.group(1).strip()
-            current_program_name = None
-
-        # Track current program name
-        program_match = re.match(r'^  - name: (.+)$', line)
-        if program_match:
-            current_program_name = program_match.group(1).strip().strip('"\'')
-
-        new_lines.append(line)
-
-        # After good_for section, add entry-level audience
-        if line.strip().startswith('good_for:') and current_id:
-            result = results_by_id.get(current_id)
-            if result and result['entry_level_audience']:
-                # Find the end of the good_for section
-                j = i + 1
-                while j < len(lines) and (lines[j].startswith('    -') or lines[j].strip() == ''):
-                    new_lines.append(lines[j])
-                    j += 1
-
-                # Add audience field
-                audience_tags = result['entry_level_audience']
-                new_lines.append('  audience:')
-                for tag in audience_tags:
-                    new_lines.append(f'    - {tag}')
-                modified_count += 1
-                i = j - 1  # Continue from after good_for items
-
-        # After program format/eligibility, add program-level audience
-        if current_program_name and line.strip().startswith(('format:', 'eligibility:')):
-            result = results_by_id.get(current_id)
-            if result and current_program_name in result.get('program_audiences', {}):
-                # Check if audience already added for this program
-                program_audience = result['program_audiences'][current_program_name]
-                if program_audience:
-                    # Look ahead to see if there's already an audience field
-                    next_i = i + 1
-                    if next_i < len(lines) and not lines[next_i].strip().startswith('audience:'):
-                        # Add audience for this program
-                        indent = '      '  # Program-level indent
-                        new_lines.append(f'{indent}audience:')
-                        for tag in program_audience:
-                            new_lines.append(f'{indent}  - {tag}')
-
-        i += 1
-
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(new_lines))
-
-    return modified_count
+    """Apply audience fields to the YAML file, leaving everything else as written.
+
+    Entry-level audience goes after good_for, program-level audience after the
+    program's format/eligibility; audience fields already present are kept.
+    Returns the number of entries that received an entry-level audience.
+    """
+    patches = audience_patches(results)
+    # Programs named in MANUAL_MAPPINGS may since have been renamed; skip those.
+    report = apply_patches(input_path, patches, output_path=output_path, strict=False)
+    for patch in report.skipped:
+        print(f"  Skipped {patch.entry_id}: program '{patch.program}' not found")
+    if report.backup:
+        print(f"\nBackup saved to {report.backup}")
+    return sum(1 for patch in report.applied if patch.program is None)
 
 
 def main():
@@ -372,14 +322,6 @@ def main():
         print(f"To apply changes, run without --preview")
         print(f"Output would be written to: {output_path}")
     else:
-        # Backup first
-        backup_path = sources_path.with_suffix('.yaml.bak')
-        with open(sources_path, 'r') as f:
-            backup_content = f.read()
-        with open(backup_path, 'w') as f:
-            f.write(backup_content)
-        print(f"\nBackup saved to {backup_path}")
-
         # Apply changes
         output_path = args.output if args.output else sources_path
         modified = apply_audience_to_yaml(sources_path, results, output_path)
@@ -5,12 +5,14 @@ Add location_type and resource_type fields to all entries in sources.yaml
 location_type: physical | virtual | hybrid | varies | online_service
 resource_type: place | event | service | program | organization
 
-This script reads sources.yaml, adds the fields, and writes back.
+This script patches missing fields into sources.yaml in place; values already
+present and everything else in the file are left as written.
 """
 
-import re
 from pathlib import Path
 
+from sources_patch import Patch, apply_patches
+
 # Define the type mappings for each entry
 ENTRY_TYPES = {
     # DISCOUNT PROGRAMS - services (apply online or in-person)
@@ -134,44 +136,21 @@ ENTRY_TYPES = {
 
 
 def add_fields_to_yaml(input_path: str, output_path: str = None):
-    """Read YAML, add type fields after category line, write back."""
-
-    if output_path is None:
-        output_path = input_path
-
-    with open(input_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    lines = content.split('\n')
-    new_lines = []
-    current_id = None
-    i = 0
-
-    while i < len(lines):
-        line = lines[i]
-        new_lines.append(line)
+    """Add missing type fields after each mapped entry's category line, in one pass."""
 
-        # Track current entry ID
-        id_match = re.match(r'^- id: (.+)$', line)
-        if id_match:
-            current_id = id_match.group(1).strip()
+    patches = [
+        Patch(entry_id, field, types[field], after=after, if_missing=True)
+        for entry_id, types in ENTRY_TYPES.items()
+        for field, after in (("location_type", ("category",)),
+                             ("resource_type", ("location_type", "category")))
+    ]
+    report = apply_patches(input_path, patches, output_path=output_path, strict=False)
 
-        # After category line, insert type fields
-        if line.strip().startswith('category:') and current_id:
-            if current_id in ENTRY_TYPES:
-                types = ENTRY_TYPES[current_id]
-                # Get indentation from current line
-                indent = '  '  # Standard 2-space indent for YAML
-                new_lines.append(f"{indent}location_type: {types['location_type']}")
-                new_lines.append(f"{indent}resource_type: {types['resource_type']}")
-
-        i += 1
-
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(new_lines))
-
-    print(f"Updated {len(ENTRY_TYPES)} entries with location_type and resource_type fields")
-    return len(ENTRY_TYPES)
+    count = len({patch.entry_id for patch in report.applied})
+    print(f"Updated {count} entries with location_type and resource_type fields")
+    if report.backup:
+        print(f"Backup saved to {report.backup}")
+    return count
 
 
 if __name__ == "__main__":
@@ -182,13 +161,5 @@ if __name__ == "__main__":
         print(f"Error: {sources_path} not found")
         exit(1)
 
-    # Backup first
-    backup_path = sources_path.with_suffix('.yaml.bak')
-    with open(sources_path, 'r') as f:
-        backup_content = f.read()
-    with open(backup_path, 'w') as f:
-        f.write(backup_content)
-    print(f"Backup saved to {backup_path}")
-
     count = add_fields_to_yaml(str(sources_path))
     print(f"Done! Added fields to {count} entries.")
@@ -19,13 +19,15 @@ Usage:
 import re
 import sys
 from collections import Counter, defaultdict
+from collections.abc import Mapping
 from datetime import date, timedelta
 from pathlib import Path
 
 # Ensure scripts/ is on the path so imports work
 sys.path.insert(0, str(Path(__file__).parent))
 
-from utils import load_sources, parse_date, VALID_CATEGORIES, VALID_LOCATION_TYPES, VALID_RESOURCE_TYPES
+from source_store import load_store
+from utils import parse_date, VALID_CATEGORIES, VALID_LOCATION_TYPES, VALID_RESOURCE_TYPES
 
 
 # ---------------------------------------------------------------------------
@@ -35,14 +37,14 @@ from utils import load_sources, parse_date, VALID_CATEGORIES, VALID_LOCATION_TYP
 VAGUE_PATTERNS = [
     r"^various", r"^weekly", r"^seasonal", r"^monthly", r"^annual",
     r"^ongoing", r"^by appointment",
-    r"contact\b.*\b(schedule|dates?|time)",
-    r"check\b.*\b(website|calendar|facebook|meetup|eventbrite|library)",
+    r"(?m:^)(?>.*?contact\b).*\b(schedule|dates?|time)",  # linear: see validate_schedules.py
+    r"(?m:^)(?>.*?check\b).*\b(website|calendar|facebook|meetup|eventbrite|library)",
     r"dates?\s+vary", r"times?\s+vary",
     r"various\s+(dates|times|events|workshops)",
     r"^\d+\+?\s+meetings", r"^multiple\b.*\b(meetings|groups)",
     r"^once\s+(weekly|monthly)", r"^twice\s+monthly", r"^periodic",
     r"summer\s+(evenings?|mornings?)", r"\(was seasonal\)",
-    r"^weekend\s+mornings?\s+during", r"year-round\b.*\bcleanups",
+    r"^weekend\s+mornings?\s+during", r"(?m:^)(?>.*?year-round\b).*\bcleanups",
     r"exhibitions?\s+per\s+year", r"^24/7", r"^365 days", r"done-in-a-day",
     r"^(january|february|march|april|may|june|july|august|september|october|november|december)(\s+\d+)?(\s*-\s*.+)?$",
     r"^\w+\s*-\s*(january|february|march|april|may|june|july|august|september|october|november|december)(\s|$)",
@@ -152,7 +154,8 @@ def sub_header(title: str):
 
 def main():
     sources_path = Path(__file__).parent.parent / "data" / "sources.yaml"
-    entries = load_sources(sources_path)
+    store = load_store(sources_path)
+    entries = store.entries
     total = len(entries)
     today = date.today()
 
@@ -245,7 +248,7 @@ def main():
                 incomplete_examples.append((e["id"], str(top_schedule)))
         elif programs and isinstance(programs, list):
             # Count program-level schedules
-            prog_schedules = [p.get("schedule") for p in programs if isinstance(p, dict) and p.get("schedule")]
+            prog_schedules = [p.get("schedule") for p in programs if isinstance(p, Mapping) and p.get("schedule")]
             if prog_schedules:
                 # Classify best schedule among programs
                 prog_classes = [classify_schedule(str(s)) for s in prog_schedules]
@@ -284,8 +287,9 @@ def main():
     if missing_schedule_entries:
         sub_header(f"Entries With No Schedule/Hours/Dates ({len(missing_schedule_entries)})")
         for eid in missing_schedule_entries:
-            name = next((e["name"] for e in entries if e["id"] == eid), eid)
-            cat = next((e["category"] for e in entries if e["id"] == eid), "?")
+            entry = store.get(eid)
+            name = entry["name"] if entry else eid
+            cat = entry["category"] if entry else "?"
             print(f"  {eid:40s}  [{cat}] {name[:40]}")
 
     # ------------------------------------------------------------------
@@ -299,19 +303,18 @@ def main():
 
     verified_dates = []
     missing_verified = []
-    overdue_entries = []
 
     for e in entries:
         lv = parse_date(e.get("last_verified"))
-        na = parse_date(e.get("next_audit"))
         if lv:
             verified_dates.append((e["id"], e.get("name", ""), e.get("category", ""), lv))
         else:
             missing_verified.append(e["id"])
 
-        if na and na < today:
-            days_overdue = (today - na).days
-            overdue_entries.append((e["id"], e.get("name", ""), e.get("category", ""), na, days_overdue))
+    overdue_entries = []
+    for e in store.next_audit_between(None, today - timedelta(days=1)):
+        na = parse_date(e["next_audit"])
+        overdue_entries.append((e["id"], e.get("name", ""), e.get("category", ""), na, (today - na).days))
 
     sub_header("Verification Age Distribution")
     if verified_dates:
@@ -443,9 +446,9 @@ def main():
         row = f"  {cat:25s}"
         for lt in ltypes:
             if lt == "<missing>":
-                count = sum(1 for e in entries if e.get("category") == cat and not e.get("location_type"))
+                count = store.count(category=cat, location_type=None)
             else:
-                count = sum(1 for e in entries if e.get("category") == cat and e.get("location_type") == lt)
+                count = store.count(category=cat, location_type=lt)
             row += f"{count:12d}"
         print(row)
 
@@ -470,7 +473,7 @@ def main():
     # Pricing by category
     sub_header("Pricing by Category")
     for cat in sorted(VALID_CATEGORIES):
-        cat_entries = [e for e in entries if e.get("category") == cat]
+        cat_entries = store.select(category=cat)
         if not cat_entries:
             continue
         models = Counter(pricing_model(e) for e in cat_entries)
@@ -504,7 +507,7 @@ def main():
     print(header)
     print("  " + "-" * (25 + 13 * len(enrichment_checks)))
     for cat in sorted(VALID_CATEGORIES):
-        cat_entries = [e for e in entries if e.get("category") == cat]
+        cat_entries = store.select(category=cat)
         if not cat_entries:
             continue
         row = f"  {cat:25s}"
@@ -537,7 +540,7 @@ def main():
     for score, eid, name in low_scores:
         if score > 1:
             break
-        cat = next((e.get("category", "?") for e in entries if e["id"] == eid), "?")
+        cat = store.get(eid, {}).get("category", "?")
         print(f"  score={score}  {eid:35s} [{cat:15s}] {name[:40]}")
         shown += 1
         if shown >= 20:
@@ -19,12 +19,15 @@ Usage:
 """
 
 import argparse
+import calendar
 import json
 import sys
 from collections import Counter
-from datetime import datetime, date, timedelta
+from datetime import date, timedelta
 from pathlib import Path
 
+import derived_cache
+from source_store import SourceStore
 from utils import load_sources, format_date, parse_date
 
 
@@ -114,14 +117,18 @@ def main():
         print(f"Error: sources.yaml not found at {sources_path}")
         return
 
-    entries = load_sources(sources_path)
-    json_mode = args.workload and args.format == "json"
-    if not json_mode:
-        print(f"Loaded {len(entries)} entries from sources.yaml\n")
-
     if args.validate:
-        from utils import validate_all_entries
-        warnings = validate_all_entries(entries, quiet=True)
+        from utils import iter_sources, validate_all_entries
+        # Validation needs one entry at a time, so stream the file.
+        count = 0
+
+        def entries():
+            nonlocal count
+            for count, entry in enumerate(iter_sources(sources_path), 1):
+                yield entry
+
+        warnings = validate_all_entries(entries(), quiet=True)
+        print(f"Loaded {count} entries from sources.yaml\n")
         print("=" * 60)
         print("ENTRY VALIDATION")
         print("=" * 60)
@@ -135,21 +142,24 @@ def main():
         print()
         return
 
+    entries = load_sources(sources_path)
+    json_mode = args.workload and args.format == "json"
+    if not json_mode:
+        print(f"Loaded {len(entries)} entries from sources.yaml\n")
+
     if args.as_of:
         today_date = parse_date(args.as_of)
         if not today_date:
             parser.error("--as-of must use YYYY-MM-DD")
-        today_dt = datetime.combine(today_date, datetime.min.time())
     else:
-        today_dt = datetime.now()
-        today_date = today_dt.date()
-    current_month = today_dt.strftime("%Y-%m")
-    next_month = (today_dt.replace(day=28) + timedelta(days=4)).strftime("%Y-%m")
+        today_date = date.today()
     week_from_now = today_date + timedelta(days=7)
 
     # Filter by category if specified
+    store = SourceStore(entries)
     if args.category:
-        entries = [e for e in entries if e.get("category") == args.category]
+        store = store.where(category=args.category)
+        entries = store.entries
         if not json_mode:
             print(f"Filtered to {len(entries)} entries in category '{args.category}'\n")
 
@@ -161,8 +171,10 @@ def main():
     if args.workload:
         from audit_policy import audit_priority, audit_queue, workload_summary
 
-        summary = workload_summary(entries, args.capacity_per_week, today_date)
-        queue = audit_queue(entries, today_date)[:max(args.limit, 0)]
+        # Priorities resolve every recurring schedule; reuse the other scripts' parses.
+        with derived_cache.session(sources_path):
+            summary = workload_summary(store, args.capacity_per_week, today_date)
+            queue = audit_queue(store, today_date)[:max(args.limit, 0)]
         if args.format == "json":
             summary["queue"] = [
                 {
@@ -216,44 +228,29 @@ def main():
             print(f"  {cat}: {count}")
         print()
 
-    # Categorize entries by audit status
-    overdue = []
-    due_this_week = []
-    due_this_month = []
-    due_next_month = []
-    unverified = []
-
-    for entry in entries:
-        # Skip closed entries for audit tracking
-        if entry.get("status") == "CLOSED":
-            continue
-
-        next_audit = entry.get("next_audit")
-        if next_audit:
-            audit_date = parse_date(next_audit)
-            audit_str = format_date(next_audit)
-
-            if audit_date:
-                # Check if overdue
-                if audit_date < today_date:
-                    days_overdue = (today_date - audit_date).days
-                    entry["_days_overdue"] = days_overdue
-                    overdue.append(entry)
-                # Check if due this week
-                elif audit_date <= week_from_now:
-                    due_this_week.append(entry)
-                # Check if due this month
-                elif audit_str.startswith(current_month):
-                    due_this_month.append(entry)
-                # Check if due next month
-                elif audit_str.startswith(next_month):
-                    due_next_month.append(entry)
-
-        flags = entry.get("flags", [])
-        for flag in flags:
-            if "UNVERIFIED" in flag or "VERIFY" in flag:
-                unverified.append(entry)
-                break
+    # Categorize entries by audit status. The date windows come straight off
+    # the store's next_audit index; closed entries are skipped for audit tracking.
+    def open_entries(found: list[dict]) -> list[dict]:
+        return [entry for entry in found if entry.get("status") != "CLOSED"]
+
+    month_end = today_date.replace(day=calendar.monthrange(today_date.year, today_date.month)[1])
+    next_month_start = month_end + timedelta(days=1)
+    next_month_end = next_month_start.replace(
+        day=calendar.monthrange(next_month_start.year, next_month_start.month)[1])
+    after_this_week = week_from_now + timedelta(days=1)
+
+    overdue = open_entries(store.next_audit_between(None, today_date - timedelta(days=1)))
+    for entry in overdue:
+        entry["_days_overdue"] = (today_date - parse_date(entry["next_audit"])).days
+    due_this_week = open_entries(store.next_audit_between(today_date, week_from_now))
+    due_this_month = open_entries(store.next_audit_between(after_this_week, month_end))
+    due_next_month = open_entries(
+        store.next_audit_between(max(after_this_week, next_month_start), next_month_end))
+
+    unverified = [
+        entry for entry in open_entries(entries)
+        if any("UNVERIFIED" in flag or "VERIFY" in flag for flag in entry.get("flags", []))
+    ]
 
     # === WEEKLY SUMMARY VIEW ===
     if args.weekly_summary:
@@ -329,7 +326,7 @@ def main():
     # === DUE THIS MONTH VIEW ===
     if args.due_this_month:
         print("=" * 60)
-        print(f"ENTRIES DUE FOR AUDIT THIS MONTH ({current_month})")
+        print(f"ENTRIES DUE FOR AUDIT THIS MONTH ({today_date:%Y-%m})")
         print("=" * 60)
         # Include overdue + this week + rest of month
         all_due_this_month = overdue + due_this_week + due_this_month
@@ -348,7 +345,7 @@ def main():
     # === DUE NEXT MONTH VIEW ===
     if args.due_next_month:
         print("=" * 60)
-        print(f"ENTRIES DUE NEXT MONTH ({next_month})")
+        print(f"ENTRIES DUE NEXT MONTH ({next_month_start:%Y-%m})")
         print("=" * 60)
         if due_next_month:
             for entry in sorted(due_next_month, key=lambda x: str(x.get("next_audit", ""))):
@@ -410,7 +407,7 @@ def main():
 
     # Due this month
     print("=" * 60)
-    print(f"ENTRIES DUE FOR AUDIT THIS MONTH ({current_month})")
+    print(f"ENTRIES DUE FOR AUDIT THIS MONTH ({today_date:%Y-%m})")
     print("=" * 60)
     if due_this_week or due_this_month:
         all_this_month = due_this_week + due_this_month
@@ -427,7 +424,7 @@ def main():
 
     # Due next month
     print("=" * 60)
-    print(f"ENTRIES DUE NEXT MONTH ({next_month})")
+    print(f"ENTRIES DUE NEXT MONTH ({next_month_start:%Y-%m})")
     print("=" * 60)
     if due_next_month:
         for entry in sorted(due_next_month, key=lambda x: str(x.get("next_audit", ""))):
@@ -12,8 +12,6 @@ Usage:
 """
 
 import argparse
-import re
-import shutil
 from datetime import date, datetime, timedelta
 from pathlib import Path
 
@@ -23,6 +21,10 @@ try:
 except ImportError:
     HAS_DATEUTIL = False
 
+from entry_index import EntryIndex, EntryLocation
+from sources_patch import Patch, apply_patches
+from utils import parse_date
+
 
 def calculate_next_audit(frequency: str, from_date: date = None) -> date:
     """Calculate the next audit date based on frequency."""
@@ -53,53 +55,49 @@ def calculate_next_audit(frequency: str, from_date: date = None) -> date:
             raise ValueError(f"Unknown audit frequency: {frequency}")
 
 
-def find_entry_info(content: str, entry_id: str) -> dict | None:
-    """Find entry in sources.yaml and extract current info."""
-    lines = content.split('\n')
-    in_entry = False
-    entry_info = {'id': entry_id}
-    current_indent = 0
-
-    for i, line in enumerate(lines):
-        # Look for entry start
-        id_match = re.match(r'^- id: (.+)$', line)
-        if id_match:
-            if id_match.group(1).strip() == entry_id:
-                in_entry = True
-                entry_info['start_line'] = i
-                continue
-            elif in_entry:
-                # Found next entry, we're done
-                entry_info['end_line'] = i
-                break
-
-        if in_entry:
-            # Extract fields
-            if line.strip().startswith('name:'):
-                entry_info['name'] = line.split(':', 1)[1].strip()
-            elif line.strip().startswith('audit_frequency:'):
-                entry_info['audit_frequency'] = line.split(':', 1)[1].strip()
-            elif line.strip().startswith('last_verified:'):
-                entry_info['last_verified_line'] = i
-                entry_info['last_verified'] = line.split(':', 1)[1].strip()
-            elif line.strip().startswith('next_audit:'):
-                entry_info['next_audit_line'] = i
-                entry_info['next_audit'] = line.split(':', 1)[1].strip()
-
-    if in_entry and 'end_line' not in entry_info:
-        entry_info['end_line'] = len(lines)
-
-    return entry_info if in_entry else None
+AUDIT_FIELDS = ("name", "audit_frequency", "last_verified", "next_audit")
+
+
+def _entry_info(location: EntryLocation, block: str) -> dict:
+    """The audit fields of one indexed entry, with their absolute line numbers."""
+    lines = block.split('\n')
+    entry_info = {'id': location.id, 'start_line': location.line, 'end_line': location.end_line}
+    for field in AUDIT_FIELDS:
+        span = location.fields.get(field)
+        if span is None:
+            continue
+        entry_info[field] = lines[span.line].split(':', 1)[1].strip()
+        if field in ('last_verified', 'next_audit'):
+            entry_info[f'{field}_line'] = location.line + span.line
+    return entry_info
+
+
+def find_entry_info(sources_path: str | Path, entry_id: str) -> dict | None:
+    """Find entry in sources.yaml and extract current info.
+
+    The entry is looked up in the file's persistent EntryIndex and read with one seek.
+    """
+    with EntryIndex.open(sources_path) as index:
+        location = index.get(entry_id)
+        block = index.read_entry(entry_id) if location else None
+    if location is None:
+        return None
+    return _entry_info(location, block.decode('utf-8'))
+
+
+def find_entry_info_in_text(content: str, entry_id: str) -> dict | None:
+    """Like find_entry_info, for sources.yaml content that is already in memory."""
+    data = content.encode('utf-8')
+    location = EntryIndex.for_bytes(data).get(entry_id)
+    if location is None:
+        return None
+    return _entry_info(location, data[location.start:location.end].decode('utf-8'))
 
 
 def update_sources_yaml(sources_path: Path, entry_id: str, new_last_verified: str,
                         new_next_audit: str, preview: bool = False) -> bool:
     """Update the entry's dates in sources.yaml."""
-    with open(sources_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    lines = content.split('\n')
-    entry_info = find_entry_info(content, entry_id)
+    entry_info = find_entry_info(sources_path, entry_id)
 
     if not entry_info:
         print(f"Error: Entry '{entry_id}' not found in sources.yaml")
@@ -110,33 +108,20 @@ def update_sources_yaml(sources_path: Path, entry_id: str, new_last_verified: st
     if 'next_audit_line' not in entry_info:
         print(f"Warning: No next_audit field found for '{entry_id}'")
 
-    # Update last_verified line
-    if 'last_verified_line' in entry_info:
-        old_line = lines[entry_info['last_verified_line']]
-        # Preserve indentation
-        indent = len(old_line) - len(old_line.lstrip())
-        lines[entry_info['last_verified_line']] = ' ' * indent + f'last_verified: {new_last_verified}'
-
-    # Update next_audit line
-    if 'next_audit_line' in entry_info:
-        old_line = lines[entry_info['next_audit_line']]
-        indent = len(old_line) - len(old_line.lstrip())
-        lines[entry_info['next_audit_line']] = ' ' * indent + f'next_audit: {new_next_audit}'
-
-    new_content = '\n'.join(lines)
-
     if preview:
         print(f"\n[PREVIEW] Would update sources.yaml:")
         print(f"  last_verified: {entry_info.get('last_verified', 'N/A')} -> {new_last_verified}")
         print(f"  next_audit: {entry_info.get('next_audit', 'N/A')} -> {new_next_audit}")
         return True
 
-    # Create backup before writing
-    backup_path = sources_path.with_suffix('.yaml.bak')
-    shutil.copy2(sources_path, backup_path)
-
-    with open(sources_path, 'w', encoding='utf-8') as f:
-        f.write(new_content)
+    # Only dates the entry already carries are rewritten; apply_patches keeps
+    # sources.yaml.bak and replaces the file atomically.
+    patches = [
+        Patch(entry_id, field, parse_date(value) or value)
+        for field, value in (('last_verified', new_last_verified), ('next_audit', new_next_audit))
+        if f'{field}_line' in entry_info
+    ]
+    apply_patches(sources_path, patches)
 
     return True
 
@@ -190,10 +175,7 @@ def main():
         return 1
 
     # Read current entry info
-    with open(sources_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    entry_info = find_entry_info(content, args.id)
+    entry_info = find_entry_info(sources_path, args.id)
     if not entry_info:
         print(f"Error: Entry '{args.id}' not found")
         return 1
@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 from collections import Counter
+from collections.abc import Mapping
 from datetime import date
 
 from dateutil.relativedelta import relativedelta
 
+from source_store import SourceStore
 from utils import parse_date
 
 
@@ -77,7 +79,7 @@ def has_open_recurring_schedule(entry: dict) -> bool:
         return bool(resolve_recurring_schedule(parse_schedule(entry["schedule"]), entry))
 
     for program in programs:
-        if not isinstance(program, dict) or not program.get("schedule"):
+        if not isinstance(program, Mapping) or not program.get("schedule"):
             continue
         if program.get("dates"):
             continue
@@ -116,16 +118,21 @@ def audit_priority(entry: dict) -> str:
     return "low"
 
 
-def audit_queue(entries: list[dict], as_of: date | None = None) -> list[dict]:
-    """Return active due entries ordered by flag, risk, and due date."""
+def audit_queue(entries: list[dict] | SourceStore, as_of: date | None = None) -> list[dict]:
+    """Return active due entries ordered by flag, risk, and due date.
+
+    A SourceStore answers the due-date cut from its next_audit index instead
+    of parsing every entry's date.
+    """
     as_of = as_of or date.today()
-    due = []
-    for entry in entries:
-        if entry.get("status") == "CLOSED":
-            continue
-        due_date = parse_date(entry.get("next_audit"))
-        if due_date and due_date <= as_of:
-            due.append(entry)
+    if isinstance(entries, SourceStore):
+        candidates = entries.next_audit_between(None, as_of)
+    else:
+        candidates = [
+            entry for entry in entries
+            if (due_date := parse_date(entry.get("next_audit"))) and due_date <= as_of
+        ]
+    due = [entry for entry in candidates if entry.get("status") != "CLOSED"]
     return sorted(
         due,
         key=lambda entry: (
@@ -138,7 +145,7 @@ def audit_queue(entries: list[dict], as_of: date | None = None) -> list[dict]:
 
 
 def workload_summary(
-    entries: list[dict], capacity_per_week: float | None = None, as_of: date | None = None
+    entries: list[dict] | SourceStore, capacity_per_week: float | None = None, as_of: date | None = None
 ) -> dict:
     """Calculate steady-state workload and whether a backlog is recoverable."""
     as_of = as_of or date.today()
@@ -150,7 +157,7 @@ def workload_summary(
         for frequency, rate in CADENCE_PER_YEAR.items()
     )
     audits_per_week = audits_per_year / 52
-    backlog = len(audit_queue(active, as_of))
+    backlog = len(audit_queue(entries, as_of))
     result = {
         "as_of": as_of.isoformat(),
         "active_entries": len(active),
@@ -0,0 +1,1184 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the sources pipeline.
+
+Each subcommand times one stage against the seeded synthetic corpora from
+synthetic_sources.py (1k/10k/100k entries by default), so the numbers show
+how a stage grows with the corpus rather than how fast it is today. Corpora
+are generated once and cached in data/.cache/.
+
+Usage:
+    python benchmark.py yaml                  # libyaml vs pure-Python load/dump, 1k/10k entries
+    python benchmark.py yaml --sizes 100000   # add the slow 100k pure-Python run
+    python benchmark.py parse                 # serial vs process-pool parse_sources, 10k entries
+    python benchmark.py store                 # SourceStore queries vs list scans
+    python benchmark.py index                 # EntryIndex lookups vs line walks, 1k/10k/100k entries
+    python benchmark.py patch                 # one batch of 1 vs 5,000 field patches, 10k/100k entries
+    python benchmark.py schedule              # parse_schedule lexer vs per-pattern rescans, 100k phrases
+    python benchmark.py dates                 # parse_date_string scanner vs per-shape rescans, 100k strings
+    python benchmark.py audience              # detect_audience one scan vs per-pattern searches, 10k entries
+    python benchmark.py occurrences           # iter_occurrences jumps vs a day-by-day walk, 10k schedules x 5 years
+    python benchmark.py recurrence            # build_recurring_event/_local_end_of_day_utc, closed-form vs listing helpers
+    python benchmark.py catalog               # expand_occurrences NumPy vs scalar, 24 months, 1k/10k entries
+    python benchmark.py window                # OccurrenceIndex 2-hour window queries vs scans, 1k/10k entries
+    python benchmark.py overlaps              # validate_schedules location overlap sweep vs pairwise, 1k/10k entries
+    python benchmark.py redos                 # worst-case inputs vs a 50 ms per-parse budget; exits 1 if over
+    python benchmark.py derived               # generate_calendar parsing, derived cache off/cold/warm, 1k/10k entries
+    python benchmark.py platforms             # VEVENTs for 3 platforms, per-platform entry_to_events vs compile once
+    python benchmark.py fold                  # fold_ical_line linear octet folding vs slicing, 10k/100k/1M-char lines
+    python benchmark.py ics                   # CalendarWriter time and peak memory, 3 platforms, 1k/10k entries
+    python benchmark.py incremental           # generate_calendar after a one-entry edit, render cache vs full, 1k/10k entries
+    python benchmark.py incremental --sizes 100000  # the same on the 100k corpus (slow)
+    python benchmark.py db                    # SourcesDB build, incremental update and queries, 1k/10k entries
+    python benchmark.py stream                # peak memory, streaming vs full parse, 1k/10k entries
+    python benchmark.py memory                # tracemalloc: plain dicts vs Entry records, 100k entries
+"""
+
+import argparse
+import calendar
+import contextlib
+import io
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import derived_cache
+import generate_calendar
+import occurrence_arrays
+import utils
+from audit_complete import find_entry_info, update_sources_yaml
+from entry_index import EntryIndex, entry_blocks, scan_entries
+from occurrence_index import OccurrenceIndex
+from source_store import SourceStore
+from sources_db import SourcesDB
+from sources_patch import Patch, apply_patches
+from generate_calendar import (
+    AUDIENCE_PATTERNS, MONTHS, _resolve_year, compile_entry_events, detect_audience, entry_to_events,
+    generate_json_feed, iter_occurrences, parse_date_string, parse_date_strings, parse_schedule, render_vevent,
+)
+from synthetic_sources import (
+    CORPUS_SIZES, generate_date_strings, generate_entries, generate_resolved_schedules, generate_schedules,
+    synthetic_sources_path,
+)
+from validate_schedules import find_overlaps, is_vague_schedule, location_occurrences
+from utils import available_cpus, is_closed, load_sources, parse_date, parse_sources, yaml_dump
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    """Fastest wall time of `repeat` calls, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def corpus_text(size: int) -> str:
+    """YAML text of the synthetic corpus with `size` entries."""
+    return synthetic_sources_path(size).read_text(encoding="utf-8")
+
+
+def corpus_entries(size: int) -> list[dict]:
+    """Parsed entries of the synthetic corpus with `size` entries."""
+    return load_sources(synthetic_sources_path(size))
+
+
+def bench_store(args) -> None:
+    """Indexed SourceStore queries against the list scans they replaced."""
+    audit_dates = sorted(d for e in corpus_entries(args.sizes[0])
+                         if (d := parse_date(e.get("next_audit"))))
+    window = (audit_dates[len(audit_dates) // 2], audit_dates[len(audit_dates) // 2] + timedelta(days=7))
+
+    def scan_window(entries):
+        return [e for e in entries
+                if (d := parse_date(e.get("next_audit"))) and window[0] <= d <= window[1]]
+
+    queries = [
+        ("id", lambda es: next(e for e in es if e.get("id") == es[-1]["id"]),
+         lambda st: st.get(st.entries[-1]["id"])),
+        ("category", lambda es: [e for e in es if e.get("category") == "transportation"],
+         lambda st: st.select(category="transportation")),
+        ("cat+open", lambda es: [e for e in es if e.get("category") == "peer_support" and not is_closed(e)],
+         lambda st: st.select(category="peer_support", closed=False)),
+        ("tag", lambda es: [e for e in es if "grief" in (e.get("good_for") or [])],
+         lambda st: st.select(tags=[("good_for", "grief")])),
+        ("next_audit", scan_window, lambda st: st.next_audit_between(*window)),
+    ]
+
+    print(f"{'entries':>8} {'build s':>8} {'query':>11} {'rows':>7} {'scan ms':>9} {'store ms':>9}")
+    for size in args.sizes:
+        entries = corpus_entries(size)
+        build = best_of(lambda: SourceStore(entries), 1)
+        store = SourceStore(entries)
+        for name, scan, query in queries:
+            result = query(store)
+            rows = len(result) if isinstance(result, list) else 1
+            scan_s = best_of(lambda: scan(entries), args.repeat)
+            query_s = best_of(lambda: query(store), args.repeat)
+            print(f"{len(entries):>8} {build:>8.3f} {name:>11} {rows:>7} "
+                  f"{scan_s * 1000:>9.3f} {query_s * 1000:>9.3f}")
+
+
+def rescan_parse_schedule(schedule_str: str) -> dict:
+    """parse_schedule as it was: per-call patterns and one rescan per day name and modifier.
+
+    Kept as the reference the single-pass lexer is timed and checked against.
+    """
+    if not schedule_str:
+        return {}
+
+    result = {}
+    schedule_lower = schedule_str.lower()
+
+    # Normalize "noon" to "12:00" for time parsing
+    schedule_normalized = re.sub(r'\bnoon\b', '12:00', schedule_lower)
+
+    day_map = {
+        "sunday": "SU", "sundays": "SU", "sun": "SU",
+        "monday": "MO", "mondays": "MO", "mon": "MO",
+        "tuesday": "TU", "tuesdays": "TU", "tue": "TU",
+        "wednesday": "WE", "wednesdays": "WE", "wed": "WE",
+        "thursday": "TH", "thursdays": "TH", "thu": "TH",
+        "friday": "FR", "fridays": "FR", "fri": "FR",
+        "saturday": "SA", "saturdays": "SA", "sat": "SA",
+    }
+
+    # Day ranges: "Mon-Fri", "Sat-Sun", "Wed-Sat", "Monday-Friday".
+    # Ranges are expanded first, then any standalone day names are added, so a
+    # string like "Fri 11am-1pm; Sat-Sun 2:30-4:30pm" keeps all three days.
+    day_codes_ordered = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+    abbrev_to_idx = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
+    day_word = r'(mon|tue|wed|thu|fri|sat|sun)(?:day|sday|nesday|rsday|urday)?s?'
+    days_found = []
+    range_spans = []
+    for range_match in re.finditer(day_word + r'\s*[-–]\s*' + day_word, schedule_lower):
+        start_idx = abbrev_to_idx[range_match.group(1)]
+        end_idx = abbrev_to_idx[range_match.group(2)]
+        if start_idx <= end_idx:
+            span = range(start_idx, end_idx + 1)
+        else:
+            # Wrap-around range such as "Sat-Tue"
+            span = list(range(start_idx, 7)) + list(range(0, end_idx + 1))
+        for i in span:
+            if day_codes_ordered[i] not in days_found:
+                days_found.append(day_codes_ordered[i])
+        range_spans.append(range_match.span())
+
+    # Individual day matching (for "Tuesdays & Thursdays", "Tue/Thu"), skipping
+    # day names already consumed by a range above.
+    for day_name, day_code in sorted(day_map.items(), key=lambda x: -len(x[0])):
+        if day_code in days_found:
+            continue
+        for match in re.finditer(r'\b' + re.escape(day_name) + r'\b', schedule_lower):
+            if any(s <= match.start() < e for s, e in range_spans):
+                continue
+            days_found.append(day_code)
+            break
+
+    if days_found:
+        # Keep a stable Mon-first ordering so output does not depend on dict order
+        days_found = [d for d in day_codes_ordered if d in days_found]
+        result["day"] = ",".join(days_found)
+
+    ordinal_pattern = r"\b([1-5])(?:st|nd|rd|th)\b"
+    ordinals = re.findall(ordinal_pattern, schedule_lower)
+    if ordinals:
+        result["week_of_month"] = sorted({int(o) for o in ordinals})
+
+    # "Last Sunday of each month", "Last Wednesday"
+    if re.search(r'\blast\b', schedule_lower) and not ordinals:
+        result["last_of_month"] = True
+
+    if "every" in schedule_lower:
+        result["weekly"] = True
+
+    # "Every other Monday", "bi-weekly", "alternate Tuesdays"
+    if re.search(r'every\s+other|bi-?weekly|alternate', schedule_lower):
+        result["interval"] = 2
+
+    # "Daily 2-10pm" means every day, but only when no explicit days were given.
+    # Otherwise phrases like "Fri-Sun (check Facebook for daily schedule)" would
+    # be widened to all seven days.
+    if re.search(r'\bdaily\b', schedule_lower) and not result.get("day"):
+        result["daily"] = True
+        result["day"] = "MO,TU,WE,TH,FR,SA,SU"
+
+    if "weekdays" in schedule_lower and not result.get("day"):
+        result["day"] = "MO,TU,WE,TH,FR"
+        result["weekly"] = True
+
+    time_pattern = r"(\d{1,2})(?::(\d{2}))?\s*(am|pm)?\s*-\s*(\d{1,2})(?::(\d{2}))?\s*(am|pm)?"
+    time_match = re.search(time_pattern, schedule_normalized)
+    if time_match:
+        start_hour = int(time_match.group(1))
+        start_min = int(time_match.group(2) or 0)
+        start_period = time_match.group(3)
+        end_hour = int(time_match.group(4))
+        end_min = int(time_match.group(5) or 0)
+        end_period = time_match.group(6)
+
+        # Infer start period when only end has one (matches JS parseSchedule logic)
+        if not start_period and end_period:
+            raw_end_hour = int(time_match.group(4))
+            if start_hour <= raw_end_hour and end_period == "pm" and start_hour < 12:
+                # Same period: "2-10pm" means 2pm-10pm
+                start_period = "pm"
+            # else: different periods, start stays as AM: "10-7pm" = 10am-7pm
+
+        if start_period == "pm" and start_hour < 12:
+            start_hour += 12
+        elif start_period == "am" and start_hour == 12:
+            start_hour = 0
+
+        if end_period == "pm" and end_hour < 12:
+            end_hour += 12
+        elif end_period == "am" and end_hour == 12:
+            end_hour = 0
+
+        result["start_time"] = f"{start_hour:02d}:{start_min:02d}"
+        result["end_time"] = f"{end_hour:02d}:{end_min:02d}"
+    else:
+        # Try single time (e.g., "6pm", "10am") — assume 1-hour duration
+        single_time = re.search(r'(\d{1,2})(?::(\d{2}))?\s*(am|pm)', schedule_normalized)
+        if single_time:
+            hour = int(single_time.group(1))
+            minute = int(single_time.group(2) or 0)
+            period = single_time.group(3)
+            if period == "pm" and hour < 12:
+                hour += 12
+            elif period == "am" and hour == 12:
+                hour = 0
+            result["start_time"] = f"{hour:02d}:{minute:02d}"
+            end_hour = hour + 1 if hour < 23 else 23
+            end_minute = minute if hour < 23 else 59
+            result["end_time"] = f"{end_hour:02d}:{end_minute:02d}"
+
+    return result
+
+
+_MONTH_ALT = "|".join(sorted(MONTHS, key=len, reverse=True))
+
+
+def rescan_parse_date_string(date_str: str, today: date | None = None) -> tuple[datetime | None, datetime | None]:
+    """parse_date_string as it was: per-call patterns and one search per shape.
+
+    Kept as the reference the single-scan version is timed and checked against.
+    """
+    if not date_str:
+        return None, None
+
+    date_lower = date_str.lower()
+
+    # An explicit four-digit year anywhere in the string applies to the whole range
+    year_match = re.search(r"\b(20\d{2})\b", date_lower)
+    explicit_year = int(year_match.group(1)) if year_match else None
+
+    month_day = rf"({_MONTH_ALT})\s+(\d{{1,2}})\b"
+    dash = r"\s*(?:-|–|—|to|through|thru)\s*"
+
+    # Cross-month range: "May 22 - June 28, 2026"
+    m = re.search(month_day + dash + month_day, date_lower)
+    if m:
+        start_month, start_day = MONTHS[m.group(1)], int(m.group(2))
+        end_month, end_day = MONTHS[m.group(3)], int(m.group(4))
+        year = _resolve_year(explicit_year, start_month, start_day, today)
+        end_year = year + 1 if end_month < start_month else year
+        try:
+            return datetime(year, start_month, start_day), datetime(end_year, end_month, end_day)
+        except ValueError:
+            pass
+
+    # Same-month range: "July 17-19, 2026", "December 15-31"
+    m = re.search(month_day + dash + r"(\d{1,2})\b", date_lower)
+    if m:
+        month, start_day, end_day = MONTHS[m.group(1)], int(m.group(2)), int(m.group(3))
+        year = _resolve_year(explicit_year, month, start_day, today)
+        try:
+            return datetime(year, month, start_day), datetime(year, month, end_day)
+        except ValueError:
+            pass
+
+    # Month-to-month span without days: "June through August 2026"
+    m = re.search(rf"\b({_MONTH_ALT})\b{dash}\b({_MONTH_ALT})\b", date_lower)
+    if m:
+        start_month, end_month = MONTHS[m.group(1)], MONTHS[m.group(2)]
+        year = _resolve_year(explicit_year, start_month, 1, today)
+        end_year = year + 1 if end_month < start_month else year
+        last_day = calendar.monthrange(end_year, end_month)[1]
+        return datetime(year, start_month, 1), datetime(end_year, end_month, last_day)
+
+    # Single date: "June 6, 2026"
+    m = re.search(month_day, date_lower)
+    if m:
+        month, day = MONTHS[m.group(1)], int(m.group(2))
+        year = _resolve_year(explicit_year, month, day, today)
+        try:
+            return datetime(year, month, day), None
+        except ValueError:
+            pass
+
+    return None, None
+
+
+def listing_nth_weekday_of_month(year: int, month: int, weekday: int, nth: int) -> date | None:
+    """The _nth_weekday_of_month that built a date for every day of the month, kept as a reference."""
+    days_in_month = calendar.monthrange(year, month)[1]
+    matches = [
+        day for day in range(1, days_in_month + 1)
+        if date(year, month, day).weekday() == weekday
+    ]
+    try:
+        return date(year, month, matches[nth - 1 if nth > 0 else nth])
+    except IndexError:
+        return None
+
+
+def listing_first_monthly_occurrence(base_date: datetime, days: list[str], weeks: list[int]) -> datetime | None:
+    """The _first_monthly_occurrence that asked listing_nth_weekday_of_month for every pair."""
+    year, month = base_date.year, base_date.month
+    for _ in range(14):
+        candidates = []
+        for day in days:
+            weekday = generate_calendar.WEEKDAY_INDEX.get(day)
+            if weekday is None:
+                continue
+            for nth in weeks:
+                found = listing_nth_weekday_of_month(year, month, weekday, nth)
+                if found and found >= base_date.date():
+                    candidates.append(found)
+        if candidates:
+            best = min(candidates)
+            return datetime(best.year, best.month, best.day)
+        month += 1
+        if month > 12:
+            month, year = 1, year + 1
+    return None
+
+
+def listing_pacific_utc_offset(dt: datetime) -> int:
+    """The _pacific_utc_offset that found both DST boundaries again on every call."""
+    dst_start = listing_nth_weekday_of_month(dt.year, 3, 6, 2)
+    dst_end = listing_nth_weekday_of_month(dt.year, 11, 6, 1)
+    if dst_start and dst_end and dst_start <= dt.date() < dst_end:
+        return 7
+    return 8
+
+
+@contextlib.contextmanager
+def listing_recurrence_helpers():
+    """Run generate_calendar with the listing helpers in place of the closed-form ones."""
+    names = ("_nth_weekday_of_month", "_first_monthly_occurrence", "_pacific_utc_offset")
+    saved = {name: getattr(generate_calendar, name) for name in names}
+    generate_calendar._nth_weekday_of_month = listing_nth_weekday_of_month
+    generate_calendar._first_monthly_occurrence = listing_first_monthly_occurrence
+    generate_calendar._pacific_utc_offset = listing_pacific_utc_offset
+    try:
+        yield
+    finally:
+        for name, helper in saved.items():
+            setattr(generate_calendar, name, helper)
+
+
+def recurrence_workload(count: int, seed: int = 0) -> list[tuple[dict, dict]]:
+    """(parsed schedule, entry bounds) pairs: synthetic phrases with random start and end dates."""
+    rng = random.Random(seed)
+    workload = []
+    for phrase in generate_schedules(count, seed=seed):
+        schedule = parse_schedule.uncached(phrase)
+        start = date(2026, 1, 1) + timedelta(days=rng.randrange(730))
+        entry = {"schedule_start_date": start.isoformat()}
+        if rng.random() < 0.5:
+            entry["schedule_end_date"] = (start + timedelta(days=rng.randrange(30, 900))).isoformat()
+        workload.append((schedule, entry))
+    return workload
+
+
+def rescan_detect_audience(text: str, patterns: dict = AUDIENCE_PATTERNS, adult_children_filter: bool = True) -> list:
+    """detect_audience as it was: one case-insensitive re.search per pattern.
+
+    add_audience_fields used the same loop over its own table without the
+    "adult children" filter. Kept as the reference AudienceMatcher is timed
+    and checked against.
+    """
+    if not text:
+        return []
+    text_lower = text.lower()
+    detected = set()
+    for tag, tag_patterns in patterns.items():
+        for pattern in tag_patterns:
+            if re.search(pattern, text_lower, re.IGNORECASE):
+                if adult_children_filter and tag == 'children' and 'adult children' in text_lower:
+                    continue
+                detected.add(tag)
+                break
+    return sorted(detected)
+
+
+# Free-text shapes that make backtracking regexes go quadratic or worse: long
+# runs of one token, tokens separated by long runs of spaces, and keywords a
+# ".*" pattern would rescan from every occurrence. Each maps a length to a
+# string of about that length.
+ADVERSARIAL_INPUTS = {
+    "digits": lambda n: "1" * n,
+    "digit then spaces": lambda n: "1" + " " * n + "x",
+    "digits and spaces": lambda n: ("1" + " " * 30) * (n // 31),
+    "dashes": lambda n: "-" * n,
+    "digit-dash": lambda n: "1-" * (n // 2),
+    "times without end": lambda n: "10:30 am - " * (n // 11),
+    "day names": lambda n: "mon" * (n // 3),
+    "day ranges": lambda n: "mon - " * (n // 6),
+    "day then spaces": lambda n: "monday" + " " * n + "-",
+    "ordinals": lambda n: "1st 2nd " * (n // 8),
+    "every": lambda n: "every " * (n // 6),
+    "month names": lambda n: "jan " * (n // 4),
+    "month then spaces": lambda n: "june" + " " * n + "1",
+    "month ranges": lambda n: "jan 1 - " * (n // 8),
+    "month spans": lambda n: "june through " * (n // 13),
+    "years": lambda n: "2026 " * (n // 5),
+    "vague keywords": lambda n: "contact check year-round " * (n // 25),
+    "keyword then spaces": lambda n: "dates" + " " * n + "x",
+    "ages": lambda n: "ages 3" + "-" * n,
+}
+
+
+def adversarial_timings(length: int, repeat: int = 1) -> list[tuple[str, str, float]]:
+    """(input family, parser, seconds) for every ADVERSARIAL_INPUTS family at `length`.
+
+    The parse length limit is lifted while timing, so the patterns themselves
+    are measured rather than the cap that normally stops such input.
+    """
+    parsers = [
+        ("parse_schedule", parse_schedule.uncached),
+        ("parse_date_string", parse_date_string.uncached),
+        ("is_vague_schedule", is_vague_schedule),
+        ("detect_audience", detect_audience.uncached),
+    ]
+    limit = generate_calendar.MAX_PARSE_LENGTH
+    generate_calendar.MAX_PARSE_LENGTH = length + 1
+    try:
+        return [(family, name, best_of(lambda: parse(make(length)), repeat))
+                for family, make in ADVERSARIAL_INPUTS.items() for name, parse in parsers]
+    finally:
+        generate_calendar.MAX_PARSE_LENGTH = limit
+
+
+def audience_texts(entries: list[dict]) -> list[str]:
+    """The entry and program texts get_entry_audience/get_program_audience scan."""
+    texts = []
+    for entry in entries:
+        practical_tips = entry.get("practical_tips", "")
+        if isinstance(practical_tips, dict):
+            practical_tips = " ".join(str(v) for v in practical_tips.values() if v)
+        fields = [entry.get("name", ""), entry.get("eligibility", ""), entry.get("notes", ""), practical_tips]
+        texts.append(" ".join(str(t) for t in fields if t))
+        for program in entry.get("programs") or []:
+            if hasattr(program, "get"):
+                texts.append(" ".join([program.get("name", ""), str(program.get("eligibility", "")),
+                                       str(program.get("notes", ""))]))
+    return texts
+
+
+def daywalk_occurrences(resolved: dict, start: date, end: date) -> list[date]:
+    """Occurrences of a resolved schedule, found by testing every day of the window.
+
+    A line-for-line port of isResolvedOccurrenceDate in docs/index.html, the
+    reference iter_occurrences is checked against.
+    """
+    anchor = date.fromisoformat(resolved["anchor_date"])
+    until = date.fromisoformat(resolved["until_date"]) if resolved.get("until_date") else None
+    interval = max(1, int(resolved.get("interval") or 1))
+    weekdays = {generate_calendar.WEEKDAY_INDEX[day] for day in resolved.get("weekdays") or []
+                if day in generate_calendar.WEEKDAY_INDEX}
+    weeks = [int(week) for week in resolved.get("month_weeks") or [] if int(week) == -1 or 1 <= int(week) <= 5]
+    frequency = resolved.get("frequency")
+    found = []
+    day = start
+    while day <= end:
+        current, day = day, day + timedelta(days=1)
+        if current < anchor or (until and current > until):
+            continue
+        if frequency == "daily":
+            if (not weekdays or current.weekday() in weekdays) and (current - anchor).days % interval == 0:
+                found.append(current)
+            continue
+        if current.weekday() not in weekdays:
+            continue
+        if frequency == "weekly":
+            elapsed = ((current - timedelta(days=current.weekday())) - (anchor - timedelta(days=anchor.weekday()))).days // 7
+            if elapsed % interval == 0:
+                found.append(current)
+        elif frequency == "monthly":
+            elapsed = (current.year - anchor.year) * 12 + current.month - anchor.month
+            if elapsed % interval:
+                continue
+            is_last = (current + timedelta(days=7)).month != current.month
+            if (current.day - 1) // 7 + 1 in weeks or (-1 in weeks and is_last):
+                found.append(current)
+    return found
+
+
+def slicing_fold_ical_line(line: str, max_length: int = 75) -> str:
+    """The old fold_ical_line: re-slices the rest of the line per fold and counts characters, not octets."""
+    if len(line) <= max_length:
+        return line
+    result = []
+    while len(line) > max_length:
+        result.append(line[:max_length])
+        line = " " + line[max_length:]
+    result.append(line)
+    return "\r\n".join(result)
+
+
+def pairwise_overlaps(occurrences: list[tuple]) -> list:
+    """find_overlaps by comparing every two occurrences at a location, the O(n^2) reference."""
+    by_location: dict[str, list] = {}
+    for location, start, end, label, owner in occurrences:
+        by_location.setdefault(location, []).append((start, end, label, owner))
+    pairs: dict[tuple[str, str, str], list] = {}
+    for location, items in by_location.items():
+        items.sort(key=lambda item: (item[0], item[1]))
+        for position, (start, end, label, owner) in enumerate(items):
+            for other_start, other_end, other, other_owner in items[:position]:
+                if other_start < end and start < other_end and other != label and (owner is None or other_owner != owner):
+                    first, second = sorted((other, label))
+                    found = pairs.setdefault((location, first, second), [0, start])
+                    found[0] += 1
+    return sorted(((location, first, second, count, start) for (location, first, second), (count, start) in pairs.items()),
+                  key=lambda overlap: (overlap[0], overlap[4], overlap[1], overlap[2]))
+
+
+def walk_to_entry(path: Path, entry_id: str) -> list[str]:
+    """The lines of one entry, found the way the editing scripts used to: line by line."""
+    lines = path.read_text(encoding="utf-8").split("\n")
+    start = lines.index(f"- id: {entry_id}")
+    end = start + 1
+    while end < len(lines) and not lines[end].startswith(("- id: ", "---")):
+        end += 1
+    return lines[start:end]
+
+
+def bench_index(args) -> None:
+    """EntryIndex builds, lookups and single-entry edits against whole-file line walks."""
+    print(f"{'entries':>8} {'scan s':>8} {'build s':>8} {'open ms':>8} "
+          f"{'walk ms':>9} {'find ms':>8} {'update ms':>10}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "sources.yaml"
+            shutil.copy(synthetic_sources_path(size), path)
+            data = path.read_bytes()
+            scan = best_of(lambda: sum(1 for _ in scan_entries(data)), 1)
+            build = best_of(lambda: EntryIndex.open(path).close(), 1)
+            with EntryIndex.open(path) as index:
+                last_id = max(index, key=lambda location: location.start).id
+            reopen = best_of(lambda: EntryIndex.open(path).close(), args.repeat)
+            walk = best_of(lambda: walk_to_entry(path, last_id), args.repeat)
+            find = best_of(lambda: find_entry_info(path, last_id), args.repeat)
+            # apply_patches' streamed rewrite and rename, plus the backup link.
+            update = best_of(lambda: update_sources_yaml(path, last_id, "2026-01-01", "2027-01-01"),
+                             args.repeat)
+            print(f"{size:>8} {scan:>8.3f} {build:>8.3f} {reopen * 1000:>8.2f} "
+                  f"{walk * 1000:>9.2f} {find * 1000:>8.2f} {update * 1000:>10.2f}")
+
+
+def bench_patch(args) -> None:
+    """One apply_patches batch of 1 patch vs `--patches` patches (spread over the file)."""
+    print(f"{'entries':>8} {'1 patch ms':>11} {f'{args.patches} patches ms':>17} {'ratio':>6}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "sources.yaml"
+            shutil.copy(synthetic_sources_path(size), path)
+            with EntryIndex.open(path) as index:
+                ids = [location.id for location in index]
+            step = max(1, len(ids) // args.patches)
+            targets = ids[::step][:args.patches]
+            runs = iter(range(1, 10_000))
+
+            def batch(entry_ids):
+                # A new date each run, so every run really rewrites the file.
+                day = date(2027, 1, 1) + timedelta(days=next(runs))
+                apply_patches(path, [Patch(entry_id, "next_audit", day) for entry_id in entry_ids])
+
+            one = best_of(lambda: batch(targets[-1:]), args.repeat)
+            many = best_of(lambda: batch(targets), args.repeat)
+            print(f"{size:>8} {one * 1000:>11.1f} {many * 1000:>17.1f} {many / one:>6.1f}")
+
+
+def traced(fn) -> tuple[object, int, int]:
+    """Run fn under tracemalloc; returns (result, retained bytes, peak bytes)."""
+    tracemalloc.start()
+    try:
+        result = fn()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, retained, peak
+
+
+def bench_memory(args) -> None:
+    """Memory held by parsed entries as PyYAML dicts vs compact Entry records."""
+    content = corpus_text(args.entries)
+    print(f"{'model':>8} {'entries':>8} {'retained MB':>12} {'peak MB':>9}")
+    results = {}
+    for name, compact in (("dict", False), ("records", True)):
+        entries, retained, peak = traced(lambda: parse_sources(content, compact=compact))
+        results[name] = retained
+        print(f"{name:>8} {len(entries):>8} {retained / 2**20:>12.1f} {peak / 2**20:>9.1f}")
+        del entries
+    print(f"records retain {results['records'] / results['dict']:.0%} of the dict model")
+
+
+def bench_schedule(args) -> None:
+    """parse_schedule throughput against the rescanning reference, checking they agree."""
+    schedules = generate_schedules(args.count)
+    expected = [rescan_parse_schedule(schedule) for schedule in schedules]
+    mismatches = sum(parse_schedule(schedule) != result for schedule, result in zip(schedules, expected))
+    print(f"{len(schedules)} phrases, {mismatches} mismatches")
+    print(f"{'parser':>8} {'total s':>8} {'us/call':>8}")
+    baseline = None
+    for name, parse in (("rescan", rescan_parse_schedule), ("lexer", parse_schedule)):
+        elapsed = best_of(lambda: [parse(schedule) for schedule in schedules], args.repeat)
+        speedup = f"  ({baseline / elapsed:.1f}x)" if baseline else ""
+        baseline = baseline or elapsed
+        print(f"{name:>8} {elapsed:>8.2f} {elapsed / len(schedules) * 1e6:>8.1f}{speedup}")
+
+
+def bench_dates(args) -> None:
+    """parse_date_string throughput against the rescanning reference, checking they agree."""
+    today = date.today()
+    date_strs = generate_date_strings(args.count)
+    expected = [rescan_parse_date_string(date_str, today) for date_str in date_strs]
+    mismatches = sum(parse_date_string(date_str, today) != result for date_str, result in zip(date_strs, expected))
+    print(f"{len(date_strs)} date strings, {mismatches} mismatches")
+    print(f"{'parser':>8} {'total s':>8} {'us/call':>8}")
+    baseline = None
+    for name, parse in (("rescan", lambda: [rescan_parse_date_string(d, today) for d in date_strs]),
+                        ("scanner", lambda: [parse_date_string(d, today) for d in date_strs]),
+                        ("bulk", lambda: parse_date_strings(date_strs, today))):
+        elapsed = best_of(parse, args.repeat)
+        speedup = f"  ({baseline / elapsed:.1f}x)" if baseline else ""
+        baseline = baseline or elapsed
+        print(f"{name:>8} {elapsed:>8.2f} {elapsed / len(date_strs) * 1e6:>8.1f}{speedup}")
+
+
+def bench_audience(args) -> None:
+    """detect_audience throughput against the per-pattern search loop, checking they agree."""
+    texts = audience_texts(generate_entries(args.entries))
+    mismatches = sum(detect_audience(text) != rescan_detect_audience(text) for text in texts)
+    print(f"{len(texts)} texts ({sum(map(len, texts)) // len(texts)} chars avg), {mismatches} mismatches")
+    print(f"{'matcher':>8} {'total s':>8} {'us/call':>8}")
+    baseline = None
+    for name, detect in (("search", rescan_detect_audience), ("scan", detect_audience)):
+        elapsed = best_of(lambda: [detect(text) for text in texts], args.repeat)
+        speedup = f"  ({baseline / elapsed:.1f}x)" if baseline else ""
+        baseline = baseline or elapsed
+        print(f"{name:>8} {elapsed:>8.2f} {elapsed / len(texts) * 1e6:>8.1f}{speedup}")
+
+
+def bench_occurrences(args) -> None:
+    """iter_occurrences against the day-by-day walk over a multi-year window, checking they agree."""
+    schedules = generate_resolved_schedules(args.count)
+    start = date(2026, 1, 1)
+    end = date(2026 + args.years, 1, 1) - timedelta(days=1)
+    expected = [daywalk_occurrences(resolved, start, end) for resolved in schedules]
+    mismatches = sum(list(iter_occurrences(resolved, start, end)) != found
+                     for resolved, found in zip(schedules, expected))
+    total = sum(map(len, expected))
+    print(f"{len(schedules)} schedules, {start} to {end}, {total} occurrences, {mismatches} mismatches")
+    print(f"{'engine':>8} {'total s':>8} {'us/schedule':>12}")
+    baseline = None
+    for name, expand in (("daywalk", daywalk_occurrences),
+                         ("jump", lambda resolved, start, end: list(iter_occurrences(resolved, start, end)))):
+        elapsed = best_of(lambda: [expand(resolved, start, end) for resolved in schedules], args.repeat)
+        speedup = f"  ({baseline / elapsed:.1f}x)" if baseline else ""
+        baseline = baseline or elapsed
+        print(f"{name:>8} {elapsed:>8.2f} {elapsed / len(schedules) * 1e6:>12.1f}{speedup}")
+
+
+def bench_catalog(args) -> int:
+    """expand_occurrences against the scalar reference over a horizon, checking they agree."""
+    if not occurrence_arrays.HAS_NUMPY:
+        print("NumPy is not installed; expand_occurrences needs it.")
+        return 1
+    start = date(2026, 3, 1)
+    month = start.year * 12 + start.month - 1 + args.months
+    end = date(month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    print(f"{'entries':>8} {'schedules':>10} {'occurrences':>12} {'scalar s':>9} {'numpy s':>8}  mismatches")
+    for size in args.sizes:
+        with contextlib.redirect_stderr(io.StringIO()):  # unparseable-schedule warnings
+            schedules = occurrence_arrays.catalog_schedules(corpus_entries(size), start)
+        expected = occurrence_arrays.scalar_occurrences(schedules, start, end)
+        arrays = occurrence_arrays.expand_occurrences(schedules, start, end)
+        got = zip(arrays.entry.tolist(), arrays.start.astype(datetime).tolist(), arrays.end.astype(datetime).tolist())
+        mismatches = len(expected) != len(arrays.entry) or sum(row != other for row, other in zip(expected, got))
+        scalar = best_of(lambda: occurrence_arrays.scalar_occurrences(schedules, start, end), args.repeat)
+        vectorized = best_of(lambda: occurrence_arrays.expand_occurrences(schedules, start, end), args.repeat)
+        print(f"{size:>8} {len(schedules):>10} {len(expected):>12} {scalar:>9.2f} {vectorized:>8.3f}  "
+              f"{mismatches}  ({scalar / vectorized:.1f}x)")
+
+
+def bench_recurrence(args) -> None:
+    """build_recurring_event and _local_end_of_day_utc, closed-form helpers vs the listing ones."""
+    today = date(2026, 1, 1)
+    workload = recurrence_workload(args.count)
+    days = [datetime(2026, 1, 1) + timedelta(days=offset) for offset in range(args.count)]
+
+    def build_all():
+        return [generate_calendar.build_recurring_event(
+                    schedule, entry, "Summary", "Description", "<p>Description</p>", "Location",
+                    f"uid-{index}", "https://example.org", "peer_support", "google", today=today)
+                for index, (schedule, entry) in enumerate(workload)]
+
+    def until_all():
+        return [generate_calendar._local_end_of_day_utc(day) for day in days]
+
+    with listing_recurrence_helpers():
+        expected = (build_all(), until_all())
+    mismatches = sum(a != b for a, b in zip(expected[0] + expected[1], build_all() + until_all()))
+    built = sum(event is not None for event in expected[0])
+    print(f"{len(workload)} schedules ({built} build an event), {len(days)} days, {mismatches} mismatches")
+    print(f"{'function':>22} {'helpers':>8} {'total s':>8} {'us/call':>8}")
+    for name, run, calls in (("build_recurring_event", build_all, len(workload)),
+                             ("_local_end_of_day_utc", until_all, len(days))):
+        with listing_recurrence_helpers():
+            baseline = best_of(run, args.repeat)
+        elapsed = best_of(run, args.repeat)
+        print(f"{name:>22} {'listing':>8} {baseline:>8.3f} {baseline / calls * 1e6:>8.1f}")
+        print(f"{name:>22} {'closed':>8} {elapsed:>8.3f} {elapsed / calls * 1e6:>8.1f}  ({baseline / elapsed:.1f}x)")
+
+
+def bench_window(args) -> None:
+    """OccurrenceIndex window queries against a scan of every occurrence, checking they agree."""
+    start = date(2026, 3, 1)
+    rng = random.Random(0)
+    print(f"{'entries':>8} {'occurrences':>12} {'build s':>8} {'results':>8} {'scan us':>9} {'index us':>9}  mismatches")
+    for size in args.sizes:
+        with contextlib.redirect_stderr(io.StringIO()):  # unparseable-schedule warnings
+            entries = corpus_entries(size)
+            began = time.perf_counter()
+            index = OccurrenceIndex.build(entries, start, args.months)
+            build = time.perf_counter() - began
+        windows = []
+        for _ in range(args.queries):
+            window_start = datetime(2026, 3, 1) + timedelta(minutes=rng.randrange(args.months * 28 * 24 * 60))
+            category = rng.choice([None, "peer_support", "events"])
+            windows.append((window_start, window_start + timedelta(hours=2), category))
+
+        def scan():
+            return [[occurrence for occurrence in index.occurrences
+                     if occurrence.start < window_end and occurrence.end > window_start
+                     and (not category or occurrence.category == category)]
+                    for window_start, window_end, category in windows]
+
+        def query():
+            return [index.query(window_start, window_end, category=category)
+                    for window_start, window_end, category in windows]
+
+        expected = scan()
+        mismatches = sum(sorted(a) != sorted(b) for a, b in zip(expected, query()))
+        scanned, indexed = best_of(scan, args.repeat), best_of(query, args.repeat)
+        results = sum(map(len, expected)) / len(windows)
+        print(f"{size:>8} {len(index.occurrences):>12} {build:>8.2f} {results:>8.1f} "
+              f"{scanned / len(windows) * 1e6:>9.0f} {indexed / len(windows) * 1e6:>9.1f}  {mismatches}")
+
+
+def bench_overlaps(args) -> None:
+    """validate_schedules' sweep-line overlap check against pairwise comparison, checking they agree."""
+    today = date(2026, 3, 1)
+    print(f"{'entries':>8} {'occurrences':>12} {'expand s':>9} {'sweep s':>8} {'pairwise s':>11} {'pairs':>6}  mismatches")
+    for size in args.sizes:
+        with contextlib.redirect_stderr(io.StringIO()):  # unparseable-schedule warnings
+            entries = corpus_entries(size)
+            began = time.perf_counter()
+            occurrences = list(location_occurrences(entries, today))
+            expand = time.perf_counter() - began
+        overlaps = find_overlaps(occurrences)
+        expected = pairwise_overlaps(occurrences)
+        mismatches = len(overlaps) != len(expected) or sum(tuple(a) != b for a, b in zip(overlaps, expected))
+        sweep = best_of(lambda: find_overlaps(occurrences), args.repeat)
+        pairwise = best_of(lambda: pairwise_overlaps(occurrences), 1)
+        print(f"{size:>8} {len(occurrences):>12} {expand:>9.2f} {sweep:>8.3f} {pairwise:>11.2f} "
+              f"{len(overlaps):>6}  {mismatches}")
+
+
+def bench_db(args) -> None:
+    """SourcesDB full build, one-entry incremental update and canned queries."""
+    print(f"{'entries':>8} {'build s':>8} {'no-op ms':>9} {'1 edit ms':>10} "
+          f"{'meets ms':>9} {'cites ms':>9} {'due ms':>7} {'search ms':>10}")
+    as_of = date(2026, 1, 1)
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            path, db_path = Path(tmp) / "sources.yaml", Path(tmp) / "mirror.sqlite"
+            shutil.copy(synthetic_sources_path(size), path)
+            build = best_of(lambda: SourcesDB.open(path, db_path, as_of=as_of).close(), 1)
+            noop = best_of(lambda: SourcesDB.open(path, db_path, as_of=as_of).close(), args.repeat)
+            runs = iter(range(1, 10_000))
+            with EntryIndex.open(path) as index:
+                last_id = max(index, key=lambda location: location.start).id
+
+            def edit():
+                day = date(2027, 1, 1) + timedelta(days=next(runs))
+                apply_patches(path, [Patch(last_id, "next_audit", day)], backup=False)
+                start = time.perf_counter()
+                SourcesDB.open(path, db_path, as_of=as_of).close()
+                return time.perf_counter() - start
+
+            update = min(edit() for _ in range(args.repeat))
+            with SourcesDB.open(path, db_path, as_of=as_of) as mirror:
+                host = mirror.sql("SELECT host FROM source_urls LIMIT 1")[0][0]
+                queries = [best_of(fn, args.repeat) for fn in (
+                    lambda: mirror.meeting_on("thursday", category="peer_support"),
+                    lambda: mirror.citing(host),
+                    lambda: mirror.due_before(date(2026, 2, 1)),
+                    lambda: mirror.search("grief"),
+                )]
+            meets, cites, due, search = (elapsed * 1000 for elapsed in queries)
+            print(f"{size:>8} {build:>8.2f} {noop * 1000:>9.2f} {update * 1000:>10.1f} "
+                  f"{meets:>9.2f} {cites:>9.2f} {due:>7.2f} {search:>10.2f}")
+
+
+def bench_redos(args) -> int:
+    """Time every parser on worst-case inputs; fail if any parse exceeds the budget."""
+    timings = adversarial_timings(args.length, args.repeat)
+    over = [(family, name, elapsed) for family, name, elapsed in timings if elapsed > args.budget]
+    slowest = sorted(timings, key=lambda t: -t[2])[:args.top]
+    print(f"{len(timings)} parses of {args.length:,}-character inputs, budget {args.budget * 1e3:.0f} ms each")
+    print(f"{'input':>20} {'parser':>18} {'ms':>8}")
+    for family, name, elapsed in slowest:
+        print(f"{family:>20} {name:>18} {elapsed * 1e3:>8.2f}")
+    for family, name, elapsed in over:
+        print(f"OVER BUDGET: {name} on {family!r}: {elapsed * 1e3:.1f} ms")
+    return 1 if over else 0
+
+
+def bench_derived(args) -> None:
+    """generate_calendar's parsing work without the derived cache, cold and warm."""
+    print(f"{'entries':>8} {'uncached s':>11} {'cold s':>8} {'warm s':>8}  warm hit rate")
+    for size in args.sizes:
+        entries = [entry for entry in load_sources(synthetic_sources_path(size)) if not is_closed(entry)]
+        today = date.today()
+
+        def run():
+            with contextlib.redirect_stderr(io.StringIO()):  # unparseable-schedule warnings
+                for platform in ("google", "apple", "outlook"):
+                    for entry in entries:
+                        entry_to_events(entry, platform=platform, today=today)
+                generate_json_feed(entries, today=today)
+
+        uncached = best_of(run, 1)
+        with tempfile.TemporaryDirectory() as tmp:
+            sources_path = Path(tmp) / "sources.yaml"
+            timings = []
+            for _ in range(2):
+                with derived_cache.session(sources_path, report=False) as cache:
+                    timings.append(best_of(run, 1))
+            hits = sum(cache.hits.values())
+            rate = hits / (hits + sum(cache.misses.values()))
+        print(f"{size:>8} {uncached:>11.2f} {timings[0]:>8.2f} {timings[1]:>8.2f}  {rate:.1%}")
+
+
+def bench_platforms(args) -> None:
+    """All three platforms' VEVENTs: entry_to_events per platform vs compiling once and rendering three times."""
+    today = date.today()
+    platforms = ("google", "apple", "outlook")
+    print(f"{'entries':>8} {'events':>8} {'per-platform s':>15} {'compile once s':>15} {'speedup':>8}  identical")
+    for size in args.sizes:
+        entries = [entry for entry in load_sources(synthetic_sources_path(size)) if not is_closed(entry)]
+
+        def per_platform():
+            return [entry_to_events(entry, platform=platform, today=today)
+                    for entry in entries for platform in platforms]
+
+        def compile_once():
+            rendered = []
+            for entry in entries:
+                events = compile_entry_events(entry, today=today)
+                rendered.extend([render_vevent(event, platform) for event in events] for platform in platforms)
+            return rendered
+
+        with contextlib.redirect_stderr(io.StringIO()):  # unparseable-schedule warnings
+            identical = per_platform() == compile_once()
+            separate = best_of(per_platform, args.repeat)
+            once = best_of(compile_once, args.repeat)
+        events = sum(len(compile_entry_events(entry, today=today)) for entry in entries)
+        print(f"{size:>8} {events:>8} {separate:>15.2f} {once:>15.2f} {separate / once:>7.1f}x  {identical}")
+
+
+def bench_fold(args) -> None:
+    """fold_ical_line on long ASCII and multi-byte lines, linear octet folding vs the slicing loop."""
+    print(f"{'text':>7} {'chars':>9} {'slicing ms':>11} {'linear ms':>10}  slicing within 75 octets")
+    for text in ("ascii", "utf-8"):
+        alphabet = "peer support " if text == "ascii" else "peña ❌ grupo "
+        for length in args.lengths:
+            line = "DESCRIPTION:" + (alphabet * (length // len(alphabet) + 1))[:length]
+            slicing = best_of(lambda: slicing_fold_ical_line(line), args.repeat)
+            linear = best_of(lambda: generate_calendar.fold_ical_line(line), args.repeat)
+            fits = all(len(piece.encode("utf-8")) <= 75 for piece in slicing_fold_ical_line(line).split("\r\n"))
+            print(f"{text:>7} {length:>9,} {slicing * 1e3:>11.2f} {linear * 1e3:>10.2f}  {fits}")
+
+
+def bench_ics(args) -> None:
+    """Peak memory and time of CalendarWriter writing every platform's calendars from a stream of entries."""
+    print(f"{'entries':>8} {'events':>8} {'time s':>8} {'peak MB':>9} {'written MB':>11}")
+    for size in args.sizes:
+        path = synthetic_sources_path(size)
+        with tempfile.TemporaryDirectory() as tmp:
+            def write():
+                with generate_calendar.CalendarWriter(Path(tmp), ["google", "apple", "outlook"]) as calendars:
+                    for entry in utils.iter_sources(path):
+                        if not is_closed(entry):
+                            calendars.add(entry)
+                return calendars
+
+            start = time.perf_counter()
+            with contextlib.redirect_stderr(io.StringIO()):  # unparseable-schedule warnings
+                calendars, _, peak = traced(write)
+            elapsed = time.perf_counter() - start
+            written = sum(f.stat().st_size for f in Path(tmp).rglob("*.ics"))
+        print(f"{size:>8} {sum(calendars.event_counts.values()):>8} {elapsed:>8.2f} {peak / 2**20:>9.1f} "
+              f"{written / 2**20:>11.1f}")
+
+
+def bench_incremental(args) -> None:
+    """generate_calendar --json after editing one entry: render cache vs a full build without caches."""
+    script = Path(__file__).resolve().parent / "generate_calendar.py"
+    print(f"{'entries':>8} {'full s':>8} {'cold s':>8} {'warm s':>8} {'1 edit s':>9} {'of full':>8}  identical")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            sources = tmp / "sources.yaml"
+            shutil.copyfile(synthetic_sources_path(size), sources)
+
+            def build(output: str, cached: bool = True) -> float:
+                env = dict(os.environ, **{utils.NO_CACHE_ENV: "" if cached else "1"})
+                start = time.perf_counter()
+                subprocess.run([sys.executable, str(script), "--json", "--sources", str(sources),
+                                "--output", str(tmp / output)], env=env, check=True, capture_output=True)
+                return time.perf_counter() - start
+
+            cold = build("cold")
+            warm = build("warm")
+            data = sources.read_bytes()
+            _, start, end = list(entry_blocks(data))[size // 2]
+            block = data[start:end].replace(b"\n  name: ", b"\n  name: Edited ", 1)
+            sources.write_bytes(data[:start] + block + data[end:])
+            edit = build("edit")
+            full = build("full", cached=False)
+            identical = all((tmp / "edit" / path.relative_to(tmp / "full")).read_bytes() == path.read_bytes()
+                            for path in (tmp / "full").rglob("*") if path.is_file())
+        print(f"{size:>8} {full:>8.2f} {cold:>8.2f} {warm:>8.2f} {edit:>9.2f} {edit / full:>8.1%}  {identical}")
+
+
+def bench_stream(args) -> None:
+    """Time and peak memory of iter_sources() vs parse_sources() as the corpus grows."""
+    print(f"{'entries':>8} {'mode':>8} {'time s':>8} {'peak MB':>9}")
+    for size in args.sizes:
+        path = synthetic_sources_path(size)
+        for name, fn in (("stream", lambda: sum(1 for _ in utils.iter_sources(path))),
+                         ("load", lambda: len(parse_sources(path.read_text(encoding="utf-8"))))):
+            start = time.perf_counter()
+            _, _, peak = traced(fn)
+            elapsed = time.perf_counter() - start
+            print(f"{size:>8} {name:>8} {elapsed:>8.2f} {peak / 2**20:>9.1f}")
+
+
+def bench_yaml(args) -> None:
+    """Load and dump timings for the libyaml and pure-Python code paths."""
+    if not utils.HAS_LIBYAML:
+        print("PyYAML was built without libyaml; only the pure-Python path is available.")
+    paths = [("python", utils.PySafeLoader, utils.PySafeDumper)]
+    if utils.HAS_LIBYAML:
+        paths.append(("libyaml", utils.SafeLoader, utils.SafeDumper))
+
+    print(f"{'entries':>8} {'path':>8} {'load s':>9} {'dump s':>9}")
+    for size in args.sizes:
+        content = corpus_text(size)
+        entries = parse_sources(content)
+        repeat = args.repeat if size < 100_000 else 1
+        baseline = None
+        for name, loader, dumper in paths:
+            load = best_of(lambda: parse_sources(content, loader=loader), repeat)
+            dump = best_of(lambda: yaml_dump(entries, dumper=dumper, allow_unicode=True,
+                                             sort_keys=False, width=120), repeat)
+            speedup = ""
+            if baseline:
+                speedup = f"  ({baseline[0] / load:.1f}x load, {baseline[1] / dump:.1f}x dump)"
+            else:
+                baseline = (load, dump)
+            print(f"{len(entries):>8} {name:>8} {load:>9.3f} {dump:>9.3f}{speedup}")
+
+
+def bench_parse(args) -> None:
+    """parse_sources serially and across process pools of growing size."""
+    print(f"{available_cpus()} CPUs available")
+    print(f"{'entries':>8} {'workers':>8} {'parse s':>9}")
+    utils.PARALLEL_MIN_BYTES = 0  # time the pool even where parse_sources would stay serial
+    for size in args.sizes:
+        content = corpus_text(size)
+        repeat = args.repeat if size < 100_000 else 1
+        serial = None
+        for workers in args.workers:
+            elapsed = best_of(lambda: parse_sources(content, workers=workers), repeat)
+            speedup = f"  ({serial / elapsed:.1f}x)" if serial else ""
+            serial = serial or elapsed
+            print(f"{size:>8} {workers:>8} {elapsed:>9.3f}{speedup}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    yaml_parser = subparsers.add_parser("yaml", help="YAML load/dump, libyaml vs pure Python")
+    yaml_parser.add_argument("--sizes", type=int, nargs="+", default=list(CORPUS_SIZES[:2]),
+                             help="Corpus sizes to time (default: 1000 10000)")
+    yaml_parser.add_argument("--repeat", type=int, default=3,
+                             help="Best-of repetitions below 100k entries (default: 3)")
+    yaml_parser.set_defaults(func=bench_yaml)
+
+    parse_parser = subparsers.add_parser("parse", help="parse_sources, serial vs process pool")
+    parse_parser.add_argument("--sizes", type=int, nargs="+", default=[CORPUS_SIZES[1]],
+                              help="Corpus sizes to time (default: 10000)")
+    parse_parser.add_argument("--workers", type=int, nargs="+",
+                              default=sorted({1, 2, 4, available_cpus()}),
+                              help="Pool sizes to time; 1 is the serial path (default: 1 2 4 and the CPU count)")
+    parse_parser.add_argument("--repeat", type=int, default=3,
+                              help="Best-of repetitions below 100k entries (default: 3)")
+    parse_parser.set_defaults(func=bench_parse)
+
+    store_parser = subparsers.add_parser("store", help="SourceStore queries vs list scans")
+    store_parser.add_argument("--sizes", type=int, nargs="+", default=list(CORPUS_SIZES),
+                              help="Corpus sizes to time (default: 1000 10000 100000)")
+    store_parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions (default: 3)")
+    store_parser.set_defaults(func=bench_store)
+
+    index_parser = subparsers.add_parser("index", help="EntryIndex lookups/edits vs line walks")
+    index_parser.add_argument("--sizes", type=int, nargs="+", default=list(CORPUS_SIZES),
+                              help="Corpus sizes to time (default: 1000 10000 100000)")
+    index_parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions (default: 3)")
+    index_parser.set_defaults(func=bench_index)
+
+    patch_parser = subparsers.add_parser("patch", help="apply_patches: 1 vs many patches in one batch")
+    patch_parser.add_argument("--sizes", type=int, nargs="+", default=list(CORPUS_SIZES[1:]),
+                              help="Corpus sizes to time (default: 10000 100000)")
+    patch_parser.add_argument("--patches", type=int, default=5000, help="Batch size (default: 5000)")
+    patch_parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions (default: 3)")
+    patch_parser.set_defaults(func=bench_patch)
+
+    schedule_parser = subparsers.add_parser("schedule", help="parse_schedule, lexer vs rescans")
+    schedule_parser.add_argument("--count", type=int, default=CORPUS_SIZES[-1],
+                                 help="Schedule phrases to parse (default: 100000)")
+    schedule_parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions (default: 3)")
+    schedule_parser.set_defaults(func=bench_schedule)
+
+    dates_parser = subparsers.add_parser("dates", help="parse_date_string, scanner vs rescans")
+    dates_parser.add_argument("--count", type=int, default=CORPUS_SIZES[-1],
+                              help="Date strings to parse (default: 100000)")
+    dates_parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions (default: 3)")
+    dates_parser.set_defaults(func=bench_dates)
+
+    audience_parser = subparsers.add_parser("audience", help="detect_audience, one scan vs per-pattern searches")
+    audience_parser.add_argument("--entries", type=int, default=CORPUS_SIZES[1],
+                                 help="Synthetic entries to take texts from (default: 10000)")
+    audience_parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions (default: 3)")
+    audience_parser.set_defaults(func=bench_audience)
+
+    occurrences_parser = subparsers.add_parser("occurrences", help="iter_occurrences, jumps vs a day-by-day walk")
+    occurrences_parser.add_argument("--count", type=int, default=CORPUS_SIZES[1],
+                                    help="Resolved schedules to expand (default: 10000)")
+    occurrences_parser.add_argument("--years", type=int, default=5, help="Window length from 2026-01-01 (default: 5)")
+    occurrences_parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions (default: 3)")
+    occurrences_parser.set_defaults(func=bench_occurrences)
+
+    catalog_parser = subparsers.add_parser("catalog", help="expand_occurrences, NumPy vs scalar expansion")
+    catalog_parser.add_argument("--sizes", type=int, nargs="+", default=list(CORPUS_SIZES[:2]),
+                                help="Corpus sizes to expand (default: 1000 10000)")
+    catalog_parser.add_argument("--months", type=int, default=24, help="Horizon in months (default: 24)")
+    catalog_parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions (default: 3)")
+    catalog_parser.set_defaults(func=bench_catalog)
+
+    recurrence_parser = subparsers.add_parser("recurrence", help="recurrence helpers, closed form vs listing")
+    recurrence_parser.add_argument("--count", type=int, default=CORPUS_SIZES[1],
+                                   help="Schedules to build and days to convert (default: 10000)")
+    recurrence_parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions (default: 3)")
+    recurrence_parser.set_defaults(func=bench_recurrence)
+
+    window_parser = subparsers.add_parser("window", help="OccurrenceIndex window queries vs scans")
+    window_parser.add_argument("--sizes", type=int, nargs="+", default=list(CORPUS_SIZES[:2]),
+                               help="Corpus sizes to index (default: 1000 10000)")
+    window_parser.add_argument("--months", type=int, default=6, help="Indexed horizon in months (default: 6)")
+    window_parser.add_argument("--queries", type=int, default=1000, help="Two-hour windows to query (default: 1000)")
+    window_parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions (default: 3)")
+    window_parser.set_defaults(func=bench_window)
+
+    overlaps_parser = subparsers.add_parser("overlaps", help="location overlap sweep vs pairwise comparison")
+    overlaps_parser.add_argument("--sizes", type=int, nargs="+", default=list(CORPUS_SIZES[:2]),
+                                 help="Corpus sizes to check (default: 1000 10000)")
+    overlaps_parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions (default: 3)")
+    overlaps_parser.set_defaults(func=bench_overlaps)
+
+    db_parser = subparsers.add_parser("db", help="SourcesDB build/update and query times")
+    db_parser.add_argument("--sizes", type=int, nargs="+", default=list(CORPUS_SIZES[:2]),
+                           help="Corpus sizes to time (default: 1000 10000)")
+    db_parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions (default: 3)")
+    db_parser.set_defaults(func=bench_db)
+
+    redos_parser = subparsers.add_parser("redos", help="worst-case inputs against a per-parse time budget")
+    redos_parser.add_argument("--length", type=int, default=20_000,
+                              help="Characters per adversarial input (default: 20000)")
+    redos_parser.add_argument("--budget", type=float, default=0.05,
+                              help="Seconds any single parse may take (default: 0.05)")
+    redos_parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions (default: 3)")
+    redos_parser.add_argument("--top", type=int, default=10, help="Slowest parses to list (default: 10)")
+    redos_parser.set_defaults(func=bench_redos)
+
+    derived_parser = subparsers.add_parser("derived", help="generate_calendar parsing, derived cache cold vs warm")
+    derived_parser.add_argument("--sizes", type=int, nargs="+", default=list(CORPUS_SIZES[:2]),
+                                help="Corpus sizes to measure (default: 1000 10000)")
+    derived_parser.set_defaults(func=bench_derived)
+
+    platforms_parser = subparsers.add_parser("platforms", help="entry_to_events per platform vs compile once")
+    platforms_parser.add_argument("--sizes", type=int, nargs="+", default=list(CORPUS_SIZES[:2]),
+                                  help="Corpus sizes to time (default: 1000 10000)")
+    platforms_parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions (default: 3)")
+    platforms_parser.set_defaults(func=bench_platforms)
+
+    fold_parser = subparsers.add_parser("fold", help="fold_ical_line, linear octet folding vs slicing")
+    fold_parser.add_argument("--lengths", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                             help="Line lengths in characters (default: 10000 100000 1000000)")
+    fold_parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions (default: 3)")
+    fold_parser.set_defaults(func=bench_fold)
+
+    ics_parser = subparsers.add_parser("ics", help="tracemalloc: CalendarWriter over streamed entries")
+    ics_parser.add_argument("--sizes", type=int, nargs="+", default=list(CORPUS_SIZES[:2]),
+                            help="Corpus sizes to write (default: 1000 10000)")
+    ics_parser.set_defaults(func=bench_ics)
+
+    incremental_parser = subparsers.add_parser("incremental", help="generate_calendar one-entry edit, render cache")
+    incremental_parser.add_argument("--sizes", type=int, nargs="+", default=list(CORPUS_SIZES[:2]),
+                                    help="Corpus sizes to build (default: 1000 10000)")
+    incremental_parser.set_defaults(func=bench_incremental)
+
+    stream_parser = subparsers.add_parser("stream", help="tracemalloc: iter_sources vs parse_sources")
+    stream_parser.add_argument("--sizes", type=int, nargs="+", default=list(CORPUS_SIZES[:2]),
+                               help="Corpus sizes to time (default: 1000 10000)")
+    stream_parser.set_defaults(func=bench_stream)
+
+    memory_parser = subparsers.add_parser("memory", help="tracemalloc: dict vs Entry record model")
+    memory_parser.add_argument("--entries", type=int, default=CORPUS_SIZES[-1],
+                               help="Corpus size (default: 100000)")
+    memory_parser.set_defaults(func=bench_memory)
+
+    args = parser.parse_args(argv)
+    return args.func(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
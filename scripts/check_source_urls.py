@@ -33,7 +33,7 @@ from urllib.request import (
     build_opener,
 )
 
-from utils import load_sources
+from utils import iter_sources
 
 
 REPORT_SCHEMA_VERSION = 1
@@ -807,8 +807,15 @@ def main(argv: list[str] | None = None) -> int:
         print(f"Error: sources file not found: {sources_path}", file=sys.stderr)
         return 2
 
-    entries = load_sources(sources_path)
-    url_sources = collect_source_urls(entries)
+    entry_count = 0
+
+    def entries():
+        # Streamed: URLs are collected as entries are read, none are kept.
+        nonlocal entry_count
+        for entry_count, entry in enumerate(iter_sources(sources_path), 1):
+            yield entry
+
+    url_sources = collect_source_urls(entries())
     results = check_urls(
         url_sources,
         max_workers=args.max_workers,
@@ -825,7 +832,7 @@ def main(argv: list[str] | None = None) -> int:
     report = build_report(
         results,
         source_file=str(sources_path),
-        entry_count=len(entries),
+        entry_count=entry_count,
         configuration=configuration,
     )
 
@@ -0,0 +1,177 @@
+"""Persistent cache of parse results shared by every script.
+
+parse_schedule, parse_date_string, resolve_recurring_schedule and
+detect_audience see the same strings on every run, in every script, and
+(in generate_calendar) once per platform. Functions decorated with
+@cached() look their results up in one on-disk table keyed by
+
+    (function, as-of date, input)
+
+inside a file stamped with the parser version, so a warm run over unchanged
+data does almost no regex work. The as-of date is None for results that do
+not depend on the current date.
+
+Caching is off until a script opens a session, so library calls and tests
+always run the parsers themselves:
+
+    with derived_cache.session(sources_path):
+        ...
+
+The session loads ``.cache/derived.pickle`` next to the sources file, keeps
+at most `max_entries` results (least recently used go first), writes the
+file back if anything was added, and prints hit counts to stderr. Values are
+stored pickled, so every lookup returns fresh objects that callers may
+mutate, as load_sources() does.
+"""
+
+import functools
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+
+from utils import cache_dir_for, caching_enabled
+
+# Bump whenever the cache file layout changes. Parser changes need no bump:
+# parser_version() hashes their source.
+DERIVED_CACHE_VERSION = 1
+
+DERIVED_CACHE_NAME = "derived.pickle"
+
+# Enough for every string of the 100k-entry synthetic corpus.
+DERIVED_CACHE_MAX_ENTRIES = 500_000
+
+# The cache the decorated functions consult, or None outside a session.
+_active = None
+
+
+class DerivedCache:
+    """An LRU table of pickled results, loaded from and saved to one file."""
+
+    def __init__(self, path: str | Path, version: str, max_entries: int = DERIVED_CACHE_MAX_ENTRIES):
+        self.path = Path(path)
+        self.version = version
+        self.max_entries = max_entries
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+        self.entries: OrderedDict = OrderedDict()
+        self.dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "rb") as f:
+                version, entries = pickle.load(f)
+        except Exception:
+            # Any unreadable, truncated or incompatible file just means starting empty.
+            return
+        if version == self.version and isinstance(entries, OrderedDict):
+            self.entries = entries
+            self._evict()
+
+    def _evict(self) -> None:
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.dirty = True
+
+    def lookup(self, kind: str, as_of, value, compute):
+        """Return compute()'s result for `value`, from the table when possible."""
+        key = (kind, as_of, value)
+        stored = self.entries.get(key)
+        if stored is not None:
+            self.hits[kind] += 1
+            self.entries.move_to_end(key)
+            return pickle.loads(stored)
+        self.misses[kind] += 1
+        result = compute()
+        self.entries[key] = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        self.dirty = True
+        self._evict()
+        return result
+
+    def save(self) -> None:
+        """Atomically replace the cache file if anything was added.
+
+        Like the sources snapshot, the cache is an optimization only, so a
+        read-only checkout or a full disk is silently ignored.
+        """
+        if not self.dirty:
+            return
+        tmp_name = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((self.version, self.entries), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, self.path)
+            tmp_name = None
+            self.dirty = False
+        except OSError:
+            if tmp_name:
+                Path(tmp_name).unlink(missing_ok=True)
+
+    def report(self) -> str:
+        """One line of hit counts per function, for the end of a run."""
+        hits, lookups = sum(self.hits.values()), sum(self.hits.values()) + sum(self.misses.values())
+        parts = [f"{kind} {self.hits[kind]}/{self.hits[kind] + self.misses[kind]}"
+                 for kind in sorted(self.hits.keys() | self.misses.keys())]
+        rate = f" ({hits / lookups:.0%})" if lookups else ""
+        return f"Derived cache: {hits}/{lookups} hits{rate}" + (f" - {', '.join(parts)}" if parts else "")
+
+
+def cached(kind: str, key=None):
+    """Decorator: look `kind` results up in the active cache.
+
+    `key` maps the call's arguments to ``(input, as_of)``, both hashable and
+    picklable; by default the single positional argument is the input and
+    the result does not depend on the date.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = _active
+            if cache is None:
+                return func(*args, **kwargs)
+            value, as_of = key(*args, **kwargs) if key else (args[0], None)
+            return cache.lookup(kind, as_of, value, lambda: func(*args, **kwargs))
+        wrapper.uncached = func
+        return wrapper
+    return decorate
+
+
+def parser_version() -> str:
+    """Version stamp for cached results: the cache format plus the parsers' source.
+
+    Any edit to generate_calendar.py, or to utils.py where the parse_date
+    helper lives, starts a fresh cache, so stale results are never served.
+    """
+    digest = hashlib.sha256(f"{DERIVED_CACHE_VERSION}\0".encode())
+    for name in ("generate_calendar.py", "utils.py"):
+        digest.update((Path(__file__).parent / name).read_bytes())
+    return digest.hexdigest()[:24]
+
+
+@contextmanager
+def session(sources_path: str | Path, max_entries: int = DERIVED_CACHE_MAX_ENTRIES, report: bool = True):
+    """Cache decorated results for the duration of the block.
+
+    Does nothing when caching is disabled (PEER_CALENDAR_NO_CACHE) or a
+    session is already open. Yields the DerivedCache, or None.
+    """
+    global _active
+    if _active is not None or not caching_enabled():
+        yield None
+        return
+    cache = DerivedCache(cache_dir_for(sources_path) / DERIVED_CACHE_NAME, parser_version(), max_entries)
+    _active = cache
+    try:
+        yield cache
+    finally:
+        _active = None
+        cache.save()
+        if report:
+            print(cache.report(), file=sys.stderr)
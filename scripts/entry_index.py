@@ -0,0 +1,539 @@
+"""Byte-offset index of the entries in sources.yaml.
+
+Scripts that edit one entry in place (audit_complete, migrate_audit_cadence,
+add_audience_fields) used to find it by walking every line of the file. An
+EntryIndex maps each entry id to its byte and line span, and records where
+each top-level field and each program (with its own fields) starts and ends
+inside that span, so a lookup is one keyed query and a read is one seek.
+
+The index for a file lives in SQLite next to the file's other derived data
+(data/.cache/, gitignored). It is built once per file content: a file whose
+size and mtime match the index is trusted as-is, one that only looks changed
+is hashed and compared, and anything else is rescanned.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import re
+import shutil
+import sqlite3
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from utils import cache_dir_for, caching_enabled
+
+
+# Bump when the scan or the stored layout changes, so older indexes are rebuilt.
+ENTRY_INDEX_VERSION = 1
+
+_CHUNK = 1 << 20
+# Ids per `WHERE id IN (...)` lookup, under SQLite's bound-parameter limit.
+_BATCH = 500
+
+# Same boundaries the line-walking code used: an entry runs from its
+# "- id:" line to the next entry or document marker. The patterns start at
+# the newline before the line they match, which lets the regex engine jump
+# between candidate lines instead of trying every byte.
+_BOUNDARY_LINE = rb"(?:- id: (.+?)[ \t]*\r?$|---[ \t]*\r?$)"
+_FIRST_BOUNDARY = re.compile(_BOUNDARY_LINE, re.M)
+_BOUNDARY = re.compile(rb"\n" + _BOUNDARY_LINE, re.M)
+# A top-level sequence item that is not an "- id:" line, i.e. an entry with
+# another first key, which the boundaries above cannot see.
+_OTHER_ITEM = rb"-(?!--| id: [^ \t\r\n])"
+_FIRST_OTHER_ITEM = re.compile(_OTHER_ITEM)
+_OTHER_ITEM_LINE = re.compile(rb"\n" + _OTHER_ITEM)
+_KEY = rb"([A-Za-z_][\w-]*):(?=[ \t\r\n]|$)"
+# "  key:" opens a top-level field ...
+_FIELD_LINE = re.compile(rb"\n  " + _KEY, re.M)
+# ... and inside `programs:`, "  - key:" opens a program and "    key:" one of its fields.
+_PROGRAM_LINE = re.compile(rb"\n(?:  - (?:" + _KEY + rb")?|    " + _KEY + rb")", re.M)
+
+
+def _scalar(value: bytes) -> str:
+    """The string a plain or quoted one-line YAML scalar stands for."""
+    text = value.decode("utf-8").strip()
+    if len(text) >= 2 and text[0] == text[-1] == "'":
+        return text[1:-1].replace("''", "'")
+    if len(text) >= 2 and text[0] == text[-1] == '"':
+        try:
+            return json.loads(text)
+        except ValueError:
+            return text[1:-1]
+    return text
+
+
+def _line_value(block: bytes, offset: int) -> bytes:
+    end = block.find(b"\n", offset)
+    line = block[offset:] if end < 0 else block[offset:end]
+    return line.split(b":", 1)[1]
+
+
+@dataclass(slots=True)
+class Span:
+    """A byte range [start, end) starting on line `line` (0-based).
+
+    Field and program spans are relative to their entry's start.
+    """
+
+    start: int
+    end: int
+    line: int
+
+
+@dataclass(slots=True)
+class ProgramLocation(Span):
+    name: str | None = None
+    fields: dict[str, Span] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class EntryLocation(Span):
+    """Where one entry sits in the file; `start`/`line` are absolute."""
+
+    id: str = ""
+    end_line: int = 0
+    fields: dict[str, Span] = field(default_factory=dict)
+    programs: list[ProgramLocation] = field(default_factory=list)
+
+    def field_span(self, name: str) -> Span | None:
+        """Absolute span of a top-level field, from its key line to the next key."""
+        span = self.fields.get(name)
+        if span is None:
+            return None
+        return Span(self.start + span.start, self.start + span.end, self.line + span.line)
+
+    def program(self, name: str) -> ProgramLocation | None:
+        """The first program with this name."""
+        return next((program for program in self.programs if program.name == name), None)
+
+    @classmethod
+    def _from_layout(cls, entry_id: str, start: int, end: int, line: int, end_line: int,
+                     layout: tuple) -> EntryLocation:
+        fields, programs = layout
+        return cls(
+            start=start, end=end, line=line, id=entry_id, end_line=end_line,
+            fields={key: Span(*span) for key, span in fields.items()},
+            programs=[
+                ProgramLocation(start=s, end=e, line=l, name=name,
+                                fields={key: Span(*span) for key, span in program_fields.items()})
+                for name, s, e, l, program_fields in programs
+            ],
+        )
+
+
+def _scan_layout(block: bytes) -> tuple[dict, list]:
+    """Field and program offsets inside one entry, as plain lists.
+
+    Returns ({field: [start, end, line]}, [[name, start, end, line, {field: [...]}], ...]).
+    """
+    fields = {"id": [0, 0, 0]}
+    open_field = fields["id"]
+    line = 0
+    position = 0
+    for match in _FIELD_LINE.finditer(block):
+        offset = match.start() + 1
+        line += block.count(b"\n", position, offset)
+        position = offset
+        open_field[1] = offset
+        open_field = fields.setdefault(match.group(1).decode("utf-8"), [offset, offset, line])
+    open_field[1] = len(block)
+
+    programs = []
+    if "programs" in fields:
+        start, end, line = fields["programs"]
+        program = program_field = None
+        position = start
+        for match in _PROGRAM_LINE.finditer(block, start, end):
+            offset = match.start() + 1
+            line += block.count(b"\n", position, offset)
+            position = offset
+            item_key, program_key = match.groups()
+            if program_key is None:
+                if program:
+                    program[2] = program_field[1] = offset
+                    program = None
+                if item_key is None:
+                    continue  # a plain string item, not a program mapping
+                key = item_key.decode("utf-8")
+                program_field = [offset, offset, line]
+                program = [None, offset, offset, line, {key: program_field}]
+                programs.append(program)
+            elif program:
+                program_field[1] = offset
+                key = program_key.decode("utf-8")
+                program_field = program[4].setdefault(key, [offset, offset, line])
+            else:
+                continue
+            if key == "name" and program[0] is None:
+                program[0] = _scalar(_line_value(block, offset))
+        if program:
+            program[2] = program_field[1] = end
+    return fields, programs
+
+
+def scan_entry(block: bytes, entry_id: str, start: int = 0, line: int = 0) -> EntryLocation:
+    """Locate the fields and programs inside one entry's bytes."""
+    return EntryLocation._from_layout(entry_id, start, start + len(block), line,
+                                      line + block.count(b"\n"), _scan_layout(block))
+
+
+def _boundaries(data: bytes) -> Iterator[tuple[int, bytes | None]]:
+    """(offset, entry id or None for a document marker) for each boundary line."""
+    first = _FIRST_BOUNDARY.match(data)
+    if first:
+        yield 0, first.group(1)
+    for match in _BOUNDARY.finditer(data):
+        yield match.start() + 1, match.group(1)
+
+
+def _scan_rows(data: bytes) -> Iterator[tuple]:
+    """(id, start, end, line, end_line, layout) for every entry, in file order."""
+    line = 0
+    position = 0
+    current = None
+    for offset, entry_id in _boundaries(data):
+        line += data.count(b"\n", position, offset)
+        position = offset
+        if current:
+            start_id, start, start_line = current
+            yield start_id, start, offset, start_line, line, _scan_layout(data[start:offset])
+        current = (_scalar(entry_id), offset, line) if entry_id else None
+    if current:
+        start_id, start, start_line = current
+        end_line = line + data.count(b"\n", position)
+        yield start_id, start, len(data), start_line, end_line, _scan_layout(data[start:])
+
+
+def entry_blocks(data: bytes) -> Iterator[tuple[str, int, int]]:
+    """(id, start, end) of every entry in file order, without field layouts."""
+    current = None
+    for offset, entry_id in _boundaries(data):
+        if current:
+            yield current[0], current[1], offset
+        current = (_scalar(entry_id), offset) if entry_id else None
+    if current:
+        yield current[0], current[1], len(data)
+
+
+def entry_blocks_cover(data: bytes) -> bool:
+    """Whether entry_blocks() sees every entry, i.e. every entry opens with its `- id:` line.
+
+    An entry that starts with another key is merged into the block before it
+    (or falls outside every block), so code that parses blocks one by one
+    must parse the whole file instead when this is False.
+    """
+    return not (_FIRST_OTHER_ITEM.match(data) or _OTHER_ITEM_LINE.search(data))
+
+
+def scan_entries(data: bytes) -> Iterator[EntryLocation]:
+    """Every entry in a sources.yaml, in file order, in one pass."""
+    return (EntryLocation._from_layout(*row) for row in _scan_rows(data))
+
+
+class EntryIndex:
+    """Entry id -> EntryLocation, backed by SQLite.
+
+    `open()` gives the persistent index of a file; `for_bytes()` indexes
+    content that only exists in memory (e.g. a migration being assembled).
+    """
+
+    def __init__(self, connection: sqlite3.Connection, path: Path | None = None):
+        self._db = connection
+        self.path = path
+        # Layouts rescanned since the last write (see `_location`), stored on close.
+        self._rescanned: list[tuple[bytes, str]] = []
+
+    @classmethod
+    def for_bytes(cls, data: bytes) -> EntryIndex:
+        index = cls(sqlite3.connect(":memory:"))
+        index._build(data)
+        return index
+
+    @classmethod
+    def open(cls, sources_path: str | Path, use_cache: bool = True) -> EntryIndex:
+        """The index of a file on disk, reusing the stored one when it is current."""
+        path = Path(sources_path)
+        if not (use_cache and caching_enabled()):
+            index = cls(sqlite3.connect(":memory:"), path)
+            index._build(path.read_bytes())
+            return index
+
+        index_path = cache_dir_for(path) / f"{path.name}.index.sqlite"
+        try:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(index_path)
+            index = cls(connection, path)
+            index._ensure_current()
+        except sqlite3.Error:
+            # Unreadable or locked index file: fall back to a throwaway one.
+            index = cls(sqlite3.connect(":memory:"), path)
+            index._build(path.read_bytes())
+        return index
+
+    def close(self) -> None:
+        with self._db:
+            self._store_rescanned()
+        self._db.close()
+
+    def __enter__(self) -> EntryIndex:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def get(self, entry_id: str) -> EntryLocation | None:
+        row = self._db.execute(
+            "SELECT id, start, end, line, end_line, layout FROM entries WHERE id = ?", (entry_id,)
+        ).fetchone()
+        return self._location(row) if row else None
+
+    def get_many(self, entry_ids: Iterable[str]) -> dict[str, EntryLocation]:
+        """Locations of the ids that are in the index, looked up in batches."""
+        ids = list(dict.fromkeys(entry_ids))
+        found = {}
+        for i in range(0, len(ids), _BATCH):
+            chunk = ids[i:i + _BATCH]
+            rows = self._db.execute(
+                "SELECT id, start, end, line, end_line, layout FROM entries "
+                f"WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+            )
+            found.update((row[0], self._location(row)) for row in rows.fetchall())
+        return found
+
+    def __contains__(self, entry_id: object) -> bool:
+        return self._db.execute("SELECT 1 FROM entries WHERE id = ?", (entry_id,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def __iter__(self) -> Iterator[EntryLocation]:
+        rows = self._db.execute("SELECT id, start, end, line, end_line, layout FROM entries ORDER BY start")
+        return (self._location(row) for row in rows)
+
+    def read_entry(self, entry_id: str) -> bytes | None:
+        """The entry's bytes, read with a single seek into the file."""
+        location = self.get(entry_id)
+        if location is None:
+            return None
+        with open(self.path, "rb") as f:
+            f.seek(location.start)
+            return f.read(location.end - location.start)
+
+    def splice(self, data: bytes, blocks: dict[str, bytes]) -> bytes:
+        """`data` with each entry in `blocks` replaced, assembled in one pass."""
+        locations = self.get_many(blocks)
+        missing = [entry_id for entry_id in blocks if entry_id not in locations]
+        if missing:
+            raise KeyError(f"entries not in index: {', '.join(missing)}")
+        pieces = []
+        position = 0
+        for location in sorted(locations.values(), key=lambda location: location.start):
+            pieces.append(data[position:location.start])
+            pieces.append(blocks[location.id])
+            position = location.end
+        pieces.append(data[position:])
+        return b"".join(pieces)
+
+    def replace_entry(self, entry_id: str, block: bytes) -> None:
+        """Replace one entry in the file (atomically, via `rewrite()`) and move the index with it."""
+        location = self.get(entry_id)
+        if location is None:
+            raise KeyError(entry_id)
+        self.rewrite([location], lambda location, old: block)
+
+    def rewrite(self, locations: Iterable[EntryLocation], edit: Callable[[EntryLocation, bytes], bytes],
+                output: Path | None = None, backup: Path | None = None) -> int:
+        """Stream the file to `output` (default: over itself) with entries edited.
+
+        `locations` come from this index (`get()` / `get_many()`).
+        `edit(location, block)` returns each one's new bytes; all
+        other bytes are copied through unchanged, so memory stays at one entry
+        however large the file. The result replaces `output` with one atomic
+        rename, after the original is kept at `backup` if given. Returns the
+        number of entries whose bytes changed.
+
+        If the file no longer has an entry where the index says (it changed
+        without its size or mtime moving), the index is rebuilt first and the
+        entries are looked up again, so an edit never lands in the wrong place.
+        """
+        locations = sorted({location.id: location for location in locations}.values(),
+                           key=lambda location: location.start)
+        if not self._still_current(locations):
+            self._build(self.path.read_bytes())
+            found = self.get_many(location.id for location in locations)
+            missing = [location.id for location in locations if location.id not in found]
+            if missing:
+                raise KeyError(f"entries no longer in {self.path.name}: {', '.join(missing)}")
+            locations = sorted(found.values(), key=lambda location: location.start)
+        target = Path(output) if output else self.path
+
+        edits = []
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+        try:
+            with open(self.path, "rb") as source, os.fdopen(fd, "wb") as out:
+                position = 0
+                for location in locations:
+                    _copy_bytes(source, out, location.start - position)
+                    old = source.read(location.end - location.start)
+                    new = edit(location, old)
+                    out.write(new)
+                    if new != old:
+                        edits.append((location, new))
+                    position = location.end
+                shutil.copyfileobj(source, out, _CHUNK)
+            if not edits and target.resolve() == self.path.resolve():
+                # Nothing changed: leave the file (and its backup) alone.
+                Path(tmp_name).unlink()
+                return 0
+            os.chmod(tmp_name, self.path.stat().st_mode & 0o777)
+            if backup:
+                _keep_backup(self.path, Path(backup))
+            os.replace(tmp_name, target)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        if target.resolve() == self.path.resolve() and edits:
+            with self._db:
+                self._record_edits(edits)
+        return len(edits)
+
+    def _still_current(self, locations: list[EntryLocation]) -> bool:
+        """Whether each location still starts at its `- id:` line and ends at a boundary or EOF."""
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            for location in locations:
+                if location.end > size:
+                    return False
+                f.seek(location.start)
+                first = _FIRST_BOUNDARY.match(f.readline())
+                if not (first and first.group(1) and _scalar(first.group(1)) == location.id):
+                    return False
+                f.seek(location.end)
+                if location.end < size and not _FIRST_BOUNDARY.match(f.readline()):
+                    return False
+        return True
+
+    def _record_edits(self, edits: list[tuple[EntryLocation, bytes]]) -> None:
+        """Move the stored offsets to match entries rewritten with new bytes."""
+        self._store_rescanned()
+        first = edits[0][0].start
+        edited = {location.start: (location, block) for location, block in edits}
+        rows = self._db.execute(
+            "SELECT id, start, end, line, end_line FROM entries WHERE start >= ? ORDER BY start", (first,)
+        ).fetchall()
+        delta = line_delta = 0
+        updates = []
+        stale = []
+        for entry_id, start, end, line, end_line in rows:
+            new_start, new_line = start + delta, line + line_delta
+            if start in edited:
+                location, block = edited[start]
+                delta += len(block) - (end - start)
+                line_delta += line + block.count(b"\n") - end_line
+                stale.append((entry_id,))
+            if delta or line_delta or start in edited:
+                updates.append((new_start, end + delta, new_line, end_line + line_delta, entry_id))
+        self._db.executemany(
+            "UPDATE entries SET start = ?, end = ?, line = ?, end_line = ? WHERE id = ?", updates
+        )
+        # Edited entries are rescanned when next read, so a large batch of
+        # edits costs no more here than one.
+        self._db.executemany("UPDATE entries SET layout = NULL WHERE id = ?", stale)
+        # Offsets now describe the edited file, whose hash we have not computed.
+        self._store_meta(self.path.stat(), digest="")
+
+    def _store_rescanned(self) -> None:
+        self._db.executemany("UPDATE entries SET layout = ? WHERE id = ?", self._rescanned)
+        self._rescanned.clear()
+
+    def _location(self, row: tuple) -> EntryLocation:
+        entry_id, start, end, line, end_line, layout = row
+        if layout is not None:
+            return EntryLocation._from_layout(entry_id, start, end, line, end_line, pickle.loads(layout))
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            scanned = _scan_layout(f.read(end - start))
+        self._rescanned.append((_dump_layout(scanned), entry_id))
+        return EntryLocation._from_layout(entry_id, start, end, line, end_line, scanned)
+
+    def _create_tables(self) -> None:
+        self._db.executescript("""
+            DROP TABLE IF EXISTS meta;
+            DROP TABLE IF EXISTS entries;
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE entries (
+                id TEXT PRIMARY KEY, start INTEGER, end INTEGER,
+                line INTEGER, end_line INTEGER, layout BLOB
+            );
+            CREATE INDEX entries_by_start ON entries (start);
+        """)
+
+    def _build(self, data: bytes) -> None:
+        self._rescanned.clear()
+        with self._db:
+            self._create_tables()
+            # The first occurrence of a duplicated id wins, as a top-down scan would.
+            self._db.executemany(
+                "INSERT OR IGNORE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                (row[:5] + (_dump_layout(row[5]),) for row in _scan_rows(data)),
+            )
+            if self.path:
+                self._store_meta(self.path.stat(), hashlib.sha256(data).hexdigest())
+
+    def _meta(self) -> dict[str, str]:
+        try:
+            return dict(self._db.execute("SELECT key, value FROM meta"))
+        except sqlite3.OperationalError:
+            return {}
+
+    def _store_meta(self, stat: os.stat_result, digest: str) -> None:
+        self._db.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", [
+            ("version", str(ENTRY_INDEX_VERSION)),
+            ("size", str(stat.st_size)),
+            ("mtime_ns", str(stat.st_mtime_ns)),
+            ("sha256", digest),
+        ])
+
+    def _ensure_current(self) -> None:
+        meta = self._meta()
+        stat = self.path.stat()
+        if meta.get("version") == str(ENTRY_INDEX_VERSION):
+            if meta.get("size") == str(stat.st_size) and meta.get("mtime_ns") == str(stat.st_mtime_ns):
+                return
+            data = self.path.read_bytes()
+            if meta.get("sha256") == hashlib.sha256(data).hexdigest():
+                with self._db:
+                    self._store_meta(stat, meta["sha256"])
+                return
+        else:
+            data = self.path.read_bytes()
+        self._build(data)
+
+
+def _dump_layout(layout: tuple) -> bytes:
+    return pickle.dumps(layout, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _copy_bytes(source, out, count: int) -> None:
+    while count > 0:
+        chunk = source.read(min(count, _CHUNK))
+        if not chunk:
+            break
+        out.write(chunk)
+        count -= len(chunk)
+
+
+def _keep_backup(path: Path, backup: Path) -> None:
+    """Keep the current file at `backup`: a hard link when possible, else a copy."""
+    backup.unlink(missing_ok=True)
+    try:
+        os.link(path, backup)
+    except OSError:
+        shutil.copy2(path, backup)
@@ -32,18 +32,28 @@ Output structure:
 
 import argparse
 import calendar
+import functools
+import gzip
 import hashlib
 import html
+import io
 import json
+import os
 import re
 import shutil
 import sys
+import tempfile
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
 from pathlib import Path
 
 import yaml
 
-from utils import load_sources, parse_date
+import derived_cache
+from derived_cache import cached
+from render_cache import RenderCache, RenderedEntry
+from utils import caching_enabled, is_closed, iter_sources, parse_date
 
 
 # Category color scheme (hex colors)
@@ -87,21 +97,100 @@ AUDIENCE_PATTERNS = {
 }
 
 
+# The only lowercase letters that re.IGNORECASE folds onto the ASCII letters
+# the patterns are written in. Folding them up front keeps matching
+# case-sensitive, which is what lets the scan dispatch on its first character.
+_CASE_FOLDS = str.maketrans({"ı": "i", "ſ": "s"})
+
+
+def _split_first_literal(pattern: str) -> tuple[bool, str, str]:
+    """Split an audience pattern into (starts at a word boundary, first character, rest).
+
+    Patterns must begin with a literal character, optionally after \\b, so the
+    matcher can file them under that character.
+    """
+    boundary = pattern.startswith(r"\b")
+    body = pattern[2:] if boundary else pattern
+    if body[:1] == "\\" and len(body) > 1 and not body[1].isalnum():
+        first, rest = body[1], body[2:]
+    elif body and body[0] not in ".^$*+?{}[]|()\\":
+        first, rest = body[0], body[1:]
+    else:
+        raise ValueError(f"audience pattern must start with a literal character: {pattern!r}")
+    if rest[:1] and rest[0] in "*+?{":
+        raise ValueError(f"audience pattern must not start with a repeated character: {pattern!r}")
+    return boundary, first, rest
+
+
+class AudienceMatcher:
+    """Finds every audience tag of a pattern table in one scan of the text.
+
+    All patterns are compiled into a single alternation, bucketed by first
+    character, with one named group per pattern (``children_0``, ...). Each
+    match consumes only that first character and checks the rest with a
+    lookahead, so a tag is still found where another tag's match began.
+    Whenever the scan stops, the other tags filed under the same character
+    are checked at that position too, so two tags starting at the same spot
+    are both reported.
+
+    `exclusions` maps a tag to phrases that rule it out anywhere in the text
+    (for example "adult children" for children). They are scanned in the
+    same pass as ``not_<tag>_<n>`` groups.
+    """
+
+    def __init__(self, patterns: Mapping[str, list[str]],
+                 exclusions: Mapping[str, list[str]] | None = None):
+        self.excluded_by: dict[str, str] = {}
+        group_tags: dict[str, str] = {}
+        buckets: dict[str, list[str]] = {}
+        by_char: dict[str, dict[str, list[str]]] = {}
+        tables = [(tag, tag, tag_patterns) for tag, tag_patterns in patterns.items()]
+        for tag, phrases in (exclusions or {}).items():
+            self.excluded_by[f"not_{tag}"] = tag
+            tables.append((f"not_{tag}", f"not_{tag}", [re.escape(phrase) for phrase in phrases]))
+        for tag, prefix, tag_patterns in tables:
+            for i, pattern in enumerate(tag_patterns):
+                boundary, first, rest = _split_first_literal(pattern)
+                name = f"{prefix}_{i}"
+                group_tags[name] = tag
+                lookbehind = rf"(?<=\b{re.escape(first)})" if boundary else ""
+                buckets.setdefault(first, []).append(f"{lookbehind}(?P<{name}>{rest})")
+                by_char.setdefault(first, {}).setdefault(tag, []).append(pattern)
+        self._group_tags = group_tags
+        self._scan = re.compile("|".join(
+            f"{re.escape(first)}(?={'|'.join(alternatives)})" for first, alternatives in buckets.items()
+        ))
+        # first character -> [(tag, that tag's patterns starting with it)]
+        self._by_char = {
+            first: [(tag, re.compile("|".join(tag_patterns))) for tag, tag_patterns in tags.items()]
+            for first, tags in by_char.items()
+        }
+
+    def __call__(self, text: str) -> list[str]:
+        if not text:
+            return []
+        text = text.lower().translate(_CASE_FOLDS)
+        found = set()
+        for m in self._scan.finditer(text):
+            found.add(self._group_tags[m.lastgroup])
+            pos = m.start()
+            for tag, pattern in self._by_char[m.group()]:
+                if tag not in found and pattern.match(text, pos):
+                    found.add(tag)
+        excluded = {self.excluded_by[tag] for tag in found if tag in self.excluded_by}
+        return sorted(tag for tag in found if tag not in excluded and tag not in self.excluded_by)
+
+
+AUDIENCE_MATCHER = AudienceMatcher(
+    AUDIENCE_PATTERNS,
+    exclusions={"children": ["adult children"]},  # "Adult Children of Alcoholics" is not for children
+)
+
+
+@cached("detect_audience")
 def detect_audience(text: str) -> list:
     """Detect audience tags from text using pattern matching."""
-    if not text:
-        return []
-    text_lower = text.lower()
-    detected = set()
-    for tag, patterns in AUDIENCE_PATTERNS.items():
-        for pattern in patterns:
-            if re.search(pattern, text_lower, re.IGNORECASE):
-                # Filter out false positives
-                if tag == 'children' and 'adult children' in text_lower:
-                    continue  # "Adult Children of Alcoholics" is not for children
-                detected.add(tag)
-                break
-    return sorted(list(detected))
+    return AUDIENCE_MATCHER(text)
 
 
 def get_entry_audience(entry: dict) -> list:
@@ -152,136 +241,141 @@ def generate_uid(entry_id: str, date_str: str = "") -> str:
     return hashlib.md5(unique_string.encode()).hexdigest()[:16] + "@portlandresources.org"
 
 
+# Schedule and date strings are short phrases; the longest in sources.yaml is
+# about 110 characters. Longer text is almost certainly a pasted paragraph, so
+# it is reported as unparseable rather than scanned.
+MAX_PARSE_LENGTH = 500
+
+
+def parse_length_error(text: str) -> str | None:
+    """Why `text` is too long for parse_schedule/parse_date_string, or None."""
+    if len(text) > MAX_PARSE_LENGTH:
+        return f"{len(text):,} characters, over the {MAX_PARSE_LENGTH}-character parse limit"
+    return None
+
+
+_DAY_CODES = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+_DAY_ABBREV_INDEX = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
+_DAY_WORD = r"(mon|tue|wed|thu|fri|sat|sun)(?:day|sday|nesday|rsday|urday)?s?"
+_TIME = r"(\d{1,2})(?::(\d{2}))?\s*"
+
+# parse_schedule() reads the days, ordinals and modifiers of a schedule in one
+# scan of this pattern. Day ranges ("Mon-Fri", "Sat–Sun") are tried first and
+# consume their day names, so those are not counted again as single days.
+_SCHEDULE_TOKEN = re.compile(
+    _DAY_WORD + r"\s*[-–]\s*" + _DAY_WORD
+    + r"|\b(sun(?:days?)?|mon(?:days?)?|tue(?:sdays?)?|wed(?:nesdays?)?"
+      r"|thu(?:rsdays?)?|fri(?:days?)?|sat(?:urdays?)?)\b"
+    + r"|\b([1-5])(?:st|nd|rd|th)\b"
+    + r"|every(\s+other)?"
+    + r"|(bi-?weekly|alternate)"
+    + r"|\b(last|daily)\b"
+    + r"|(weekdays)"
+)
+# Times may start inside other tokens ("9-1st", "6-7pmon-fri"), so they are a
+# separate search: the first time range, else the first single time. The
+# spaces around an optional am/pm are "\s*(?:(am|pm)\s*)?" rather than
+# "\s*(am|pm)?\s*": two adjacent \s* can split a run of n spaces n ways,
+# which made "1" followed by a long run of spaces take quadratic time.
+_TIME_RANGE = re.compile(_TIME + r"(?:(am|pm)\s*)?-\s*" + _TIME + r"(am|pm)?")
+_SINGLE_TIME = re.compile(_TIME + r"(am|pm)")
+_NOON = re.compile(r"\bnoon\b")
+
+
+def _day_range(start: str, end: str) -> list[int]:
+    """Weekday indexes from one abbreviation to another, wrapping past Sunday."""
+    first, last = _DAY_ABBREV_INDEX[start], _DAY_ABBREV_INDEX[end]
+    if first <= last:
+        return list(range(first, last + 1))
+    return list(range(first, 7)) + list(range(0, last + 1))
+
+
+def _clock(hour: int, period: str | None) -> int:
+    if period == "pm" and hour < 12:
+        return hour + 12
+    if period == "am" and hour == 12:
+        return 0
+    return hour
+
+
+@cached("parse_schedule")
 def parse_schedule(schedule_str: str) -> dict:
-    """Parse schedule strings into structured data."""
-    if not schedule_str:
-        return {}
+    """Parse schedule strings into structured data.
 
-    result = {}
-    schedule_lower = schedule_str.lower()
-
-    # Normalize "noon" to "12:00" for time parsing
-    schedule_normalized = re.sub(r'\bnoon\b', '12:00', schedule_lower)
-
-    day_map = {
-        "sunday": "SU", "sundays": "SU", "sun": "SU",
-        "monday": "MO", "mondays": "MO", "mon": "MO",
-        "tuesday": "TU", "tuesdays": "TU", "tue": "TU",
-        "wednesday": "WE", "wednesdays": "WE", "wed": "WE",
-        "thursday": "TH", "thursdays": "TH", "thu": "TH",
-        "friday": "FR", "fridays": "FR", "fri": "FR",
-        "saturday": "SA", "saturdays": "SA", "sat": "SA",
-    }
+    Strings longer than MAX_PARSE_LENGTH parse as {} (see parse_length_error).
+    """
+    if not schedule_str or len(schedule_str) > MAX_PARSE_LENGTH:
+        return {}
 
-    # Day ranges: "Mon-Fri", "Sat-Sun", "Wed-Sat", "Monday-Friday".
-    # Ranges are expanded first, then any standalone day names are added, so a
-    # string like "Fri 11am-1pm; Sat-Sun 2:30-4:30pm" keeps all three days.
-    day_codes_ordered = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
-    abbrev_to_idx = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
-    day_word = r'(mon|tue|wed|thu|fri|sat|sun)(?:day|sday|nesday|rsday|urday)?s?'
-    days_found = []
-    range_spans = []
-    for range_match in re.finditer(day_word + r'\s*[-–]\s*' + day_word, schedule_lower):
-        start_idx = abbrev_to_idx[range_match.group(1)]
-        end_idx = abbrev_to_idx[range_match.group(2)]
-        if start_idx <= end_idx:
-            span = range(start_idx, end_idx + 1)
+    text = schedule_str.lower()
+    if "noon" in text:
+        # Normalize "noon" to "12:00" for time parsing
+        text = _NOON.sub("12:00", text)
+
+    days = set()
+    ordinals = set()
+    every = every_other = last = daily = weekdays = False
+    for token in _SCHEDULE_TOKEN.finditer(text):
+        range_start, range_end, day_name, ordinal, other, interval, word, weekdays_word = token.groups()
+        if range_start:
+            days.update(_day_range(range_start, range_end))
+        elif day_name:
+            days.add(_DAY_ABBREV_INDEX[day_name[:3]])
+        elif ordinal:
+            ordinals.add(int(ordinal))
+        elif word == "last":
+            last = True
+        elif word == "daily":
+            daily = True
+        elif interval:
+            every_other = True
+        elif weekdays_word:
+            weekdays = True
         else:
-            # Wrap-around range such as "Sat-Tue"
-            span = list(range(start_idx, 7)) + list(range(0, end_idx + 1))
-        for i in span:
-            if day_codes_ordered[i] not in days_found:
-                days_found.append(day_codes_ordered[i])
-        range_spans.append(range_match.span())
-
-    # Individual day matching (for "Tuesdays & Thursdays", "Tue/Thu"), skipping
-    # day names already consumed by a range above.
-    for day_name, day_code in sorted(day_map.items(), key=lambda x: -len(x[0])):
-        if day_code in days_found:
-            continue
-        for match in re.finditer(r'\b' + re.escape(day_name) + r'\b', schedule_lower):
-            if any(s <= match.start() < e for s, e in range_spans):
-                continue
-            days_found.append(day_code)
-            break
+            every = True
+            every_other = every_other or bool(other)
 
-    if days_found:
-        # Keep a stable Mon-first ordering so output does not depend on dict order
-        days_found = [d for d in day_codes_ordered if d in days_found]
-        result["day"] = ",".join(days_found)
-
-    ordinal_pattern = r"\b([1-5])(?:st|nd|rd|th)\b"
-    ordinals = re.findall(ordinal_pattern, schedule_lower)
+    result = {}
+    if days:
+        # Keep a stable Mon-first ordering
+        result["day"] = ",".join(_DAY_CODES[i] for i in sorted(days))
     if ordinals:
-        result["week_of_month"] = sorted({int(o) for o in ordinals})
-
+        result["week_of_month"] = sorted(ordinals)
     # "Last Sunday of each month", "Last Wednesday"
-    if re.search(r'\blast\b', schedule_lower) and not ordinals:
+    if last and not ordinals:
         result["last_of_month"] = True
-
-    if "every" in schedule_lower:
+    if every:
         result["weekly"] = True
-
     # "Every other Monday", "bi-weekly", "alternate Tuesdays"
-    if re.search(r'every\s+other|bi-?weekly|alternate', schedule_lower):
+    if every_other:
         result["interval"] = 2
-
     # "Daily 2-10pm" means every day, but only when no explicit days were given.
     # Otherwise phrases like "Fri-Sun (check Facebook for daily schedule)" would
     # be widened to all seven days.
-    if re.search(r'\bdaily\b', schedule_lower) and not result.get("day"):
+    if daily and not days:
         result["daily"] = True
         result["day"] = "MO,TU,WE,TH,FR,SA,SU"
-
-    if "weekdays" in schedule_lower and not result.get("day"):
+    if weekdays and not result.get("day"):
         result["day"] = "MO,TU,WE,TH,FR"
         result["weekly"] = True
 
-    time_pattern = r"(\d{1,2})(?::(\d{2}))?\s*(am|pm)?\s*-\s*(\d{1,2})(?::(\d{2}))?\s*(am|pm)?"
-    time_match = re.search(time_pattern, schedule_normalized)
-    if time_match:
-        start_hour = int(time_match.group(1))
-        start_min = int(time_match.group(2) or 0)
-        start_period = time_match.group(3)
-        end_hour = int(time_match.group(4))
-        end_min = int(time_match.group(5) or 0)
-        end_period = time_match.group(6)
-
-        # Infer start period when only end has one (matches JS parseSchedule logic)
-        if not start_period and end_period:
-            raw_end_hour = int(time_match.group(4))
-            if start_hour <= raw_end_hour and end_period == "pm" and start_hour < 12:
-                # Same period: "2-10pm" means 2pm-10pm
-                start_period = "pm"
-            # else: different periods, start stays as AM: "10-7pm" = 10am-7pm
-
-        if start_period == "pm" and start_hour < 12:
-            start_hour += 12
-        elif start_period == "am" and start_hour == 12:
-            start_hour = 0
-
-        if end_period == "pm" and end_hour < 12:
-            end_hour += 12
-        elif end_period == "am" and end_hour == 12:
-            end_hour = 0
-
-        result["start_time"] = f"{start_hour:02d}:{start_min:02d}"
-        result["end_time"] = f"{end_hour:02d}:{end_min:02d}"
-    else:
-        # Try single time (e.g., "6pm", "10am") — assume 1-hour duration
-        single_time = re.search(r'(\d{1,2})(?::(\d{2}))?\s*(am|pm)', schedule_normalized)
-        if single_time:
-            hour = int(single_time.group(1))
-            minute = int(single_time.group(2) or 0)
-            period = single_time.group(3)
-            if period == "pm" and hour < 12:
-                hour += 12
-            elif period == "am" and hour == 12:
-                hour = 0
-            result["start_time"] = f"{hour:02d}:{minute:02d}"
-            end_hour = hour + 1 if hour < 23 else 23
-            end_minute = minute if hour < 23 else 59
-            result["end_time"] = f"{end_hour:02d}:{end_minute:02d}"
+    time_range = _TIME_RANGE.search(text)
+    single_time = None if time_range else _SINGLE_TIME.search(text)
+    if time_range:
+        start_hour, start_min, start_period, end_hour, end_min, end_period = time_range.groups()
+        start_hour, end_hour = int(start_hour), int(end_hour)
+        # Infer start period when only end has one (matches JS parseSchedule logic):
+        # "2-10pm" means 2pm-10pm, but "10-7pm" is 10am-7pm.
+        if not start_period and end_period == "pm" and start_hour <= end_hour and start_hour < 12:
+            start_period = "pm"
+        result["start_time"] = f"{_clock(start_hour, start_period):02d}:{int(start_min or 0):02d}"
+        result["end_time"] = f"{_clock(end_hour, end_period):02d}:{int(end_min or 0):02d}"
+    elif single_time:
+        # A single time ("6pm", "10am") is assumed to last an hour
+        hour, minute, period = single_time.groups()
+        hour, minute = _clock(int(hour), period), int(minute or 0)
+        result["start_time"] = f"{hour:02d}:{minute:02d}"
+        result["end_time"] = f"{hour + 1:02d}:{minute:02d}" if hour < 23 else "23:59"
 
     return result
 
@@ -294,7 +388,32 @@ MONTHS = {
     "aug": 8, "sept": 9, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
 }
 
-_MONTH_ALT = "|".join(sorted(MONTHS, key=len, reverse=True))
+
+
+def _trie_pattern(words) -> str:
+    """A regex matching any of `words`, factored by shared prefixes.
+
+    Optional suffixes are greedy, so as in a longest-first alternation the
+    longest word is tried first and backtracking falls back to shorter ones.
+    """
+    root = {}
+    for word in words:
+        node = root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node: dict) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(root)
+
+
+_MONTH_TRIE = _trie_pattern(MONTHS)
 
 
 def _resolve_year(explicit_year: int | None, month: int, day: int, today: date | None = None) -> int:
@@ -316,30 +435,68 @@ def _resolve_year(explicit_year: int | None, month: int, day: int, today: date |
     return today.year if candidate >= today else today.year + 1
 
 
+_MONTH_DAY = rf"({_MONTH_TRIE})\s+(\d{{1,2}})\b"
+_DATE_DASH = r"\s*(?:-|–|—|to|through|thru)\s*"
+
+# parse_date_string() scans a date string once with _DATE_SCAN, which finds
+# explicit years and every position where a month name can start. It consumes
+# only the first letter of a month ("jan" may run into "nov"), and both
+# branches open with a literal, so the regex engine skips ahead between
+# candidates. At each month position, _DATE_SHAPES tests every date shape in
+# a lookahead. That gives the leftmost match of each shape, and the caller
+# takes them in priority order.
+_DATE_SCAN = re.compile(
+    r"2(?<!\w2)0\d\d\b|" + "|".join(
+        f"{first}(?={'|'.join(sorted(rest))})"
+        for first, rest in sorted(
+            (first, {key[1:3] for key in MONTHS if key[0] == first}) for first in {key[0] for key in MONTHS}
+        )
+    )
+)
+_DATE_SHAPES = re.compile(
+    rf"(?:(?={_MONTH_DAY}{_DATE_DASH}{_MONTH_DAY})|)"
+    rf"(?:(?={_MONTH_DAY}{_DATE_DASH}(\d{{1,2}})\b)|)"
+    rf"(?:(?=\b({_MONTH_TRIE})\b{_DATE_DASH}\b({_MONTH_TRIE})\b)|)"
+    rf"(?:(?={_MONTH_DAY})|)"
+)
+
+
+def _date_string_key(date_str: str, today: date | None = None) -> tuple:
+    """Cache key for parse_date_string: year-less dates depend on the as-of date."""
+    return date_str, today or date.today()
+
+
+@cached("parse_date_string", key=_date_string_key)
 def parse_date_string(date_str: str, today: date | None = None) -> tuple[datetime | None, datetime | None]:
     """Parse date strings into (start, end) datetimes.
 
     Handles same-month ranges ("July 17-19, 2026"), cross-month ranges
     ("May 22 - June 28, 2026"), month-to-month spans without days
-    ("June through August 2026"), and single dates.
+    ("June through August 2026"), and single dates. Strings longer than
+    MAX_PARSE_LENGTH parse as (None, None) (see parse_length_error).
     """
-    if not date_str:
+    if not date_str or len(date_str) > MAX_PARSE_LENGTH:
         return None, None
 
     date_lower = date_str.lower()
-
-    # An explicit four-digit year anywhere in the string applies to the whole range
-    year_match = re.search(r"\b(20\d{2})\b", date_lower)
-    explicit_year = int(year_match.group(1)) if year_match else None
-
-    month_day = rf"({_MONTH_ALT})\s+(\d{{1,2}})\b"
-    dash = r"\s*(?:-|–|—|to|through|thru)\s*"
+    explicit_year = cross = same = span = single = None
+    for m in _DATE_SCAN.finditer(date_lower):
+        if m.group()[0] == "2":
+            # An explicit four-digit year anywhere in the string applies to the whole range
+            explicit_year = explicit_year or int(m.group())
+            continue
+        if cross and same and span:
+            continue  # Every shape's leftmost match is known; only a year can still turn up
+        groups = _DATE_SHAPES.match(date_lower, m.start()).groups()
+        cross = cross or (groups[0] and groups[0:4])
+        same = same or (groups[4] and groups[4:7])
+        span = span or (groups[7] and groups[7:9])
+        single = single or (groups[9] and groups[9:11])
 
     # Cross-month range: "May 22 - June 28, 2026"
-    m = re.search(month_day + dash + month_day, date_lower)
-    if m:
-        start_month, start_day = MONTHS[m.group(1)], int(m.group(2))
-        end_month, end_day = MONTHS[m.group(3)], int(m.group(4))
+    if cross:
+        start_month, start_day = MONTHS[cross[0]], int(cross[1])
+        end_month, end_day = MONTHS[cross[2]], int(cross[3])
         year = _resolve_year(explicit_year, start_month, start_day, today)
         end_year = year + 1 if end_month < start_month else year
         try:
@@ -348,9 +505,8 @@ def parse_date_string(date_str: str, today: date | None = None) -> tuple[datetim
             pass
 
     # Same-month range: "July 17-19, 2026", "December 15-31"
-    m = re.search(month_day + dash + r"(\d{1,2})\b", date_lower)
-    if m:
-        month, start_day, end_day = MONTHS[m.group(1)], int(m.group(2)), int(m.group(3))
+    if same:
+        month, start_day, end_day = MONTHS[same[0]], int(same[1]), int(same[2])
         year = _resolve_year(explicit_year, month, start_day, today)
         try:
             return datetime(year, month, start_day), datetime(year, month, end_day)
@@ -358,18 +514,16 @@ def parse_date_string(date_str: str, today: date | None = None) -> tuple[datetim
             pass
 
     # Month-to-month span without days: "June through August 2026"
-    m = re.search(rf"\b({_MONTH_ALT})\b{dash}\b({_MONTH_ALT})\b", date_lower)
-    if m:
-        start_month, end_month = MONTHS[m.group(1)], MONTHS[m.group(2)]
+    if span:
+        start_month, end_month = MONTHS[span[0]], MONTHS[span[1]]
         year = _resolve_year(explicit_year, start_month, 1, today)
         end_year = year + 1 if end_month < start_month else year
         last_day = calendar.monthrange(end_year, end_month)[1]
         return datetime(year, start_month, 1), datetime(end_year, end_month, last_day)
 
     # Single date: "June 6, 2026"
-    m = re.search(month_day, date_lower)
-    if m:
-        month, day = MONTHS[m.group(1)], int(m.group(2))
+    if single:
+        month, day = MONTHS[single[0]], int(single[1])
         year = _resolve_year(explicit_year, month, day, today)
         try:
             return datetime(year, month, day), None
@@ -379,6 +533,24 @@ def parse_date_string(date_str: str, today: date | None = None) -> tuple[datetim
     return None, None
 
 
+def parse_date_strings(
+    date_strs: Iterable[str], today: date | None = None,
+) -> list[tuple[datetime | None, datetime | None]]:
+    """parse_date_string() over many strings, resolved against one as-of date.
+
+    `today` is read once for the whole batch (rather than once per year-less
+    date), and repeated strings are parsed once.
+    """
+    today = today or date.today()
+    parsed = {}
+    results = []
+    for date_str in date_strs:
+        if date_str not in parsed:
+            parsed[date_str] = parse_date_string(date_str, today=today)
+        results.append(parsed[date_str])
+    return results
+
+
 def format_ical_date(dt: datetime, all_day: bool = False) -> str:
     """Format datetime for iCal."""
     if all_day:
@@ -407,16 +579,31 @@ def escape_ical_text(text: str) -> str:
 
 
 def fold_ical_line(line: str, max_length: int = 75) -> str:
-    """Fold long lines according to iCal spec."""
-    if len(line) <= max_length:
-        return line
+    """Fold long lines according to iCal spec.
 
-    result = []
-    while len(line) > max_length:
-        result.append(line[:max_length])
-        line = " " + line[max_length:]
-    result.append(line)
-    return "\r\n".join(result)
+    RFC 5545 limits lines to 75 octets of UTF-8, counting the space that
+    starts each continuation line, and a fold must not split a multi-byte
+    character. Pieces are cut in one pass, so long text folds in linear time.
+    """
+    if len(line) <= max_length and (line.isascii() or len(line.encode("utf-8")) <= max_length):
+        return line
+    if line.isascii():
+        step = max_length - 1
+        pieces = [line[:max_length]]
+        pieces.extend(line[i:i + step] for i in range(max_length, len(line), step))
+        return "\r\n ".join(pieces)
+
+    octets = line.encode("utf-8")
+    pieces = []
+    start, limit = 0, max_length
+    while len(octets) - start > limit:
+        cut = start + limit
+        while octets[cut] & 0xC0 == 0x80:  # back up to the first byte of a character
+            cut -= 1
+        pieces.append(octets[start:cut].decode("utf-8"))
+        start, limit = cut, max_length - 1
+    pieces.append(octets[start:].decode("utf-8"))
+    return "\r\n ".join(pieces)
 
 
 def generate_event_description(entry: dict, program: dict = None) -> tuple[str, str]:
@@ -490,6 +677,95 @@ def generate_event_description(entry: dict, program: dict = None) -> tuple[str,
     return plain_text, html_text
 
 
+@dataclass(slots=True)
+class CalendarEvent:
+    """One VEVENT before it is written for a platform.
+
+    Entries are compiled to these once (compile_entry_events); render_vevent()
+    writes one for Google, Apple or Outlook, which differ only in Outlook's
+    HTML description and busy status. dtstart and dtend are already formatted
+    (local times, or dates when all_day).
+    """
+
+    uid: str
+    summary: str
+    description: str
+    location: str
+    dtstart: str
+    dtend: str
+    all_day: bool = False
+    rrule: str | None = None
+    url: str | None = None
+    category: str | None = None
+    html_description: str | None = None
+    dtstamp: str | None = None
+    # The lines every platform shares, before and after Outlook's, escaped and folded on first render
+    _parts: tuple[str, str] | None = field(default=None, init=False, repr=False, compare=False)
+
+    def shared_parts(self) -> tuple[str, str]:
+        if self._parts is None:
+            lines = [
+                "BEGIN:VEVENT",
+                f"UID:{self.uid}",
+                f"DTSTAMP:{self.dtstamp or DEFAULT_DTSTAMP}",
+            ]
+
+            # Date/time handling
+            if self.all_day:
+                lines.append(f"DTSTART;VALUE=DATE:{self.dtstart}")
+                if self.dtend:
+                    lines.append(f"DTEND;VALUE=DATE:{self.dtend}")
+            else:
+                lines.append(f"DTSTART;TZID=America/Los_Angeles:{self.dtstart}")
+                if self.dtend:
+                    lines.append(f"DTEND;TZID=America/Los_Angeles:{self.dtend}")
+
+            # Summary with category prefix for combined calendars
+            lines.append(fold_ical_line(f"SUMMARY:{escape_ical_text(self.summary)}"))
+
+            # Description - plain text for all, HTML for Outlook (see render_vevent)
+            if self.description:
+                lines.append(fold_ical_line(f"DESCRIPTION:{escape_ical_text(self.description)}"))
+            head = "\r\n".join(lines)
+
+            lines = []
+            # Location
+            if self.location:
+                lines.append(fold_ical_line(f"LOCATION:{escape_ical_text(self.location)}"))
+
+            # URL
+            if self.url:
+                lines.append(fold_ical_line(f"URL:{self.url}"))
+
+            # Recurrence rule
+            if self.rrule:
+                lines.append(f"RRULE:{self.rrule}")
+
+            # Categories - included for all platforms (some may ignore)
+            if self.category:
+                category_name = CATEGORY_NAMES.get(self.category, self.category.replace("_", " ").title())
+                lines.append(f"CATEGORIES:{category_name}")
+
+            # Transparency (show as free/busy)
+            lines.append("TRANSP:TRANSPARENT")
+
+            lines.append("END:VEVENT")
+            self._parts = (head, "\r\n".join(lines))
+        return self._parts
+
+
+def render_vevent(event: CalendarEvent, platform: str = "google") -> str:
+    """Write a compiled event as a VEVENT component optimized for the target platform."""
+    head, tail = event.shared_parts()
+    # Outlook: Add HTML description (no iCal escaping — HTML uses its own encoding;
+    # no line folding — splitting mid-tag corrupts HTML and Outlook handles long lines)
+    if platform == "outlook" and event.html_description:
+        # Set as busy by default
+        return (f"{head}\r\nX-ALT-DESC;FMTTYPE=text/html:{event.html_description}\r\n"
+                f"X-MICROSOFT-CDO-BUSYSTATUS:FREE\r\n{tail}")
+    return f"{head}\r\n{tail}"
+
+
 def create_vevent(
     uid: str,
     summary: str,
@@ -506,59 +782,9 @@ def create_vevent(
     dtstamp: str = None,
 ) -> str:
     """Create a VEVENT component optimized for the target platform."""
-    lines = [
-        "BEGIN:VEVENT",
-        f"UID:{uid}",
-        f"DTSTAMP:{dtstamp or DEFAULT_DTSTAMP}",
-    ]
-
-    # Date/time handling
-    if all_day:
-        lines.append(f"DTSTART;VALUE=DATE:{dtstart}")
-        if dtend:
-            lines.append(f"DTEND;VALUE=DATE:{dtend}")
-    else:
-        lines.append(f"DTSTART;TZID=America/Los_Angeles:{dtstart}")
-        if dtend:
-            lines.append(f"DTEND;TZID=America/Los_Angeles:{dtend}")
-
-    # Summary with category prefix for combined calendars
-    lines.append(fold_ical_line(f"SUMMARY:{escape_ical_text(summary)}"))
-
-    # Description - plain text for all, HTML for Outlook
-    if description:
-        lines.append(fold_ical_line(f"DESCRIPTION:{escape_ical_text(description)}"))
-
-    # Outlook: Add HTML description (no iCal escaping — HTML uses its own encoding;
-    # no line folding — splitting mid-tag corrupts HTML and Outlook handles long lines)
-    if platform == "outlook" and html_description:
-        lines.append(f"X-ALT-DESC;FMTTYPE=text/html:{html_description}")
-        # Set as busy by default
-        lines.append("X-MICROSOFT-CDO-BUSYSTATUS:FREE")
-
-    # Location
-    if location:
-        lines.append(fold_ical_line(f"LOCATION:{escape_ical_text(location)}"))
-
-    # URL
-    if url:
-        lines.append(f"URL:{url}")
-
-    # Recurrence rule
-    if rrule:
-        lines.append(f"RRULE:{rrule}")
-
-    # Categories - included for all platforms (some may ignore)
-    if category:
-        category_name = CATEGORY_NAMES.get(category, category.replace("_", " ").title())
-        lines.append(f"CATEGORIES:{category_name}")
-
-    # Transparency (show as free/busy)
-    lines.append("TRANSP:TRANSPARENT")
-
-    lines.append("END:VEVENT")
-
-    return "\r\n".join(lines)
+    event = CalendarEvent(uid, summary, description, location, dtstart, dtend, all_day=all_day, rrule=rrule,
+                          url=url, category=category, html_description=html_description, dtstamp=dtstamp)
+    return render_vevent(event, platform)
 
 
 WEEKDAY_INDEX = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
@@ -603,17 +829,37 @@ def _first_weekly_occurrence(base_date: datetime, days: list[str]) -> datetime |
     return base_date + timedelta(days=min(offsets))
 
 
+@functools.lru_cache(maxsize=None)
+def _month_shape(year: int, month: int) -> tuple[int, int]:
+    """(weekday of the 1st, days in month); every weekday-of-month question reduces to these."""
+    return calendar.monthrange(year, month)
+
+
 def _nth_weekday_of_month(year: int, month: int, weekday: int, nth: int) -> date | None:
     """Date of the nth (1-5, or -1 for last) given weekday in a month."""
-    days_in_month = calendar.monthrange(year, month)[1]
-    matches = [
-        day for day in range(1, days_in_month + 1)
-        if date(year, month, day).weekday() == weekday
-    ]
-    try:
-        return date(year, month, matches[nth - 1 if nth > 0 else nth])
-    except IndexError:
+    first_weekday, days_in_month = _month_shape(year, month)
+    if nth > 0:
+        day = 1 + (weekday - first_weekday) % 7 + 7 * (nth - 1)
+    elif nth < 0:
+        day = days_in_month - (first_weekday + days_in_month - 1 - weekday) % 7 + 7 * (nth + 1)
+    else:
         return None
+    return date(year, month, day) if 1 <= day <= days_in_month else None
+
+
+def _month_occurrence_days(year: int, month: int, weekdays: list[int], weeks: list[int]) -> list[int]:
+    """Sorted days of the month matching any (week, weekday) pair, by arithmetic."""
+    first_weekday, days_in_month = _month_shape(year, month)
+    last_weekday = (first_weekday + days_in_month - 1) % 7
+    days = set()
+    for weekday in weekdays:
+        first = 1 + (weekday - first_weekday) % 7
+        for nth in weeks:
+            if nth == -1:
+                days.add(days_in_month - (last_weekday - weekday) % 7)
+            elif nth > 0 and first + 7 * (nth - 1) <= days_in_month:
+                days.add(first + 7 * (nth - 1))
+    return sorted(days)
 
 
 def _first_monthly_occurrence(
@@ -625,20 +871,12 @@ def _first_monthly_occurrence(
     clients render an extra event on the DTSTART date. Walking forward month by
     month guarantees that; simply advancing to the next matching weekday does not.
     """
+    weekdays = [WEEKDAY_INDEX[day] for day in days if day in WEEKDAY_INDEX]
     year, month = base_date.year, base_date.month
     for _ in range(14):  # a year plus slack covers 5th-week rules that skip months
-        candidates = []
-        for day in days:
-            weekday = WEEKDAY_INDEX.get(day)
-            if weekday is None:
-                continue
-            for nth in weeks:
-                found = _nth_weekday_of_month(year, month, weekday, nth)
-                if found and found >= base_date.date():
-                    candidates.append(found)
-        if candidates:
-            best = min(candidates)
-            return datetime(best.year, best.month, best.day)
+        for day in _month_occurrence_days(year, month, weekdays, weeks):
+            if (year, month, day) >= (base_date.year, base_date.month, base_date.day):
+                return datetime(year, month, day)
         month += 1
         if month > 12:
             month, year = 1, year + 1
@@ -652,6 +890,13 @@ def _end_day_offset(start_time: str, end_time: str) -> int:
     return int((end_hour, end_minute) <= (start_hour, start_minute))
 
 
+def _recurring_key(schedule: dict, entry: dict, today: date | None = None) -> tuple:
+    """Cache key for resolve_recurring_schedule: only an end date makes it date-dependent."""
+    end = entry.get("schedule_end_date")
+    return (repr(schedule), repr(entry.get("schedule_start_date")), repr(end)), (today or date.today()) if end else None
+
+
+@cached("resolve_recurring_schedule", key=_recurring_key)
 def resolve_recurring_schedule(
     schedule: dict,
     entry: dict,
@@ -721,6 +966,66 @@ def resolve_recurring_schedule(
     }
 
 
+def iter_occurrences(resolved: dict, start: date, end: date) -> Iterator[date]:
+    """Yield the dates a resolved schedule occurs on between start and end, inclusive.
+
+    Follows the same rules as docs/index.html: nothing before anchor_date or
+    after until_date, weekly intervals count Monday-based weeks from the
+    anchor's week, monthly intervals count months from the anchor's month, and
+    week -1 is the last such weekday. Rather than testing every day of the
+    window, it jumps from one matching week or month to the next, so the cost
+    is proportional to the number of occurrences.
+    """
+    anchor = date.fromisoformat(resolved["anchor_date"])
+    lo = max(start, anchor)
+    hi = end
+    if resolved.get("until_date"):
+        hi = min(hi, date.fromisoformat(resolved["until_date"]))
+    if lo > hi:
+        return
+    interval = max(1, int(resolved.get("interval") or 1))
+    weekdays = sorted({WEEKDAY_INDEX[day] for day in resolved.get("weekdays") or [] if day in WEEKDAY_INDEX})
+    frequency = resolved.get("frequency")
+
+    if frequency == "daily":
+        day = lo + timedelta(days=-(lo - anchor).days % interval)
+        step = timedelta(days=interval)
+        while day <= hi:
+            if not weekdays or day.weekday() in weekdays:
+                yield day
+            day += step
+    elif not weekdays:
+        return
+    elif frequency == "weekly":
+        anchor_monday = anchor - timedelta(days=anchor.weekday())
+        monday = lo - timedelta(days=lo.weekday())
+        # Round up to the next week in step with the anchor's week.
+        monday += timedelta(weeks=-((monday - anchor_monday).days // 7) % interval)
+        step = timedelta(weeks=interval)
+        while monday <= hi:
+            for weekday in weekdays:
+                day = monday + timedelta(days=weekday)
+                if day > hi:
+                    return
+                if day >= lo:
+                    yield day
+            monday += step
+    elif frequency == "monthly":
+        weeks = [int(week) for week in resolved.get("month_weeks") or []]
+        month_index = lo.year * 12 + lo.month - 1
+        month_index += -(month_index - (anchor.year * 12 + anchor.month - 1)) % interval
+        last_index = hi.year * 12 + hi.month - 1
+        while month_index <= last_index:
+            year, month = divmod(month_index, 12)
+            for day in _month_occurrence_days(year, month + 1, weekdays, weeks):
+                found = date(year, month + 1, day)
+                if found > hi:
+                    return
+                if found >= lo:
+                    yield found
+            month_index += interval
+
+
 def resolve_fixed_schedule(
     dates: str | list,
     schedule: str | None = None,
@@ -738,10 +1043,8 @@ def resolve_fixed_schedule(
     parsed_times = parse_schedule(schedule) if schedule else {}
     has_times = bool(parsed_times.get("start_time") and parsed_times.get("end_time"))
     occurrences = []
-    for date_item in date_items:
-        if not isinstance(date_item, str):
-            continue
-        start_date, end_date = parse_date_string(date_item, today=today)
+    date_strs = [date_item for date_item in date_items if isinstance(date_item, str)]
+    for start_date, end_date in parse_date_strings(date_strs, today=today):
         if not start_date:
             continue
         effective_end = end_date or start_date
@@ -762,6 +1065,29 @@ def resolve_fixed_schedule(
     return {"type": "fixed", "occurrences": occurrences}
 
 
+def resolve_entry_schedule(entry: dict, today: date | None = None) -> dict | None:
+    """The entry's own resolved schedule, as published in the JSON feed."""
+    if entry.get("dates"):
+        # Entry-level fixed dates are always all-day, matching ICS output.
+        return resolve_fixed_schedule(entry["dates"], today=today)
+    if entry.get("schedule") and not entry.get("programs"):
+        return resolve_recurring_schedule(parse_schedule(entry["schedule"]), entry, today=today)
+    return None
+
+
+def resolve_program_schedule(program: dict, entry: dict, today: date | None = None) -> dict | None:
+    """A program's resolved schedule; its own bounds override the entry's."""
+    if program.get("dates"):
+        return resolve_fixed_schedule(program["dates"], program.get("schedule"), today=today)
+    if program.get("schedule"):
+        return resolve_recurring_schedule(
+            parse_schedule(program["schedule"]),
+            _effective_schedule_entry(entry, program),
+            today=today,
+        )
+    return None
+
+
 def _effective_schedule_entry(entry: dict, program: dict) -> dict:
     """Return entry bounds with each program-level bound overriding its parent."""
     effective_entry = dict(entry)
@@ -771,6 +1097,12 @@ def _effective_schedule_entry(entry: dict, program: dict) -> dict:
     return effective_entry
 
 
+@functools.lru_cache(maxsize=None)
+def _dst_transitions(year: int) -> tuple[date, date]:
+    """First day of PDT and first day of PST again: 2nd Sunday in March, 1st in November."""
+    return _nth_weekday_of_month(year, 3, 6, 2), _nth_weekday_of_month(year, 11, 6, 1)
+
+
 def _pacific_utc_offset(dt: datetime) -> int:
     """Hours to add to Pacific local time to get UTC (7 during PDT, 8 during PST).
 
@@ -778,11 +1110,8 @@ def _pacific_utc_offset(dt: datetime) -> int:
     from the second Sunday in March to the first Sunday in November - so the
     result does not depend on the tzdata package being installed.
     """
-    dst_start = _nth_weekday_of_month(dt.year, 3, 6, 2)   # 2nd Sunday in March
-    dst_end = _nth_weekday_of_month(dt.year, 11, 6, 1)    # 1st Sunday in November
-    if dst_start and dst_end and dst_start <= dt.date() < dst_end:
-        return 7
-    return 8
+    dst_start, dst_end = _dst_transitions(dt.year)
+    return 7 if dst_start <= dt.date() < dst_end else 8
 
 
 def _local_end_of_day_utc(day: datetime) -> str:
@@ -791,7 +1120,7 @@ def _local_end_of_day_utc(day: datetime) -> str:
     return (local_end + timedelta(hours=_pacific_utc_offset(local_end))).strftime("%Y%m%dT%H%M%SZ")
 
 
-def build_recurring_event(
+def compile_recurring_event(
     schedule: dict,
     entry: dict,
     summary: str,
@@ -801,11 +1130,10 @@ def build_recurring_event(
     uid: str,
     website: str,
     category: str,
-    platform: str,
     dtstamp: str = None,
     today: date = None,
-) -> str | None:
-    """Build a recurring VEVENT from parsed schedule data. Returns None if schedule is incomplete."""
+) -> CalendarEvent | None:
+    """Compile a recurring event from parsed schedule data. Returns None if schedule is incomplete."""
     resolved = resolve_recurring_schedule(schedule, entry, today=today)
     if not resolved:
         return None
@@ -850,7 +1178,7 @@ def build_recurring_event(
         # Overnight session such as "12-12am" (noon to midnight)
         dtend += timedelta(days=1)
 
-    return create_vevent(
+    return CalendarEvent(
         uid=uid,
         summary=summary,
         description=description,
@@ -860,25 +1188,44 @@ def build_recurring_event(
         rrule=rrule,
         url=website,
         category=category,
-        platform=platform,
         html_description=html_desc,
         dtstamp=dtstamp,
     )
 
 
+def build_recurring_event(
+    schedule: dict,
+    entry: dict,
+    summary: str,
+    description: str,
+    html_desc: str,
+    location: str,
+    uid: str,
+    website: str,
+    category: str,
+    platform: str,
+    dtstamp: str = None,
+    today: date = None,
+) -> str | None:
+    """Build a recurring VEVENT from parsed schedule data. Returns None if schedule is incomplete."""
+    event = compile_recurring_event(schedule, entry, summary, description, html_desc, location, uid,
+                                    website, category, dtstamp=dtstamp, today=today)
+    return render_vevent(event, platform) if event else None
+
+
 _warned_schedules = set()
 
 def _make_date_event(
-    date_str: str, entry_id: str, name: str, description: str,
-    html_desc: str, address: str, website: str, category: str, platform: str,
+    dates: tuple[datetime | None, datetime | None], entry_id: str, name: str, description: str,
+    html_desc: str, address: str, website: str, category: str,
     times: dict | None = None, uid_suffix: str = "", dtstamp: str = None,
-) -> str | None:
-    """Create a VEVENT from a date string.
+) -> CalendarEvent | None:
+    """Compile an event from a parsed (start, end) date string.
 
     All-day by default. When `times` carries a parsed start/end time (from a
     program's `schedule`), a timed single-day event is produced instead.
     """
-    start_date, end_date = parse_date_string(date_str)
+    start_date, end_date = dates
     if not start_date:
         return None
     end = end_date if end_date else start_date
@@ -893,7 +1240,7 @@ def _make_date_event(
         dtend = start_date.replace(hour=end_h, minute=end_m)
         if dtend <= dtstart:
             dtend += timedelta(days=1)
-        return create_vevent(
+        return CalendarEvent(
             uid=uid,
             summary=name,
             description=description,
@@ -902,12 +1249,11 @@ def _make_date_event(
             dtend=format_ical_date(dtend),
             url=website,
             category=category,
-            platform=platform,
             html_description=html_desc,
             dtstamp=dtstamp,
         )
 
-    return create_vevent(
+    return CalendarEvent(
         uid=uid,
         summary=name,
         description=description,
@@ -917,28 +1263,41 @@ def _make_date_event(
         all_day=True,
         url=website,
         category=category,
-        platform=platform,
         html_description=html_desc,
         dtstamp=dtstamp,
     )
 
 
-def _warn_unparseable(key: str, schedule_str: str, label: str) -> None:
-    """Print a deduplicated warning for an unparseable schedule."""
-    if key not in _warned_schedules:
-        _warned_schedules.add(key)
-        print(f"  WARNING: unparseable schedule for {label}: \"{schedule_str}\"", file=sys.stderr)
+def print_warnings(warnings: Iterable[tuple[str, str]]) -> None:
+    """Print each (key, message) warning, once per key per run."""
+    for key, message in warnings:
+        if key not in _warned_schedules:
+            _warned_schedules.add(key)
+            print(message, file=sys.stderr)
 
 
-def is_closed(entry: dict) -> bool:
-    """True if the entry is recorded as permanently closed or discontinued."""
-    if str(entry.get("status", "")).upper() == "CLOSED":
-        return True
-    return any("❌" in str(flag) for flag in entry.get("flags", []) or [])
+def _warn_unparseable(key: str, schedule_str: str, label: str, warnings: list | None) -> None:
+    """Warn about an unparseable schedule: append to `warnings`, or print it when there is no list."""
+    too_long = parse_length_error(schedule_str)
+    if too_long:
+        message = f"  WARNING: unparseable schedule for {label}: {too_long}: \"{schedule_str[:60]}...\""
+    else:
+        message = f"  WARNING: unparseable schedule for {label}: \"{schedule_str}\""
+    if warnings is None:
+        print_warnings([(key, message)])
+    else:
+        warnings.append((key, message))
 
 
-def entry_to_events(entry: dict, platform: str = "google") -> list[str]:
-    """Convert a source entry to one or more VEVENT strings."""
+def compile_entry_events(entry: dict, today: date | None = None,
+                         warnings: list | None = None) -> list[CalendarEvent]:
+    """Compile a source entry to its events, ready for render_vevent() on any platform.
+
+    `today` is the as-of date for year-less dates and ended schedules
+    (default: the current date). Unparseable schedules are appended to
+    `warnings` as (key, message) pairs for print_warnings(), or printed
+    straight away without a list.
+    """
     events = []
     dtstamp = entry_dtstamp(entry)
     entry_id = entry.get("id", "unknown")
@@ -952,20 +1311,20 @@ def entry_to_events(entry: dict, platform: str = "google") -> list[str]:
     if dates:
         description, html_desc = generate_event_description(entry)
         date_items = [dates] if isinstance(dates, str) else (dates if isinstance(dates, list) else [])
-        for date_item in date_items:
-            if isinstance(date_item, str):
-                vevent = _make_date_event(
-                    date_item, entry_id, name, description, html_desc,
-                    address, website, category, platform, dtstamp=dtstamp,
-                )
-                if vevent:
-                    events.append(vevent)
+        date_strs = [date_item for date_item in date_items if isinstance(date_item, str)]
+        for parsed in parse_date_strings(date_strs, today=today):
+            event = _make_date_event(
+                parsed, entry_id, name, description, html_desc,
+                address, website, category, dtstamp=dtstamp,
+            )
+            if event:
+                events.append(event)
 
     # Recurring programs (sub-entries with their own schedules)
     programs = entry.get("programs", [])
     if isinstance(programs, list):
         for program in programs:
-            if not isinstance(program, dict):
+            if not isinstance(program, Mapping):
                 continue
             program_name = program.get("name", name)
             program_key = program.get("id", program_name)
@@ -977,16 +1336,15 @@ def entry_to_events(entry: dict, platform: str = "google") -> list[str]:
                 description, html_desc = generate_event_description(entry, program)
                 times = parse_schedule(program.get("schedule", "")) if program.get("schedule") else None
                 date_items = [program_dates] if isinstance(program_dates, str) else program_dates
-                for date_item in date_items:
-                    if not isinstance(date_item, str):
-                        continue
-                    vevent = _make_date_event(
-                        date_item, entry_id, full_name, description, html_desc,
-                        program.get("location", address), website, category, platform,
+                date_strs = [date_item for date_item in date_items if isinstance(date_item, str)]
+                for parsed in parse_date_strings(date_strs, today=today):
+                    event = _make_date_event(
+                        parsed, entry_id, full_name, description, html_desc,
+                        program.get("location", address), website, category,
                         times=times, uid_suffix=f"{program_key}-", dtstamp=dtstamp,
                     )
-                    if vevent:
-                        events.append(vevent)
+                    if event:
+                        events.append(event)
                 continue
 
             if "schedule" not in program:
@@ -994,45 +1352,55 @@ def entry_to_events(entry: dict, platform: str = "google") -> list[str]:
             schedule = parse_schedule(program.get("schedule", ""))
 
             if program.get("schedule") and not schedule.get("day"):
-                _warn_unparseable(f"{entry_id}>{program_name}", program["schedule"], f"{entry_id} > {program_name}")
+                _warn_unparseable(f"{entry_id}>{program_name}", program["schedule"], f"{entry_id} > {program_name}",
+                                  warnings)
 
             description, html_desc = generate_event_description(entry, program)
 
             # Merge program-level schedule bounds
             effective_entry = _effective_schedule_entry(entry, program)
 
-            vevent = build_recurring_event(
+            event = compile_recurring_event(
                 schedule=schedule, entry=effective_entry, summary=full_name,
                 description=description, html_desc=html_desc,
                 location=program.get("location", address),
                 uid=generate_uid(entry_id, program_key),
-                website=website, category=category, platform=platform,
-                dtstamp=dtstamp,
+                website=website, category=category,
+                dtstamp=dtstamp, today=today,
             )
-            if vevent:
-                events.append(vevent)
+            if event:
+                events.append(event)
 
     # Entry-level schedule (no sub-programs, no dates)
     schedule_str = entry.get("schedule")
     if schedule_str and not programs and not dates:
         schedule = parse_schedule(schedule_str)
         if not schedule.get("day"):
-            _warn_unparseable(entry_id, schedule_str, entry_id)
+            _warn_unparseable(entry_id, schedule_str, entry_id, warnings)
         description, html_desc = generate_event_description(entry)
 
-        vevent = build_recurring_event(
+        event = compile_recurring_event(
             schedule=schedule, entry=entry, summary=name,
             description=description, html_desc=html_desc,
             location=address, uid=generate_uid(entry_id, "recurring"),
-            website=website, category=category, platform=platform,
-            dtstamp=dtstamp,
+            website=website, category=category,
+            dtstamp=dtstamp, today=today,
         )
-        if vevent:
-            events.append(vevent)
+        if event:
+            events.append(event)
 
     return events
 
 
+def entry_to_events(entry: dict, platform: str = "google", today: date | None = None) -> list[str]:
+    """Convert a source entry to one or more VEVENT strings.
+
+    `today` is the as-of date for year-less dates and ended schedules
+    (default: the current date).
+    """
+    return [render_vevent(event, platform) for event in compile_entry_events(entry, today=today)]
+
+
 def generate_vtimezone() -> str:
     """Generate VTIMEZONE component for America/Los_Angeles."""
     return """BEGIN:VTIMEZONE
@@ -1055,13 +1423,13 @@ END:STANDARD
 END:VTIMEZONE"""
 
 
-def create_vcalendar(
-    events: list[str],
-    calendar_name: str,
-    platform: str = "google",
-    category: str = None
-) -> str:
-    """Create a full VCALENDAR optimized for the target platform."""
+VCALENDAR_FOOTER = "END:VCALENDAR"
+
+PLATFORMS = ("google", "apple", "outlook")
+
+
+def vcalendar_header(calendar_name: str, platform: str = "google", category: str = None) -> str:
+    """Everything create_vcalendar writes before the first event."""
     header = [
         "BEGIN:VCALENDAR",
         "VERSION:2.0",
@@ -1089,99 +1457,117 @@ def create_vcalendar(
         header.append("X-WR-TIMEZONE:America/Los_Angeles")
 
     # Add VTIMEZONE for all platforms
-    timezone = generate_vtimezone()
+    return "\r\n".join(header) + "\r\n" + generate_vtimezone() + "\r\n"
 
-    footer = ["END:VCALENDAR"]
 
+def create_vcalendar(
+    events: list[str],
+    calendar_name: str,
+    platform: str = "google",
+    category: str = None
+) -> str:
+    """Create a full VCALENDAR optimized for the target platform."""
     # Combine: header + timezone + events + footer
-    header_str = "\r\n".join(header)
-    footer_str = "\r\n".join(footer)
+    header = vcalendar_header(calendar_name, platform=platform, category=category)
+    return header + "\r\n".join(events) + "\r\n" + VCALENDAR_FOOTER
 
-    return header_str + "\r\n" + timezone + "\r\n" + "\r\n".join(events) + "\r\n" + footer_str
 
+def category_calendar_name(category: str) -> str:
+    category_name = CATEGORY_NAMES.get(category, category.replace("_", " ").title())
+    return f"Portland Resources - {category_name}"
 
-def generate_json_feed(entries: list[dict], today: date | None = None) -> dict:
-    """Generate a JSON feed for web applications."""
-    events = []
 
-    for entry in entries:
-        event_data = {
-            "id": entry.get("id"),
-            "title": entry.get("name"),
-            "category": entry.get("category"),
-            "categoryName": CATEGORY_NAMES.get(entry.get("category", ""), entry.get("category", "")),
-            "color": CATEGORY_COLORS.get(entry.get("category", ""), "#808080"),
-            "address": entry.get("address"),
-            "latitude": entry.get("latitude"),
-            "longitude": entry.get("longitude"),
-            "phone": entry.get("phone"),
-            "email": entry.get("email"),
-            "website": entry.get("website"),
-            "pricing": entry.get("pricing"),
-            "hours": entry.get("hours"),
-            "eligibility": entry.get("eligibility"),
-            "features": entry.get("features", []),
-            "location_type": entry.get("location_type"),
-            "resource_type": entry.get("resource_type"),
-            "programs": entry.get("programs", []),
-            "dates": entry.get("dates"),
-            "schedule": entry.get("schedule"),
-            "schedule_start_date": entry.get("schedule_start_date"),
-            "schedule_end_date": entry.get("schedule_end_date"),
-            "resolved_schedule": None,
-            "flags": entry.get("flags", []),
-            "last_verified": entry.get("last_verified"),
-            "accessibility": entry.get("accessibility", []),
-            "social_intensity": entry.get("social_intensity"),
-            "good_for": entry.get("good_for", []),
-            "audience": get_entry_audience(entry),
-            "audience_notes": entry.get("audience_notes"),
-            "notes": entry.get("notes"),
-            "practical_tips": entry.get("practical_tips"),
-        }
-        if entry.get("dates"):
-            # Entry-level fixed dates are always all-day, matching ICS output.
-            event_data["resolved_schedule"] = resolve_fixed_schedule(
-                entry["dates"], today=today,
-            )
+class CalendarWriter:
+    """Writes each platform's category calendars and all-events.ics as entries arrive.
 
-        # Add detected audience to programs
-        if event_data["programs"]:
-            enriched_programs = []
-            for prog in event_data["programs"]:
-                if isinstance(prog, dict):
-                    prog_copy = dict(prog)
-                    prog_copy["audience"] = get_program_audience(prog, entry)
-                    if prog.get("dates"):
-                        prog_copy["resolved_schedule"] = resolve_fixed_schedule(
-                            prog["dates"], prog.get("schedule"), today=today,
-                        )
-                    elif prog.get("schedule"):
-                        prog_copy["resolved_schedule"] = resolve_recurring_schedule(
-                            parse_schedule(prog["schedule"]),
-                            _effective_schedule_entry(entry, prog),
-                            today=today,
-                        )
-                    else:
-                        prog_copy["resolved_schedule"] = None
-                    enriched_programs.append(prog_copy)
-                else:
-                    # Program is just a string, skip enrichment
-                    enriched_programs.append(prog)
-            event_data["programs"] = enriched_programs
-        elif entry.get("schedule") and not entry.get("dates"):
-            event_data["resolved_schedule"] = resolve_recurring_schedule(
-                parse_schedule(entry["schedule"]), entry, today=today,
-            )
-        events.append(event_data)
+    Events go straight to their category file, and all-events.ics is copied
+    together from those files on close (categories in order of first
+    appearance), so the output matches create_vcalendar() over the whole
+    list without any calendar being held in memory. Peak memory is one
+    entry's events plus the write buffers, however large the catalog.
+    """
 
-    # "As of" the newest verification date rather than the wall clock, so an
-    # unchanged sources.yaml regenerates to an identical file.
-    verified_dates = [d for d in (parse_date(e.get("last_verified")) for e in entries) if d]
+    BUFFER_SIZE = 1 << 16
+
+    def __init__(self, output_dir: Path, platforms: list[str], today: date | None = None):
+        self.output_dir = output_dir
+        self.platforms = platforms
+        self.today = today or date.today()
+        self.categories: dict[str, None] = {}
+        self.event_counts = {platform: 0 for platform in platforms}
+        # (platform, category) -> open file and the byte offset its events start at
+        self._files: dict[tuple[str, str], tuple] = {}
+        for platform in platforms:
+            (output_dir / platform).mkdir(parents=True, exist_ok=True)
+
+    def __enter__(self) -> "CalendarWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            for f, _ in self._files.values():
+                f.close()
+
+    def add(self, entry: dict) -> None:
+        # Parsing, recurrence and descriptions happen once; each platform only renders.
+        events = compile_entry_events(entry, today=self.today)
+        self.add_rendered(entry.get("category"), render_platforms(events, self.platforms), len(events))
+
+    def add_rendered(self, category: str | None, vevents: dict[str, str], count: int) -> None:
+        """Append an entry's already rendered VEVENT blocks (platform -> text) to its category."""
+        category = category or "general"
+        self.categories.setdefault(category)
+        if not count:
+            return
+        for platform in self.platforms:
+            self._category_file(platform, category).write(vevents[platform])
+            self.event_counts[platform] += count
+
+    def _category_file(self, platform: str, category: str):
+        f, _ = self._files.get((platform, category), (None, 0))
+        if f is None:
+            header = vcalendar_header(category_calendar_name(category), platform=platform, category=category)
+            f = open(self.output_dir / platform / f"{category}.ics", "w", encoding="utf-8", newline="",
+                     buffering=self.BUFFER_SIZE)
+            f.write(header)
+            self._files[(platform, category)] = (f, len(header.encode("utf-8")))
+        return f
+
+    def close(self) -> None:
+        for f, _ in self._files.values():
+            f.write(VCALENDAR_FOOTER)
+            f.close()
+        footer = VCALENDAR_FOOTER.encode("utf-8")
+        for platform in self.platforms:
+            if not self.event_counts[platform]:
+                continue
+            header = vcalendar_header("Portland Metro Resources - All Events", platform=platform, category=None)
+            with open(self.output_dir / platform / "all-events.ics", "wb", buffering=self.BUFFER_SIZE) as out:
+                out.write(header.encode("utf-8"))
+                for category in self.categories:
+                    if (platform, category) not in self._files:
+                        continue
+                    _, events_start = self._files[(platform, category)]
+                    path = self.output_dir / platform / f"{category}.ics"
+                    with open(path, "rb") as f:
+                        f.seek(events_start)
+                        remaining = path.stat().st_size - events_start - len(footer)
+                        while remaining > 0:
+                            chunk = f.read(min(remaining, self.BUFFER_SIZE))
+                            out.write(chunk)
+                            remaining -= len(chunk)
+                out.write(footer)
 
+
+def generate_json_feed(entries: list[dict], today: date | None = None) -> dict:
+    """Generate a JSON feed for web applications."""
+    today = today or date.today()
+    events = [json_feed_record(entry, today) for entry in entries]
     return {
         "schedule_schema_version": SCHEDULE_SCHEMA_VERSION,
-        "generated": max(verified_dates).isoformat() if verified_dates else "",
+        "generated": json_feed_generated(parse_date(e.get("last_verified")) for e in entries),
         "count": len(events),
         "categories": CATEGORY_NAMES,
         "colors": CATEGORY_COLORS,
@@ -1189,26 +1575,309 @@ def generate_json_feed(entries: list[dict], today: date | None = None) -> dict:
     }
 
 
-def copy_to_docs(output_dir: Path, docs_dir: Path, platforms: list[str]) -> None:
-    """Copy generated calendar files to docs/ for GitHub Pages hosting."""
+def json_feed_generated(verified_dates: Iterable[date | None]) -> str:
+    """The feed's "generated" stamp.
+
+    "As of" the newest verification date rather than the wall clock, so an
+    unchanged sources.yaml regenerates to an identical file.
+    """
+    verified_dates = [d for d in verified_dates if d]
+    return max(verified_dates).isoformat() if verified_dates else ""
+
+
+def json_feed_record(entry: dict, today: date) -> dict:
+    """One entry's record in the JSON feed's "events" list."""
+    event_data = {
+        "id": entry.get("id"),
+        "title": entry.get("name"),
+        "category": entry.get("category"),
+        "categoryName": CATEGORY_NAMES.get(entry.get("category", ""), entry.get("category", "")),
+        "color": CATEGORY_COLORS.get(entry.get("category", ""), "#808080"),
+        "address": entry.get("address"),
+        "latitude": entry.get("latitude"),
+        "longitude": entry.get("longitude"),
+        "phone": entry.get("phone"),
+        "email": entry.get("email"),
+        "website": entry.get("website"),
+        "pricing": entry.get("pricing"),
+        "hours": entry.get("hours"),
+        "eligibility": entry.get("eligibility"),
+        "features": entry.get("features", []),
+        "location_type": entry.get("location_type"),
+        "resource_type": entry.get("resource_type"),
+        "programs": entry.get("programs", []),
+        "dates": entry.get("dates"),
+        "schedule": entry.get("schedule"),
+        "schedule_start_date": entry.get("schedule_start_date"),
+        "schedule_end_date": entry.get("schedule_end_date"),
+        "resolved_schedule": None,
+        "flags": entry.get("flags", []),
+        "last_verified": entry.get("last_verified"),
+        "accessibility": entry.get("accessibility", []),
+        "social_intensity": entry.get("social_intensity"),
+        "good_for": entry.get("good_for", []),
+        "audience": get_entry_audience(entry),
+        "audience_notes": entry.get("audience_notes"),
+        "notes": entry.get("notes"),
+        "practical_tips": entry.get("practical_tips"),
+    }
+    event_data["resolved_schedule"] = resolve_entry_schedule(entry, today=today)
+
+    # Add detected audience to programs
+    if event_data["programs"]:
+        enriched_programs = []
+        for prog in event_data["programs"]:
+            if isinstance(prog, Mapping):
+                prog_copy = dict(prog)
+                prog_copy["audience"] = get_program_audience(prog, entry)
+                prog_copy["resolved_schedule"] = resolve_program_schedule(prog, entry, today=today)
+                enriched_programs.append(prog_copy)
+            else:
+                # Program is just a string, skip enrichment
+                enriched_programs.append(prog)
+        event_data["programs"] = enriched_programs
+    return event_data
+
+
+def json_record_text(record: dict) -> str:
+    """A feed record serialized exactly as json.dump(feed, indent=2) writes it inside "events"."""
+    # Strings never hold a raw newline (json escapes it), so every newline is indentation.
+    return json.dumps(record, indent=2, default=str).replace("\n", "\n    ")
+
+
+def write_json_feed(path: Path, records: list[str], generated: str) -> None:
+    """Write events.json from serialized records; the same bytes as json.dump(generate_json_feed(...), indent=2)."""
+    head = json.dumps({
+        "schedule_schema_version": SCHEDULE_SCHEMA_VERSION,
+        "generated": generated,
+        "count": len(records),
+        "categories": CATEGORY_NAMES,
+        "colors": CATEGORY_COLORS,
+        "events": [],
+    }, indent=2)
+    with open(path, "w", encoding="utf-8", buffering=CalendarWriter.BUFFER_SIZE) as f:
+        if not records:
+            f.write(head)
+            return
+        f.write(head[:-len("[]\n}")])
+        f.write("[\n    ")
+        for i, record in enumerate(records):
+            if i:
+                f.write(",\n    ")
+            f.write(record)
+        f.write("\n  ]\n}")
+
+
+def render_platforms(events: list[CalendarEvent], platforms: Iterable[str]) -> dict[str, str]:
+    """platform -> the events' VEVENT blocks, each followed by CRLF.
+
+    Platforms whose text is identical share one string, so a pickled render
+    (render_cache.py) stores Google's and Apple's events once.
+    """
+    rendered, seen = {}, {}
+    for platform in platforms:
+        text = "".join([render_vevent(event, platform) + "\r\n" for event in events])
+        rendered[platform] = seen.setdefault(text, text)
+    return rendered
+
+
+def render_entry(entry: dict, today: date, platforms: Iterable[str] = PLATFORMS,
+                 with_json: bool = True) -> RenderedEntry:
+    """Everything generate_calendar writes for one entry: VEVENTs for each platform and its feed record."""
+    closed = is_closed(entry)
+    warnings = []
+    events = [] if closed else compile_entry_events(entry, today=today, warnings=warnings)
+    return RenderedEntry(
+        entry_id=entry.get("id", "?"),
+        category=entry.get("category"),
+        closed=closed,
+        last_verified=parse_date(entry.get("last_verified")),
+        event_count=len(events),
+        vevents=render_platforms(events, platforms),
+        json=json_record_text(json_feed_record(entry, today)) if with_json and not closed else None,
+        warnings=tuple(warnings),
+    )
+
+
+@dataclass
+class PublishReport:
+    """What copy_to_docs changed under docs/, as paths relative to it."""
+
+    added: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    def __str__(self) -> str:
+        if not (self.added or self.updated or self.removed):
+            return f"no changes ({self.unchanged} files up to date)"
+        return (f"{len(self.added)} added, {len(self.updated)} updated, {len(self.removed)} removed, "
+                f"{self.unchanged} unchanged")
+
+
+def _file_digest(path: Path) -> bytes:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").digest()
+
+
+def publish_file(src: Path, dst: Path) -> bool:
+    """Copy src to dst unless dst already holds the same bytes; returns whether dst was written.
+
+    The new content goes to a temporary file beside dst and is renamed over
+    it, so readers see the old file or the new one, never a partial write.
+    """
+    if dst.exists() and dst.stat().st_size == src.stat().st_size and _file_digest(dst) == _file_digest(src):
+        return False
+    mode = dst.stat().st_mode & 0o777 if dst.exists() else 0o644
+    fd, tmp_name = tempfile.mkstemp(dir=dst.parent, prefix=f".{dst.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as out, open(src, "rb") as f:
+            shutil.copyfileobj(f, out, CalendarWriter.BUFFER_SIZE)
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, dst)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return True
+
+
+# Stamped into every .gz header instead of the time of compression, so the
+# same feed always compresses to the same bytes.
+GZIP_MTIME = 0
+
+ARTIFACT_MANIFEST = "manifest.json"
+
+
+def gzip_bytes(data: bytes) -> bytes:
+    """Deterministic gzip: no file name, a fixed mtime, and the same OS byte on every platform."""
+    buffer = io.BytesIO()
+    with gzip.GzipFile(filename="", mode="wb", compresslevel=9, fileobj=buffer, mtime=GZIP_MTIME) as f:
+        f.write(data)
+    return buffer.getvalue()
+
+
+def _read_manifest(path: Path) -> dict:
+    """The artifacts of a manifest.json, or {} if it is missing or unreadable."""
+    try:
+        artifacts = json.loads(path.read_text(encoding="utf-8"))["artifacts"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+    return artifacts if isinstance(artifacts, dict) else {}
+
+
+def write_compressed_artifacts(output_dir: Path, platforms: list[str], with_json: bool = True) -> dict:
+    """Write a .gz beside each .ics generated for `platforms` and, with `with_json`, events.json.
+
+    Returns {path relative to the output root: {"sha256", "size", "gzip_size"}}
+    for this run's feeds. A feed whose sha256 matches the last manifest and
+    whose .gz is still there is not compressed again.
+    """
+    previous = _read_manifest(output_dir / ARTIFACT_MANIFEST)
+    paths = [path for platform in platforms if (output_dir / platform).is_dir()
+             for path in sorted((output_dir / platform).glob("*.ics"))]
+    if with_json and (output_dir / "events.json").exists():
+        paths.append(output_dir / "events.json")
+
+    artifacts = {}
+    for path in paths:
+        name = path.relative_to(output_dir).as_posix()
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        compressed_path = path.with_name(path.name + ".gz")
+        known = previous.get(name)
+        if (isinstance(known, dict) and known.get("sha256") == digest and compressed_path.exists()
+                and compressed_path.stat().st_size == known.get("gzip_size")):
+            gzip_size = known["gzip_size"]
+        else:
+            compressed = gzip_bytes(data)
+            compressed_path.write_bytes(compressed)
+            gzip_size = len(compressed)
+        artifacts[name] = {"sha256": digest, "size": len(data), "gzip_size": gzip_size}
+    return artifacts
+
+
+def artifact_manifest(docs_dir: Path, published: dict) -> dict:
+    """The manifest of every calendar and events.json that docs_dir serves.
+
+    Feeds published this run are described by `published` (from
+    write_compressed_artifacts()); the rest, left by earlier runs for other
+    platforms or without --json, are hashed where they sit, and given a
+    .gz if they lack one. The manifest carries no timestamps, so it changes
+    exactly when a feed does.
+    """
+    paths = [path for platform in PLATFORMS if (docs_dir / platform).is_dir()
+             for path in sorted((docs_dir / platform).glob("*.ics"))]
+    if (docs_dir / "events.json").exists():
+        paths.append(docs_dir / "events.json")
+    artifacts = {}
+    for path in paths:
+        name = path.relative_to(docs_dir).as_posix()
+        if name in published:
+            artifacts[name] = published[name]
+            continue
+        data = path.read_bytes()
+        compressed_path = path.with_name(path.name + ".gz")
+        if not compressed_path.exists():
+            compressed_path.write_bytes(gzip_bytes(data))
+        artifacts[name] = {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data),
+                           "gzip_size": compressed_path.stat().st_size}
+    return {"artifacts": artifacts}
+
+
+def copy_to_docs(output_dir: Path, docs_dir: Path, platforms: list[str], with_json: bool = True,
+                 artifacts: dict | None = None) -> PublishReport:
+    """Publish generated calendar files to docs/ for GitHub Pages hosting.
+
+    Only files whose content changed are written, each atomically, and only
+    calendars no longer generated are deleted, so a run with nothing new
+    touches nothing (the static host and CDN validate caches on mtimes).
+    events.json is published only `with_json`, so a leftover one in
+    output/ is not. Given this run's `artifacts` (write_compressed_artifacts()),
+    manifest.json is rebuilt to describe everything docs/ then serves.
+    """
     docs_dir.mkdir(parents=True, exist_ok=True)
+    report = PublishReport()
+
+    def publish(src: Path, dst: Path) -> None:
+        existed = dst.exists()
+        if not publish_file(src, dst):
+            report.unchanged += 1
+        else:
+            (report.updated if existed else report.added).append(dst.relative_to(docs_dir).as_posix())
 
-    # Copy platform directories
+    # Platform directories
     for platform in platforms:
         src_platform = output_dir / platform
         dst_platform = docs_dir / platform
-        if src_platform.exists():
-            # Remove existing and copy fresh
-            if dst_platform.exists():
-                shutil.rmtree(dst_platform)
-            shutil.copytree(src_platform, dst_platform)
-
-    # Copy events.json if it exists
-    json_src = output_dir / "events.json"
-    if json_src.exists():
-        shutil.copy2(json_src, docs_dir / "events.json")
-
-    print(f"Copied calendar files to {docs_dir}")
+        if not src_platform.exists():
+            continue
+        dst_platform.mkdir(exist_ok=True)
+        generated = {path.name for path in src_platform.iterdir() if path.is_file()}
+        for name in sorted(generated):
+            publish(src_platform / name, dst_platform / name)
+        for path in sorted(dst_platform.iterdir()):
+            if path.is_file() and path.name not in generated:
+                path.unlink()
+                report.removed.append(path.relative_to(docs_dir).as_posix())
+
+    # events.json and its .gz, if this run generated them
+    if with_json:
+        for name in ("events.json", "events.json.gz"):
+            if (output_dir / name).exists():
+                publish(output_dir / name, docs_dir / name)
+
+    if artifacts is not None:
+        # Written to output/ first, so it is published like any other file.
+        manifest = artifact_manifest(docs_dir, artifacts)
+        (output_dir / ARTIFACT_MANIFEST).write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n",
+                                                    encoding="utf-8")
+        publish(output_dir / ARTIFACT_MANIFEST, docs_dir / ARTIFACT_MANIFEST)
+
+    print(f"Published to {docs_dir}: {report}")
+    for label, paths in (("added", report.added), ("updated", report.updated), ("removed", report.removed)):
+        for path in paths:
+            print(f"  {label}: {path}")
+    return report
 
 
 def main():
@@ -1221,8 +1890,12 @@ def main():
     parser.add_argument("--json", action="store_true", help="Also generate JSON feed")
     parser.add_argument("--publish", action="store_true",
                         help="Copy generated files to docs/ for GitHub Pages")
+    parser.add_argument("--verify-cache", action="store_true",
+                        help="Render every entry from scratch and fail if any cached render differs")
 
     args = parser.parse_args()
+    if args.verify_cache and not caching_enabled():
+        parser.error("--verify-cache needs the render cache, which PEER_CALENDAR_NO_CACHE turns off")
 
     script_dir = Path(__file__).parent
     sources_path = (script_dir / args.sources).resolve()
@@ -1235,86 +1908,77 @@ def main():
     output_dir.mkdir(parents=True, exist_ok=True)
 
     print(f"Loading sources from {sources_path}...")
-    entries = load_sources(sources_path)
-    print(f"Loaded {len(entries)} entries")
-
-    # Permanently closed resources stay in sources.yaml as a record, but must not
-    # be published to calendars, the map, or the resources directory.
-    closed = [e for e in entries if is_closed(e)]
-    if closed:
-        entries = [e for e in entries if not is_closed(e)]
-        print(f"Excluding {len(closed)} closed entries: {', '.join(e.get('id', '?') for e in closed)}")
-
-    # Filter by category if specified
-    if args.category:
-        entries = [e for e in entries if e.get("category") == args.category]
-        print(f"Filtered to {len(entries)} entries in category '{args.category}'")
 
     # Determine which platforms to generate
-    platforms = ["google", "apple", "outlook"] if args.platform == "all" else [args.platform]
-
-    # Group entries by category
-    categories: dict[str, list[dict]] = {}
-    for entry in entries:
-        cat = entry.get("category", "general")
-        if cat not in categories:
-            categories[cat] = []
-        categories[cat].append(entry)
-
-    # Generate calendars for each platform
-    for platform in platforms:
-        platform_dir = output_dir / platform
-        platform_dir.mkdir(parents=True, exist_ok=True)
-
-        all_events = []
-        total_events = 0
-
-        for category, cat_entries in categories.items():
-            cat_events = []
-            for entry in cat_entries:
-                events = entry_to_events(entry, platform=platform)
-                cat_events.extend(events)
-                all_events.extend(events)
-
-            if cat_events:
-                category_name = CATEGORY_NAMES.get(category, category.replace("_", " ").title())
-                calendar = create_vcalendar(
-                    cat_events,
-                    f"Portland Resources - {category_name}",
-                    platform=platform,
-                    category=category
-                )
-                output_path = platform_dir / f"{category}.ics"
-                with open(output_path, "w", encoding="utf-8", newline="") as f:
-                    f.write(calendar)
-                total_events += len(cat_events)
-
-        # Generate combined calendar with all categories
-        if all_events:
-            combined = create_vcalendar(
-                all_events,
-                "Portland Metro Resources - All Events",
-                platform=platform,
-                category=None  # No specific category color for combined
-            )
-            combined_path = platform_dir / "all-events.ics"
-            with open(combined_path, "w", encoding="utf-8", newline="") as f:
-                f.write(combined)
-
-        print(f"Generated {platform}/ ({len(all_events)} events across {len(categories)} categories)")
-
-    # Generate JSON feed (platform-independent)
-    if args.json:
-        json_feed = generate_json_feed(entries)
-        json_path = output_dir / "events.json"
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(json_feed, f, indent=2, default=str)
-        print(f"Generated events.json")
+    platforms = list(PLATFORMS) if args.platform == "all" else [args.platform]
+    today = date.today()
+
+    # Parse results are shared with the other scripts through the derived
+    # cache, so unchanged schedules, dates and audiences are not parsed again.
+    with derived_cache.session(sources_path):
+        render_report = None
+        if caching_enabled():
+            # Entries whose bytes are unchanged since the last run (same
+            # generator, same day) come back from the render cache as text.
+            cache = RenderCache.for_sources(sources_path, today)
+            rendered, render_report = cache.update(sources_path.read_bytes(), lambda entry: render_entry(entry, today),
+                                                   verify=args.verify_cache)
+            cache.save()
+        else:
+            # One pass over the file: each entry is rendered for every platform
+            # as it is read and written straight to the calendars.
+            rendered = (render_entry(entry, today, platforms, with_json=args.json)
+                        for entry in iter_sources(sources_path))
+
+        loaded = published = 0
+        closed = []
+        records, verified_dates = [], []
+        with CalendarWriter(output_dir, platforms, today) as calendars:
+            for entry in rendered:
+                loaded += 1
+                # Kept with each render, so a cached entry warns like a fresh one.
+                print_warnings(entry.warnings)
+                # Permanently closed resources stay in sources.yaml as a record, but must not
+                # be published to calendars, the map, or the resources directory.
+                if entry.closed:
+                    closed.append(entry.entry_id)
+                    continue
+                # Filter by category if specified
+                if args.category and entry.category != args.category:
+                    continue
+                published += 1
+                calendars.add_rendered(entry.category, entry.vevents, entry.event_count)
+                if args.json:
+                    records.append(entry.json)
+                    verified_dates.append(entry.last_verified)
+        print(f"Loaded {loaded} entries")
+        if render_report:
+            print(f"Render cache: {render_report}")
+            if render_report.mismatched:
+                print(f"Error: cached renders differ for {', '.join(render_report.mismatched)}")
+        if closed:
+            print(f"Excluding {len(closed)} closed entries: {', '.join(closed)}")
+        categories = calendars.categories
+        if args.category:
+            print(f"Filtered to {published} entries in category '{args.category}'")
+
+        for platform in platforms:
+            print(f"Generated {platform}/ ({calendars.event_counts[platform]} events "
+                  f"across {len(categories)} categories)")
+
+        # Generate JSON feed (platform-independent)
+        if args.json:
+            write_json_feed(output_dir / "events.json", records, json_feed_generated(verified_dates))
+            print(f"Generated events.json")
 
     # Copy to docs/ for GitHub Pages if --publish flag is set
     if args.publish:
+        artifacts = write_compressed_artifacts(output_dir, platforms, with_json=args.json)
+        size = sum(artifact["size"] for artifact in artifacts.values())
+        compressed = sum(artifact["gzip_size"] for artifact in artifacts.values())
+        print(f"Compressed {len(artifacts)} feeds: {size / 2**20:.1f} MB -> {compressed / 2**20:.1f} MB gzip")
         docs_dir = script_dir.parent / "docs"
-        copy_to_docs(output_dir, docs_dir, platforms)
+        copy_to_docs(output_dir, docs_dir, platforms, with_json=args.json, artifacts=artifacts)
 
     print(f"\nCalendar files saved to {output_dir}")
     print("\nOutput structure:")
@@ -1329,6 +1993,9 @@ def main():
     print("  apple/   - X-APPLE-CALENDAR-COLOR for category colors")
     print("  outlook/ - X-ALT-DESC for HTML descriptions, busy status")
 
+    if render_report and render_report.mismatched:
+        sys.exit(1)
+
 
 if __name__ == "__main__":
     main()
@@ -13,11 +13,11 @@ Usage:
 
 import argparse
 import sys
-from collections import defaultdict
 from datetime import date
 from pathlib import Path
 
-from utils import load_sources, get_default_sources_path, format_date
+from source_store import SourceStore, load_store
+from utils import get_default_sources_path, format_date
 
 
 # Category display config: order, titles, and intro paragraphs
@@ -372,18 +372,14 @@ def generate_category_section(category, entries) -> str:
 
 
 def generate_guide(entries, categories=None) -> str:
-    """Generate the full guide markdown from entries."""
-    # Group by category
-    by_category = defaultdict(list)
-    for entry in entries:
-        cat = entry.get("category", "unknown")
-        by_category[cat].append(entry)
+    """Generate the full guide markdown from entries (a list or a SourceStore)."""
+    store = entries if isinstance(entries, SourceStore) else SourceStore(entries)
 
     # Determine which categories to include
     if categories:
         cats_to_generate = [c for c in CATEGORY_ORDER if c in categories]
     else:
-        cats_to_generate = [c for c in CATEGORY_ORDER if c in by_category]
+        cats_to_generate = [c for c in CATEGORY_ORDER if store.count(category=c)]
 
     lines = []
 
@@ -396,9 +392,7 @@ def generate_guide(entries, categories=None) -> str:
     )
     lines.append("")
     today = date.today().strftime("%B %d, %Y")
-    total_active = sum(
-        1 for e in entries if e.get("status") != "CLOSED"
-    )
+    total_active = len(store) - store.count(status="CLOSED")
     lines.append(
         f"*Generated from verified data on {today}. "
         f"{total_active} active resources across {len(cats_to_generate)} categories.*"
@@ -411,7 +405,7 @@ def generate_guide(entries, categories=None) -> str:
     for cat in cats_to_generate:
         config = CATEGORY_CONFIG.get(cat, {})
         title = config.get("title", cat.replace("_", " ").title())
-        count = len([e for e in by_category[cat] if e.get("status") != "CLOSED"])
+        count = store.count(category=cat) - store.count(category=cat, status="CLOSED")
         anchor = title.lower().replace(" ", "-").replace("&", "").replace(":", "").replace(",", "")
         anchor = anchor.replace("--", "-").strip("-")
         lines.append(f"- [{title}](#{anchor}) ({count} resources)")
@@ -440,8 +434,9 @@ def generate_guide(entries, categories=None) -> str:
 
     # Category sections
     for cat in cats_to_generate:
-        if by_category[cat]:
-            lines.append(generate_category_section(cat, by_category[cat]))
+        cat_entries = store.select(category=cat)
+        if cat_entries:
+            lines.append(generate_category_section(cat, cat_entries))
 
     # Tips section
     lines.append("## Tips for Those with Social Anxiety")
@@ -498,19 +493,19 @@ def main():
     )
     args = parser.parse_args()
 
-    entries = load_sources(args.sources)
-    print(f"Loaded {len(entries)} entries from {args.sources}", file=sys.stderr)
+    store = load_store(args.sources)
+    print(f"Loaded {len(store)} entries from {args.sources}", file=sys.stderr)
 
     categories = None
     if args.category:
         categories = {args.category}
-        matching = [e for e in entries if e.get("category") == args.category]
+        matching = store.select(category=args.category)
         if not matching:
             print(f"Error: No entries found for category '{args.category}'", file=sys.stderr)
             sys.exit(1)
         print(f"Filtering to category '{args.category}' ({len(matching)} entries)", file=sys.stderr)
 
-    guide_content = generate_guide(entries, categories)
+    guide_content = generate_guide(store, categories)
 
     args.output.mkdir(parents=True, exist_ok=True)
     if args.category:
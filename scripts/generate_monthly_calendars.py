@@ -16,6 +16,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from collections import defaultdict
 
+from generate_calendar import fold_ical_line
+
 
 def parse_ical_date(date_str):
     """Parse iCal date string to datetime."""
@@ -253,16 +255,7 @@ def create_vevent_from_occurrence(original_event, occurrence_dt, uid_suffix, all
     for prop, value in original_event.items():
         if prop not in skip_props and prop not in ('BEGIN', 'END'):
             # Re-fold long lines
-            line = f"{prop}:{value}"
-            if len(line) > 75:
-                folded = []
-                while len(line) > 75:
-                    folded.append(line[:75])
-                    line = ' ' + line[75:]
-                folded.append(line)
-                lines.append('\r\n'.join(folded))
-            else:
-                lines.append(line)
+            lines.append(fold_ical_line(f"{prop}:{value}"))
 
     lines.append('END:VEVENT')
     return '\r\n'.join(lines)
@@ -18,9 +18,8 @@ import urllib.request
 import urllib.parse
 from pathlib import Path
 
-import yaml
-
-from utils import load_sources, get_default_sources_path
+from sources_patch import Patch, apply_patches
+from utils import get_default_sources_path, load_sources
 
 NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
 USER_AGENT = "PeerSupportCalendar/1.0 (avoigt@folktime.org)"
@@ -207,44 +206,16 @@ def main():
     print(f"\nGeocoded: {geocoded}, Failed: {failed}, Total cached: {len(cache)}", file=sys.stderr)
 
     if geocoded > 0:
-        # Rebuild the YAML file preserving multi-document structure
-        with open(args.sources) as f:
-            raw = f.read()
-
-        # Load as documents to preserve structure
-        documents = list(yaml.safe_load_all(raw))
-
-        # Build lookup of updated entries by id
-        updated = {e["id"]: e for e in entries if e.get("latitude")}
-
-        # Update entries in each document
-        for doc_idx, doc in enumerate(documents):
-            if not doc or not isinstance(doc, list):
-                continue
-            for entry_idx, entry in enumerate(doc):
-                if not isinstance(entry, dict):
-                    continue
-                eid = entry.get("id")
-                if eid and eid in updated:
-                    entry["latitude"] = updated[eid]["latitude"]
-                    entry["longitude"] = updated[eid]["longitude"]
-
-        # Write back
-        # Create backup
-        backup = args.sources.with_suffix(".yaml.bak")
-        import shutil
-        shutil.copy2(args.sources, backup)
-        print(f"Backup saved to {backup}", file=sys.stderr)
-
-        with open(args.sources, "w") as f:
-            for i, doc in enumerate(documents):
-                if i > 0 or raw.lstrip().startswith("---"):
-                    f.write("---\n")
-                if doc is not None:
-                    yaml.dump(doc, f, default_flow_style=False, allow_unicode=True,
-                             sort_keys=False, width=120)
-
-        print(f"Updated {args.sources}", file=sys.stderr)
+        # Patch the coordinates in place; comments and layout stay as written.
+        patches = [
+            Patch(entry["id"], field, entry[field], after=after)
+            for entry in to_geocode if entry.get("latitude") is not None
+            for field, after in (("latitude", ()), ("longitude", ("latitude",)))
+        ]
+        report = apply_patches(args.sources, patches)
+        if report.backup:
+            print(f"Backup saved to {report.backup}", file=sys.stderr)
+            print(f"Updated {args.sources}", file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -5,11 +5,11 @@ from __future__ import annotations
 
 import argparse
 import json
-import re
 from datetime import date
 from pathlib import Path
 
 from audit_policy import cadence_deadline
+from sources_patch import Patch, apply_patches, patch_text
 from utils import parse_date, parse_sources, validate_all_entries
 
 
@@ -48,17 +48,15 @@ PRESERVE_DUE_IDS = {
 }
 
 
-def _replace_entry_fields(content: str, entry_id: str, next_audit: date) -> str:
-    pattern = re.compile(rf"(?ms)^- id: {re.escape(entry_id)}\n.*?(?=^---$|^- id: |\Z)")
-    match = pattern.search(content)
-    if not match:
-        raise ValueError(f"entry not found: {entry_id}")
-    block = match.group(0)
-    if not re.search(r"(?m)^  audit_frequency: quarterly$", block):
-        raise ValueError(f"{entry_id}: expected quarterly cadence")
-    block = re.sub(r"(?m)^  audit_frequency: quarterly$", "  audit_frequency: annually", block, count=1)
-    block = re.sub(r"(?m)^  next_audit: .*?$", f"  next_audit: {next_audit.isoformat()}", block, count=1)
-    return content[:match.start()] + block + content[match.end():]
+def _migration_patches(changes: list[dict]) -> list[Patch]:
+    return [
+        patch
+        for change in changes
+        for patch in (
+            Patch(change["id"], "audit_frequency", change["to"]),
+            Patch(change["id"], "next_audit", date.fromisoformat(change["new_next_audit"])),
+        )
+    ]
 
 
 def migrate(
@@ -74,7 +72,6 @@ def migrate(
 
     last_verified_before = {key: parse_date(value.get("last_verified")) for key, value in entries.items()}
     changes = []
-    output = content
     for entry_id in sorted(migration_ids):
         entry = entries[entry_id]
         if entry.get("audit_frequency") == "annually":
@@ -87,7 +84,6 @@ def migrate(
             raise ValueError(f"{entry_id}: invalid audit dates")
         new_deadline = cadence_deadline("annually", verified)
         new_due = current_due if entry_id in preserve_due_ids else new_deadline
-        output = _replace_entry_fields(output, entry_id, new_due)
         changes.append({
             "id": entry_id,
             "from": "quarterly",
@@ -96,6 +92,7 @@ def migrate(
             "new_next_audit": new_due.isoformat(),
         })
 
+    output = patch_text(content, _migration_patches(changes))
     migrated = parse_sources(output)
     warnings = validate_all_entries(migrated, quiet=True)
     if warnings:
@@ -117,11 +114,12 @@ def main(argv: list[str] | None = None) -> int:
     if not path.is_absolute():
         path = (script_dir / path).resolve()
     original = path.read_text(encoding="utf-8")
-    updated, changes = migrate(original)
+    _, changes = migrate(original)  # validates before anything is written
     if args.report:
         Path(args.report).write_text(json.dumps({"changes": changes}, indent=2) + "\n", encoding="utf-8")
     if args.apply:
-        path.write_text(updated, encoding="utf-8")
+        # Same patches, applied to the file: one backup, one atomic rename.
+        apply_patches(path, _migration_patches(changes))
         action = "Updated"
     else:
         action = "Would update"
@@ -0,0 +1,187 @@
+"""Compact in-memory representation of sources.yaml entries.
+
+PyYAML hands back one dict per entry and per program, each with its own hash
+table and its own copy of every repeated string ("events", "drop_in",
+"Every Tuesday 6-7:30pm"). Entry and Program keep the dict interface every
+script already uses, but store their values in a plain list against a shared,
+interned key layout (a Shape), and intern the strings that repeat across
+entries.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Iterable, Iterator
+
+
+# Fields whose string values (or list items) come from a small vocabulary or
+# repeat verbatim across entries, so one shared copy is worth the lookup.
+INTERNED_FIELDS = frozenset({
+    "category", "resource_type", "location_type", "status", "audit_frequency",
+    "social_intensity", "schedule", "accessibility", "good_for", "audience",
+    "flags", "day", "days", "frequency",
+})
+
+
+class Shape:
+    """An ordered, shared key layout: which value slot holds which key."""
+
+    __slots__ = ("keys", "index", "_added")
+
+    _shapes: dict[tuple[str, ...], Shape] = {}
+
+    def __init__(self, keys: tuple[str, ...]):
+        self.keys = keys
+        self.index = {key: slot for slot, key in enumerate(keys)}
+        self._added: dict[str, Shape] = {}
+
+    @classmethod
+    def of(cls, keys: tuple[str, ...]) -> Shape:
+        shape = cls._shapes.get(keys)
+        if shape is None:
+            keys = tuple(sys.intern(key) if type(key) is str else key for key in keys)
+            shape = cls._shapes[keys] = cls(keys)
+        return shape
+
+    def adding(self, key: str) -> Shape:
+        """The shape with `key` appended, as dict insertion would order it."""
+        shape = self._added.get(key)
+        if shape is None:
+            shape = self._added[key] = Shape.of(self.keys + (key,))
+        return shape
+
+
+class Record(MutableMapping):
+    """A mapping stored as a shared Shape plus a list of values.
+
+    Reads, writes, iteration order, equality with dicts and pickling all
+    behave like the dict it replaces.
+    """
+
+    __slots__ = ("_shape", "_values")
+
+    def __init__(self, data: Mapping | None = None):
+        data = data or {}
+        self._shape = Shape.of(tuple(data))
+        self._values = list(data.values())
+
+    @classmethod
+    def _restore(cls, keys: tuple[str, ...], values: list) -> Record:
+        record = cls.__new__(cls)
+        record._shape = Shape.of(keys)
+        record._values = values
+        return record
+
+    def __reduce__(self):
+        return (self.__class__._restore, (self._shape.keys, self._values))
+
+    def __getitem__(self, key: str) -> Any:
+        slot = self._shape.index.get(key)
+        if slot is None:
+            raise KeyError(key)
+        return self._values[slot]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        slot = self._shape.index.get(key)
+        return default if slot is None else self._values[slot]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._shape.index
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        slot = self._shape.index.get(key)
+        if slot is None:
+            self._shape = self._shape.adding(key)
+            self._values.append(value)
+        else:
+            self._values[slot] = value
+
+    def __delitem__(self, key: str) -> None:
+        slot = self._shape.index.get(key)
+        if slot is None:
+            raise KeyError(key)
+        keys = self._shape.keys
+        self._shape = Shape.of(keys[:slot] + keys[slot + 1:])
+        del self._values[slot]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._shape.keys)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def copy(self) -> Record:
+        return self._restore(self._shape.keys, list(self._values))
+
+
+class Program(Record):
+    """One entry under an entry's `programs:` list."""
+
+    __slots__ = ()
+
+    @property
+    def name(self) -> str | None:
+        return self.get("name")
+
+    @property
+    def schedule(self) -> str | None:
+        return self.get("schedule")
+
+
+class Entry(Record):
+    """One resource from sources.yaml."""
+
+    __slots__ = ()
+
+    @property
+    def id(self) -> str | None:
+        return self.get("id")
+
+    @property
+    def name(self) -> str | None:
+        return self.get("name")
+
+    @property
+    def category(self) -> str | None:
+        return self.get("category")
+
+    @property
+    def programs(self) -> list:
+        return self.get("programs") or []
+
+
+def _record(cls: type[Record], data: dict) -> Record:
+    record = cls.__new__(cls)
+    record._shape = Shape.of(tuple(data))
+    record._values = [_compact(key, value) for key, value in data.items()]
+    return record
+
+
+def _compact(field: str, value: Any) -> Any:
+    # Only strings are shared: PyYAML would write any other object that
+    # appears twice as an anchor/alias pair when the entries are dumped again.
+    if type(value) is str:
+        return sys.intern(value) if field in INTERNED_FIELDS else value
+    if type(value) is list:
+        if field == "programs":
+            return [_record(Program, item) if type(item) is dict else _compact(field, item)
+                    for item in value]
+        return [_compact(field, item) for item in value]
+    if type(value) is dict:
+        return {sys.intern(key) if type(key) is str else key: _compact(key, item)
+                for key, item in value.items()}
+    return value
+
+
+def compact_entry(entry: dict) -> Entry:
+    """The Entry record equal to one parsed entry dict."""
+    return _record(Entry, entry)
+
+
+def compact_entries(entries: Iterable[dict]) -> list[Entry]:
+    """Entry/Program records equal to `entries`, sharing repeated keys and strings."""
+    return [_record(Entry, entry) for entry in entries]
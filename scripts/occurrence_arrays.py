@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""Every occurrence of every event over a horizon, as flat NumPy arrays.
+
+Planning and analytics questions ("how many groups meet each day next year?",
+"which hours of the week are busiest?") need the whole catalog expanded, not
+one event at a time. expand_occurrences() takes the resolved schedules the
+JSON feed publishes and returns three parallel arrays, one row per
+occurrence:
+
+    entry   int32           index into the entries list
+    start   datetime64[m]   local wall-clock start
+    end     datetime64[m]   local wall-clock end (all-day: midnight after the last day)
+
+Recurring schedules are expanded with vectorized weekday and month-week
+arithmetic, one array operation per (weekday, week) pair rather than a
+Python loop per occurrence. scalar_occurrences() is the plain-Python
+reference built on iter_occurrences(); the two return identical rows in
+the same order: by schedule, then start, then end.
+
+NumPy is optional: without it scalar_occurrences() still works and the CLI
+says what to install.
+
+Usage:
+    python occurrence_arrays.py                      # occurrences per category, next 24 months
+    python occurrence_arrays.py --by day --months 3  # per day
+    python occurrence_arrays.py --by hour            # per hour of the week, Monday 00:00 first
+"""
+
+import argparse
+import sys
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import NamedTuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+from generate_calendar import (
+    WEEKDAY_INDEX, is_closed, iter_occurrences, resolve_entry_schedule, resolve_program_schedule,
+)
+from utils import get_default_sources_path, load_sources, parse_date
+
+# 1970-01-01, day zero of datetime64, was a Thursday.
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_EPOCH_WEEKDAY = 3
+
+DEFAULT_HORIZON_MONTHS = 24
+
+
+class OccurrenceArrays(NamedTuple):
+    """Parallel arrays, one row per occurrence."""
+
+    entry: "np.ndarray"
+    start: "np.ndarray"
+    end: "np.ndarray"
+
+
+def iter_catalog_schedules(entries: list[dict], today: date | None = None) -> Iterator[tuple[int, dict | None, dict]]:
+    """(entry index, program or None, resolved schedule) for every open entry and program that has one.
+
+    These are the same resolved_schedule values generate_json_feed publishes.
+    """
+    for index, entry in enumerate(entries):
+        if is_closed(entry):
+            continue
+        resolved = resolve_entry_schedule(entry, today=today)
+        if resolved:
+            yield index, None, resolved
+        for program in entry.get("programs") or []:
+            if hasattr(program, "get"):
+                resolved = resolve_program_schedule(program, entry, today=today)
+                if resolved:
+                    yield index, program, resolved
+
+
+def catalog_schedules(entries: list[dict], today: date | None = None) -> list[tuple[int, dict]]:
+    """(entry index, resolved schedule) pairs from iter_catalog_schedules()."""
+    return [(index, resolved) for index, _, resolved in iter_catalog_schedules(entries, today)]
+
+
+def _minutes(clock: str) -> int:
+    hour, minute = clock.split(":")
+    return int(hour) * 60 + int(minute)
+
+
+def _fixed_rows(occurrence: dict) -> tuple[date, datetime, datetime]:
+    """(first day, start, end) of one fixed occurrence."""
+    first = date.fromisoformat(occurrence["start_date"])
+    last = date.fromisoformat(occurrence["end_date"])
+    if occurrence["all_day"]:
+        return first, datetime(first.year, first.month, first.day), datetime(last.year, last.month, last.day) + timedelta(days=1)
+    start = datetime(first.year, first.month, first.day) + timedelta(minutes=_minutes(occurrence["start_time"]))
+    end = (datetime(last.year, last.month, last.day)
+           + timedelta(days=occurrence["end_day_offset"], minutes=_minutes(occurrence["end_time"])))
+    return first, start, end
+
+
+def schedule_occurrences(resolved: dict, start: date, end: date) -> list[tuple[datetime, datetime]]:
+    """Sorted (start, end) of one resolved schedule's occurrences in the window.
+
+    Fixed occurrences count when their first day falls in the window,
+    recurring ones when iter_occurrences() yields their day.
+    """
+    found = []
+    if resolved["type"] == "fixed":
+        for occurrence in resolved["occurrences"]:
+            first, begin, finish = _fixed_rows(occurrence)
+            if start <= first <= end:
+                found.append((begin, finish))
+    else:
+        start_minutes = _minutes(resolved["start_time"])
+        end_minutes = _minutes(resolved["end_time"])
+        for day in iter_occurrences(resolved, start, end):
+            midnight = datetime(day.year, day.month, day.day)
+            found.append((midnight + timedelta(minutes=start_minutes),
+                          midnight + timedelta(days=resolved["end_day_offset"], minutes=end_minutes)))
+    return sorted(found)
+
+
+def scalar_occurrences(schedules: list[tuple[int, dict]], start: date, end: date) -> list[tuple[int, datetime, datetime]]:
+    """(entry index, start, end) rows, one occurrence at a time, from schedule_occurrences()."""
+    return [(entry_index, begin, finish)
+            for entry_index, resolved in schedules
+            for begin, finish in schedule_occurrences(resolved, start, end)]
+
+
+def _day_number(day: date) -> int:
+    return day.toordinal() - _EPOCH_ORDINAL
+
+
+def _expand(counts):
+    """(row, step) pairs: row i repeated counts[i] times, with steps 0..counts[i]-1."""
+    rows = np.repeat(np.arange(len(counts)), counts)
+    steps = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+    return rows, steps
+
+
+def _recurring_days(params: dict) -> tuple["np.ndarray", "np.ndarray"]:
+    """(schedule, day number) of every recurring occurrence, sorted and unique."""
+    sched, lo, hi, anchor = params["sched"], params["lo"], params["hi"], params["anchor"]
+    interval, weekday_mask, week_mask, frequency = (
+        params["interval"], params["weekdays"], params["weeks"], params["frequency"])
+    found_sched, found_day = [], []
+
+    # Daily: every interval-th day from the anchor, optionally limited to some weekdays.
+    daily = np.flatnonzero(frequency == 0)
+    if len(daily):
+        first = lo[daily] + (-(lo[daily] - anchor[daily])) % interval[daily]
+        counts = np.where(hi[daily] >= first, (hi[daily] - first) // interval[daily] + 1, 0)
+        rows, steps = _expand(counts)
+        days = first[rows] + steps * interval[daily][rows]
+        mask = weekday_mask[daily][rows]
+        keep = (mask == 0) | ((mask >> ((days + _EPOCH_WEEKDAY) % 7)) & 1 == 1)
+        found_sched.append(sched[daily[rows][keep]])
+        found_day.append(days[keep])
+
+    # Weekly: Monday weeks in step with the anchor's week, plus each weekday offset.
+    weekly = np.flatnonzero(frequency == 1)
+    if len(weekly):
+        lo_w, hi_w, step = lo[weekly], hi[weekly], 7 * interval[weekly]
+        anchor_monday = anchor[weekly] - (anchor[weekly] + _EPOCH_WEEKDAY) % 7
+        monday = lo_w - (lo_w + _EPOCH_WEEKDAY) % 7
+        monday += 7 * ((-((monday - anchor_monday) // 7)) % interval[weekly])
+        counts = np.where(hi_w >= monday, (hi_w - monday) // step + 1, 0)
+        for weekday in range(7):
+            pairs = np.flatnonzero((weekday_mask[weekly] >> weekday) & 1)
+            rows, steps = _expand(counts[pairs])
+            which = pairs[rows]
+            days = monday[which] + steps * step[which] + weekday
+            keep = (days >= lo_w[which]) & (days <= hi_w[which])
+            found_sched.append(sched[weekly[which][keep]])
+            found_day.append(days[keep])
+
+    # Monthly: months in step with the anchor's month, plus each (weekday, week) day.
+    monthly = np.flatnonzero(frequency == 2)
+    if len(monthly):
+        lo_m, hi_m, step = lo[monthly], hi[monthly], interval[monthly]
+        lo_month = lo_m.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        hi_month = hi_m.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        anchor_month = anchor[monthly].astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        first_month = lo_month + (-(lo_month - anchor_month)) % step
+        counts = np.where(hi_month >= first_month, (hi_month - first_month) // step + 1, 0)
+        rows, steps = _expand(counts)
+        months = first_month[rows] + steps * step[rows]
+        month_start = months.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+        days_in_month = (months + 1).astype("datetime64[M]").astype("datetime64[D]").astype(np.int64) - month_start
+        first_weekday = (month_start + _EPOCH_WEEKDAY) % 7
+        last_weekday = (first_weekday + days_in_month - 1) % 7
+        weekdays, weeks = weekday_mask[monthly][rows], week_mask[monthly][rows]
+        for weekday in range(7):
+            has_weekday = (weekdays >> weekday) & 1 == 1
+            first_match = 1 + (weekday - first_weekday) % 7
+            for week in (1, 2, 3, 4, 5, -1):
+                if week == -1:
+                    day_of_month = days_in_month - (last_weekday - weekday) % 7
+                    selected = has_weekday & (weeks & 1 == 1)
+                else:
+                    day_of_month = first_match + 7 * (week - 1)
+                    selected = has_weekday & ((weeks >> week) & 1 == 1) & (day_of_month <= days_in_month)
+                days = month_start + day_of_month - 1
+                which = rows[selected]
+                days = days[selected]
+                keep = (days >= lo_m[which]) & (days <= hi_m[which])
+                found_sched.append(sched[monthly[which][keep]])
+                found_day.append(days[keep])
+
+    if not found_sched:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    key = np.sort(np.concatenate(found_sched) << 32 | (np.concatenate(found_day) + (1 << 31)))
+    # A 5th and a last week can name the same day; keep it once.
+    key = key[np.concatenate(([True], key[1:] != key[:-1]))]
+    return key >> 32, (key & 0xFFFFFFFF) - (1 << 31)
+
+
+def expand_occurrences(schedules: list[tuple[int, dict]], start: date, end: date) -> OccurrenceArrays:
+    """Every occurrence of every schedule between start and end, inclusive, as arrays.
+
+    Row for row the same as scalar_occurrences(). Needs NumPy.
+    """
+    if not HAS_NUMPY:
+        raise RuntimeError("expand_occurrences needs NumPy (pip install numpy)")
+    window_lo, window_hi = _day_number(start), _day_number(end)
+    frequencies = {"daily": 0, "weekly": 1, "monthly": 2}
+    recurring = {name: [] for name in ("sched", "lo", "hi", "anchor", "interval", "weekdays", "weeks",
+                                       "frequency", "start", "end", "offset")}
+    fixed = []
+    for position, (_, resolved) in enumerate(schedules):
+        if resolved["type"] == "fixed":
+            for occurrence in resolved["occurrences"]:
+                first, begin, finish = _fixed_rows(occurrence)
+                if start <= first <= end:
+                    fixed.append((position, begin, finish))
+            continue
+        if resolved.get("frequency") not in frequencies:
+            continue
+        anchor = _day_number(date.fromisoformat(resolved["anchor_date"]))
+        until = resolved.get("until_date")
+        weeks = 0
+        for week in resolved.get("month_weeks") or []:
+            week = int(week)
+            if week == -1 or 1 <= week <= 5:
+                weeks |= 1 << (0 if week == -1 else week)
+        for name, value in (
+            ("sched", position), ("anchor", anchor), ("lo", max(window_lo, anchor)),
+            ("hi", min(window_hi, _day_number(date.fromisoformat(until))) if until else window_hi),
+            ("interval", max(1, int(resolved.get("interval") or 1))),
+            ("weekdays", sum(1 << WEEKDAY_INDEX[day] for day in set(resolved.get("weekdays") or [])
+                             if day in WEEKDAY_INDEX)),
+            ("weeks", weeks), ("frequency", frequencies[resolved["frequency"]]),
+            ("start", _minutes(resolved["start_time"])), ("end", _minutes(resolved["end_time"])),
+            ("offset", resolved.get("end_day_offset", 0)),
+        ):
+            recurring[name].append(value)
+    params = {name: np.array(values, dtype=np.int64) for name, values in recurring.items()}
+
+    sched, days = _recurring_days(params)
+    which = np.searchsorted(params["sched"], sched)
+    starts = days * 1440 + params["start"][which]
+    ends = (days + params["offset"][which]) * 1440 + params["end"][which]
+
+    fixed.sort()
+    sched = np.concatenate([sched, np.array([row[0] for row in fixed], dtype=np.int64)])
+    starts = np.concatenate([starts, np.array([row[1] for row in fixed], dtype="datetime64[m]").astype(np.int64)])
+    ends = np.concatenate([ends, np.array([row[2] for row in fixed], dtype="datetime64[m]").astype(np.int64)])
+    # Recurring rows are already in (schedule, start) order and fixed rows were
+    # sorted above, ties broken by end; a stable sort on (schedule, start)
+    # interleaves the two without reordering either.
+    order = np.argsort(sched << 32 | (starts + (1 << 31)), kind="stable")
+    entry_index = np.array([index for index, _ in schedules], dtype=np.int32)
+    return OccurrenceArrays(
+        entry=entry_index[sched[order]] if len(order) else np.empty(0, np.int32),
+        start=starts[order].astype("datetime64[m]"),
+        end=ends[order].astype("datetime64[m]"),
+    )
+
+
+def counts_per_day(occurrences: OccurrenceArrays) -> tuple["np.ndarray", "np.ndarray"]:
+    """(days, counts) of occurrences by start day."""
+    return np.unique(occurrences.start.astype("datetime64[D]"), return_counts=True)
+
+
+def counts_per_category(occurrences: OccurrenceArrays, entries: list[dict]) -> dict[str, int]:
+    """Occurrences per entry category, largest first."""
+    names = sorted({str(entry.get("category")) for entry in entries})
+    code = {name: index for index, name in enumerate(names)}
+    codes = np.array([code[str(entry.get("category"))] for entry in entries], dtype=np.int32)
+    counts = np.bincount(codes[occurrences.entry], minlength=len(names)) if len(entries) else []
+    return dict(sorted(((name, int(count)) for name, count in zip(names, counts) if count),
+                       key=lambda item: -item[1]))
+
+
+def counts_per_hour_of_week(occurrences: OccurrenceArrays) -> "np.ndarray":
+    """168 counts of occurrences by start hour, Monday 00:00-00:59 first."""
+    hours = occurrences.start.astype("datetime64[h]").astype(np.int64)
+    return np.bincount((hours + 24 * _EPOCH_WEEKDAY) % 168, minlength=168)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sources", type=Path, default=get_default_sources_path(), help="Path to sources.yaml")
+    parser.add_argument("--as-of", help="Resolve schedules and start the horizon at YYYY-MM-DD instead of today")
+    parser.add_argument("--months", type=int, default=DEFAULT_HORIZON_MONTHS,
+                        help=f"Horizon length in months (default: {DEFAULT_HORIZON_MONTHS})")
+    parser.add_argument("--by", choices=["category", "day", "hour"], default="category",
+                        help="How to count occurrences (default: category)")
+    args = parser.parse_args(argv)
+
+    today = date.today()
+    if args.as_of:
+        today = parse_date(args.as_of)
+        if not today:
+            parser.error("--as-of must use YYYY-MM-DD")
+    if not HAS_NUMPY:
+        print("occurrence_arrays.py needs NumPy: pip install numpy", file=sys.stderr)
+        return 1
+
+    entries = load_sources(args.sources)
+    month = today.year * 12 + today.month - 1 + args.months
+    end = date(month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    occurrences = expand_occurrences(catalog_schedules(entries, today), today, end)
+    print(f"{len(occurrences.entry):,} occurrences of {len(np.unique(occurrences.entry)):,} entries, "
+          f"{today} to {end}")
+    if args.by == "category":
+        for category, count in counts_per_category(occurrences, entries).items():
+            print(f"{count:>9,}  {category}")
+    elif args.by == "day":
+        for day, count in zip(*counts_per_day(occurrences)):
+            print(f"{day}  {count:>6,}")
+    else:
+        counts = counts_per_hour_of_week(occurrences)
+        for weekday, name in enumerate(WEEKDAY_INDEX):
+            print(f"{name}  " + " ".join(f"{count:>4}" for count in counts[weekday * 24:(weekday + 1) * 24]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""Interval index over every occurrence: what is on between two times.
+
+Questions like "what is happening this evening?", "which peer_support groups
+meet Tuesday after 5pm?" or "what is on during the festival weekend?" used to
+mean regenerating the feed and scanning it. OccurrenceIndex expands the
+resolved schedules the JSON feed publishes over a horizon (12 months from
+the as-of date by default) and keeps the occurrences in a centered interval
+tree, so a window query costs O(log n + k) for k results instead of a pass
+over the catalog.
+
+Filters on category, audience, good_for and location_type query a tree that
+holds only the occurrences with that value. Each one is built the first
+time it is asked for and kept, so a filtered query also costs what it
+returns. With several filters the one with the fewest occurrences picks the
+tree and the others are checked on its results.
+
+Usage:
+    python occurrence_index.py --on 2026-10-20 --after 17:00 --category peer_support
+    python occurrence_index.py --start 2026-08-14 --end 2026-08-17 --good-for family_friendly
+    python occurrence_index.py --start "2026-10-17 18:00" --end "2026-10-17 23:00" --location-type physical
+"""
+
+import argparse
+import sys
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import NamedTuple
+
+from generate_calendar import get_entry_audience, get_program_audience
+from occurrence_arrays import iter_catalog_schedules, schedule_occurrences
+from utils import get_default_sources_path, load_sources, parse_date
+
+DEFAULT_HORIZON_MONTHS = 12
+
+FACETS = ("category", "audience", "good_for", "location_type")
+
+
+class Occurrence(NamedTuple):
+    """One occurrence of an entry or program; start and end are local wall-clock times."""
+
+    start: datetime
+    end: datetime
+    entry_id: str
+    name: str
+    program: str | None
+    category: str | None
+
+
+class IntervalTree:
+    """Static centered interval tree over (start, end, value) half-open intervals.
+
+    Each node keeps the intervals containing its center twice, sorted by
+    start and by end, so a query walks one root-to-leaf path per window edge
+    and reads only intervals that overlap.
+    """
+
+    def __init__(self, intervals: list[tuple]):
+        self.size = len(intervals)
+        self._root = self._build(sorted(intervals))
+
+    @classmethod
+    def _build(cls, intervals: list[tuple]):
+        if not intervals:
+            return None
+        center = intervals[len(intervals) // 2][0]
+        left, here, right = [], [], []
+        for interval in intervals:
+            if interval[1] <= center:
+                left.append(interval)
+            elif interval[0] > center:
+                right.append(interval)
+            else:
+                here.append(interval)
+        by_end = sorted(here, key=lambda interval: interval[1], reverse=True)
+        return center, here, by_end, cls._build(left), cls._build(right)
+
+    def overlapping(self, start, end) -> list:
+        """Values of the intervals overlapping [start, end), in no particular order."""
+        found = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            center, by_start, by_end, left, right = node
+            if end <= center:
+                # Every interval here ends after the center, so it overlaps iff it starts before `end`.
+                for interval in by_start:
+                    if interval[0] >= end:
+                        break
+                    found.append(interval[2])
+                stack.append(left)
+            elif start >= center:
+                # ...and starts at or before the center, so it overlaps iff it ends after `start`.
+                for interval in by_end:
+                    if interval[1] <= start:
+                        break
+                    found.append(interval[2])
+                stack.append(right)
+            else:
+                found.extend(interval[2] for interval in by_start)
+                stack.append(left)
+                stack.append(right)
+        return found
+
+
+class OccurrenceIndex:
+    """Every occurrence over a horizon, queryable by time window and facets."""
+
+    def __init__(self, occurrences: list[Occurrence], facets: list[dict], horizon: tuple[date, date]):
+        self.occurrences = occurrences
+        self.facets = facets
+        self.horizon = horizon
+        self._postings: dict[tuple[str, str], list[int]] = {}
+        for position, values in enumerate(facets):
+            for facet, facet_values in values.items():
+                for value in facet_values:
+                    self._postings.setdefault((facet, value), []).append(position)
+        self._trees: dict = {None: self._tree(range(len(occurrences)))}
+
+    @classmethod
+    def build(cls, entries: list[dict], today: date | None = None,
+              months: int = DEFAULT_HORIZON_MONTHS) -> "OccurrenceIndex":
+        """Index the occurrences of every open entry and program from `today` for `months` months."""
+        today = today or date.today()
+        month = today.year * 12 + today.month - 1 + months
+        end = date(month // 12, month % 12 + 1, 1) - timedelta(days=1)
+        occurrences, facets = [], []
+        for index, program, resolved in iter_catalog_schedules(entries, today):
+            entry = entries[index]
+            audience = get_program_audience(program, entry) if program else get_entry_audience(entry)
+            values = {
+                "category": _facet_values(entry.get("category")),
+                "audience": _facet_values(audience),
+                "good_for": _facet_values(entry.get("good_for")),
+                "location_type": _facet_values(entry.get("location_type")),
+            }
+            program_name = program.get("name") if program else None
+            for start, finish in schedule_occurrences(resolved, today, end):
+                occurrences.append(Occurrence(start, finish, entry.get("id"), entry.get("name"),
+                                              program_name, entry.get("category")))
+                facets.append(values)
+        return cls(occurrences, facets, (today, end))
+
+    @classmethod
+    def from_sources(cls, sources_path: str | Path, today: date | None = None,
+                     months: int = DEFAULT_HORIZON_MONTHS) -> "OccurrenceIndex":
+        return cls.build(load_sources(sources_path), today, months)
+
+    def _tree(self, positions) -> IntervalTree:
+        occurrences = self.occurrences
+        return IntervalTree([(occurrences[i].start, occurrences[i].end, i) for i in positions])
+
+    def count(self, facet: str, value: str) -> int:
+        """Occurrences carrying a facet value, without building its tree."""
+        return len(self._postings.get((facet, value), ()))
+
+    def query(self, start: datetime, end: datetime, category: str | None = None, audience: str | None = None,
+              good_for: str | None = None, location_type: str | None = None) -> list[Occurrence]:
+        """Occurrences overlapping [start, end) that match every given filter, by start time."""
+        filters = [(facet, value) for facet, value in zip(FACETS, (category, audience, good_for, location_type))
+                   if value]
+        key = min(filters, key=lambda item: self.count(*item)) if filters else None
+        if key not in self._trees:
+            self._trees[key] = self._tree(self._postings.get(key, ()))
+        rest = [item for item in filters if item != key]
+        positions = [i for i in self._trees[key].overlapping(start, end)
+                     if all(value in self.facets[i][facet] for facet, value in rest)]
+        positions.sort(key=lambda i: (self.occurrences[i].start, self.occurrences[i].end, i))
+        return [self.occurrences[i] for i in positions]
+
+
+def _facet_values(value) -> frozenset:
+    if not value:
+        return frozenset()
+    if isinstance(value, str):
+        return frozenset([value])
+    return frozenset(str(item) for item in value if item)
+
+
+def _parse_moment(text: str) -> datetime | None:
+    """'YYYY-MM-DD', 'YYYY-MM-DD HH:MM' or 'YYYY-MM-DDTHH:MM'."""
+    try:
+        return datetime.fromisoformat(text.strip())
+    except ValueError:
+        return None
+
+
+def _parse_clock(text: str) -> time | None:
+    try:
+        return time.fromisoformat(text.strip())
+    except ValueError:
+        return None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sources", type=Path, default=get_default_sources_path(), help="Path to sources.yaml")
+    parser.add_argument("--as-of", help="Resolve schedules and start the horizon at YYYY-MM-DD instead of today")
+    parser.add_argument("--months", type=int, default=DEFAULT_HORIZON_MONTHS,
+                        help=f"Horizon length in months (default: {DEFAULT_HORIZON_MONTHS})")
+    parser.add_argument("--on", help="One day, YYYY-MM-DD (narrow it with --after/--before)")
+    parser.add_argument("--after", help="With --on: window starts at HH:MM")
+    parser.add_argument("--before", help="With --on: window ends at HH:MM")
+    parser.add_argument("--start", help="Window start, YYYY-MM-DD or 'YYYY-MM-DD HH:MM'")
+    parser.add_argument("--end", help="Window end (exclusive), YYYY-MM-DD or 'YYYY-MM-DD HH:MM'")
+    for facet in FACETS:
+        parser.add_argument(f"--{facet.replace('_', '-')}", dest=facet, help=f"Only this {facet}")
+    args = parser.parse_args(argv)
+
+    today = date.today()
+    if args.as_of:
+        today = parse_date(args.as_of)
+        if not today:
+            parser.error("--as-of must use YYYY-MM-DD")
+    if args.on:
+        day = parse_date(args.on)
+        if not day or args.start or args.end:
+            parser.error("--on takes YYYY-MM-DD and replaces --start/--end")
+        after = _parse_clock(args.after) if args.after else time(0)
+        before = _parse_clock(args.before) if args.before else None
+        if after is None or (args.before and before is None):
+            parser.error("--after/--before must use HH:MM")
+        start = datetime.combine(day, after)
+        end = datetime.combine(day, before) if before else datetime.combine(day + timedelta(days=1), time(0))
+    else:
+        if args.after or args.before:
+            parser.error("--after/--before need --on")
+        if not (args.start and args.end):
+            parser.error("give --on, or both --start and --end")
+        start, end = _parse_moment(args.start), _parse_moment(args.end)
+        if not (start and end):
+            parser.error("--start/--end must use YYYY-MM-DD or 'YYYY-MM-DD HH:MM'")
+
+    index = OccurrenceIndex.from_sources(args.sources, today, args.months)
+    if not (datetime.combine(index.horizon[0], time(0)) <= start
+            and end <= datetime.combine(index.horizon[1] + timedelta(days=1), time(0))):
+        print(f"Note: only {index.horizon[0]} to {index.horizon[1]} is indexed (--as-of/--months to change)",
+              file=sys.stderr)
+    found = index.query(start, end, **{facet: getattr(args, facet) for facet in FACETS})
+    for occurrence in found:
+        name = occurrence.name + (f" - {occurrence.program}" if occurrence.program else "")
+        print(f"{occurrence.start:%a %Y-%m-%d %H:%M}-{occurrence.end:%H:%M}  {occurrence.category:<18} {name}")
+    print(f"{len(found)} occurrences between {start:%Y-%m-%d %H:%M} and {end:%Y-%m-%d %H:%M}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
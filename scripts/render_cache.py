@@ -0,0 +1,216 @@
+"""Per-entry render cache, so generate_calendar only re-renders what changed.
+
+Editing one entry in sources.yaml used to regenerate every VEVENT and the
+whole events.json. The manifest kept here maps each entry's content hash
+(its bytes in sources.yaml, found as in entry_index.py) to what
+generate_calendar rendered for it: the VEVENT blocks for every platform and
+the events.json record, already serialized. The manifest is stamped with
+the generator version (a hash of the code that renders) and the as-of date,
+since resolved schedules depend on both; if either moves, everything is
+rendered again.
+
+On each run only entries whose bytes changed are parsed and rendered, and
+the calendars and feed are reassembled from the cached text, in file order.
+That needs every entry to open with its `- id:` line; if one does not, the
+whole file is parsed and rendered without the cache.
+`verify=True` renders every entry from scratch and reports any cached
+render that differs, which would mean the cache key misses an input.
+
+Like the other caches in data/.cache/ this is an optimization only:
+PEER_CALENDAR_NO_CACHE=1 turns it off, and a missing, stale or unreadable
+manifest just means a full build.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import NamedTuple
+
+from entry_index import entry_blocks, entry_blocks_cover
+from utils import cache_dir_for, parse_sources
+
+# Bump whenever the manifest layout changes. Generator changes need no bump:
+# generator_version() hashes their source.
+RENDER_CACHE_VERSION = 2
+
+RENDER_CACHE_NAME = "render-manifest.pickle"
+
+# Changed entries are parsed this many at a time, in one YAML stream each.
+PARSE_BATCH = 1000
+
+
+class RenderedEntry(NamedTuple):
+    """Everything generate_calendar writes for one entry."""
+
+    entry_id: str
+    category: str | None
+    closed: bool
+    last_verified: date | None
+    event_count: int
+    vevents: dict[str, str]  # platform -> its VEVENT blocks, each followed by CRLF
+    json: str | None         # the events.json record, indented as it sits in the feed
+    warnings: tuple[tuple[str, str], ...] = ()  # (key, message) for print_warnings(), replayed on cache hits
+
+
+@dataclass
+class RenderReport:
+    """What one build took from the manifest and what it had to render."""
+
+    reused: int = 0
+    rendered: int = 0
+    removed: int = 0
+    mismatched: list[str] = field(default_factory=list)
+    uncached: bool = False
+
+    def __str__(self) -> str:
+        if self.uncached:
+            return f"not used, an entry does not open with its id line ({self.rendered} rendered)"
+        text = f"{self.reused} reused, {self.rendered} rendered, {self.removed} dropped"
+        if self.mismatched:
+            text += f", {len(self.mismatched)} cached renders differ from a clean build"
+        return text
+
+
+def generator_version() -> str:
+    """Version stamp for rendered text: the manifest format plus the source of everything that renders."""
+    digest = hashlib.sha256(f"{RENDER_CACHE_VERSION}\0".encode())
+    for name in ("generate_calendar.py", "utils.py", "models.py"):
+        digest.update((Path(__file__).parent / name).read_bytes())
+    return digest.hexdigest()[:24]
+
+
+def content_hash(block: bytes) -> str:
+    return hashlib.blake2b(block, digest_size=16).hexdigest()
+
+
+def _parse_blocks(blocks: list[tuple[str, bytes]]) -> list | None:
+    """Parse (id, block) pairs, all in one YAML stream where possible.
+
+    None if any block does not parse to exactly one entry with its id.
+    """
+    # Every block is a top-level `- id:` item, so together they form one sequence.
+    text = b"---\n" + b"".join(block if block.endswith(b"\n") else block + b"\n" for _, block in blocks)
+    entries = parse_sources(text.decode("utf-8"))
+    if len(entries) != len(blocks):
+        entries = []
+        for _, block in blocks:
+            parsed = parse_sources(block.decode("utf-8"))
+            if len(parsed) != 1:
+                return None
+            entries.extend(parsed)
+    if any(str(entry.get("id")) != entry_id for (entry_id, _), entry in zip(blocks, entries)):
+        return None
+    return entries
+
+
+class RenderCache:
+    """Content hash -> RenderedEntry, loaded from and saved to one manifest file."""
+
+    def __init__(self, path: str | Path, as_of: date, version: str | None = None):
+        self.path = Path(path)
+        self.as_of = as_of
+        self.version = version or generator_version()
+        self.entries: dict[str, RenderedEntry] = {}
+        self.dirty = False
+        self._load()
+
+    @classmethod
+    def for_sources(cls, sources_path: str | Path, as_of: date) -> RenderCache:
+        return cls(cache_dir_for(sources_path) / RENDER_CACHE_NAME, as_of)
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "rb") as f:
+                version, as_of, entries = pickle.load(f)
+        except Exception:
+            # Any unreadable, truncated or incompatible file just means starting empty.
+            return
+        if version == self.version and as_of == self.as_of and isinstance(entries, dict):
+            self.entries = entries
+
+    def update(self, data: bytes, render: Callable[[object], RenderedEntry],
+               verify: bool = False) -> tuple[list[RenderedEntry], RenderReport]:
+        """Every entry of `data` rendered, in file order, re-rendering only changed ones.
+
+        With `verify`, every entry is rendered and cached renders that differ
+        are listed in the report's `mismatched`. If entry_blocks() cannot
+        split out every entry, the whole file is rendered and the manifest
+        emptied.
+        """
+        if not entry_blocks_cover(data):
+            return self._render_all(data, render)
+        report = RenderReport()
+        hashes, pending = [], {}
+        for entry_id, start, end in entry_blocks(data):
+            block = data[start:end]
+            digest = content_hash(block)
+            hashes.append(digest)
+            if verify or digest not in self.entries:
+                pending.setdefault(digest, (entry_id, block))
+
+        fresh = self._render(pending, render)
+        if fresh is None:
+            return self._render_all(data, render)
+        for digest, entry in fresh.items():
+            stored = self.entries.get(digest)
+            if stored is None:
+                report.rendered += 1
+            elif stored != entry:
+                report.mismatched.append(entry.entry_id)
+
+        current = {}
+        rendered = []
+        for digest in hashes:
+            entry = fresh.get(digest) or self.entries[digest]
+            current[digest] = entry
+            rendered.append(entry)
+        report.reused = len(current) - report.rendered - len(report.mismatched)
+        report.removed = len(self.entries.keys() - current.keys())
+        self.dirty = self.dirty or bool(report.rendered or report.mismatched or report.removed)
+        self.entries = current
+        return rendered, report
+
+    def _render_all(self, data: bytes, render) -> tuple[list[RenderedEntry], RenderReport]:
+        """Every entry of a whole-file parse rendered, with nothing cached."""
+        rendered = [render(entry) for entry in parse_sources(data.decode("utf-8"))]
+        self.dirty = self.dirty or bool(self.entries)
+        self.entries = {}
+        return rendered, RenderReport(rendered=len(rendered), uncached=True)
+
+    @staticmethod
+    def _render(pending: dict[str, tuple[str, bytes]], render) -> dict[str, RenderedEntry] | None:
+        """digest -> render for each pending block; None if a block does not hold just its own entry."""
+        items = list(pending.items())
+        fresh = {}
+        for start in range(0, len(items), PARSE_BATCH):
+            batch = items[start:start + PARSE_BATCH]
+            entries = _parse_blocks([block for _, block in batch])
+            if entries is None:
+                return None
+            for (digest, _), entry in zip(batch, entries):
+                fresh[digest] = render(entry)
+        return fresh
+
+    def save(self) -> None:
+        """Atomically replace the manifest if anything changed; failures are ignored."""
+        if not self.dirty:
+            return
+        tmp_name = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((self.version, self.as_of, self.entries), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, self.path)
+            tmp_name = None
+            self.dirty = False
+        except OSError:
+            if tmp_name:
+                Path(tmp_name).unlink(missing_ok=True)
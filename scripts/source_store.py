@@ -0,0 +1,181 @@
+"""Indexed, read-mostly view over the entries in sources.yaml.
+
+Scripts used to answer every question ("which peer_support entries are due
+this month?") with a fresh list comprehension over all entries. A SourceStore
+builds its hash and sorted indexes once, so a filtered view costs time
+proportional to what it returns rather than to the size of the corpus.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from utils import TAG_VOCABULARIES, is_closed, load_sources, parse_date
+
+
+INDEXED_FIELDS = ("category", "resource_type", "location_type", "status")
+
+
+def _index_key(value):
+    """Normalize a field value for hashing; empty and unhashable values are None."""
+    if not value:
+        return None
+    try:
+        hash(value)
+    except TypeError:
+        return None
+    return value
+
+
+def _entry_tags(entry: dict) -> frozenset[tuple[str, str]]:
+    tags = set()
+    for field in TAG_VOCABULARIES:
+        values = entry.get(field) or []
+        if isinstance(values, str):
+            values = [values]
+        for value in values:
+            if _index_key(value) is not None:
+                tags.add((field, value))
+    return frozenset(tags)
+
+
+class _DateIndex:
+    """Entry positions sorted by a date field; unparseable dates are left out."""
+
+    def __init__(self, entries: list[dict], field: str):
+        pairs = sorted(
+            (parsed, position)
+            for position, parsed in enumerate(parse_date(entry.get(field)) for entry in entries)
+            if parsed
+        )
+        self.keys = [key for key, _ in pairs]
+        self.positions = [position for _, position in pairs]
+
+    def between(self, start: date | None, end: date | None) -> list[int]:
+        lo = bisect_left(self.keys, start) if start else 0
+        hi = bisect_right(self.keys, end) if end else len(self.keys)
+        return self.positions[lo:hi]
+
+
+class SourceStore:
+    """Entries plus hash indexes by id, field and tag, and sorted date indexes.
+
+    Iterating a store yields entries in file order, so it can stand in for the
+    list returned by ``load_sources`` wherever a consumer only loops over it.
+    """
+
+    def __init__(self, entries: Iterable[dict]):
+        self.entries = list(entries)
+        self._by_id: dict[str, int] = {}
+        self._keys = {field: [] for field in INDEXED_FIELDS}
+        self._postings = {field: defaultdict(list) for field in INDEXED_FIELDS}
+        self._tags: list[frozenset] = []
+        self._tag_postings: dict[tuple[str, str], list[int]] = defaultdict(list)
+        self._closed: list[int] = []
+        self._closed_flags: list[bool] = []
+
+        for position, entry in enumerate(self.entries):
+            entry_id = entry.get("id")
+            if entry_id is not None:
+                self._by_id.setdefault(entry_id, position)
+            for field in INDEXED_FIELDS:
+                key = _index_key(entry.get(field))
+                self._keys[field].append(key)
+                self._postings[field][key].append(position)
+            tags = _entry_tags(entry)
+            self._tags.append(tags)
+            for tag in tags:
+                self._tag_postings[tag].append(position)
+            closed = is_closed(entry)
+            self._closed_flags.append(closed)
+            if closed:
+                self._closed.append(position)
+
+        self._next_audit = _DateIndex(self.entries, "next_audit")
+        self._last_verified = _DateIndex(self.entries, "last_verified")
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.entries)
+
+    def __contains__(self, entry_id: object) -> bool:
+        return entry_id in self._by_id
+
+    def get(self, entry_id: str, default: dict | None = None) -> dict | None:
+        """The entry with this id (the first, if the file repeats an id)."""
+        position = self._by_id.get(entry_id)
+        return default if position is None else self.entries[position]
+
+    def values(self, field: str) -> list:
+        """Distinct values of an indexed field, in order of first appearance."""
+        return [key for key, positions in self._postings[field].items() if positions]
+
+    def count(self, **criteria) -> int:
+        return len(self._select_positions(**criteria))
+
+    def select(self, *, closed: bool | None = None,
+               tags: Iterable[tuple[str, str]] = (), **fields) -> list[dict]:
+        """Entries matching every criterion, in file order.
+
+        ``fields`` are exact matches on INDEXED_FIELDS (``None`` selects entries
+        where the field is missing or empty); ``tags`` are ``(field, value)``
+        pairs from TAG_VOCABULARIES; ``closed`` filters on ``is_closed``.
+        """
+        return [self.entries[p] for p in self._select_positions(closed=closed, tags=tags, **fields)]
+
+    def where(self, **criteria) -> SourceStore:
+        """A new store over the entries ``select(**criteria)`` returns."""
+        return SourceStore(self.select(**criteria))
+
+    def next_audit_between(self, start: date | None = None, end: date | None = None) -> list[dict]:
+        """Entries whose next_audit falls in [start, end], earliest first."""
+        return [self.entries[p] for p in self._next_audit.between(start, end)]
+
+    def last_verified_between(self, start: date | None = None, end: date | None = None) -> list[dict]:
+        """Entries whose last_verified falls in [start, end], oldest first."""
+        return [self.entries[p] for p in self._last_verified.between(start, end)]
+
+    def _select_positions(self, *, closed: bool | None = None,
+                          tags: Iterable[tuple[str, str]] = (), **fields) -> list[int]:
+        unknown = set(fields) - set(INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"not an indexed field: {', '.join(sorted(unknown))}")
+        tags = list(tags)
+
+        # Each criterion is its posting list plus a per-position test. Walk
+        # the shortest list and test only the others, so the cost follows the
+        # most selective criterion rather than the size of the corpus.
+        criteria = []
+        for field, value in fields.items():
+            keys, key = self._keys[field], _index_key(value)
+            criteria.append((self._postings[field].get(key, []),
+                             lambda p, keys=keys, key=key: keys[p] == key))
+        for tag in tags:
+            criteria.append((self._tag_postings.get(tag, []),
+                             lambda p, tag=tag: tag in self._tags[p]))
+        if closed:
+            criteria.append((self._closed, self._closed_flags.__getitem__))
+        if not criteria:
+            if closed is False:
+                return [p for p, flag in enumerate(self._closed_flags) if not flag]
+            return list(range(len(self.entries)))
+
+        criteria.sort(key=lambda criterion: len(criterion[0]))
+        base = criteria[0][0]
+        tests = [test for _, test in criteria[1:]]
+        if closed is False:
+            tests.append(lambda p: not self._closed_flags[p])
+        if not tests:
+            return list(base)
+        return [p for p in base if all(test(p) for test in tests)]
+
+
+def load_store(sources_path: str | Path) -> SourceStore:
+    """Load sources.yaml (through the snapshot cache) into an indexed store."""
+    return SourceStore(load_sources(sources_path))
@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+"""SQLite mirror of sources.yaml for ad-hoc questions.
+
+Questions like "which peer_support groups meet on Thursdays?", "which entries
+cite this host?" or "what is due before December?" used to mean another loop
+over load_sources(). `build` mirrors the file into SQLite instead: entries,
+programs, tags, source URLs and the resolved schedules the JSON feed
+publishes, with indexes on category, next_audit and weekday, and a full-text
+(FTS5) index over names, notes and practical_tips.
+
+Rebuilds are incremental. Entries are found by their byte spans (as in
+entry_index.py) and only those whose bytes changed are parsed again; moving
+the as-of date re-resolves every schedule, since resolution depends on it.
+
+Usage:
+    python sources_db.py build                          # create/update data/.cache/sources.yaml.mirror.sqlite
+    python sources_db.py meets thursday --category peer_support
+    python sources_db.py cites multco.us
+    python sources_db.py due --before 2026-12-01
+    python sources_db.py search "grief support"
+    python sources_db.py sql "SELECT category, COUNT(*) FROM entries GROUP BY 1"
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from entry_index import entry_blocks, entry_blocks_cover
+from generate_calendar import WEEKDAY_INDEX, resolve_entry_schedule, resolve_program_schedule
+from utils import TAG_VOCABULARIES, cache_dir_for, get_default_sources_path, is_closed, parse_date, parse_sources
+
+
+# Bump when the schema or what goes into it changes; older mirrors are rebuilt.
+SOURCES_DB_VERSION = 1
+
+WEEKDAY_CODES = {code: name for code, name in zip(
+    WEEKDAY_INDEX, ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"))}
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE entries (
+    id TEXT PRIMARY KEY, position INTEGER, content_hash TEXT,
+    name TEXT, category TEXT, resource_type TEXT, location_type TEXT, status TEXT, closed INTEGER,
+    address TEXT, latitude REAL, longitude REAL, website TEXT,
+    audit_frequency TEXT, last_verified TEXT, next_audit TEXT,
+    schedule TEXT, notes TEXT, practical_tips TEXT,
+    data TEXT
+);
+CREATE INDEX entries_by_category ON entries (category);
+CREATE INDEX entries_by_next_audit ON entries (next_audit);
+CREATE INDEX entries_by_position ON entries (position);
+CREATE TABLE programs (
+    entry_id TEXT, position INTEGER, name TEXT, schedule TEXT, format TEXT, notes TEXT, data TEXT,
+    PRIMARY KEY (entry_id, position)
+);
+CREATE TABLE tags (entry_id TEXT, program INTEGER, field TEXT, tag TEXT);
+CREATE INDEX tags_by_tag ON tags (field, tag);
+CREATE INDEX tags_by_entry ON tags (entry_id);
+CREATE TABLE source_urls (entry_id TEXT, url TEXT, host TEXT);
+CREATE INDEX source_urls_by_host ON source_urls (host);
+CREATE INDEX source_urls_by_entry ON source_urls (entry_id);
+CREATE TABLE schedules (
+    entry_id TEXT, program INTEGER, type TEXT, weekday TEXT,
+    frequency TEXT, interval INTEGER, month_weeks TEXT, anchor_date TEXT, until_date TEXT,
+    start_date TEXT, end_date TEXT, start_time TEXT, end_time TEXT, all_day INTEGER
+);
+CREATE INDEX schedules_by_weekday ON schedules (weekday);
+CREATE INDEX schedules_by_entry ON schedules (entry_id);
+"""
+
+# Rowids match entries.rowid.
+SEARCH_SCHEMA = "CREATE VIRTUAL TABLE search USING fts5(name, notes, practical_tips)"
+
+CHILD_TABLES = ("programs", "tags", "source_urls", "schedules")
+
+
+def _fts5_available() -> bool:
+    try:
+        sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+# Python's sqlite3 is almost always built with FTS5; without it `search`
+# falls back to LIKE over the stored text.
+HAS_FTS5 = _fts5_available()
+
+
+@dataclass
+class BuildReport:
+    """What an update did to the mirror."""
+
+    added: int = 0
+    changed: int = 0
+    removed: int = 0
+    unchanged: int = 0
+
+    def __str__(self) -> str:
+        if not (self.added or self.changed or self.removed):
+            return f"up to date ({self.unchanged} entries)"
+        return (f"{self.added} added, {self.changed} changed, {self.removed} removed, "
+                f"{self.unchanged} unchanged")
+
+
+def weekday_code(day: str) -> str:
+    """'thursday', 'thu' or 'TH' -> 'TH' (the codes resolved schedules use)."""
+    text = day.strip().lower()
+    for code, name in WEEKDAY_CODES.items():
+        if text in (code.lower(), name, name[:3]):
+            return code
+    raise ValueError(f"unknown weekday: {day!r}")
+
+
+def url_host(url: str) -> str | None:
+    """Lowercase host of a URL without a leading 'www.'."""
+    host = urlsplit(url.strip()).hostname
+    if not host:
+        return None
+    return host[4:] if host.startswith("www.") else host
+
+
+def _iso(value) -> str | None:
+    parsed = parse_date(value)
+    if parsed:
+        return parsed.isoformat()
+    return None if value in (None, "") else str(value)
+
+
+def _text(value) -> str:
+    """Flatten a scalar, list or mapping into searchable text."""
+    if value is None:
+        return ""
+    if isinstance(value, dict):
+        return "\n".join(f"{key}: {_text(item)}" for key, item in value.items())
+    if isinstance(value, list):
+        return "\n".join(_text(item) for item in value)
+    return str(value)
+
+
+def _json(value) -> str:
+    return json.dumps(value, default=str, ensure_ascii=False)
+
+
+def _tag_rows(entry_id: str, program: int | None, record: dict) -> list[tuple]:
+    rows = []
+    for field in TAG_VOCABULARIES:
+        values = record.get(field) or []
+        if isinstance(values, str):
+            values = [values]
+        rows.extend((entry_id, program, field, str(value)) for value in values if value)
+    return rows
+
+
+def _schedule_rows(entry_id: str, program: int | None, resolved: dict | None) -> list[tuple]:
+    if not resolved:
+        return []
+    if resolved["type"] == "recurring":
+        return [
+            (entry_id, program, "recurring", weekday, resolved["frequency"], resolved["interval"],
+             _json(resolved["month_weeks"]), resolved["anchor_date"], resolved["until_date"],
+             None, None, resolved["start_time"], resolved["end_time"], 0)
+            for weekday in resolved["weekdays"]
+        ]
+    rows = []
+    for occurrence in resolved["occurrences"]:
+        start, end = occurrence["start_date"], occurrence["end_date"]
+        # A single-day occurrence also answers "what is on this weekday".
+        weekday = list(WEEKDAY_INDEX)[date.fromisoformat(start).weekday()] if start == end else None
+        rows.append((entry_id, program, "fixed", weekday, None, None, None, None, None, start, end,
+                     occurrence["start_time"], occurrence["end_time"], int(occurrence["all_day"])))
+    return rows
+
+
+class SourcesDB:
+    """An SQLite mirror of one sources file, kept current by `update()`."""
+
+    def __init__(self, connection: sqlite3.Connection, sources_path: Path):
+        self._db = connection
+        self._db.row_factory = sqlite3.Row
+        self.sources_path = sources_path
+
+    @classmethod
+    def open(cls, sources_path: str | Path | None = None, db_path: str | Path | None = None,
+             as_of: date | None = None) -> SourcesDB:
+        """The mirror of `sources_path`, brought up to date with it."""
+        sources_path = Path(sources_path or get_default_sources_path())
+        if db_path is None:
+            db_path = cache_dir_for(sources_path) / f"{sources_path.name}.mirror.sqlite"
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        mirror = cls(sqlite3.connect(db_path), sources_path)
+        mirror.report = mirror.update(as_of)
+        return mirror
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> SourcesDB:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # -- building ---------------------------------------------------------
+
+    def _meta(self) -> dict[str, str]:
+        try:
+            return {row[0]: row[1] for row in self._db.execute("SELECT key, value FROM meta")}
+        except sqlite3.OperationalError:
+            return {}
+
+    def _reset(self) -> None:
+        tables = [row[0] for row in self._db.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'search_%'")]
+        for table in tables:
+            self._db.execute(f"DROP TABLE IF EXISTS {table}")
+        self._db.executescript(SCHEMA)
+        if HAS_FTS5:
+            self._db.execute(SEARCH_SCHEMA)
+
+    def update(self, as_of: date | None = None) -> BuildReport:
+        """Bring the mirror in line with the sources file; cheap when nothing changed."""
+        as_of = (as_of or date.today()).isoformat()
+        meta = self._meta()
+        stat = self.sources_path.stat()
+        current = meta.get("version") == str(SOURCES_DB_VERSION) and meta.get("as_of") == as_of
+        if current and meta.get("size") == str(stat.st_size) and meta.get("mtime_ns") == str(stat.st_mtime_ns):
+            return BuildReport(unchanged=int(meta.get("entries", 0)))
+
+        data = self.sources_path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        with self._db:
+            if current and meta.get("sha256") == digest:
+                self._store_meta(stat, digest, as_of, int(meta.get("entries", 0)))
+                return BuildReport(unchanged=int(meta.get("entries", 0)))
+            if not current:
+                # New schema or a new as-of date: every schedule must be resolved again.
+                self._reset()
+            report = self._sync(data, date.fromisoformat(as_of))
+            self._store_meta(stat, digest, as_of, report.added + report.changed + report.unchanged)
+        return report
+
+    def _store_meta(self, stat, digest: str, as_of: str, entries: int) -> None:
+        self._db.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", [
+            ("version", str(SOURCES_DB_VERSION)),
+            ("size", str(stat.st_size)),
+            ("mtime_ns", str(stat.st_mtime_ns)),
+            ("sha256", digest),
+            ("as_of", as_of),
+            ("entries", str(entries)),
+        ])
+
+    def _sync(self, data: bytes, as_of: date) -> BuildReport:
+        stored = {row[0]: (row[1], row[2]) for row in
+                  self._db.execute("SELECT id, content_hash, position FROM entries")}
+        report = self._sync_blocks(data, stored, as_of) if entry_blocks_cover(data) else None
+        return report or self._sync_all(data, stored, as_of)
+
+    def _sync_blocks(self, data: bytes, stored: dict, as_of: date) -> BuildReport | None:
+        """Reparse only the entry blocks whose bytes changed.
+
+        Returns None, having written nothing, if a changed block does not
+        hold exactly the one entry its `- id:` line names.
+        """
+        report = BuildReport()
+        seen = set()
+        moved, dirty = [], []
+        for entry_id, start, end in entry_blocks(data):
+            if entry_id in seen:
+                continue  # The first occurrence of a duplicated id wins.
+            position = len(seen)
+            seen.add(entry_id)
+            block = data[start:end]
+            content_hash = hashlib.blake2b(block, digest_size=16).hexdigest()
+            old = stored.get(entry_id)
+            if old and old[0] == content_hash:
+                report.unchanged += 1
+                if old[1] != position:
+                    moved.append((position, entry_id))
+                continue
+            if old:
+                report.changed += 1
+            else:
+                report.added += 1
+            dirty.append((entry_id, position, content_hash, block))
+
+        parsed = self._parse(dirty)
+        if parsed is None:
+            return None
+        for (entry_id, position, content_hash, _), entry in zip(dirty, parsed):
+            if entry_id in stored:
+                self._delete(entry_id)
+            self._insert(entry_id, position, content_hash, entry, as_of)
+        for entry_id in stored.keys() - seen:
+            self._delete(entry_id)
+            report.removed += 1
+        self._db.executemany("UPDATE entries SET position = ? WHERE id = ?", moved)
+        return report
+
+    def _sync_all(self, data: bytes, stored: dict, as_of: date) -> BuildReport:
+        """Mirror a whole-file parse, for files whose entries cannot all be split out by `- id:` line."""
+        report = BuildReport()
+        for entry_id in stored:
+            self._delete(entry_id)
+        seen = set()
+        for entry in parse_sources(data.decode("utf-8"), compact=False, workers=None):
+            entry_id = str(entry.get("id"))
+            if entry_id in seen:
+                continue
+            if entry_id in stored:
+                report.changed += 1
+            else:
+                report.added += 1
+            # No block hash: the next block-by-block sync parses these again.
+            self._insert(entry_id, len(seen), "", entry, as_of)
+            seen.add(entry_id)
+        report.removed = len(stored.keys() - seen)
+        return report
+
+    @staticmethod
+    def _parse(dirty: list[tuple[str, int, str, bytes]]) -> list[dict] | None:
+        """Parse changed entry blocks, all in one YAML stream where possible.
+
+        None if any block does not parse to exactly one entry with its id.
+        """
+        if not dirty:
+            return []
+        # Every block is a top-level `- id:` item, so together they form one sequence.
+        text = b"---\n" + b"".join(block if block.endswith(b"\n") else block + b"\n"
+                                    for *_, block in dirty)
+        entries = parse_sources(text.decode("utf-8"), compact=False, workers=None)
+        if len(entries) != len(dirty):
+            entries = []
+            for *_, block in dirty:
+                parsed = parse_sources(block.decode("utf-8"), compact=False)
+                if len(parsed) != 1:
+                    return None
+                entries.extend(parsed)
+        if any(str(entry.get("id")) != entry_id for (entry_id, *_), entry in zip(dirty, entries)):
+            return None
+        return entries
+
+    def _delete(self, entry_id: str) -> None:
+        row = self._db.execute("SELECT rowid FROM entries WHERE id = ?", (entry_id,)).fetchone()
+        if row and HAS_FTS5:
+            self._db.execute("DELETE FROM search WHERE rowid = ?", (row[0],))
+        self._db.execute("DELETE FROM entries WHERE id = ?", (entry_id,))
+        for table in CHILD_TABLES:
+            self._db.execute(f"DELETE FROM {table} WHERE entry_id = ?", (entry_id,))
+
+    def _insert(self, entry_id: str, position: int, content_hash: str, entry: dict, as_of: date) -> None:
+        tips = _text(entry.get("practical_tips"))
+        cursor = self._db.execute(
+            "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", (
+                entry_id, position, content_hash,
+                entry.get("name"), entry.get("category"), entry.get("resource_type"),
+                entry.get("location_type"), entry.get("status"), int(is_closed(entry)),
+                entry.get("address"), entry.get("latitude"), entry.get("longitude"), entry.get("website"),
+                entry.get("audit_frequency"), _iso(entry.get("last_verified")), _iso(entry.get("next_audit")),
+                entry.get("schedule"), entry.get("notes"), tips, _json(entry),
+            ))
+        names = [_text(entry.get("name"))]
+        notes = [_text(entry.get("notes"))]
+        programs, tags, schedules = [], _tag_rows(entry_id, None, entry), []
+        schedules.extend(_schedule_rows(entry_id, None, resolve_entry_schedule(entry, today=as_of)))
+        for index, program in enumerate(entry.get("programs") or []):
+            if not isinstance(program, dict):
+                continue
+            programs.append((entry_id, index, program.get("name"), program.get("schedule"),
+                             program.get("format"), program.get("notes"), _json(program)))
+            names.append(_text(program.get("name")))
+            notes.append(_text(program.get("notes")))
+            tags.extend(_tag_rows(entry_id, index, program))
+            schedules.extend(_schedule_rows(entry_id, index,
+                                            resolve_program_schedule(program, entry, today=as_of)))
+        urls = entry.get("source_urls") or []
+        if isinstance(urls, str):
+            urls = [urls]
+        url_rows = [(entry_id, url.strip(), url_host(url)) for url in urls if isinstance(url, str) and url.strip()]
+
+        self._db.executemany("INSERT INTO programs VALUES (?, ?, ?, ?, ?, ?, ?)", programs)
+        self._db.executemany("INSERT INTO tags VALUES (?, ?, ?, ?)", tags)
+        self._db.executemany("INSERT INTO source_urls VALUES (?, ?, ?)", url_rows)
+        self._db.executemany("INSERT INTO schedules VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", schedules)
+        if HAS_FTS5:
+            self._db.execute("INSERT INTO search (rowid, name, notes, practical_tips) VALUES (?, ?, ?, ?)",
+                             (cursor.lastrowid, "\n".join(names), "\n".join(notes), tips))
+
+    # -- queries ----------------------------------------------------------
+
+    def sql(self, query: str, params: tuple = ()) -> list[sqlite3.Row]:
+        return self._db.execute(query, params).fetchall()
+
+    def meeting_on(self, weekday: str, category: str | None = None) -> list[sqlite3.Row]:
+        """Open entries and programs with a resolved schedule on `weekday`, in file order."""
+        query = """
+            SELECT e.id, e.name, p.name AS program, s.type, s.frequency, s.start_date,
+                   s.start_time, s.end_time
+            FROM schedules s
+            JOIN entries e ON e.id = s.entry_id
+            LEFT JOIN programs p ON p.entry_id = s.entry_id AND p.position = s.program
+            WHERE s.weekday = ? AND e.closed = 0
+        """
+        params = [weekday_code(weekday)]
+        if category:
+            query += " AND e.category = ?"
+            params.append(category)
+        return self.sql(query + " ORDER BY e.position, s.program, s.start_date", tuple(params))
+
+    def citing(self, host: str) -> list[sqlite3.Row]:
+        """Entries with a source URL on `host` (a 'www.' prefix is ignored)."""
+        return self.sql("""
+            SELECT e.id, e.name, u.url FROM source_urls u JOIN entries e ON e.id = u.entry_id
+            WHERE u.host = ? ORDER BY e.position
+        """, (url_host(f"//{host}") or host,))
+
+    def due_before(self, day: date) -> list[sqlite3.Row]:
+        """Entries whose next_audit falls before `day`, soonest first."""
+        return self.sql("""
+            SELECT id, name, category, next_audit FROM entries
+            WHERE next_audit < ? ORDER BY next_audit, position
+        """, (day.isoformat(),))
+
+    def search(self, text: str) -> list[sqlite3.Row]:
+        """Entries whose names, notes or practical_tips match `text`, best first.
+
+        `text` is an FTS5 query; if it does not parse as one, its words are
+        searched as plain terms.
+        """
+        if not HAS_FTS5:
+            pattern = f"%{text}%"
+            return self.sql("""
+                SELECT id, name FROM entries
+                WHERE name LIKE ? OR notes LIKE ? OR practical_tips LIKE ? OR data LIKE ?
+                ORDER BY position
+            """, (pattern,) * 4)
+        query = """
+            SELECT e.id, e.name FROM search JOIN entries e ON e.rowid = search.rowid
+            WHERE search MATCH ? ORDER BY rank
+        """
+        try:
+            return self.sql(query, (text,))
+        except sqlite3.OperationalError:
+            terms = " ".join('"' + word.replace('"', '""') + '"' for word in text.split())
+            return self.sql(query, (terms,)) if terms else []
+
+
+def _print_rows(rows: list[sqlite3.Row]) -> None:
+    for row in rows:
+        print("\t".join("" if value is None else str(value) for value in row))
+    print(f"({len(rows)} rows)", file=sys.stderr)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="SQLite mirror of sources.yaml")
+    parser.add_argument("--sources", type=Path, default=get_default_sources_path(),
+                        help="Path to sources.yaml")
+    parser.add_argument("--db", type=Path,
+                        help="Database path (default: data/.cache/sources.yaml.mirror.sqlite)")
+    parser.add_argument("--as-of", help="Resolve schedules as of YYYY-MM-DD instead of today")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("build", help="Create or incrementally update the mirror")
+    meets = subparsers.add_parser("meets", help="Entries and programs meeting on a weekday")
+    meets.add_argument("weekday", help="e.g. thursday, thu or TH")
+    meets.add_argument("--category", help="Only this category")
+    cites = subparsers.add_parser("cites", help="Entries citing a host in source_urls")
+    cites.add_argument("host")
+    due = subparsers.add_parser("due", help="Entries whose next_audit is before a date")
+    due.add_argument("--before", required=True, help="YYYY-MM-DD")
+    search = subparsers.add_parser("search", help="Full-text search over names, notes and practical_tips")
+    search.add_argument("text")
+    sql = subparsers.add_parser("sql", help="Run a read-only SQL query")
+    sql.add_argument("query")
+    args = parser.parse_args(argv)
+
+    as_of = None
+    if args.as_of:
+        as_of = parse_date(args.as_of)
+        if not as_of:
+            parser.error("--as-of must use YYYY-MM-DD")
+    before = None
+    if args.command == "due":
+        before = parse_date(args.before)
+        if not before:
+            parser.error("--before must use YYYY-MM-DD")
+    if args.command == "meets":
+        try:
+            weekday_code(args.weekday)
+        except ValueError as e:
+            parser.error(str(e))
+
+    with SourcesDB.open(args.sources, args.db, as_of=as_of) as mirror:
+        if args.command == "build":
+            print(f"{args.sources.name}: {mirror.report}")
+            return 0
+        if mirror.report.added or mirror.report.changed or mirror.report.removed:
+            print(f"Updated mirror: {mirror.report}", file=sys.stderr)
+        if args.command == "meets":
+            rows = mirror.meeting_on(args.weekday, args.category)
+        elif args.command == "cites":
+            rows = mirror.citing(args.host)
+        elif args.command == "due":
+            rows = mirror.due_before(before)
+        elif args.command == "search":
+            rows = mirror.search(args.text)
+        else:
+            mirror._db.execute("PRAGMA query_only = ON")
+            try:
+                rows = mirror.sql(args.query)
+            except sqlite3.Error as e:
+                print(f"Error: {e}", file=sys.stderr)
+                return 1
+    _print_rows(rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
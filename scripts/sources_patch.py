@@ -0,0 +1,200 @@
+"""Batch, format-preserving field edits to sources.yaml.
+
+The maintenance scripts change a few fields of some entries (audit dates,
+audience tags, coordinates, type fields). Re-dumping the whole YAML loses
+comments and layout, and line-walking regexes each have their own blind
+spots. Here every change is a Patch: set one top-level field of an entry, or
+one field of a named program. A batch of patches is applied in one streaming
+pass over the file (through the file's EntryIndex), with one backup and one
+atomic rename; bytes outside the patched fields are copied through untouched.
+
+New values are rendered the way yaml_dump lays out sources.yaml (block lists
+at the key's indentation, plain scalars where YAML allows them).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+from entry_index import EntryIndex, EntryLocation, Span
+from utils import yaml_dump
+
+
+@dataclass(frozen=True)
+class Patch:
+    """Set `field` to `value` on one entry, or on its program named `program`.
+
+    An existing field is replaced where it stands (left alone with
+    `if_missing`). A missing one is inserted after the last of the `after`
+    fields present, or else at the end of the entry (or program).
+    """
+
+    entry_id: str
+    field: str
+    value: Any
+    program: str | None = None
+    after: tuple[str, ...] = ()
+    if_missing: bool = False
+
+
+@dataclass
+class PatchReport:
+    """What a batch did: patches written, entries changed, patches without a target.
+
+    `backup` is where the original was kept, if the file was rewritten in place.
+    """
+
+    applied: list[Patch] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    skipped: list[Patch] = field(default_factory=list)
+    backup: Path | None = None
+
+
+def render_field(name: str, value: Any, indent: int) -> bytes:
+    """`name: value` as yaml_dump writes it in sources.yaml, indented."""
+    text = yaml_dump({name: value}, default_flow_style=False, allow_unicode=True,
+                     sort_keys=False, width=120)
+    pad = " " * indent
+    return "".join(pad + line for line in text.splitlines(keepends=True)).encode("utf-8")
+
+
+def _content_end(block: bytes, start: int, end: int) -> int:
+    """End of a span without its trailing blank and comment lines."""
+    while end > start:
+        line_start = max(block.rfind(b"\n", start, end - 1) + 1, start)
+        stripped = block[line_start:end].strip()
+        if stripped and not stripped.startswith(b"#"):
+            break
+        end = line_start
+    return end
+
+
+def _target(location: EntryLocation, patch: Patch) -> tuple[dict[str, Span], int, int, int] | None:
+    """(fields, indent, insertion start, insertion end) for the patch's entry or program."""
+    if patch.program is None:
+        return location.fields, 2, 0, location.end - location.start
+    program = location.program(patch.program)
+    if program is None:
+        return None
+    return program.fields, 4, program.start, program.end
+
+
+def _render(patch: Patch, indent: int, rendered: dict) -> bytes:
+    """render_field, remembered per batch (the same date or tag is often set many times)."""
+    try:
+        key = (patch.field, type(patch.value), patch.value, indent)
+        text = rendered.get(key)
+    except TypeError:  # lists and other unhashable values
+        return render_field(patch.field, patch.value, indent)
+    if text is None:
+        text = rendered[key] = render_field(patch.field, patch.value, indent)
+    return text
+
+
+def _edit_entry(location: EntryLocation, block: bytes, patches: list[Patch],
+                rendered: dict | None = None) -> tuple[bytes, list[Patch]]:
+    """The entry's new bytes and the patches that were written into them."""
+    rendered = {} if rendered is None else rendered
+    # Later patches to the same field win; the rest keep their order.
+    latest = {(patch.program, patch.field): patch for patch in patches}
+    replacements = []
+    applied = []
+    for order, patch in enumerate(latest.values()):
+        fields, indent, start, end = _target(location, patch)
+        text = _render(patch, indent, rendered)
+        span = fields.get(patch.field)
+        if span is not None and patch.if_missing:
+            continue
+        applied.append(patch)
+        if span is not None:
+            span_end = _content_end(block, span.start, span.end)
+            if block[span.start:span.start + indent].startswith(b"  - "):
+                # The program's first key shares its line with the list dash.
+                text = b"  - " + text[4:]
+            replacements.append((span.start, span_end, order, text))
+            continue
+        anchors = [fields[name] for name in patch.after if name in fields]
+        if anchors:
+            anchor = max(anchors, key=lambda span: span.start)
+            offset = _content_end(block, anchor.start, anchor.end)
+        else:
+            offset = _content_end(block, start, end)
+        if offset and block[offset - 1:offset] != b"\n":
+            text = b"\n" + text
+        replacements.append((offset, offset, order, text))
+
+    pieces = []
+    position = 0
+    for start, end, _, text in sorted(replacements):
+        pieces.append(block[position:start])
+        pieces.append(text)
+        position = max(position, end)
+    pieces.append(block[position:])
+    return b"".join(pieces), applied
+
+
+def _plan(index: EntryIndex, patches: Iterable[Patch],
+          strict: bool) -> tuple[dict[str, EntryLocation], dict[str, list[Patch]], list[Patch]]:
+    """Locations of the patched entries, their patches, and the patches without a target."""
+    patches = list(patches)
+    locations = index.get_many(patch.entry_id for patch in patches)
+    by_entry: dict[str, list[Patch]] = {}
+    skipped = []
+    for patch in patches:
+        location = locations.get(patch.entry_id)
+        if location is None or _target(location, patch) is None:
+            skipped.append(patch)
+            continue
+        by_entry.setdefault(patch.entry_id, []).append(patch)
+    if strict and skipped:
+        missing = ", ".join(f"{p.entry_id}/{p.program}" if p.program else p.entry_id for p in skipped)
+        raise ValueError(f"patch targets not found: {missing}")
+    return locations, by_entry, skipped
+
+
+def patch_text(content: str, patches: Iterable[Patch], strict: bool = True) -> str:
+    """`content` with the patches applied (for text that is not on disk yet)."""
+    data = content.encode("utf-8")
+    index = EntryIndex.for_bytes(data)
+    locations, by_entry, _ = _plan(index, patches, strict)
+    blocks = {}
+    rendered = {}
+    for entry_id, entry_patches in by_entry.items():
+        location = locations[entry_id]
+        blocks[entry_id], _ = _edit_entry(location, data[location.start:location.end], entry_patches, rendered)
+    return index.splice(data, blocks).decode("utf-8")
+
+
+def apply_patches(sources_path: str | Path, patches: Iterable[Patch], output_path: str | Path | None = None,
+                  backup: bool = True, strict: bool = True) -> PatchReport:
+    """Apply a batch of patches to a file in one pass.
+
+    Writes over `sources_path` (keeping the original as `.yaml.bak` when
+    `backup`) or to `output_path`. With `strict`, a patch naming an unknown
+    entry or program fails the whole batch before anything is written;
+    otherwise such patches are skipped and reported.
+    """
+    path = Path(sources_path)
+    with EntryIndex.open(path) as index:
+        locations, by_entry, skipped = _plan(index, patches, strict)
+        report = PatchReport(skipped=skipped)
+        if not by_entry:
+            return report
+        rendered = {}
+
+        def edit(location: EntryLocation, block: bytes) -> bytes:
+            new, applied = _edit_entry(location, block, by_entry[location.id], rendered)
+            report.applied.extend(applied)
+            if new != block:
+                report.changed.append(location.id)
+            return new
+
+        output = Path(output_path) if output_path else None
+        in_place = output is None or output.resolve() == path.resolve()
+        keep = path.with_suffix(".yaml.bak") if backup and in_place else None
+        if index.rewrite([locations[entry_id] for entry_id in by_entry], edit, output=output, backup=keep):
+            report.backup = keep
+    return report
+
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Synthetic sources.yaml corpora for load and performance testing.
+
+The real file has a few hundred entries, which says little about how a stage
+scales. This builds larger corpora that keep the shape of the real data:
+entries are modelled on randomly drawn real "prototype" entries, so the
+category mix, field coverage, tag lists and program counts follow the real
+distributions, while the parts that vary per entry are regenerated:
+
+- schedules: real phrases (keeping the real share of vague ones) mixed with
+  templated phrases in the styles parse_schedule understands
+- dates: the single-date, list, same-month, cross-month and month-span
+  forms parse_date_string understands
+- addresses and coordinates inside geocode_addresses.PORTLAND_BOUNDS
+- source_urls: shared public-agency hosts in their real proportions, plus
+  per-organization hosts, so host counts grow the way a real corpus would
+
+Output is a pure function of (size, seed, the real sources.yaml): the same
+arguments always produce byte-identical YAML.
+
+Usage:
+    python synthetic_sources.py --entries 10000 --output /tmp/sources-10k.yaml
+    python synthetic_sources.py --entries 100000 --seed 7 --output big.yaml
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import tempfile
+from collections import Counter
+from collections.abc import Mapping
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from urllib.parse import urlparse
+
+from geocode_addresses import PORTLAND_BOUNDS
+from utils import cache_dir_for, get_default_sources_path, load_sources, yaml_dump
+
+
+# Bump when the generator's output changes for a given (size, seed), so cached
+# corpora from an older generator are regenerated.
+GENERATOR_VERSION = 1
+
+# The sizes benchmarks and scale tests target.
+CORPUS_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_SEED = 0
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+DAY_ABBREVS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+MONTH_NAMES = ["January", "February", "March", "April", "May", "June", "July",
+               "August", "September", "October", "November", "December"]
+ORDINALS = ["1st", "2nd", "3rd", "4th"]
+
+STREETS = ["Burnside", "Hawthorne", "Division", "Alberta", "Killingsworth", "Sandy",
+           "Belmont", "Broadway", "Powell", "Foster", "Lombard", "Glisan", "Stark",
+           "Morrison", "Salmon", "Main", "Canyon", "Boones Ferry", "Macadam", "Fremont"]
+STREET_PREFIXES = ["NE", "SE", "NW", "SW", "N"]
+STREET_SUFFIXES = ["St", "Ave", "Blvd", "Rd", "Hwy", "Way"]
+CITIES = [("Portland", "972"), ("Beaverton", "970"), ("Gresham", "970"), ("Hillsboro", "971"),
+          ("Lake Oswego", "970"), ("Milwaukie", "972"), ("Oregon City", "970"),
+          ("Tigard", "972"), ("Tualatin", "970"), ("Vancouver", "986")]
+HOST_WORDS = ["community", "portland", "peer", "arts", "parks", "wellness", "northwest",
+              "recovery", "friends", "center", "collective", "network", "metro", "rose"]
+HOST_TLDS = ["org", "org", "org", "com", "net", "us"]
+
+
+def _format_time(minutes: int, with_suffix: bool = True) -> str:
+    hour, minute = divmod(minutes, 60)
+    text = str((hour - 1) % 12 + 1) + (f":{minute:02d}" if minute else "")
+    return text + ("am" if hour < 12 else "pm") if with_suffix else text
+
+
+def _time_range(rng: random.Random) -> str:
+    """A time range in the house style: "6-7:30pm", "10am-12pm", "11:30am-1pm"."""
+    start = rng.randrange(7 * 60, 20 * 60, 30)
+    end = start + rng.choice([60, 90, 120, 150, 180])
+    same_half = (start < 12 * 60) == (end < 12 * 60)
+    return f"{_format_time(start, not same_half)}-{_format_time(end)}"
+
+
+def _templated_schedule(rng: random.Random) -> str:
+    """A schedule phrase parse_schedule resolves to a recurrence."""
+    day = rng.randrange(7)
+    other = (day + rng.randrange(1, 7)) % 7
+    times = _time_range(rng)
+    style = rng.randrange(8)
+    if style == 0:
+        return f"Every {DAYS[day]}, {times}"
+    if style == 1:
+        return f"{DAYS[day]}s {times}"
+    if style == 2:
+        return f"{rng.choice(ORDINALS)} {DAYS[day]} of the month, {times}"
+    if style == 3:
+        return f"1st & 3rd {DAYS[day]}s, {times}"
+    if style == 4:
+        return f"Last {DAYS[day]} {times}"
+    if style == 5:
+        first, last = sorted((day, other))
+        return f"{DAY_ABBREVS[first]}-{DAY_ABBREVS[last]} {times}"
+    if style == 6:
+        first, last = sorted((day, other))
+        return f"{DAY_ABBREVS[first]}/{DAY_ABBREVS[last]} {times}"
+    return f"Daily {times}"
+
+
+def _format_date(day: date) -> str:
+    return f"{MONTH_NAMES[day.month - 1]} {day.day}, {day.year}"
+
+
+def _dates_value(rng: random.Random, year: int):
+    """A `dates` value in one of the forms parse_date_string understands."""
+    start = date(year, 1, 1) + timedelta(days=rng.randrange(365))
+    style = rng.randrange(5)
+    if style == 0:
+        return _format_date(start)
+    if style == 1:
+        step = rng.choice([7, 14])
+        return [_format_date(start + timedelta(days=step * i)) for i in range(rng.randrange(2, 9))]
+    if style == 2:
+        end = min(start + timedelta(days=rng.randrange(1, 4)),
+                  date(start.year, start.month, 28) if start.day <= 28 else start)
+        if end.month != start.month or end <= start:
+            return _format_date(start)
+        return f"{MONTH_NAMES[start.month - 1]} {start.day}-{end.day}, {year}"
+    if style == 3:
+        end = start + timedelta(days=rng.randrange(20, 60))
+        if end.year != start.year:
+            return _format_date(start)
+        return (f"{MONTH_NAMES[start.month - 1]} {start.day} - "
+                f"{MONTH_NAMES[end.month - 1]} {end.day}, {year}")
+    last_month = min(start.month + rng.randrange(1, 4), 12)
+    return f"{MONTH_NAMES[start.month - 1]} through {MONTH_NAMES[last_month - 1]} {year}"
+
+
+def _fresh(value):
+    """A deep, plain-container copy sharing no mutable objects or dates.
+
+    PyYAML writes any object it meets twice as an anchor and alias, so
+    entries modelled on the same prototype must not share anything.
+    """
+    if isinstance(value, Mapping):
+        return {key: _fresh(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_fresh(item) for item in value]
+    if isinstance(value, datetime):
+        return value.replace()
+    if isinstance(value, date):
+        return date(value.year, value.month, value.day)
+    return value
+
+
+class _Model:
+    """Distributions drawn from the real corpus."""
+
+    def __init__(self, entries: list[dict]):
+        self.entries = entries
+        self.programs: dict[str, list[dict]] = {}
+        schedules = []
+        for entry in entries:
+            if entry.get("schedule"):
+                schedules.append(str(entry["schedule"]))
+            for program in entry.get("programs") or []:
+                if not isinstance(program, Mapping):
+                    continue
+                self.programs.setdefault(entry.get("category"), []).append(program)
+                if program.get("schedule"):
+                    schedules.append(str(program["schedule"]))
+        self.schedules = schedules
+
+        hosts = Counter(
+            urlparse(url).netloc
+            for entry in entries for url in entry.get("source_urls") or [] if isinstance(url, str)
+        )
+        total_urls = sum(hosts.values()) or 1
+        # Hosts that serve more than one URL are shared agencies (portland.gov,
+        # trimet.org); everything else stands in for one organization's site.
+        shared = sorted((host, count) for host, count in hosts.items() if count > 1)
+        self.shared_hosts = [host for host, _ in shared]
+        self.shared_weights = [count for _, count in shared]
+        self.shared_share = sum(self.shared_weights) / total_urls
+
+        verified = [entry["last_verified"] for entry in entries if isinstance(entry.get("last_verified"), date)]
+        self.verified_range = (min(verified), max(verified)) if verified else (date(2026, 1, 1),) * 2
+        self.year = self.verified_range[1].year
+
+
+class _Generator:
+    def __init__(self, model: _Model, seed: int):
+        self.model = model
+        self.rng = random.Random(seed)
+        self.org_hosts: list[str] = []
+
+    def schedule(self) -> str:
+        # Half the phrases are real ones, so the real share of vague phrasing
+        # ("Various", "Check website") carries over; half are templated.
+        if self.rng.random() < 0.5:
+            return self.rng.choice(self.model.schedules)
+        return _templated_schedule(self.rng)
+
+    def address(self) -> tuple[str, float, float]:
+        rng = self.rng
+        city, zip_prefix = rng.choice(CITIES)
+        address = (f"{rng.randrange(100, 20000)} {rng.choice(STREET_PREFIXES)} {rng.choice(STREETS)} "
+                   f"{rng.choice(STREET_SUFFIXES)}, {city}, OR {zip_prefix}{rng.randrange(10, 100):02d}")
+        lat = round(rng.uniform(PORTLAND_BOUNDS["lat_min"], PORTLAND_BOUNDS["lat_max"]), 6)
+        lng = round(rng.uniform(PORTLAND_BOUNDS["lng_min"], PORTLAND_BOUNDS["lng_max"]), 6)
+        return address, lat, lng
+
+    def host(self, index: int) -> str:
+        rng = self.rng
+        if self.model.shared_hosts and rng.random() < self.model.shared_share:
+            return rng.choices(self.model.shared_hosts, self.model.shared_weights)[0]
+        # Organizations often list a couple of pages on their own site.
+        if self.org_hosts and rng.random() < 0.15:
+            return self.org_hosts[-1]
+        host = f"www.{rng.choice(HOST_WORDS)}-{rng.choice(HOST_WORDS)}-{index}.{rng.choice(HOST_TLDS)}"
+        self.org_hosts.append(host)
+        return host
+
+    def source_urls(self, count: int, index: int) -> list[str]:
+        rng = self.rng
+        return [f"https://{self.host(index)}/{rng.choice(HOST_WORDS)}/{rng.randrange(1, 500)}"
+                for _ in range(count)]
+
+    def program(self, category: str, index: int) -> dict:
+        rng = self.rng
+        pool = self.model.programs.get(category) or [p for ps in self.model.programs.values() for p in ps]
+        program = _fresh(rng.choice(pool))
+        program["name"] = f"{program.get('name', 'Program')} {index}"
+        if program.get("schedule"):
+            program["schedule"] = self.schedule()
+        if program.get("dates"):
+            program["dates"] = _dates_value(rng, self.model.year)
+        return program
+
+    def entry(self, index: int) -> dict:
+        rng = self.rng
+        prototype = rng.choice(self.model.entries)
+        entry = _fresh(prototype)
+        entry["id"] = f"{prototype['id']}-{index}"
+        entry["name"] = f"{prototype.get('name', 'Resource')} {index}"
+        if "address" in prototype:
+            address, lat, lng = self.address()
+            entry["address"] = address
+            if "latitude" in prototype:
+                entry["latitude"], entry["longitude"] = lat, lng
+        entry["source_urls"] = self.source_urls(len(prototype.get("source_urls") or []) or 1, index)
+        if prototype.get("schedule"):
+            entry["schedule"] = self.schedule()
+        if prototype.get("dates"):
+            entry["dates"] = _dates_value(rng, self.model.year)
+        if prototype.get("programs"):
+            entry["programs"] = [self.program(prototype.get("category"), index * 100 + i)
+                                 for i in range(len(prototype["programs"]))]
+        first, last = self.model.verified_range
+        verified = first + timedelta(days=rng.randrange((last - first).days + 1))
+        entry["last_verified"] = verified
+        if isinstance(prototype.get("next_audit"), date) and isinstance(prototype.get("last_verified"), date):
+            entry["next_audit"] = verified + (prototype["next_audit"] - prototype["last_verified"])
+        return entry
+
+
+def generate_entries(count: int, seed: int = DEFAULT_SEED, template: list[dict] | None = None) -> list[dict]:
+    """`count` synthetic entries modelled on `template` (default: the real corpus)."""
+    template = template if template is not None else load_sources(get_default_sources_path())
+    generator = _Generator(_Model(template), seed)
+    return [generator.entry(index) for index in range(count)]
+
+
+def generate_schedules(count: int, seed: int = DEFAULT_SEED, template: list[dict] | None = None) -> list[str]:
+    """`count` schedule phrases, drawn the way synthetic entries draw theirs."""
+    template = template if template is not None else load_sources(get_default_sources_path())
+    generator = _Generator(_Model(template), seed)
+    return [generator.schedule() for _ in range(count)]
+
+
+def generate_date_strings(count: int, seed: int = DEFAULT_SEED, year: int = 2026) -> list[str]:
+    """`count` date strings in the forms synthetic `dates` values take."""
+    rng = random.Random(seed)
+    date_strs: list[str] = []
+    while len(date_strs) < count:
+        value = _dates_value(rng, year)
+        date_strs.extend(value if isinstance(value, list) else [value])
+    return date_strs[:count]
+
+
+def generate_resolved_schedules(count: int, seed: int = DEFAULT_SEED, year: int = 2026) -> list[dict]:
+    """`count` resolved_schedule dicts with random intervals, weeks, anchors and end dates.
+
+    Weekly and monthly in equal measure, 1-3 weekdays, up to three month
+    weeks (including -1), intervals up to 4 and an until_date on half of
+    them. Anchors fall anywhere in the three years from `year - 1`, and need
+    not be occurrences themselves, so the engine's bounds are exercised too.
+    """
+    rng = random.Random(seed)
+    weekday_codes = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+    schedules = []
+    for _ in range(count):
+        monthly = rng.random() < 0.5
+        anchor = date(year - 1, 1, 1) + timedelta(days=rng.randrange(3 * 365))
+        until = anchor + timedelta(days=rng.randrange(1500)) if rng.random() < 0.5 else None
+        schedules.append({
+            "type": "recurring",
+            "frequency": "monthly" if monthly else "weekly",
+            "interval": rng.choice([1, 1, 1, 2, 2, 3, 4]),
+            "weekdays": rng.sample(weekday_codes, rng.randint(1, 3)),
+            "month_weeks": sorted(rng.sample([1, 2, 3, 4, 5, -1], rng.randint(1, 3))) if monthly else [],
+            "anchor_date": anchor.isoformat(),
+            "until_date": until.isoformat() if until else None,
+            "start_time": "18:00",
+            "end_time": "19:30",
+            "end_day_offset": 0,
+        })
+    return schedules
+
+
+def generate_sources_text(count: int, seed: int = DEFAULT_SEED, template: list[dict] | None = None) -> str:
+    """Synthetic sources.yaml text: one YAML document per category, like the real file."""
+    by_category: dict[str, list[dict]] = {}
+    for entry in generate_entries(count, seed, template):
+        by_category.setdefault(entry.get("category"), []).append(entry)
+    documents = [
+        yaml_dump(entries, allow_unicode=True, sort_keys=False, width=120, default_flow_style=False)
+        for entries in by_category.values()
+    ]
+    return "".join(f"---\n{document}" for document in documents)
+
+
+def synthetic_sources_path(count: int, seed: int = DEFAULT_SEED) -> Path:
+    """Path of a cached synthetic corpus, generating it on first use.
+
+    Corpora live next to the derived caches of the real sources.yaml
+    (data/.cache/, gitignored) and are keyed by size, seed, generator version
+    and the real file's content, so every benchmark and scale test can share
+    one copy and an edit to the real data regenerates it.
+    """
+    sources_path = get_default_sources_path()
+    template_hash = hashlib.sha256(sources_path.read_bytes()).hexdigest()[:12]
+    cache_dir = cache_dir_for(sources_path)
+    path = cache_dir / f"synthetic-{count}-s{seed}-v{GENERATOR_VERSION}-{template_hash}.yaml"
+    if not path.exists():
+        for stale in cache_dir.glob(f"synthetic-{count}-s{seed}-*.yaml"):
+            stale.unlink(missing_ok=True)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=cache_dir, prefix=".synthetic-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(generate_sources_text(count, seed))
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    return path
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic sources.yaml for scale testing")
+    parser.add_argument("--entries", type=int, default=CORPUS_SIZES[0],
+                        help=f"Number of entries (benchmarks use {', '.join(map(str, CORPUS_SIZES))})")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Random seed (default: 0)")
+    parser.add_argument("--output", type=Path, help="Write here instead of stdout")
+    args = parser.parse_args(argv)
+    if args.entries < 0:
+        parser.error("--entries cannot be negative")
+
+    text = generate_sources_text(args.entries, args.seed)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+        print(f"Wrote {args.entries} entries to {args.output}", file=sys.stderr)
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
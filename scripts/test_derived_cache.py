@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Tests for the persistent derived-data cache.
+
+Run: python -m pytest test_derived_cache.py -v
+  or: python test_derived_cache.py
+"""
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import derived_cache
+from derived_cache import DerivedCache
+from generate_calendar import generate_json_feed, parse_date_string, parse_schedule
+from utils import NO_CACHE_ENV, get_default_sources_path, load_sources
+
+
+class TestDerivedCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "derived.pickle"
+        self.sources_path = Path(self.tmp.name) / "sources.yaml"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def session(self, **kwargs):
+        return derived_cache.session(self.sources_path, report=False, **kwargs)
+
+    def test_hit_returns_a_fresh_copy(self):
+        cache = DerivedCache(self.path, "v1")
+        first = cache.lookup("f", None, "x", lambda: {"days": ["MO"]})
+        first["days"].append("TU")
+        self.assertEqual(cache.lookup("f", None, "x", lambda: self.fail("recomputed")), {"days": ["MO"]})
+        self.assertEqual((cache.hits["f"], cache.misses["f"]), (1, 1))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = DerivedCache(self.path, "v1", max_entries=2)
+        cache.lookup("f", None, "a", lambda: 1)
+        cache.lookup("f", None, "b", lambda: 2)
+        cache.lookup("f", None, "a", lambda: 1)
+        cache.lookup("f", None, "c", lambda: 3)
+        self.assertEqual([key[2] for key in cache.entries], ["a", "c"])
+
+    def test_saved_table_is_reused_only_by_the_same_version(self):
+        cache = DerivedCache(self.path, "v1")
+        cache.lookup("f", date(2026, 3, 1), "a", lambda: 1)
+        cache.save()
+        self.assertEqual(len(DerivedCache(self.path, "v1").entries), 1)
+        self.assertEqual(len(DerivedCache(self.path, "v2").entries), 0)
+        self.assertEqual(len(DerivedCache(self.path, "v1", max_entries=0).entries), 0)
+
+    def test_unreadable_file_starts_empty(self):
+        for payload in (b"not a pickle", b"coperator\ntruediv\n(I1\nI0\ntR."):
+            with self.subTest(payload=payload):
+                self.path.write_bytes(payload)
+                self.assertEqual(len(DerivedCache(self.path, "v1").entries), 0)
+
+    def test_parsers_are_uncached_outside_a_session(self):
+        with mock.patch.object(DerivedCache, "lookup") as lookup:
+            parse_schedule("Mondays 6-7pm")
+        lookup.assert_not_called()
+
+    def test_session_keys_dates_by_as_of_date(self):
+        with self.session() as cache:
+            self.assertEqual(parse_date_string("March 12", today=date(2026, 3, 1))[0].year, 2026)
+            self.assertEqual(parse_date_string("March 12", today=date(2026, 4, 1))[0].year, 2027)
+            parse_date_string("March 12", today=date(2026, 3, 1))
+        self.assertEqual((cache.hits["parse_date_string"], cache.misses["parse_date_string"]), (1, 2))
+
+    def test_disabled_and_nested_sessions_do_nothing(self):
+        with mock.patch.dict(os.environ, {NO_CACHE_ENV: "1"}), self.session() as cache:
+            self.assertIsNone(cache)
+        self.assertFalse(self.path.exists())
+        with self.session() as outer, self.session() as inner:
+            self.assertIsNotNone(outer)
+            self.assertIsNone(inner)
+
+    def test_warm_run_parses_nothing(self):
+        entries = load_sources(get_default_sources_path())
+        as_of = date(2026, 3, 1)
+        expected = generate_json_feed(entries, today=as_of)
+        with self.session() as cold:
+            self.assertEqual(generate_json_feed(entries, today=as_of), expected)
+        self.assertTrue(self.path.parent.joinpath(".cache", derived_cache.DERIVED_CACHE_NAME).exists())
+        with self.session() as warm:
+            self.assertEqual(generate_json_feed(entries, today=as_of), expected)
+        self.assertGreater(sum(cold.misses.values()), 100)
+        self.assertEqual(sum(warm.misses.values()), 0)
+        self.assertEqual(set(warm.hits), {"parse_schedule", "parse_date_string",
+                                          "resolve_recurring_schedule", "detect_audience"})
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
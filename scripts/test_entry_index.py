@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""Tests for the byte-offset entry index and the scripts that edit through it.
+
+Run: python -m pytest test_entry_index.py -v
+  or: python test_entry_index.py
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from add_audience_fields import analyze_entry, apply_audience_to_yaml
+from audit_complete import find_entry_info, find_entry_info_in_text, update_sources_yaml
+from entry_index import EntryIndex, entry_blocks_cover, scan_entries
+from utils import NO_CACHE_ENV, get_default_sources_path, load_sources, parse_sources
+
+
+SAMPLE = """\
+---
+# Peer support
+---
+- id: alpha
+  name: Alpha Group
+  category: peer_support
+  good_for:
+    - grief
+  audit_frequency: quarterly
+  last_verified: 2026-01-05
+  next_audit: 2026-04-05
+  programs:
+  - name: "Monday \\"Circle\\""
+    schedule: Every Monday 6-7pm
+    format: in_person
+  - Drop-in hours
+  - name: 'Women''s Group'
+    eligibility: Women 18+
+    last_verified: 2020-01-01
+---
+---
+- id: beta
+  name: Beta Café
+  category: events
+  audit_frequency: monthly
+  last_verified: 2026-02-01
+  next_audit: 2026-03-01
+"""
+
+
+class TestScan(unittest.TestCase):
+    def setUp(self):
+        self.data = SAMPLE.encode("utf-8")
+        self.index = EntryIndex.for_bytes(self.data)
+
+    def test_entry_spans_stop_at_next_entry_or_document_marker(self):
+        alpha, beta = self.index.get("alpha"), self.index.get("beta")
+        self.assertTrue(self.data[alpha.start:alpha.end].startswith(b"- id: alpha\n"))
+        self.assertTrue(self.data[alpha.start:alpha.end].endswith(b"2020-01-01\n"))
+        self.assertEqual(self.data[beta.start:beta.end].decode().splitlines()[-1], "  next_audit: 2026-03-01")
+        self.assertEqual((alpha.line, alpha.end_line), (3, 19))
+        self.assertEqual((beta.line, beta.end_line), (21, 27))
+        self.assertEqual([location.id for location in self.index], ["alpha", "beta"])
+
+    def test_field_spans_are_top_level_only(self):
+        alpha = self.index.get("alpha")
+        self.assertEqual(list(alpha.fields), list(parse_sources(SAMPLE)[0]))
+        span = alpha.field_span("last_verified")
+        self.assertEqual(self.data[span.start:span.end], b"  last_verified: 2026-01-05\n")
+        self.assertEqual(span.line, 9)
+        good_for = alpha.field_span("good_for")
+        self.assertEqual(self.data[good_for.start:good_for.end], b"  good_for:\n    - grief\n")
+
+    def test_programs_unquote_names_and_skip_plain_items(self):
+        alpha = self.index.get("alpha")
+        self.assertEqual([program.name for program in alpha.programs], ['Monday "Circle"', "Women's Group"])
+        womens = alpha.program("Women's Group")
+        self.assertEqual(list(womens.fields), ["name", "eligibility", "last_verified"])
+        block = self.data[alpha.start:alpha.end]
+        span = womens.fields["eligibility"]
+        self.assertEqual(block[span.start:span.end], b"    eligibility: Women 18+\n")
+        self.assertIsNone(alpha.program("Drop-in hours"))
+
+    def test_entry_blocks_cover_only_id_first_entries(self):
+        self.assertTrue(entry_blocks_cover(self.data))
+        for data in (self.data.replace(b"- id: beta\n  name: Beta Caf\xc3\xa9\n", b"- name: Beta\n  id: beta\n"),
+                     b"- name: First\n  id: first\n" + self.data,
+                     self.data + b"-\n  id: last\n"):
+            with self.subTest(data=data[:30]):
+                self.assertFalse(entry_blocks_cover(data))
+
+    def test_splice_replaces_entries_in_one_pass(self):
+        beta = self.index.get("beta")
+        block = self.data[beta.start:beta.end].replace(b"monthly", b"quarterly")
+        spliced = self.index.splice(self.data, {"beta": block})
+        self.assertEqual(spliced, self.data.replace(b"monthly", b"quarterly"))
+        with self.assertRaises(KeyError):
+            self.index.splice(self.data, {"missing": b""})
+
+    def test_real_sources_match_parsed_entries(self):
+        path = get_default_sources_path()
+        locations = list(scan_entries(path.read_bytes()))
+        entries = load_sources(path)
+        self.assertEqual([location.id for location in locations], [entry["id"] for entry in entries])
+        for location, entry in zip(locations, entries):
+            with self.subTest(id=entry["id"]):
+                self.assertEqual(list(location.fields), list(entry))
+                programs = [p for p in entry.get("programs") or [] if hasattr(p, "get")]
+                self.assertEqual([p.name for p in location.programs],
+                                 [None if p.get("name") is None else str(p["name"]) for p in programs])
+
+
+class TestPersistentIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "sources.yaml"
+        self.path.write_text(SAMPLE, encoding="utf-8")
+        self.env = mock.patch.dict(os.environ)
+        self.env.start()
+        os.environ.pop(NO_CACHE_ENV, None)
+
+    def tearDown(self):
+        self.env.stop()
+        self.tmp.cleanup()
+
+    def assertMatchesFreshScan(self, index):
+        self.assertEqual(list(index), list(EntryIndex.for_bytes(self.path.read_bytes())))
+
+    def test_index_is_stored_and_reused(self):
+        with EntryIndex.open(self.path) as index:
+            self.assertEqual(len(index), 2)
+        self.assertTrue((Path(self.tmp.name) / ".cache" / "sources.yaml.index.sqlite").exists())
+        with mock.patch("entry_index._scan_rows") as scan, EntryIndex.open(self.path) as index:
+            self.assertIn("beta", index)
+        scan.assert_not_called()
+
+    def test_changed_file_is_rescanned(self):
+        EntryIndex.open(self.path).close()
+        self.path.write_text(SAMPLE.replace("- id: beta", "- id: gamma"), encoding="utf-8")
+        with EntryIndex.open(self.path) as index:
+            self.assertNotIn("beta", index)
+            self.assertIsNotNone(index.get("gamma"))
+
+    def test_touched_but_unchanged_file_keeps_index(self):
+        EntryIndex.open(self.path).close()
+        os.utime(self.path, ns=(0, 0))
+        with mock.patch("entry_index._scan_rows") as scan, EntryIndex.open(self.path) as index:
+            self.assertEqual(len(index), 2)
+        scan.assert_not_called()
+
+    def test_replace_entry_shifts_later_entries(self):
+        with EntryIndex.open(self.path) as index:
+            alpha = index.read_entry("alpha")
+            index.replace_entry("alpha", alpha.replace(b"  category: peer_support\n",
+                                                       b"  category: peer_support\n  status: open\n"))
+            self.assertIn(b"  status: open\n", self.path.read_bytes())
+            self.assertMatchesFreshScan(index)
+            self.assertEqual(index.read_entry("beta")[:10], b"- id: beta")
+        fresh = list(EntryIndex.for_bytes(self.path.read_bytes()))
+        with mock.patch("entry_index._scan_rows") as scan, EntryIndex.open(self.path) as index:
+            self.assertEqual(list(index), fresh)
+        scan.assert_not_called()
+
+    def test_stale_offsets_are_rebuilt_before_writing(self):
+        EntryIndex.open(self.path).close()
+        stat = self.path.stat()
+        # Same size and mtime, but alpha now starts 8 bytes earlier.
+        shifted = SAMPLE.replace("# Peer support", "# Peer").replace("Alpha Group", "Alpha Group renamed").encode()
+        self.path.write_bytes(shifted)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(self.path.stat().st_size, stat.st_size)
+        block = b"- id: alpha\n  name: Replaced\n"
+        with EntryIndex.open(self.path) as index:
+            index.replace_entry("alpha", block)
+            self.assertMatchesFreshScan(index)
+        self.assertEqual(self.path.read_bytes(), EntryIndex.for_bytes(shifted).splice(shifted, {"alpha": block}))
+
+    def test_no_cache_builds_in_memory(self):
+        os.environ[NO_CACHE_ENV] = "1"
+        with EntryIndex.open(self.path) as index:
+            self.assertEqual(index.read_entry("beta")[:10], b"- id: beta")
+        self.assertFalse((Path(self.tmp.name) / ".cache").exists())
+
+
+class TestEditingScripts(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "sources.yaml"
+        self.path.write_text(SAMPLE, encoding="utf-8")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_find_entry_info_reads_top_level_fields(self):
+        info = find_entry_info(self.path, "alpha")
+        self.assertEqual(info, find_entry_info_in_text(SAMPLE, "alpha"))
+        self.assertEqual(find_entry_info(str(self.path), "alpha"), info)
+        self.assertEqual(info["name"], "Alpha Group")
+        self.assertEqual(info["last_verified"], "2026-01-05")
+        self.assertEqual(SAMPLE.split("\n")[info["next_audit_line"]], "  next_audit: 2026-04-05")
+        self.assertIsNone(find_entry_info(self.path, "missing"))
+
+    def test_update_sources_yaml_edits_only_the_entry(self):
+        with redirect_stdout(StringIO()):
+            self.assertTrue(update_sources_yaml(self.path, "beta", "2026-10-01", "2026-11-01"))
+            self.assertTrue(update_sources_yaml(self.path, "alpha", "2026-10-01", "2027-1-1"))
+        after_beta = SAMPLE.replace("2026-02-01", "2026-10-01").replace("2026-03-01", "2026-11-01")
+        expected = after_beta.replace("2026-01-05", "2026-10-01").replace("2026-04-05", "2027-01-01")
+        self.assertEqual(self.path.read_text(encoding="utf-8"), expected)
+        self.assertEqual(self.path.with_suffix(".yaml.bak").read_text(encoding="utf-8"), after_beta)
+        self.assertEqual(find_entry_info(self.path, "beta")["next_audit"], "2026-11-01")
+
+    def test_apply_audience_matches_whole_file_walk(self):
+        sources = get_default_sources_path()
+        path = Path(self.tmp.name) / "real.yaml"
+        shutil.copy(sources, path)
+        results = [result for result in map(analyze_entry, load_sources(sources))
+                   if result["entry_level_audience"] or result["program_audiences"]]
+        output = Path(self.tmp.name) / "out.yaml"
+        modified = apply_audience_to_yaml(path, results, output)
+        self.assertGreater(modified, 0)
+        self.assertEqual(path.read_bytes(), sources.read_bytes())
+        # Every edit lands inside its own entry; the rest of the file is untouched.
+        touched = {result["id"] for result in results}
+        before = EntryIndex.for_bytes(path.read_bytes())
+        after = EntryIndex.for_bytes(output.read_bytes())
+        self.assertEqual([location.id for location in before], [location.id for location in after])
+        original, updated = path.read_bytes(), output.read_bytes()
+        for old, new in zip(before, after):
+            if old.id not in touched:
+                self.assertEqual(original[old.start:old.end], updated[new.start:new.end])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Tests for the vectorized catalog occurrence expansion.
+
+Run: python -m pytest test_occurrence_arrays.py -v
+  or: python test_occurrence_arrays.py
+"""
+import os
+import sys
+import unittest
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import occurrence_arrays
+from occurrence_arrays import (
+    catalog_schedules, counts_per_category, counts_per_day, counts_per_hour_of_week, expand_occurrences,
+    scalar_occurrences,
+)
+from synthetic_sources import generate_entries, generate_resolved_schedules
+from utils import get_default_sources_path, load_sources
+
+
+AS_OF = date(2026, 3, 1)
+HORIZON_END = date(2028, 2, 29)
+
+
+def recurring(frequency="weekly", weekdays=("MO",), interval=1, month_weeks=(), anchor="2026-03-02", until=None):
+    return {
+        "type": "recurring", "frequency": frequency, "interval": interval,
+        "weekdays": list(weekdays), "month_weeks": list(month_weeks),
+        "anchor_date": anchor, "until_date": until,
+        "start_time": "22:00", "end_time": "01:00", "end_day_offset": 1,
+    }
+
+
+@unittest.skipUnless(occurrence_arrays.HAS_NUMPY, "NumPy not installed")
+class TestExpandOccurrences(unittest.TestCase):
+    def rows(self, schedules, start=AS_OF, end=HORIZON_END):
+        arrays = expand_occurrences(schedules, start, end)
+        return [(int(entry), begin.astype(datetime), finish.astype(datetime))
+                for entry, begin, finish in zip(arrays.entry, arrays.start, arrays.end)]
+
+    def assertSameAsScalar(self, schedules, start=AS_OF, end=HORIZON_END):
+        expected = scalar_occurrences(schedules, start, end)
+        self.assertEqual(self.rows(schedules, start, end), expected)
+        return expected
+
+    def test_real_catalog(self):
+        entries = load_sources(get_default_sources_path())
+        rows = self.assertSameAsScalar(catalog_schedules(entries, AS_OF))
+        self.assertGreater(len(rows), 1000)
+
+    def test_synthetic_catalog(self):
+        self.assertSameAsScalar(catalog_schedules(generate_entries(300, seed=17), AS_OF))
+
+    def test_random_resolved_schedules(self):
+        schedules = list(enumerate(generate_resolved_schedules(500, seed=17)))
+        self.assertSameAsScalar(schedules, date(2025, 1, 1), date(2029, 12, 31))
+
+    def test_overnight_times_and_daily_frequency(self):
+        schedules = [(0, recurring("daily", weekdays=[], interval=3)), (1, recurring("daily", ["SA"]))]
+        rows = self.assertSameAsScalar(schedules, date(2026, 3, 1), date(2026, 3, 14))
+        self.assertEqual(rows[0], (0, datetime(2026, 3, 2, 22, 0), datetime(2026, 3, 3, 1, 0)))
+        self.assertEqual([begin.day for entry, begin, _ in rows], [2, 5, 8, 11, 14, 7, 14])
+
+    def test_fifth_and_last_week_are_not_counted_twice(self):
+        schedules = [(0, recurring("monthly", ["FR"], month_weeks=[5, -1], anchor="2026-01-01"))]
+        rows = self.assertSameAsScalar(schedules, date(2026, 5, 1), date(2026, 5, 31))
+        self.assertEqual([begin.day for _, begin, _ in rows], [29])
+
+    def test_fixed_occurrences_use_their_own_times(self):
+        schedules = [(4, {"type": "fixed", "occurrences": [
+            {"start_date": "2026-04-10", "end_date": "2026-04-12", "all_day": True,
+             "start_time": None, "end_time": None, "end_day_offset": 0},
+            {"start_date": "2026-04-01", "end_date": "2026-04-01", "all_day": False,
+             "start_time": "18:00", "end_time": "20:00", "end_day_offset": 0},
+            {"start_date": "2025-04-01", "end_date": "2025-04-01", "all_day": True,
+             "start_time": None, "end_time": None, "end_day_offset": 0},
+        ]})]
+        self.assertEqual(self.assertSameAsScalar(schedules), [
+            (4, datetime(2026, 4, 1, 18, 0), datetime(2026, 4, 1, 20, 0)),
+            (4, datetime(2026, 4, 10), datetime(2026, 4, 13)),
+        ])
+
+    def test_empty_catalog(self):
+        arrays = expand_occurrences([], AS_OF, HORIZON_END)
+        self.assertEqual((len(arrays.entry), len(arrays.start), len(arrays.end)), (0, 0, 0))
+
+    def test_counts(self):
+        entries = [{"category": "fitness"}, {"category": "events"}]
+        schedules = [(0, recurring(weekdays=["MO", "WE"])), (1, recurring(weekdays=["SU"]))]
+        arrays = expand_occurrences(schedules, date(2026, 3, 2), date(2026, 3, 8))
+        self.assertEqual(counts_per_category(arrays, entries), {"fitness": 2, "events": 1})
+        days, counts = counts_per_day(arrays)
+        self.assertEqual([str(day) for day in days], ["2026-03-02", "2026-03-04", "2026-03-08"])
+        self.assertEqual(counts.tolist(), [1, 1, 1])
+        by_hour = counts_per_hour_of_week(arrays)
+        self.assertEqual(len(by_hour), 168)
+        self.assertEqual({hour: int(by_hour[hour]) for hour in by_hour.nonzero()[0]},
+                         {22: 1, 2 * 24 + 22: 1, 6 * 24 + 22: 1})
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
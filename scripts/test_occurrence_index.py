@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Tests for the occurrence interval index.
+
+Run: python -m pytest test_occurrence_index.py -v
+  or: python test_occurrence_index.py
+"""
+import os
+import random
+import sys
+import unittest
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from occurrence_index import FACETS, IntervalTree, OccurrenceIndex, main
+from utils import get_default_sources_path, load_sources
+
+
+AS_OF = date(2026, 3, 1)
+
+
+class TestIntervalTree(unittest.TestCase):
+    def test_matches_a_scan(self):
+        rng = random.Random(19)
+        intervals = []
+        for value in range(3000):
+            start = rng.randrange(10_000)
+            intervals.append((start, start + rng.choice([1, 5, 60, 600, 3000]), value))
+        tree = IntervalTree(intervals)
+        for _ in range(500):
+            start = rng.randrange(-100, 11_000)
+            end = start + rng.randrange(1, 800)
+            self.assertEqual(sorted(tree.overlapping(start, end)),
+                             sorted(value for lo, hi, value in intervals if lo < end and hi > start))
+
+    def test_windows_are_half_open(self):
+        tree = IntervalTree([(10, 20, "a")])
+        self.assertEqual(tree.overlapping(20, 30), [])
+        self.assertEqual(tree.overlapping(0, 10), [])
+        self.assertEqual(tree.overlapping(19, 30), ["a"])
+        self.assertEqual(IntervalTree([]).overlapping(0, 10), [])
+
+
+class TestOccurrenceIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.index = OccurrenceIndex.build(load_sources(get_default_sources_path()), AS_OF, months=6)
+
+    def scan(self, start, end, **filters):
+        index = self.index
+        return [occurrence for position, occurrence in enumerate(index.occurrences)
+                if occurrence.start < end and occurrence.end > start
+                and all(value in index.facets[position][facet] for facet, value in filters.items())]
+
+    def test_queries_match_a_scan(self):
+        rng = random.Random(19)
+        values = {facet: sorted({value for facet_values in self.index.facets for value in facet_values[facet]})
+                  for facet in FACETS}
+        for _ in range(150):
+            start = datetime(2026, 3, 1) + timedelta(minutes=rng.randrange(180 * 24 * 60))
+            end = start + timedelta(minutes=rng.choice([30, 240, 24 * 60, 3 * 24 * 60]))
+            filters = {facet: rng.choice(values[facet]) for facet in rng.sample(FACETS, rng.randint(0, 2))}
+            expected = sorted(self.scan(start, end, **filters), key=lambda o: (o.start, o.end))
+            self.assertEqual(self.index.query(start, end, **filters), expected, (start, end, filters))
+
+    def test_evening_query(self):
+        found = self.index.query(datetime(2026, 3, 3, 17), datetime(2026, 3, 4), category="peer_support")
+        self.assertTrue(found)
+        self.assertTrue(all(o.category == "peer_support" and o.end > datetime(2026, 3, 3, 17) for o in found))
+        self.assertEqual([o.start for o in found], sorted(o.start for o in found))
+
+    def test_unknown_filter_value_finds_nothing(self):
+        self.assertEqual(self.index.query(datetime(2026, 3, 1), datetime(2026, 4, 1), category="nope"), [])
+
+    def test_cli_rejects_mixed_windows(self):
+        with self.assertRaises(SystemExit):
+            main(["--on", "2026-03-03", "--start", "2026-03-03", "--end", "2026-03-04"])
+        with self.assertRaises(SystemExit):
+            main(["--start", "2026-03-03"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
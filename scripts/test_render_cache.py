@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Tests for the per-entry render cache behind incremental generate_calendar runs.
+
+Run: python -m pytest test_render_cache.py -v
+  or: python test_render_cache.py
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from entry_index import entry_blocks
+from generate_calendar import generate_json_feed, json_feed_generated, render_entry, write_json_feed
+from render_cache import RENDER_CACHE_NAME, RenderCache
+from utils import NO_CACHE_ENV, cache_dir_for, get_default_sources_path, is_closed, load_sources
+
+
+AS_OF = date(2026, 3, 1)
+
+
+def render(entry):
+    return render_entry(entry, AS_OF)
+
+
+# beta opens with `name:`, so entry_blocks() folds it into alpha's block.
+NAME_FIRST = b"""---
+- id: alpha
+  name: Alpha Group
+  category: peer_support
+  schedule: Every Monday 6-7pm
+- name: Beta Group
+  id: beta
+  category: peer_support
+  schedule: Every Tuesday 6-7pm
+"""
+
+
+def edit_entry(data: bytes, position: int) -> bytes:
+    """`data` with the name of the entry at `position` changed."""
+    _, start, end = list(entry_blocks(data))[position]
+    return data[:start] + data[start:end].replace(b"\n  name: ", b"\n  name: Edited ", 1) + data[end:]
+
+
+class TestJsonFeedText(unittest.TestCase):
+    def assertSameFeed(self, entries):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "events.json"
+            rendered = [render(entry) for entry in entries]
+            write_json_feed(path, [entry.json for entry in rendered],
+                            json_feed_generated(entry.last_verified for entry in rendered))
+            expected = json.dumps(generate_json_feed(entries, today=AS_OF), indent=2, default=str)
+            self.assertEqual(path.read_text(encoding="utf-8"), expected)
+
+    def test_matches_json_dump_of_the_feed(self):
+        self.assertSameFeed([entry for entry in load_sources(get_default_sources_path()) if not is_closed(entry)])
+
+    def test_empty_feed(self):
+        self.assertSameFeed([])
+
+
+class TestRenderCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / RENDER_CACHE_NAME
+        self.data = get_default_sources_path().read_bytes()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, data, as_of=AS_OF, version="v1", verify=False):
+        cache = RenderCache(self.path, as_of, version)
+        rendered, report = cache.update(data, lambda entry: render_entry(entry, as_of), verify=verify)
+        cache.save()
+        return rendered, report
+
+    def test_unchanged_sources_reuse_every_render(self):
+        first, report = self.build(self.data)
+        self.assertEqual((report.reused, report.removed), (0, 0))
+        self.assertEqual(len(first), len(list(entry_blocks(self.data))))
+        second, report = self.build(self.data)
+        self.assertEqual((report.reused, report.rendered), (len(first), 0))
+        self.assertEqual(second, first)
+        self.assertTrue(any(entry.warnings for entry in second))
+
+    def test_one_edit_renders_one_entry(self):
+        before, _ = self.build(self.data)
+        after, report = self.build(edit_entry(self.data, 10))
+        self.assertEqual((report.rendered, report.removed), (1, 1))
+        self.assertEqual(after[:10] + after[11:], before[:10] + before[11:])
+        self.assertNotEqual(after[10], before[10])
+
+    def test_as_of_date_and_generator_version_invalidate(self):
+        self.build(self.data)
+        for as_of, version in ((date(2026, 3, 2), "v1"), (AS_OF, "v2")):
+            with self.subTest(as_of=as_of, version=version):
+                _, report = self.build(self.data, as_of=as_of, version=version)
+                self.assertEqual(report.reused, 0)
+                self.build(self.data)
+
+    def test_renders_match_a_clean_build(self):
+        cached, _ = self.build(self.data)
+        fresh = [render_entry(entry, AS_OF) for entry in load_sources(get_default_sources_path())]
+        self.assertEqual(cached, fresh)
+
+    def test_verify_reports_stale_renders(self):
+        rendered, _ = self.build(self.data)
+        cache = RenderCache(self.path, AS_OF, "v1")
+        digest = next(iter(cache.entries))
+        cache.entries[digest] = cache.entries[digest]._replace(event_count=99)
+        cache.dirty = True
+        cache.save()
+        repaired, report = self.build(self.data, verify=True)
+        self.assertEqual(len(report.mismatched), 1)
+        self.assertEqual(repaired, rendered)
+        _, report = self.build(self.data, verify=True)
+        self.assertEqual(report.mismatched, [])
+
+    def test_entries_not_opening_with_id_are_rendered_uncached(self):
+        self.build(self.data)
+        rendered, report = self.build(NAME_FIRST)
+        self.assertEqual([entry.entry_id for entry in rendered], ["alpha", "beta"])
+        self.assertEqual((report.uncached, report.rendered), (True, 2))
+        self.assertEqual(RenderCache(self.path, AS_OF, "v1").entries, {})
+
+    def test_unreadable_manifest_starts_empty(self):
+        for payload in (b"not a pickle", b"coperator\ntruediv\n(I1\nI0\ntR."):
+            with self.subTest(payload=payload):
+                self.path.write_bytes(payload)
+                self.assertEqual(RenderCache(self.path, AS_OF, "v1").entries, {})
+
+
+class TestIncrementalGeneration(unittest.TestCase):
+    """generate_calendar writes the same files with and without the render cache."""
+
+    def run_generator(self, sources, output, *args, cached=True):
+        env = dict(os.environ, **{NO_CACHE_ENV: "" if cached else "1"})
+        return subprocess.run(
+            [sys.executable, str(Path(__file__).with_name("generate_calendar.py")), "--json",
+             "--sources", str(sources), "--output", str(output), *args],
+            env=env, capture_output=True, text=True)
+
+    def assertSameTree(self, left, right):
+        files = sorted(path.relative_to(left) for path in left.rglob("*") if path.is_file())
+        self.assertEqual(files, sorted(path.relative_to(right) for path in right.rglob("*") if path.is_file()))
+        for name in files:
+            self.assertEqual((left / name).read_bytes(), (right / name).read_bytes(), name)
+
+    def test_cached_runs_match_full_builds(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            sources = tmp / "sources.yaml"
+            shutil.copyfile(get_default_sources_path(), sources)
+            cold = self.run_generator(sources, tmp / "cold")
+            self.assertEqual(cold.returncode, 0)
+            self.assertTrue((cache_dir_for(sources) / RENDER_CACHE_NAME).exists())
+            sources.write_bytes(edit_entry(sources.read_bytes(), 3))
+            run = self.run_generator(sources, tmp / "edit", "--verify-cache")
+            self.assertEqual(run.returncode, 0, run.stdout + run.stderr)
+            self.assertIn("1 rendered, 1 dropped", run.stdout)
+            # Unparseable-schedule warnings are replayed for entries taken from the cache.
+            warm = self.run_generator(sources, tmp / "warm")
+            self.assertIn("0 rendered", warm.stdout)
+            warnings = [line for line in cold.stderr.splitlines() if "WARNING" in line]
+            self.assertTrue(warnings)
+            self.assertEqual([line for line in warm.stderr.splitlines() if "WARNING" in line], warnings)
+            self.run_generator(sources, tmp / "full", cached=False)
+            self.assertSameTree(tmp / "edit", tmp / "full")
+
+    def test_entries_not_opening_with_id_are_generated(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            sources = tmp / "sources.yaml"
+            sources.write_bytes(NAME_FIRST)
+            run = self.run_generator(sources, tmp / "cached")
+            self.assertIn("Loaded 2 entries", run.stdout)
+            self.run_generator(sources, tmp / "full", cached=False)
+            self.assertSameTree(tmp / "cached", tmp / "full")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
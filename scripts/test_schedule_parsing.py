@@ -3,31 +3,61 @@
 Run: python -m pytest test_schedule_parsing.py -v
   or: python test_schedule_parsing.py
 """
+import contextlib
+import gzip
+import hashlib
+import io
+import json
 import os
+import random
 import re
 import sys
+import tempfile
+import time
 import unittest
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
 # Add scripts directory to path for imports
 sys.path.insert(0, os.path.dirname(__file__))
 
 from generate_calendar import (
+    AudienceMatcher,
     build_recurring_event,
+    compile_entry_events,
+    copy_to_docs,
+    gzip_bytes,
+    create_vevent,
     detect_audience,
     get_entry_audience,
     get_program_audience,
     entry_to_events,
+    fold_ical_line,
     generate_event_description,
     generate_json_feed,
+    MAX_PARSE_LENGTH,
     is_closed,
+    iter_occurrences,
     parse_date_string,
+    parse_date_strings,
+    parse_length_error,
     parse_schedule,
     resolve_fixed_schedule,
+    render_vevent,
     resolve_recurring_schedule,
+    write_compressed_artifacts,
 )
+import add_audience_fields
+import generate_calendar
+from benchmark import (
+    adversarial_timings, audience_texts, daywalk_occurrences, listing_first_monthly_occurrence,
+    listing_nth_weekday_of_month, listing_pacific_utc_offset, pairwise_overlaps, rescan_detect_audience,
+    rescan_parse_date_string, rescan_parse_schedule, slicing_fold_ical_line,
+)
+from dateutil import rrule
+from synthetic_sources import generate_date_strings, generate_entries, generate_resolved_schedules, generate_schedules
 from utils import load_sources
+from validate_schedules import find_overlaps, location_occurrences, normalize_location
 
 
 class TestParseSchedule(unittest.TestCase):
@@ -307,6 +337,55 @@ class TestDetectAudience(unittest.TestCase):
         self.assertIn("young_adults", result)
 
 
+class TestAudienceMatcher(unittest.TestCase):
+    """The one-scan matcher must tag every text exactly as the per-pattern searches did."""
+
+    FRAGMENTS = ["adult children", "children", "kids", "kid", "teen", "ages 3-12", "age 13-18", "ages 1 12",
+                 "grade 7-12", "(18-35)", "ages 19-25", "young adult", "seniors", "65+", "older adults",
+                 "women's", "women-only", "(women)", "female identifying", "lgbtqia2s", "genderqueer", "pride",
+                 "trans", "trans pdx", "qtibipoc", "bipoc", "black, indigenous", "en español", "esperanza",
+                 "spanish-language", "middle school", "ſeniors", "prıde", "KIDS", "İ", " ", "-", "x"]
+
+    def assertSameTags(self, texts):
+        for text in texts:
+            self.assertEqual(detect_audience(text), rescan_detect_audience(text), text)
+            self.assertEqual(
+                add_audience_fields.detect_audience_from_text(text),
+                rescan_detect_audience(text, add_audience_fields.AUDIENCE_PATTERNS, adult_children_filter=False),
+                text,
+            )
+
+    def test_real_texts(self):
+        self.assertSameTags(audience_texts(load_sources(Path(__file__).resolve().parents[1] / "data" / "sources.yaml")))
+
+    def test_synthetic_texts(self):
+        self.assertSameTags(audience_texts(generate_entries(1_000, seed=13)))
+
+    def test_fragment_soup(self):
+        """Tags inside and next to other tags' matches, and letters IGNORECASE folds ('ſ', 'ı')."""
+        rng = random.Random(5)
+        self.assertSameTags(
+            "".join(rng.choice(self.FRAGMENTS) + rng.choice(["", " ", " ", "-"]) for _ in range(rng.randrange(1, 8)))
+            for _ in range(20_000)
+        )
+
+    def test_tags_starting_at_the_same_character(self):
+        matcher = AudienceMatcher({"a": [r"\bab"], "b": [r"abc"], "c": [r"b"]})
+        self.assertEqual(matcher("xabc"), ["b", "c"])
+        self.assertEqual(matcher("x abc"), ["a", "b", "c"])
+
+    def test_exclusion_anywhere_in_text(self):
+        matcher = AudienceMatcher({"children": [r"kids?\b"]}, exclusions={"children": ["adult children"]})
+        self.assertEqual(matcher("Kids welcome"), ["children"])
+        self.assertEqual(matcher("Kids welcome. Adult Children of Alcoholics"), [])
+
+    def test_pattern_must_start_with_literal(self):
+        with self.assertRaises(ValueError):
+            AudienceMatcher({"seniors": [r"(?:senior)s?"]})
+        with self.assertRaises(ValueError):
+            AudienceMatcher({"kids": [r"k?ids"]})
+
+
 class TestGetEntryAudience(unittest.TestCase):
     """Test entry-level audience resolution."""
 
@@ -388,6 +467,40 @@ class TestDayRanges(unittest.TestCase):
         self.assertTrue(result.get("daily"))
 
 
+class TestScheduleLexer(unittest.TestCase):
+    """The single-pass lexer must read every schedule exactly as the per-pattern rescans did."""
+
+    FRAGMENTS = ["mon", "tue", "tues", "thurs", "Sunday", "FRIDAYS", "wednesday", "sat", "salmon",
+                 "-", "–", "/", "&", ",", " ", "1st", "3rd", "5th", "6th", "every", "other",
+                 "bi-weekly", "biweekly", "alternate", "last", "daily", "weekdays", "everyday",
+                 "noon", "afternoon", "6", "12", "9:30", "0", "am", "pm", "7pm", "x"]
+
+    def assertSameParse(self, schedules):
+        for schedule in schedules:
+            expected = rescan_parse_schedule(schedule)
+            actual = parse_schedule(schedule)
+            if actual != expected or list(actual) != list(expected):
+                self.fail(f"{schedule!r}: {actual} != {expected}")
+
+    def test_real_schedules(self):
+        schedules = []
+        for entry in load_sources(Path(__file__).resolve().parents[1] / "data" / "sources.yaml"):
+            schedules.append(entry.get("schedule"))
+            schedules.extend(p.get("schedule") for p in entry.get("programs") or [] if hasattr(p, "get"))
+        self.assertSameParse([str(s) for s in schedules if s])
+
+    def test_synthetic_schedules(self):
+        self.assertSameParse(generate_schedules(20_000, seed=11))
+
+    def test_fragment_soup(self):
+        """Overlapping tokens: ranges inside words, ordinals after times, 'noon' in other words."""
+        rng = random.Random(5)
+        self.assertSameParse(
+            "".join(rng.choice(self.FRAGMENTS) + rng.choice(["", "", " ", "-"]) for _ in range(rng.randrange(1, 9)))
+            for _ in range(20_000)
+        )
+
+
 class TestParseDateString(unittest.TestCase):
     """Date strings for one-time events."""
 
@@ -426,6 +539,72 @@ class TestParseDateString(unittest.TestCase):
     def test_unparseable(self):
         self.assertEqual(self.parse("Various dates"), (None, None))
 
+    def test_invalid_cross_month_range_falls_back(self):
+        """Feb 30 can't start a range, so the same-month range later on is used."""
+        start, end = self.parse("Feb 30 - March 2, July 1-3 2026")
+        self.assertEqual((start.date(), end.date()), (date(2026, 7, 1), date(2026, 7, 3)))
+
+    def test_bulk_parse_shares_one_as_of_date(self):
+        texts = ["February 6", "Various dates", "February 6", "June through August 2026"]
+        self.assertEqual(parse_date_strings(texts, today=self.TODAY), [self.parse(t) for t in texts])
+        self.assertEqual(parse_date_strings([], today=self.TODAY), [])
+
+
+class TestDateScanner(unittest.TestCase):
+    """The one-pass scanner must read every date string exactly as the per-shape rescans did."""
+
+    FRAGMENTS = ["jan", "january", "janov", "junov", "Feb", "feb 30", "march", "mar", "may", "mayor",
+                 "sept", "sep", "september", "december", "dec", "june", "july", "summer", "nov",
+                 " ", "-", "–", "—", "to", "through", "thru", ",", "1", "5", "12", "29", "31", "32",
+                 "2026", "2027", "1999", "20261", "a2026", "x", "and", "/"]
+    AS_OF = [date(2026, 7, 24), date(2026, 12, 31)]
+
+    def assertSameParse(self, texts):
+        for text in texts:
+            for today in self.AS_OF:
+                expected = rescan_parse_date_string(text, today=today)
+                actual = parse_date_string(text, today=today)
+                if actual != expected:
+                    self.fail(f"{text!r} as of {today}: {actual} != {expected}")
+
+    def test_real_dates(self):
+        texts = []
+        for entry in load_sources(Path(__file__).resolve().parents[1] / "data" / "sources.yaml"):
+            for obj in [entry, *(p for p in entry.get("programs") or [] if hasattr(p, "get"))]:
+                dates = obj.get("dates")
+                texts.extend([dates] if isinstance(dates, str) else dates if isinstance(dates, list) else [])
+        self.assertSameParse([t for t in texts if isinstance(t, str)])
+
+    def test_synthetic_dates(self):
+        self.assertSameParse(generate_date_strings(10_000, seed=11))
+
+    def test_fragment_soup(self):
+        """Month names inside words and each other ('janov'), impossible days, years glued to words."""
+        rng = random.Random(5)
+        self.assertSameParse(
+            "".join(rng.choice(self.FRAGMENTS) + rng.choice(["", " ", " ", ", "]) for _ in range(rng.randrange(1, 8)))
+            for _ in range(20_000)
+        )
+
+
+class TestWorstCaseInputs(unittest.TestCase):
+    """Free text must never make a parser backtrack its way into a stall."""
+
+    BUDGET = 0.25  # seconds; linear patterns take a few ms at this length, quadratic ones seconds
+
+    def test_adversarial_inputs_parse_in_linear_time(self):
+        for family, parser, elapsed in adversarial_timings(20_000):
+            with self.subTest(family=family, parser=parser):
+                self.assertLess(elapsed, self.BUDGET)
+
+    def test_over_long_input_is_refused(self):
+        schedule = "Mondays 6-7pm"
+        self.assertEqual(parse_schedule(schedule + " " * (MAX_PARSE_LENGTH - len(schedule)))["day"], "MO")
+        self.assertEqual(parse_schedule(schedule + " " * MAX_PARSE_LENGTH), {})
+        self.assertEqual(parse_date_string("June 6, 2026" + " " * MAX_PARSE_LENGTH), (None, None))
+        self.assertIsNone(parse_length_error(schedule))
+        self.assertEqual(parse_length_error("x" * 1234), "1,234 characters, over the 500-character parse limit")
+
 
 class TestRecurrenceRules(unittest.TestCase):
     """DTSTART must be a real occurrence of the RRULE it carries."""
@@ -490,6 +669,39 @@ class TestRecurrenceRules(unittest.TestCase):
         self.assertIsNone(self.build("Every Tuesday 6-7pm", {"schedule_end_date": "2020-03-01"}))
 
 
+class TestClosedFormRecurrenceHelpers(unittest.TestCase):
+    """The arithmetic helpers agree with the listing versions they replaced."""
+
+    def test_nth_weekday_of_month(self):
+        for year in range(1995, 2060):
+            for month in range(1, 13):
+                for weekday in range(7):
+                    for nth in (1, 2, 3, 4, 5, -1, -2, -5):
+                        self.assertEqual(
+                            generate_calendar._nth_weekday_of_month(year, month, weekday, nth),
+                            listing_nth_weekday_of_month(year, month, weekday, nth),
+                            (year, month, weekday, nth),
+                        )
+
+    def test_first_monthly_occurrence(self):
+        rng = random.Random(18)
+        for _ in range(3000):
+            base = datetime(2026, 1, 1) + timedelta(days=rng.randrange(3000))
+            days = rng.sample(["MO", "TU", "WE", "TH", "FR", "SA", "SU"], rng.randint(1, 3))
+            weeks = [-1] if rng.random() < 0.2 else sorted(rng.sample([1, 2, 3, 4, 5], rng.randint(1, 2)))
+            self.assertEqual(generate_calendar._first_monthly_occurrence(base, days, weeks),
+                             listing_first_monthly_occurrence(base, days, weeks), (base, days, weeks))
+
+    def test_pacific_offset_around_transitions(self):
+        day = datetime(2000, 1, 1, 23, 59, 59)
+        while day.year < 2045:
+            self.assertEqual(generate_calendar._pacific_utc_offset(day), listing_pacific_utc_offset(day), day)
+            day += timedelta(days=1)
+        self.assertEqual(generate_calendar._local_end_of_day_utc(datetime(2026, 3, 7)), "20260308T075959Z")
+        self.assertEqual(generate_calendar._local_end_of_day_utc(datetime(2026, 3, 8)), "20260309T065959Z")
+        self.assertEqual(generate_calendar._local_end_of_day_utc(datetime(2026, 11, 1)), "20261102T075959Z")
+
+
 class TestResolvedScheduleContract(unittest.TestCase):
     """The web feed receives the same normalized recurrence used by ICS."""
 
@@ -680,6 +892,123 @@ class TestResolvedScheduleContract(unittest.TestCase):
         self.assertIn("<strong>Cost:</strong> $50", html_description)
 
 
+class TestIterOccurrences(unittest.TestCase):
+    """iter_occurrences jumps between occurrences but lists what a day-by-day walk finds."""
+
+    def resolved(self, frequency="weekly", weekdays=("TU",), interval=1, month_weeks=(),
+                 anchor="2026-08-04", until=None):
+        return {
+            "type": "recurring", "frequency": frequency, "interval": interval,
+            "weekdays": list(weekdays), "month_weeks": list(month_weeks),
+            "anchor_date": anchor, "until_date": until,
+            "start_time": "18:00", "end_time": "19:00", "end_day_offset": 0,
+        }
+
+    def occurrences(self, resolved, start=date(2026, 1, 1), end=date(2026, 12, 31)):
+        return list(iter_occurrences(resolved, start, end))
+
+    def test_biweekly_counts_weeks_from_the_anchor(self):
+        resolved = self.resolved(weekdays=["TU", "TH"], interval=2)
+        self.assertEqual(self.occurrences(resolved, date(2026, 8, 10), date(2026, 8, 31)),
+                         [date(2026, 8, 18), date(2026, 8, 20)])
+        self.assertEqual(self.occurrences(resolved, date(2026, 8, 24), date(2026, 9, 4)),
+                         [date(2026, 9, 1), date(2026, 9, 3)])
+
+    def test_nothing_before_the_anchor_or_after_until(self):
+        resolved = self.resolved(weekdays=["MO"], anchor="2026-08-10", until="2026-09-07")
+        self.assertEqual(self.occurrences(resolved),
+                         [date(2026, 8, 10), date(2026, 8, 17), date(2026, 8, 24),
+                          date(2026, 8, 31), date(2026, 9, 7)])
+        self.assertEqual(self.occurrences(resolved, date(2025, 1, 1), date(2026, 8, 9)), [])
+
+    def test_last_week_of_month(self):
+        resolved = self.resolved("monthly", ["SU"], month_weeks=[-1], anchor="2026-08-30")
+        self.assertEqual(self.occurrences(resolved),
+                         [date(2026, 8, 30), date(2026, 9, 27), date(2026, 10, 25),
+                          date(2026, 11, 29), date(2026, 12, 27)])
+
+    def test_fifth_week_skips_months_without_one(self):
+        resolved = self.resolved("monthly", ["FR"], month_weeks=[5], anchor="2026-01-30")
+        self.assertEqual(self.occurrences(resolved, end=date(2026, 6, 30)),
+                         [date(2026, 1, 30), date(2026, 5, 29)])
+
+    def test_monthly_interval_counts_months_from_the_anchor(self):
+        resolved = self.resolved("monthly", ["MO"], interval=3, month_weeks=[1, 3], anchor="2026-02-02")
+        self.assertEqual([day.month for day in self.occurrences(resolved)], [2, 2, 5, 5, 8, 8, 11, 11])
+
+    def test_matches_the_day_walk(self):
+        schedules = generate_resolved_schedules(1000, seed=11)
+        feed = generate_json_feed(load_sources(Path(__file__).resolve().parents[1] / "data" / "sources.yaml"),
+                                  today=date(2026, 3, 1))
+        for event in feed["events"]:
+            for item in [event] + event.get("programs", []):
+                if hasattr(item, "get") and (item.get("resolved_schedule") or {}).get("type") == "recurring":
+                    schedules.append(item["resolved_schedule"])
+        for resolved in schedules:
+            start = date.fromisoformat(resolved["anchor_date"]) - timedelta(days=200)
+            end = start + timedelta(days=900)
+            self.assertEqual(self.occurrences(resolved, start, end), daywalk_occurrences(resolved, start, end),
+                             resolved)
+
+    def test_matches_dateutil_rrule(self):
+        for resolved in generate_resolved_schedules(500, seed=12):
+            anchor = datetime.fromisoformat(resolved["anchor_date"])
+            weekdays = [getattr(rrule, day) for day in resolved["weekdays"]]
+            if resolved["frequency"] == "monthly":
+                weekdays = [day(nth) for day in weekdays for nth in resolved["month_weeks"]]
+            until = resolved["until_date"] and datetime.fromisoformat(resolved["until_date"])
+            expected = rrule.rrule(
+                rrule.WEEKLY if resolved["frequency"] == "weekly" else rrule.MONTHLY,
+                dtstart=anchor, interval=resolved["interval"], wkst=rrule.MO,
+                byweekday=weekdays, until=until,
+            ).between(datetime(2025, 1, 1), datetime(2029, 12, 31), inc=True)
+            self.assertEqual(self.occurrences(resolved, date(2025, 1, 1), date(2029, 12, 31)),
+                             [day.date() for day in expected], resolved)
+
+
+class TestLocationOverlaps(unittest.TestCase):
+    """validate_schedules reports schedules that claim the same room at the same time."""
+
+    def test_normalize_location(self):
+        self.assertEqual(normalize_location("3520 SE Yamhill Street, Portland"),
+                         normalize_location("3520 Southeast Yamhill St."))
+        self.assertEqual(normalize_location("909 NE 52nd Ave, Room 203"), "909 ne 52nd ave / room 203")
+        self.assertEqual(normalize_location("Central Library"), "central library")
+        self.assertIsNone(normalize_location("Online (Zoom)"))
+        self.assertIsNone(normalize_location(""))
+
+    def test_half_open_edges_and_owners(self):
+        at = lambda hour: datetime(2026, 3, 2, hour)
+        occurrences = [
+            ("hall", at(18), at(20), "a", None),
+            ("hall", at(20), at(21), "b", None),        # starts as "a" ends: no overlap
+            ("hall", at(19), at(21), "c", "venue"),
+            ("hall", at(19), at(20), "d", "venue"),     # same owner as "c"
+            ("hall", at(19), at(20), "a", None),        # same label as "a"
+            ("annex", at(18), at(20), "e", None),
+        ]
+        self.assertEqual([tuple(overlap)[:4] for overlap in find_overlaps(occurrences)], [
+            ("hall", "a", "c", 2), ("hall", "a", "d", 2), ("hall", "b", "c", 1),
+        ])
+
+    def test_matches_pairwise_comparison(self):
+        rng = random.Random(20)
+        base = datetime(2026, 3, 2)
+        occurrences = []
+        for _ in range(3000):
+            start = base + timedelta(minutes=rng.randrange(0, 14 * 24 * 60, 30))
+            occurrences.append((rng.choice("abcde"), start, start + timedelta(minutes=rng.choice([30, 60, 90, 120])),
+                                f"group-{rng.randrange(60)}", rng.choice([None, None, "x", "y"])))
+        self.assertEqual([tuple(overlap) for overlap in find_overlaps(occurrences)], pairwise_overlaps(occurrences))
+
+    def test_real_catalog(self):
+        entries = load_sources(Path(__file__).resolve().parents[1] / "data" / "sources.yaml")
+        occurrences = list(location_occurrences(entries, date(2026, 3, 1)))
+        self.assertGreater(len(occurrences), 100)
+        self.assertFalse(any(location is None or start >= end for location, start, end, _, _ in occurrences))
+        self.assertEqual([tuple(overlap) for overlap in find_overlaps(occurrences)], pairwise_overlaps(occurrences))
+
+
 class TestDeterministicOutput(unittest.TestCase):
     """Regenerating unchanged data must produce byte-identical feeds.
 
@@ -712,6 +1041,72 @@ class TestDeterministicOutput(unittest.TestCase):
         self.assertIn((dtstart.day - 1) // 7 + 1, (1, 3))
 
 
+class TestCompiledEvents(unittest.TestCase):
+    """Entries compile once; each platform only renders the compiled events."""
+
+    def setUp(self):
+        entries = load_sources(Path(__file__).resolve().parents[1] / "data" / "sources.yaml")
+        self.entries = [entry for entry in entries if not is_closed(entry)] + generate_entries(200, seed=21)
+
+    def test_render_matches_create_vevent_fields(self):
+        event = compile_entry_events(TestDeterministicOutput.ENTRY)[0]
+        fields = {name: getattr(event, name) for name in (
+            "uid", "summary", "description", "location", "dtstart", "dtend", "all_day", "rrule", "url",
+            "category", "html_description", "dtstamp")}
+        for platform in ("google", "apple", "outlook"):
+            self.assertEqual(render_vevent(event, platform), create_vevent(platform=platform, **fields))
+
+    def test_platforms_differ_only_in_outlook_lines(self):
+        for entry in self.entries:
+            for event in compile_entry_events(entry, today=date(2026, 3, 1)):
+                outlook = render_vevent(event, "outlook")
+                google = render_vevent(event, "google")
+                self.assertEqual(google, render_vevent(event, "apple"))
+                self.assertEqual([line for line in outlook.split("\r\n")
+                                  if not line.startswith(("X-ALT-DESC", "X-MICROSOFT-CDO-BUSYSTATUS"))],
+                                 google.split("\r\n"))
+
+    def test_entry_to_events_renders_compiled_events(self):
+        for entry in self.entries:
+            events = compile_entry_events(entry, today=date(2026, 3, 1))
+            for platform in ("outlook", "google"):
+                self.assertEqual(entry_to_events(entry, platform, today=date(2026, 3, 1)),
+                                 [render_vevent(event, platform) for event in events])
+
+
+class TestFoldIcalLine(unittest.TestCase):
+    """Lines fold at 75 octets of UTF-8 without splitting a character (RFC 5545 section 3.1)."""
+
+    def assertFolded(self, line):
+        folded = fold_ical_line(line)
+        pieces = folded.split("\r\n")
+        self.assertTrue(all(len(piece.encode("utf-8")) <= 75 for piece in pieces), pieces)
+        self.assertTrue(all(piece.startswith(" ") for piece in pieces[1:]))
+        self.assertEqual(pieces[0] + "".join(piece[1:] for piece in pieces[1:]), line)
+        return pieces
+
+    def test_ascii_folds_as_before(self):
+        for length in (0, 74, 75, 76, 149, 150, 151, 1000):
+            line = "x" * length
+            self.assertEqual(fold_ical_line(line), slicing_fold_ical_line(line))
+
+    def test_multibyte_text_counts_octets(self):
+        line = "DESCRIPTION:" + "ñ" * 40  # 52 characters, 92 octets
+        pieces = self.assertFolded(line)
+        self.assertEqual(pieces, ["DESCRIPTION:" + "ñ" * 31, " " + "ñ" * 9])
+
+    def test_never_splits_a_character(self):
+        rng = random.Random(22)
+        for _ in range(500):
+            self.assertFolded("SUMMARY:" + "".join(rng.choice("ab ñ❌😀\\,") for _ in range(rng.randrange(300))))
+
+    def test_long_lines_fold_in_linear_time(self):
+        line = "DESCRIPTION:" + "peña ❌ grupo " * 100_000
+        began = time.perf_counter()
+        self.assertFolded(line)
+        self.assertLess(time.perf_counter() - began, 0.5)
+
+
 class TestClosedEntries(unittest.TestCase):
     """Permanently closed resources must not reach the published feeds."""
 
@@ -744,5 +1139,129 @@ class TestPublishedUidUniqueness(unittest.TestCase):
         self.assertEqual(duplicates, [])
 
 
+class PublishTestCase(unittest.TestCase):
+    """A generated output/ tree and a docs/ tree to publish it to."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.output, self.docs = Path(tmp.name) / "output", Path(tmp.name) / "docs"
+        for name, text in (("google/all-events.ics", "all"), ("google/peer_support.ics", "peer"),
+                           ("apple/all-events.ics", "all"), ("events.json", "{}")):
+            self.write(self.output / name, text)
+        self.write(self.docs / "index.html", "<html>")
+
+    @staticmethod
+    def write(path, text):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+    def publish(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return copy_to_docs(self.output, self.docs, ["google", "apple"])
+
+    def snapshot(self):
+        return {path.relative_to(self.docs).as_posix(): (path.read_bytes(), path.stat().st_mtime_ns, path.stat().st_ino)
+                for path in self.docs.rglob("*") if path.is_file()}
+
+
+class TestCopyToDocs(PublishTestCase):
+    """--publish writes only what changed, atomically, and leaves unrelated files alone."""
+
+    def test_first_publish_adds_everything(self):
+        report = self.publish()
+        self.assertEqual(sorted(report.added), ["apple/all-events.ics", "events.json", "google/all-events.ics",
+                                                "google/peer_support.ics"])
+        self.assertEqual((self.docs / "google" / "peer_support.ics").read_text(encoding="utf-8"), "peer")
+
+    def test_unchanged_publish_touches_nothing(self):
+        self.publish()
+        before = self.snapshot()
+        report = self.publish()
+        self.assertEqual((report.added, report.updated, report.removed, report.unchanged), ([], [], [], 4))
+        self.assertEqual(self.snapshot(), before)
+
+    def test_only_changed_files_are_written_and_orphans_removed(self):
+        self.publish()
+        self.write(self.docs / "google" / "retired_category.ics", "old")
+        self.write(self.output / "google" / "peer_support.ics", "peer, revised")
+        before = self.snapshot()
+        report = self.publish()
+        self.assertEqual(report.updated, ["google/peer_support.ics"])
+        self.assertEqual(report.removed, ["google/retired_category.ics"])
+        after = self.snapshot()
+        for name in ("google/all-events.ics", "apple/all-events.ics", "events.json", "index.html"):
+            self.assertEqual(after[name], before[name])
+        self.assertEqual(after["google/peer_support.ics"][0], b"peer, revised")
+        self.assertEqual([path.name for path in self.docs.rglob("*.tmp")], [])
+
+
+class TestCompressedArtifacts(PublishTestCase):
+    """--publish also ships byte-stable .gz siblings and a checksum manifest of docs/."""
+
+    def publish_run(self, platforms=("google", "apple"), with_json=True):
+        artifacts = write_compressed_artifacts(self.output, list(platforms), with_json=with_json)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return copy_to_docs(self.output, self.docs, list(platforms), with_json=with_json, artifacts=artifacts)
+
+    def manifest(self):
+        return json.loads((self.docs / "manifest.json").read_text(encoding="utf-8"))["artifacts"]
+
+    def test_gzip_is_deterministic(self):
+        data = "BEGIN:VCALENDAR\r\n".encode("utf-8") * 100
+        self.assertEqual(gzip_bytes(data), gzip_bytes(data))
+        self.assertEqual(gzip.decompress(gzip_bytes(data)), data)
+        self.assertEqual(gzip_bytes(data)[4:10], b"\x00\x00\x00\x00\x02\xff")  # mtime 0, level 9, OS unknown
+
+    def test_manifest_lists_every_feed(self):
+        report = self.publish_run()
+        self.assertIn("google/all-events.ics.gz", report.added)
+        self.assertIn("events.json.gz", report.added)
+        manifest = self.manifest()
+        self.assertEqual(sorted(manifest), ["apple/all-events.ics", "events.json", "google/all-events.ics",
+                                            "google/peer_support.ics"])
+        peer = self.docs / "google" / "peer_support.ics.gz"
+        self.assertEqual(manifest["google/peer_support.ics"], {
+            "sha256": hashlib.sha256(b"peer").hexdigest(), "size": 4, "gzip_size": peer.stat().st_size,
+        })
+        self.assertEqual(gzip.decompress(peer.read_bytes()), b"peer")
+
+    def test_unchanged_feeds_are_not_recompressed(self):
+        self.publish_run()
+        compressed = self.output / "google" / "all-events.ics.gz"
+        before = compressed.stat().st_mtime_ns
+        self.write(self.output / "google" / "peer_support.ics", "peer, revised")
+        self.publish_run()
+        self.assertEqual(compressed.stat().st_mtime_ns, before)
+        self.assertEqual(self.manifest()["google/peer_support.ics"]["size"], 13)
+
+    def test_publish_ships_artifacts_once(self):
+        self.publish_run()
+        before = self.snapshot()
+        self.assertEqual(self.publish_run().added, [])
+        self.assertEqual(self.snapshot(), before)
+
+    def test_one_platform_keeps_the_rest_of_the_manifest(self):
+        self.publish_run()
+        self.write(self.docs / "outlook" / "all-events.ics", "published before manifests")
+        self.write(self.output / "google" / "peer_support.ics", "peer, revised")
+        report = self.publish_run(platforms=["google"], with_json=False)
+        self.assertEqual(sorted(report.updated), ["google/peer_support.ics", "google/peer_support.ics.gz",
+                                                  "manifest.json"])
+        manifest = self.manifest()
+        self.assertEqual(sorted(manifest), ["apple/all-events.ics", "events.json", "google/all-events.ics",
+                                            "google/peer_support.ics", "outlook/all-events.ics"])
+        self.assertEqual(manifest["google/peer_support.ics"]["size"], 13)
+        outlook = self.docs / "outlook" / "all-events.ics.gz"
+        self.assertEqual(gzip.decompress(outlook.read_bytes()), b"published before manifests")
+        self.assertEqual(manifest["outlook/all-events.ics"]["gzip_size"], outlook.stat().st_size)
+
+    def test_leftover_json_feed_is_not_published(self):
+        report = self.publish_run(with_json=False)
+        self.assertNotIn("events.json", report.added)
+        self.assertFalse((self.docs / "events.json").exists())
+        self.assertNotIn("events.json", self.manifest())
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Tests for the indexed SourceStore.
+
+Run: python -m pytest test_source_store.py -v
+  or: python test_source_store.py
+"""
+import os
+import sys
+import unittest
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from audit_policy import audit_queue
+from source_store import SourceStore
+from utils import is_closed, load_sources, parse_date
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+ENTRIES = [
+    {"id": "a", "name": "A", "category": "events", "location_type": "physical",
+     "next_audit": "2026-03-01", "last_verified": "2026-01-01", "good_for": ["grief"]},
+    {"id": "b", "name": "B", "category": "peer_support", "location_type": "virtual",
+     "next_audit": date(2026, 2, 1), "good_for": ["grief", "isolation"]},
+    {"id": "c", "name": "C", "category": "events", "status": "CLOSED",
+     "next_audit": "2026-02-15", "last_verified": "2025-06-01"},
+    {"id": "d", "name": "D", "category": "events", "location_type": "",
+     "flags": ["❌ CLOSED - moved"], "next_audit": "not a date"},
+    {"id": "e", "name": "E", "category": "peer_support", "resource_type": "program",
+     "next_audit": "2026-02-01", "audience": ["seniors"]},
+    {"id": "a", "name": "Duplicate A", "category": "parks_nature"},
+]
+
+
+class TestSourceStore(unittest.TestCase):
+    def setUp(self):
+        self.store = SourceStore(ENTRIES)
+
+    def ids(self, entries):
+        return [entry["id"] for entry in entries]
+
+    def test_iterates_in_file_order(self):
+        self.assertEqual(list(self.store), ENTRIES)
+        self.assertEqual(len(self.store), len(ENTRIES))
+
+    def test_get_returns_first_entry_with_id(self):
+        self.assertEqual(self.store.get("a")["name"], "A")
+        self.assertIsNone(self.store.get("missing"))
+        self.assertEqual(self.store.get("missing", {}), {})
+        self.assertIn("e", self.store)
+
+    def test_select_by_field_keeps_file_order(self):
+        self.assertEqual(self.ids(self.store.select(category="events")), ["a", "c", "d"])
+        self.assertEqual(self.ids(self.store.select(category="events", location_type="physical")), ["a"])
+
+    def test_none_selects_missing_or_empty_values(self):
+        self.assertEqual(self.ids(self.store.select(category="events", location_type=None)), ["c", "d"])
+
+    def test_select_by_tag(self):
+        self.assertEqual(self.ids(self.store.select(tags=[("good_for", "grief")])), ["a", "b"])
+        self.assertEqual(
+            self.ids(self.store.select(tags=[("good_for", "grief"), ("good_for", "isolation")])), ["b"])
+        self.assertEqual(self.ids(self.store.select(tags=[("audience", "seniors")])), ["e"])
+
+    def test_closed_filter_matches_is_closed(self):
+        self.assertEqual(self.ids(self.store.select(closed=True)), ["c", "d"])
+        self.assertEqual(self.ids(self.store.select(closed=False)), ["a", "b", "e", "a"])
+        self.assertEqual(self.ids(self.store.select(category="events", closed=False)), ["a"])
+
+    def test_unknown_field_is_an_error(self):
+        with self.assertRaises(ValueError):
+            self.store.select(name="A")
+
+    def test_values_in_first_appearance_order(self):
+        self.assertEqual(self.store.values("category"), ["events", "peer_support", "parks_nature"])
+
+    def test_where_builds_a_narrower_store(self):
+        events = self.store.where(category="events", closed=False)
+        self.assertEqual(self.ids(events), ["a"])
+        self.assertEqual(events.values("category"), ["events"])
+
+    def test_next_audit_range_is_inclusive_and_date_ordered(self):
+        self.assertEqual(self.ids(self.store.next_audit_between(date(2026, 2, 1), date(2026, 3, 1))),
+                         ["b", "e", "c", "a"])
+        self.assertEqual(self.ids(self.store.next_audit_between(None, date(2026, 1, 31))), [])
+        self.assertEqual(self.ids(self.store.next_audit_between(date(2026, 2, 2))), ["c", "a"])
+
+    def test_last_verified_range(self):
+        self.assertEqual(self.ids(self.store.last_verified_between()), ["c", "a"])
+        self.assertEqual(self.ids(self.store.last_verified_between(date(2025, 12, 1))), ["a"])
+
+    def test_audit_queue_same_for_store_and_list(self):
+        as_of = date(2026, 2, 20)
+        self.assertEqual(audit_queue(self.store, as_of), audit_queue(ENTRIES, as_of))
+
+
+class TestCorpusStore(unittest.TestCase):
+    """Indexed queries must agree with a plain scan of the real data."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.entries = load_sources(ROOT / "data" / "sources.yaml")
+        cls.store = SourceStore(cls.entries)
+
+    def test_category_and_closed_views(self):
+        for category in {entry.get("category") for entry in self.entries}:
+            with self.subTest(category=category):
+                self.assertEqual(self.store.select(category=category, closed=False),
+                                 [e for e in self.entries
+                                  if e.get("category") == category and not is_closed(e)])
+
+    def test_next_audit_window(self):
+        start, end = date(2026, 3, 1), date(2026, 5, 31)
+        expected = sorted(
+            (e for e in self.entries
+             if parse_date(e.get("next_audit")) and start <= parse_date(e["next_audit"]) <= end),
+            key=lambda e: parse_date(e["next_audit"]),
+        )
+        self.assertEqual(self.store.next_audit_between(start, end), expected)
+
+    def test_audit_queue_same_for_store_and_list(self):
+        for as_of in (date(2026, 1, 1), date(2026, 6, 1), date(2027, 1, 1)):
+            with self.subTest(as_of=as_of):
+                self.assertEqual(audit_queue(self.store, as_of), audit_queue(self.entries, as_of))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""Tests for loading sources.yaml.
+
+Run: python -m pytest test_sources.py -v
+  or: python test_sources.py
+"""
+import importlib
+import json
+import os
+import pickle
+import sys
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import yaml
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import utils
+from generate_calendar import generate_json_feed
+from models import Entry, Program
+from utils import NO_CACHE_ENV, cache_dir_for, load_sources, parse_sources, yaml_dump, yaml_load_all
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SAMPLE = """---
+- id: first
+  name: First
+  category: events
+  last_verified: 2026-01-31
+---
+- id: second
+  name: Second
+  category: peer_support
+  programs:
+  - name: Group
+    schedule: Every Tuesday 6-7:30pm
+"""
+
+
+class TempSources:
+    """A throwaway sources.yaml in its own directory, so its .cache/ is too."""
+
+    def __init__(self, content: str = SAMPLE):
+        self.dir = tempfile.TemporaryDirectory(prefix="peer-calendar-sources-")
+        self.path = Path(self.dir.name) / "sources.yaml"
+        self.path.write_text(content, encoding="utf-8")
+
+    def snapshots(self) -> list[Path]:
+        return sorted(cache_dir_for(self.path).glob("sources.yaml.*.pickle"))
+
+
+class TestSourcesSnapshotCache(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(os.environ, {NO_CACHE_ENV: ""})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.sources = TempSources()
+        self.addCleanup(self.sources.dir.cleanup)
+
+    def test_second_load_does_not_reparse(self):
+        first = load_sources(self.sources.path)
+        with mock.patch("utils.parse_sources", side_effect=AssertionError("reparsed")):
+            second = load_sources(self.sources.path)
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.sources.snapshots()), 1)
+
+    def test_each_load_returns_independent_objects(self):
+        first = load_sources(self.sources.path)
+        first[0]["name"] = "mutated"
+        self.assertEqual(load_sources(self.sources.path)[0]["name"], "First")
+
+    def test_content_change_invalidates_and_replaces_snapshot(self):
+        load_sources(self.sources.path)
+        old_snapshot = self.sources.snapshots()
+        self.sources.path.write_text(SAMPLE.replace("First", "Renamed"), encoding="utf-8")
+        entries = load_sources(self.sources.path)
+        self.assertEqual(entries[0]["name"], "Renamed")
+        self.assertEqual(len(self.sources.snapshots()), 1)
+        self.assertNotEqual(self.sources.snapshots(), old_snapshot)
+
+    def test_loader_version_is_part_of_the_key(self):
+        load_sources(self.sources.path)
+        with mock.patch.object(utils, "SOURCES_CACHE_VERSION", utils.SOURCES_CACHE_VERSION + 1), \
+                mock.patch("utils.parse_sources", wraps=parse_sources) as parse:
+            load_sources(self.sources.path)
+        parse.assert_called_once()
+
+    def test_corrupt_snapshot_falls_back_to_parsing(self):
+        load_sources(self.sources.path)
+        snapshot = self.sources.snapshots()[0]
+        truncated = snapshot.read_bytes()[:40]
+        for payload in (b"not a pickle", truncated, b"cbuiltins\nint\n(S'x'\ntR.", b"cbuiltins\nint\n(I1\nI2\nI3\ntR."):
+            with self.subTest(payload=payload[:20]):
+                snapshot.write_bytes(payload)
+                self.assertEqual([e["id"] for e in load_sources(self.sources.path)], ["first", "second"])
+
+    def test_environment_can_disable_the_cache(self):
+        with mock.patch.dict(os.environ, {NO_CACHE_ENV: "1"}):
+            load_sources(self.sources.path)
+        self.assertEqual(self.sources.snapshots(), [])
+
+    def test_unwritable_cache_directory_is_not_fatal(self):
+        with mock.patch("utils.tempfile.mkstemp", side_effect=PermissionError("read-only")):
+            entries = load_sources(self.sources.path)
+        self.assertEqual(len(entries), 2)
+
+
+class TestCorpusSnapshot(unittest.TestCase):
+    def test_snapshot_matches_a_fresh_parse(self):
+        path = ROOT / "data" / "sources.yaml"
+        content = path.read_text(encoding="utf-8")
+        self.assertEqual(load_sources(path), parse_sources(content))
+
+
+class TestEntryRecords(unittest.TestCase):
+    """Entry/Program records must be indistinguishable from the dicts they replace."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.content = (ROOT / "data" / "sources.yaml").read_text(encoding="utf-8")
+        cls.entries = parse_sources(cls.content)
+        cls.dicts = parse_sources(cls.content, compact=False)
+
+    def test_records_equal_plain_dicts(self):
+        self.assertEqual(self.entries, self.dicts)
+        for entry, raw in zip(self.entries, self.dicts):
+            self.assertIsInstance(entry, Entry)
+            self.assertEqual(list(entry), list(raw))
+            for program, raw_program in zip(entry.get("programs") or [], raw.get("programs") or []):
+                if isinstance(raw_program, dict):
+                    self.assertIsInstance(program, Program)
+
+    def test_no_per_instance_dict(self):
+        entry = self.entries[0]
+        self.assertFalse(hasattr(entry, "__dict__"))
+        with self.assertRaises(AttributeError):
+            entry.extra = 1
+
+    def test_vocabulary_and_keys_are_shared(self):
+        by_category = {}
+        for entry in self.entries:
+            first = by_category.setdefault(entry["category"], entry["category"])
+            self.assertIs(entry["category"], first)
+        keys = {id(key) for entry in self.entries for key in entry if key == "name"}
+        self.assertEqual(len(keys), 1)
+
+    def test_mutation_keeps_dict_semantics(self):
+        entry = parse_sources(SAMPLE)[0]
+        entry["_days_overdue"] = 3
+        entry["name"] = "Renamed"
+        del entry["last_verified"]
+        self.assertEqual(dict(entry), {"id": "first", "name": "Renamed", "category": "events",
+                                       "_days_overdue": 3})
+        self.assertEqual(entry.setdefault("notes", "x"), "x")
+        self.assertNotIn("missing", entry)
+
+    def test_pickle_round_trip(self):
+        restored = pickle.loads(pickle.dumps(self.entries))
+        self.assertEqual(restored, self.dicts)
+        self.assertIsInstance(restored[0], Entry)
+
+    def test_yaml_dump_matches_dicts(self):
+        dump = lambda data: yaml_dump(data, allow_unicode=True, sort_keys=False, width=120)
+        self.assertEqual(dump(self.entries), dump(self.dicts))
+
+    def test_json_feed_is_byte_identical(self):
+        today = utils.parse_date("2026-03-01")
+        feed = lambda entries: json.dumps(generate_json_feed(entries, today), indent=2, default=str)
+        self.assertEqual(feed(self.entries), feed(self.dicts))
+
+
+@unittest.skipUnless(utils.HAS_LIBYAML, "PyYAML built without libyaml")
+class TestLibyamlParity(unittest.TestCase):
+    """The C-backed path must be a drop-in replacement for the pure-Python one."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.content = (ROOT / "data" / "sources.yaml").read_text(encoding="utf-8")
+        cls.python_entries = parse_sources(cls.content, loader=utils.PySafeLoader)
+
+    def test_loaders_produce_identical_entries(self):
+        self.assertEqual(parse_sources(self.content, loader=utils.SafeLoader), self.python_entries)
+
+    def test_dumpers_round_trip_to_identical_entries(self):
+        for dumper in (utils.PySafeDumper, utils.SafeDumper):
+            with self.subTest(dumper=dumper.__name__):
+                text = yaml_dump(self.python_entries, dumper=dumper, allow_unicode=True,
+                                 sort_keys=False, width=120)
+                self.assertEqual(list(yaml_load_all(text))[0], self.python_entries)
+
+
+class TestParallelParse(unittest.TestCase):
+    """The process-pool loader must return exactly what the serial one does."""
+
+    def setUp(self):
+        patcher = mock.patch.object(utils, "PARALLEL_MIN_BYTES", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assertSameEntries(self, content):
+        serial = parse_sources(content)
+        parallel = parse_sources(content, workers=2)
+        self.assertEqual([list(e.items()) for e in parallel], [list(e.items()) for e in serial])
+        self.assertEqual(yaml_dump(parallel, sort_keys=False), yaml_dump(serial, sort_keys=False))
+
+    def test_real_sources(self):
+        self.assertSameEntries((ROOT / "data" / "sources.yaml").read_text(encoding="utf-8"))
+
+    def test_synthetic_corpus(self):
+        from synthetic_sources import synthetic_sources_path
+        self.assertSameEntries(synthetic_sources_path(1000).read_text(encoding="utf-8"))
+
+    def test_pieces_cover_the_stream_and_cut_between_items(self):
+        content = "# header\n" + SAMPLE + "- id: third\n  name: Third\n"
+        pieces = utils.split_sources(content, 8)
+        self.assertEqual("".join(pieces), content)
+        self.assertGreater(len(pieces), 2)
+        for piece in pieces[1:]:
+            self.assertTrue(piece.startswith(("---\n", "- id: ")), piece)
+        self.assertEqual([e["id"] for p in pieces for e in parse_sources(p)], ["first", "second", "third"])
+        self.assertEqual(len(utils.split_sources(content, 2)), 2)
+
+    def test_unsafe_streams_stay_whole(self):
+        mapping_document = "---\nid: solo\ngood_for:\n- grief\n---\n- id: next\n- id: last\n"
+        self.assertEqual(utils.split_sources(mapping_document, 8),
+                         ["---\nid: solo\ngood_for:\n- grief\n", "---\n- id: next\n", "- id: last\n"])
+        for content in ("%YAML 1.1\n" + SAMPLE, SAMPLE + "...\n", SAMPLE.replace("Group", "&ref Group"),
+                        SAMPLE.replace("- id: second", "- id: second\nstray: text")):
+            with self.subTest(content=content):
+                self.assertIsNone(utils.split_sources(content, 8))
+
+    def test_small_input_and_one_worker_stay_serial(self):
+        with mock.patch.object(utils, "ProcessPoolExecutor") as pool:
+            parse_sources(SAMPLE, workers=1)
+            with mock.patch.object(utils, "PARALLEL_MIN_BYTES", len(SAMPLE) + 1):
+                parse_sources(SAMPLE, workers=4)
+        pool.assert_not_called()
+
+
+class TestIterSources(unittest.TestCase):
+    """The streaming iterator yields what load_sources() returns, one entry at a time."""
+
+    def assertStreamsLikeLoad(self, path, loader=None):
+        streamed = list(utils.iter_sources(path, loader=loader))
+        loaded = parse_sources(Path(path).read_text(encoding="utf-8"))
+        self.assertEqual([list(e.items()) for e in streamed], [list(e.items()) for e in loaded])
+        self.assertTrue(all(isinstance(e, Entry) for e in streamed))
+
+    def test_real_sources(self):
+        for loader in (None, utils.PySafeLoader):
+            with self.subTest(loader=loader):
+                self.assertStreamsLikeLoad(ROOT / "data" / "sources.yaml", loader)
+
+    def test_document_shapes(self):
+        sources = TempSources("# comment only\n---\n---\nid: solo\nname: Solo\n---\n"
+                              "- id: listed\n- just a string\n- name: no id\n- [nested]\n" + SAMPLE)
+        self.addCleanup(sources.dir.cleanup)
+        self.assertEqual([e["id"] for e in utils.iter_sources(sources.path)],
+                         ["solo", "listed", "first", "second"])
+        self.assertStreamsLikeLoad(sources.path)
+
+    def test_memory_stays_flat(self):
+        from synthetic_sources import synthetic_sources_path
+        path = synthetic_sources_path(1000)
+        self.assertStreamsLikeLoad(path)
+        tracemalloc.start()
+        try:
+            for _ in utils.iter_sources(path):
+                pass
+            streamed_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+            parse_sources(path.read_text(encoding="utf-8"))
+            loaded_peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertLess(streamed_peak * 10, loaded_peak)
+
+    def test_streaming_consumers(self):
+        from check_source_urls import collect_source_urls
+        from generate_calendar import CalendarWriter, category_calendar_name, create_vcalendar, entry_to_events
+        path = ROOT / "data" / "sources.yaml"
+        entries = load_sources(path)
+        self.assertEqual(utils.validate_all_entries(utils.iter_sources(path), quiet=True),
+                         utils.validate_all_entries(entries, quiet=True))
+        self.assertEqual(collect_source_urls(utils.iter_sources(path)), collect_source_urls(entries))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with CalendarWriter(Path(tmp), ["apple"]) as calendars:
+                for entry in utils.iter_sources(path):
+                    calendars.add(entry)
+            events = {}
+            for entry in entries:
+                events.setdefault(entry.get("category") or "general", []).extend(
+                    entry_to_events(entry, platform="apple"))
+            for category, category_events in events.items():
+                if category_events:
+                    self.assertEqual((Path(tmp) / "apple" / f"{category}.ics").read_bytes(),
+                                     create_vcalendar(category_events, category_calendar_name(category),
+                                                      platform="apple", category=category).encode("utf-8"))
+            combined = [event for category_events in events.values() for event in category_events]
+            self.assertEqual((Path(tmp) / "apple" / "all-events.ics").read_bytes(),
+                             create_vcalendar(combined, "Portland Metro Resources - All Events",
+                                              platform="apple").encode("utf-8"))
+            self.assertEqual(calendars.event_counts["apple"], len(combined))
+
+
+class TestPureYamlFallback(unittest.TestCase):
+    def test_missing_libyaml_falls_back_to_python_classes(self):
+        self.addCleanup(importlib.reload, utils)
+        with mock.patch.dict(yaml.__dict__):
+            yaml.__dict__.pop("CSafeLoader", None)
+            yaml.__dict__.pop("CSafeDumper", None)
+            importlib.reload(utils)
+        self.assertFalse(utils.HAS_LIBYAML)
+        self.assertIs(utils.SafeLoader, yaml.SafeLoader)
+        self.assertIs(utils.SafeDumper, yaml.SafeDumper)
+        self.assertEqual([e["id"] for e in utils.parse_sources(SAMPLE)], ["first", "second"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""Tests for the SQLite mirror of sources.yaml.
+
+Run: python -m pytest test_sources_db.py -v
+  or: python test_sources_db.py
+"""
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import sources_db
+from generate_calendar import generate_json_feed
+from sources_db import SourcesDB, url_host, weekday_code
+from utils import get_default_sources_path, load_sources
+
+
+AS_OF = date(2026, 3, 1)
+
+SAMPLE = """\
+---
+# Peer support
+---
+- id: alpha
+  name: Alpha Group
+  category: peer_support
+  good_for:
+  - grief
+  next_audit: 2026-04-05
+  source_urls:
+  - https://www.example.org/alpha
+  practical_tips:
+    parking: Free lot behind the library
+  programs:
+  - name: Thursday Circle
+    schedule: Every Thursday 6-7pm
+    audience:
+    - seniors
+  - name: Lantern Walk
+    dates:
+    - March 12
+---
+- id: beta
+  name: Beta Market
+  category: food_farms
+  schedule: Saturdays 9am-1pm
+  next_audit: 2026-06-01
+  notes: Vendors accept SNAP.
+  source_urls:
+  - https://example.org/market
+---
+- id: gamma
+  name: Gamma Circle
+  category: peer_support
+  schedule: Thursdays 7-8pm
+  status: closed
+"""
+
+
+class TestHelpers(unittest.TestCase):
+    def test_weekday_code(self):
+        self.assertEqual([weekday_code(d) for d in ("thursday", "Thu", "TH", " sunday ")], ["TH", "TH", "TH", "SU"])
+        with self.assertRaises(ValueError):
+            weekday_code("someday")
+
+    def test_url_host(self):
+        self.assertEqual(url_host("https://WWW.Example.org/path?q=1"), "example.org")
+        self.assertEqual(url_host("http://multco.us"), "multco.us")
+        self.assertIsNone(url_host("not a url"))
+
+
+class TestSourcesDB(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "sources.yaml"
+        self.path.write_text(SAMPLE, encoding="utf-8")
+        self.db_path = Path(self.tmp.name) / "mirror.sqlite"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def open(self, as_of=AS_OF):
+        return SourcesDB.open(self.path, self.db_path, as_of=as_of)
+
+    def rowids(self, mirror):
+        return {row["id"]: row["rowid"] for row in mirror.sql("SELECT rowid, id FROM entries")}
+
+    def test_build_and_canned_queries(self):
+        with self.open() as mirror:
+            self.assertEqual((mirror.report.added, mirror.report.changed), (3, 0))
+            thursday = mirror.meeting_on("thursday", category="peer_support")
+            self.assertEqual([(r["id"], r["program"], r["start_time"]) for r in thursday],
+                             [("alpha", "Thursday Circle", "18:00"), ("alpha", "Lantern Walk", None)])
+            self.assertEqual([r["id"] for r in mirror.meeting_on("SA")], ["beta"])
+            self.assertEqual([r["id"] for r in mirror.citing("www.example.org")], ["alpha", "beta"])
+            self.assertEqual([r["id"] for r in mirror.due_before(date(2026, 5, 1))], ["alpha"])
+            self.assertEqual(mirror.sql("SELECT tag FROM tags WHERE field = 'audience' AND program = 0")[0][0],
+                             "seniors")
+            self.assertEqual(mirror.sql("SELECT COUNT(*) FROM programs")[0][0], 2)
+
+    @unittest.skipUnless(sources_db.HAS_FTS5, "SQLite built without FTS5")
+    def test_full_text_search(self):
+        with self.open() as mirror:
+            self.assertEqual([r["id"] for r in mirror.search("snap")], ["beta"])
+            self.assertEqual([r["id"] for r in mirror.search("parking lot")], ["alpha"])
+            self.assertEqual([r["id"] for r in mirror.search("lantern")], ["alpha"])
+            # Not valid FTS5 syntax: searched as plain words.
+            self.assertEqual([r["id"] for r in mirror.search("free-lot (")], ["alpha"])
+
+    def test_incremental_update_touches_only_changed_entries(self):
+        with self.open() as mirror:
+            before = self.rowids(mirror)
+        edited = (SAMPLE.replace("Vendors accept SNAP.", "Vendors accept EBT.")
+                  .replace("- id: gamma", "- id: delta"))
+        self.path.write_text(edited, encoding="utf-8")
+        with mock.patch("sources_db.parse_sources", wraps=sources_db.parse_sources) as parse, self.open() as mirror:
+            report = mirror.report
+            after = self.rowids(mirror)
+            self.assertEqual([r["id"] for r in mirror.search("ebt")] if sources_db.HAS_FTS5 else ["beta"], ["beta"])
+            self.assertEqual(mirror.sql("SELECT COUNT(*) FROM schedules WHERE entry_id = 'gamma'")[0][0], 0)
+        self.assertEqual((report.added, report.changed, report.removed, report.unchanged), (1, 1, 1, 1))
+        parse.assert_called_once()
+        self.assertNotIn("Alpha Group", parse.call_args[0][0])
+        self.assertEqual(after["alpha"], before["alpha"])
+        self.assertEqual(set(after), {"alpha", "beta", "delta"})
+
+    def test_moved_entries_keep_file_order(self):
+        self.open().close()
+        alpha, beta, gamma = SAMPLE.split("---\n- id: ")[1:]
+        self.path.write_text("---\n- id: " + gamma + "---\n- id: " + alpha + "---\n- id: " + beta, encoding="utf-8")
+        with self.open() as mirror:
+            self.assertEqual(mirror.report.unchanged, 3)
+            self.assertEqual([r[0] for r in mirror.sql("SELECT id FROM entries ORDER BY position")],
+                             ["gamma", "alpha", "beta"])
+
+    def test_entries_not_opening_with_id_are_mirrored(self):
+        self.open().close()
+        # beta follows a document marker and epsilon shares a document with gamma.
+        edited = (SAMPLE.replace("- id: beta\n  name: Beta Market\n", "- name: Beta Market\n  id: beta\n")
+                  + "- name: Epsilon Walk\n  id: epsilon\n  category: events\n")
+        self.path.write_text(edited, encoding="utf-8")
+        with self.open() as mirror:
+            self.assertEqual(sorted(r[0] for r in mirror.sql("SELECT id FROM entries")),
+                             ["alpha", "beta", "epsilon", "gamma"])
+            self.assertEqual([r["id"] for r in mirror.meeting_on("SA")], ["beta"])
+            self.assertEqual((mirror.report.added, mirror.report.changed, mirror.report.removed), (1, 3, 0))
+        self.path.write_text(SAMPLE, encoding="utf-8")
+        with self.open() as mirror:
+            self.assertEqual([r[0] for r in mirror.sql("SELECT id FROM entries ORDER BY position")],
+                             ["alpha", "beta", "gamma"])
+            self.assertEqual(mirror.report.removed, 1)
+
+    def test_unchanged_file_is_not_read(self):
+        self.open().close()
+        with mock.patch("sources_db.entry_blocks") as blocks, self.open() as mirror:
+            self.assertEqual(mirror.report.unchanged, 3)
+        blocks.assert_not_called()
+        os.utime(self.path, ns=(0, 0))
+        with mock.patch("sources_db.entry_blocks") as blocks, self.open() as mirror:
+            self.assertEqual(mirror.report.unchanged, 3)
+        blocks.assert_not_called()
+
+    def test_new_as_of_date_resolves_every_schedule_again(self):
+        self.open().close()
+        with self.open(as_of=date(2026, 4, 1)) as mirror:
+            self.assertEqual(mirror.report.added, 3)
+            # A date without a year now falls in 2027, on a Friday.
+            self.assertEqual([r["program"] for r in mirror.meeting_on("TH", category="peer_support")],
+                             ["Thursday Circle"])
+            self.assertEqual(mirror.meeting_on("FR")[0]["start_date"], "2027-03-12")
+
+    def test_schedules_match_json_feed(self):
+        path = get_default_sources_path()
+        entries = load_sources(path)
+        feed = generate_json_feed(entries, today=AS_OF)
+        with SourcesDB.open(path, self.db_path, as_of=AS_OF) as mirror:
+            stored = {(r["entry_id"], r["program"], r["type"], r["weekday"], r["start_date"], r["start_time"])
+                      for r in mirror.sql("SELECT * FROM schedules")}
+        expected = set()
+        for entry in feed["events"]:
+            targets = [(None, entry.get("resolved_schedule"))]
+            targets += [(i, p.get("resolved_schedule")) for i, p in enumerate(entry.get("programs") or [])
+                        if isinstance(p, dict)]
+            for program, resolved in targets:
+                if not resolved:
+                    continue
+                if resolved["type"] == "recurring":
+                    expected.update((entry["id"], program, "recurring", day, None, resolved["start_time"])
+                                    for day in resolved["weekdays"])
+                else:
+                    for occ in resolved["occurrences"]:
+                        day = date.fromisoformat(occ["start_date"]).strftime("%a").upper()[:2]
+                        expected.add((entry["id"], program, "fixed",
+                                       day if occ["start_date"] == occ["end_date"] else None,
+                                       occ["start_date"], occ["start_time"]))
+        self.assertGreater(len(expected), 100)
+        self.assertEqual(stored, expected)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
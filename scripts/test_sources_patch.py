@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""Tests for the batch, format-preserving sources.yaml patch engine.
+
+Run: python -m pytest test_sources_patch.py -v
+  or: python test_sources_patch.py
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import date
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from add_type_fields import add_fields_to_yaml
+from entry_index import EntryIndex
+from sources_patch import Patch, apply_patches, patch_text, render_field
+from synthetic_sources import synthetic_sources_path
+from utils import load_sources, parse_sources
+
+
+SAMPLE = """\
+---
+# Peer support
+---
+- id: alpha
+  name: Alpha Group
+  category: peer_support
+  good_for:
+  - grief
+  notes: >-
+    Folded notes that run
+    over two lines.
+
+  # keep this comment
+  last_verified: 2026-01-05
+  programs:
+  - name: Monday Circle
+    format: in_person
+  - name: Women's Group
+    eligibility: Women 18+
+---
+- id: beta
+  name: Beta
+  category: events
+  last_verified: 2026-02-01
+"""
+
+
+class TestRenderField(unittest.TestCase):
+    def test_matches_sources_yaml_layout(self):
+        self.assertEqual(render_field("next_audit", date(2026, 5, 1), 2), b"  next_audit: 2026-05-01\n")
+        self.assertEqual(render_field("audience", ["teens", "women"], 4), b"    audience:\n    - teens\n    - women\n")
+        self.assertEqual(render_field("latitude", 45.514986, 2), b"  latitude: 45.514986\n")
+        self.assertEqual(render_field("name", "Note: quoted", 2), b"  name: 'Note: quoted'\n")
+
+
+class TestPatchText(unittest.TestCase):
+    def test_replaces_multiline_field_and_keeps_trailing_comment(self):
+        patched = patch_text(SAMPLE, [Patch("alpha", "notes", "Short.")])
+        self.assertIn("  notes: Short.\n\n  # keep this comment\n  last_verified", patched)
+        self.assertEqual(parse_sources(patched)[0]["notes"], "Short.")
+
+    def test_inserts_after_anchor_or_at_end(self):
+        patched = patch_text(SAMPLE, [
+            Patch("alpha", "audience", ["seniors"], after=("missing", "good_for")),
+            Patch("beta", "latitude", 45.5),
+            Patch("beta", "longitude", -122.6, after=("latitude",)),
+        ])
+        self.assertIn("  good_for:\n  - grief\n  audience:\n  - seniors\n  notes:", patched)
+        self.assertTrue(patched.endswith("  last_verified: 2026-02-01\n  latitude: 45.5\n  longitude: -122.6\n"))
+
+    def test_program_fields(self):
+        patched = patch_text(SAMPLE, [
+            Patch("alpha", "audience", ["women"], program="Women's Group", after=("format", "eligibility")),
+            Patch("alpha", "name", "Monday: Circle", program="Monday Circle"),
+        ])
+        programs = parse_sources(patched)[0]["programs"]
+        self.assertEqual(programs[0], {"name": "Monday: Circle", "format": "in_person"})
+        self.assertEqual(programs[1], {"name": "Women's Group", "eligibility": "Women 18+", "audience": ["women"]})
+
+    def test_if_missing_and_last_patch_wins(self):
+        patched = patch_text(SAMPLE, [
+            Patch("alpha", "category", "events", if_missing=True),
+            Patch("beta", "category", "social_activities"),
+            Patch("beta", "category", "parks_nature"),
+        ])
+        alpha, beta = parse_sources(patched)
+        self.assertEqual((alpha["category"], beta["category"]), ("peer_support", "parks_nature"))
+
+    def test_only_patched_lines_change(self):
+        patched = patch_text(SAMPLE, [Patch("alpha", "last_verified", date(2026, 9, 9))])
+        self.assertEqual(patched, SAMPLE.replace("2026-01-05", "2026-09-09"))
+
+    def test_unknown_targets(self):
+        with self.assertRaisesRegex(ValueError, "gamma, alpha/Nope"):
+            patch_text(SAMPLE, [Patch("gamma", "name", "G"), Patch("alpha", "x", 1, program="Nope")])
+        self.assertEqual(patch_text(SAMPLE, [Patch("gamma", "name", "G")], strict=False), SAMPLE)
+
+
+class TestApplyPatches(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "sources.yaml"
+        self.path.write_text(SAMPLE, encoding="utf-8")
+        self.backup = self.path.with_suffix(".yaml.bak")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_one_backup_and_atomic_replace(self):
+        inode = self.path.stat().st_ino
+        patches = [Patch("alpha", "audience", ["teens"], after=("good_for",)),
+                   Patch("beta", "last_verified", date(2026, 10, 1))]
+        report = apply_patches(self.path, patches)
+        self.assertEqual(report.changed, ["alpha", "beta"])
+        self.assertEqual(report.applied, patches)
+        self.assertEqual(self.backup.read_text(encoding="utf-8"), SAMPLE)
+        self.assertNotEqual(self.path.stat().st_ino, inode)
+        self.assertEqual(self.path.read_text(encoding="utf-8"), patch_text(SAMPLE, patches))
+        self.assertEqual(list(Path(self.tmp.name).glob(".sources.yaml.*.tmp")), [])
+
+    def test_index_follows_the_edit(self):
+        apply_patches(self.path, [Patch("alpha", "audience", ["teens", "women"], after=("good_for",))])
+        fresh = list(EntryIndex.for_bytes(self.path.read_bytes()))
+        with mock.patch("entry_index._scan_rows") as scan, EntryIndex.open(self.path) as index:
+            self.assertEqual(list(index), fresh)
+        scan.assert_not_called()
+
+    def test_failed_batch_and_no_op_leave_file_untouched(self):
+        stat = self.path.stat()
+        with self.assertRaises(ValueError):
+            apply_patches(self.path, [Patch("beta", "name", "B"), Patch("gamma", "name", "G")])
+        report = apply_patches(self.path, [Patch("beta", "category", "events")])
+        self.assertEqual(report.changed, [])
+        self.assertEqual(self.path.stat().st_mtime_ns, stat.st_mtime_ns)
+        self.assertFalse(self.backup.exists())
+
+    def test_output_path_leaves_source_alone(self):
+        output = Path(self.tmp.name) / "out.yaml"
+        apply_patches(self.path, [Patch("beta", "name", "B")], output_path=output)
+        self.assertEqual(self.path.read_text(encoding="utf-8"), SAMPLE)
+        self.assertFalse(self.backup.exists())
+        self.assertEqual(parse_sources(output.read_text(encoding="utf-8"))[1]["name"], "B")
+
+    def test_large_batch_matches_parsed_edits(self):
+        shutil.copy(synthetic_sources_path(1000), self.path)
+        entries = load_sources(self.path)
+        patches = [Patch(entry["id"], "next_audit", date(2027, 1, 1 + i % 28)) for i, entry in enumerate(entries)]
+        patches += [Patch(entry["id"], "audience", ["seniors"], after=("good_for",)) for entry in entries[::3]]
+        report = apply_patches(self.path, patches)
+        self.assertEqual(len(report.changed), len(entries))
+        for i, entry in enumerate(entries):
+            entry["next_audit"] = date(2027, 1, 1 + i % 28)
+            if i % 3 == 0:
+                entry["audience"] = ["seniors"]
+        patched = {entry["id"]: entry for entry in parse_sources(self.path.read_text(encoding="utf-8"))}
+        for entry in entries:
+            self.assertEqual(dict(patched[entry["id"]]), dict(entry))
+
+
+class TestAddTypeFields(unittest.TestCase):
+    def test_inserts_missing_types_after_category(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "sources.yaml"
+            path.write_text(SAMPLE.replace("- id: alpha", "- id: arts-for-all")
+                            .replace("- id: beta", "- id: trimet-low-income")
+                            .replace("  category: events\n", "  category: events\n  location_type: physical\n"),
+                            encoding="utf-8")
+            with redirect_stdout(StringIO()) as out:
+                self.assertEqual(add_fields_to_yaml(str(path)), 2)
+            self.assertIn(f"Backup saved to {path.with_suffix('.yaml.bak')}", out.getvalue())
+            path.with_suffix(".yaml.bak").unlink()
+            with redirect_stdout(StringIO()) as out:
+                self.assertEqual(add_fields_to_yaml(str(path)), 0)
+            self.assertNotIn("Backup saved", out.getvalue())
+            self.assertFalse(path.with_suffix(".yaml.bak").exists())
+            arts, trimet = parse_sources(path.read_text(encoding="utf-8"))
+        self.assertEqual(list(arts)[:5], ["id", "name", "category", "location_type", "resource_type"])
+        self.assertEqual((arts["location_type"], arts["resource_type"]), ("physical", "service"))
+        self.assertEqual((trimet["location_type"], trimet["resource_type"]), ("physical", "service"))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Tests for the synthetic sources.yaml generator.
+
+Run: python -m pytest test_synthetic_sources.py -v
+  or: python test_synthetic_sources.py
+"""
+import os
+import random
+import sys
+import unittest
+from collections import Counter
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from generate_calendar import parse_date_string, parse_schedule
+from geocode_addresses import PORTLAND_BOUNDS
+from synthetic_sources import _dates_value, _templated_schedule, generate_entries, generate_sources_text
+from utils import get_default_sources_path, load_sources, parse_sources, validate_entry
+
+
+SIZE = 1000
+
+
+class TestSyntheticSources(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.real = load_sources(get_default_sources_path())
+        cls.text = generate_sources_text(SIZE, seed=11, template=cls.real)
+        cls.entries = parse_sources(cls.text)
+
+    def test_same_seed_is_byte_identical(self):
+        self.assertEqual(generate_sources_text(SIZE, seed=11, template=self.real), self.text)
+        self.assertNotEqual(generate_sources_text(SIZE, seed=12, template=self.real), self.text)
+
+    def test_round_trips_with_unique_ids(self):
+        self.assertEqual(len(self.entries), SIZE)
+        self.assertEqual(len({entry["id"] for entry in self.entries}), SIZE)
+        self.assertNotIn("&id", self.text)
+
+    def test_entries_pass_validation_like_the_real_data(self):
+        real_warnings = sum(bool(validate_entry(entry)) for entry in self.real) / len(self.real)
+        synthetic_warnings = sum(bool(validate_entry(entry)) for entry in self.entries) / SIZE
+        self.assertLessEqual(synthetic_warnings, real_warnings + 0.05)
+
+    def test_category_mix_follows_the_real_data(self):
+        real = Counter(entry["category"] for entry in self.real)
+        synthetic = Counter(entry["category"] for entry in self.entries)
+        self.assertEqual(set(synthetic), set(real))
+        for category, count in real.items():
+            with self.subTest(category=category):
+                self.assertAlmostEqual(synthetic[category] / SIZE, count / len(self.real), delta=0.04)
+
+    def test_coordinates_inside_portland_bounds(self):
+        located = [entry for entry in self.entries if entry.get("latitude") is not None]
+        self.assertTrue(located)
+        for entry in located:
+            self.assertTrue(PORTLAND_BOUNDS["lat_min"] <= entry["latitude"] <= PORTLAND_BOUNDS["lat_max"])
+            self.assertTrue(PORTLAND_BOUNDS["lng_min"] <= entry["longitude"] <= PORTLAND_BOUNDS["lng_max"])
+
+    def test_hosts_are_shared_but_grow_with_the_corpus(self):
+        hosts = Counter(urlparse(url).netloc for entry in self.entries for url in entry["source_urls"])
+        self.assertGreater(len(hosts), SIZE // 3)
+        self.assertLess(len(hosts), sum(hosts.values()))
+        self.assertIn("www.portland.gov", hosts)
+
+    def test_schedule_parse_rate_close_to_real(self):
+        def parse_rate(entries):
+            schedules = [str(p["schedule"]) for e in entries for p in (e.get("programs") or [])
+                         if hasattr(p, "get") and p.get("schedule")]
+            return sum(bool(parse_schedule(s)) for s in schedules) / len(schedules)
+
+        self.assertGreaterEqual(parse_rate(self.entries), parse_rate(self.real) - 0.05)
+
+
+class TestGeneratedPhrases(unittest.TestCase):
+    def test_templated_schedules_resolve(self):
+        rng = random.Random(5)
+        for _ in range(500):
+            phrase = _templated_schedule(rng)
+            parsed = parse_schedule(phrase)
+            with self.subTest(phrase=phrase):
+                self.assertIn("start_time", parsed)
+                self.assertTrue(parsed.get("day") or parsed.get("daily"))
+
+    def test_dates_parse(self):
+        rng = random.Random(5)
+        for _ in range(500):
+            value = _dates_value(rng, 2026)
+            for text in value if isinstance(value, list) else [value]:
+                with self.subTest(text=text):
+                    self.assertIsNotNone(parse_date_string(text)[0])
+
+    def test_generate_entries_is_deterministic(self):
+        template = load_sources(get_default_sources_path())
+        self.assertEqual(generate_entries(50, seed=3, template=template),
+                         generate_entries(50, seed=3, template=template))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -1,29 +1,287 @@
 """Shared utilities for Portland Metro Resources scripts."""
 
+import hashlib
+import os
+import pickle
 import re
 import sys
+import tempfile
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date, datetime
+from itertools import chain
 from pathlib import Path
 
 import yaml
 
+from yaml.composer import Composer
+from yaml.constructor import SafeConstructor
+from yaml.resolver import Resolver
 
-def parse_sources(content: str) -> list[dict]:
-    """Parse sources from multi-document YAML text."""
-    documents = []
-    for doc in yaml.safe_load_all(content):
-        if doc and isinstance(doc, list):
-            documents.extend(doc)
-        elif doc and isinstance(doc, dict):
-            documents.append(doc)
+from models import Entry, Program, compact_entries, compact_entry
 
-    return [d for d in documents if d and isinstance(d, dict) and "id" in d]
 
-
-def load_sources(sources_path: str | Path) -> list[dict]:
-    """Load and parse the sources.yaml file (multi-document YAML)."""
+# Bump whenever parse_sources() changes what it returns, so snapshots written
+# by an older loader are never mistaken for current ones.
+SOURCES_CACHE_VERSION = 2
+
+# Set to any non-empty value to bypass every on-disk cache (debugging, CI bisects).
+NO_CACHE_ENV = "PEER_CALENDAR_NO_CACHE"
+
+# Below this much YAML, starting a process pool costs more than it saves and
+# parse_sources() stays serial whatever `workers` says.
+PARALLEL_MIN_BYTES = 2 << 20
+
+# libyaml-backed classes when PyYAML was built against it, the pure-Python
+# ones otherwise. Both construct identical entries (see test_sources.py); the
+# C pair is roughly an order of magnitude faster on sources.yaml.
+PySafeLoader = yaml.SafeLoader
+PySafeDumper = yaml.SafeDumper
+SafeLoader = getattr(yaml, "CSafeLoader", PySafeLoader)
+SafeDumper = getattr(yaml, "CSafeDumper", PySafeDumper)
+HAS_LIBYAML = SafeLoader is not PySafeLoader
+
+# Entry/Program records dump exactly like the dicts they replace.
+for _dumper in {PySafeDumper, SafeDumper}:
+    _dumper.add_representer(Entry, _dumper.represent_dict)
+    _dumper.add_representer(Program, _dumper.represent_dict)
+del _dumper
+
+
+def yaml_load_all(content, loader=None):
+    """Iterate the documents of a YAML stream with the fastest safe loader."""
+    return yaml.load_all(content, Loader=loader or SafeLoader)
+
+
+def yaml_dump(data, stream=None, dumper=None, **kwargs):
+    """Serialize with the fastest safe dumper; keyword arguments as yaml.dump."""
+    return yaml.dump(data, stream, Dumper=dumper or SafeDumper, **kwargs)
+
+
+def parse_sources(content: str, loader=None, compact: bool = True, workers: int | None = 1) -> list[Entry]:
+    """Parse sources from multi-document YAML text.
+
+    Entries come back as compact Entry/Program records (see models.py) unless
+    `compact` is False, in which case they are the plain dicts PyYAML built.
+
+    With `workers` above 1 (None: one per CPU), text of at least
+    PARALLEL_MIN_BYTES is cut with split_sources() and the pieces are parsed
+    in a process pool, then merged in their original order. The result is
+    the same as the serial parse, which is used whenever the text is small or
+    cannot be split safely.
+    """
+    def documents():
+        for doc in yaml_load_all(content, loader):
+            if doc and isinstance(doc, list):
+                yield from doc
+            elif doc and isinstance(doc, dict):
+                yield doc
+
+    workers = available_cpus() if workers is None else workers
+    pieces = None
+    if workers > 1 and len(content) >= PARALLEL_MIN_BYTES:
+        pieces = split_sources(content, workers * 4)
+    if pieces and len(pieces) > 1:
+        with ProcessPoolExecutor(min(workers, len(pieces))) as pool:
+            parsed = pool.map(_parse_piece, pieces, [loader] * len(pieces))
+            entries = chain.from_iterable(parsed)
+            return compact_entries(entries) if compact else list(entries)
+
+    # Compacting as documents arrive keeps only one document's worth of raw
+    # dicts alive at a time.
+    entries = (d for d in documents() if d and isinstance(d, dict) and "id" in d)
+    return compact_entries(entries) if compact else list(entries)
+
+
+def _parse_piece(content: str, loader=None) -> list[dict]:
+    return parse_sources(content, loader, compact=False)
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+# Lines that start in column 0: document markers, top-level sequence items,
+# or (in a mapping document) keys and indentless lists.
+_COLUMN_ZERO = re.compile(r"^[^\s#].*", re.M)
+_DOCUMENT_START = re.compile(r"---(?:[ \t]|$)")
+# Anchors and aliases may tie one piece to another; any hint of one (even in a
+# quoted string) keeps the parse serial.
+_ANCHOR_OR_ALIAS = re.compile(r"(?:^|[\s\[{,])[&*][^\s,\[\]{}]")
+
+
+def split_sources(content: str, parts: int) -> list[str] | None:
+    """Cut a YAML stream into at most `parts` pieces of similar size.
+
+    Each piece parses on its own to exactly the entries it holds, so parsing
+    the pieces in order and concatenating gives what parse_sources(content)
+    gives. Cuts fall on document markers (`---`) and, inside a document
+    whose top level is a block sequence, between its column-0 `- ` items;
+    no YAML is parsed to find them. Returns None for streams where a cut
+    could change the result: directives, `...` document ends, anchors or
+    aliases, or column-0 text inside a top-level sequence.
+    """
+    if _ANCHOR_OR_ALIAS.search(content):
+        return None
+    cuts = [0]
+    sequence = None  # Whether the current document's top level is a sequence.
+    for match in _COLUMN_ZERO.finditer(content):
+        line = match.group()
+        if line.startswith(("%", "...")):
+            return None
+        if _DOCUMENT_START.match(line):
+            cuts.append(match.start())
+            rest = line[3:].strip()
+            sequence = None if not rest or rest.startswith("#") else False
+        elif line == "-" or line.startswith(("- ", "-\t")):
+            if sequence:
+                cuts.append(match.start())
+            elif sequence is None:
+                sequence = True
+        elif sequence:
+            return None
+        else:
+            sequence = False
+
+    # Keep the cuts nearest to `parts` evenly spaced offsets.
+    chosen = {0}
+    for k in range(1, parts):
+        i = bisect_left(cuts, len(content) * k // parts)
+        if i < len(cuts):
+            chosen.add(cuts[i])
+    bounds = sorted(chosen) + [len(content)]
+    return [content[start:end] for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def caching_enabled() -> bool:
+    """False when the environment asks scripts to skip their on-disk caches."""
+    return not os.environ.get(NO_CACHE_ENV)
+
+
+def cache_dir_for(sources_path: str | Path) -> Path:
+    """Directory holding derived artifacts for a sources file (gitignored)."""
+    return Path(sources_path).parent / ".cache"
+
+
+def _sources_snapshot_path(sources_path: Path, content: str) -> Path:
+    """Snapshot location keyed by content hash and loader version."""
+    key = hashlib.sha256()
+    key.update(f"{SOURCES_CACHE_VERSION}:{yaml.__version__}\0".encode())
+    key.update(content.encode("utf-8"))
+    return cache_dir_for(sources_path) / f"{sources_path.name}.{key.hexdigest()[:24]}.pickle"
+
+
+def _read_snapshot(snapshot_path: Path) -> list[dict] | None:
+    try:
+        with open(snapshot_path, "rb") as f:
+            entries = pickle.load(f)
+    except Exception:
+        # Any unreadable, truncated or incompatible snapshot just means a fresh parse.
+        return None
+    return entries if isinstance(entries, list) else None
+
+
+def _write_snapshot(snapshot_path: Path, entries: list[dict], sources_name: str) -> None:
+    """Atomically replace the snapshot and drop stale ones for the same file.
+
+    A cache is an optimization only: a read-only checkout or a full disk must
+    never stop a script, so every failure here is swallowed.
+    """
+    tmp_name = None
+    try:
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=snapshot_path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, snapshot_path)
+        tmp_name = None
+        for stale in snapshot_path.parent.glob(f"{sources_name}.*.pickle"):
+            if stale != snapshot_path:
+                stale.unlink()
+    except OSError:
+        if tmp_name:
+            Path(tmp_name).unlink(missing_ok=True)
+
+
+def load_sources(sources_path: str | Path, use_cache: bool = True, workers: int | None = None) -> list[Entry]:
+    """Load and parse the sources.yaml file (multi-document YAML).
+
+    Entries are compact Entry/Program records (models.py): mappings that
+    read, assign and compare like the dicts they replace but are not dict
+    instances. Convert with dict() where a real dict is needed; json.dumps
+    needs a `default` that does the same for nested programs.
+
+    Parsed entries are snapshotted next to the file (``.cache/``) keyed by the
+    SHA-256 of its content and the loader version, so a CI run that calls
+    several scripts in a row pays for the YAML parse once. Each call returns
+    freshly unpickled objects; callers may mutate them freely. Large files are
+    parsed across `workers` processes (see parse_sources).
+    """
+    sources_path = Path(sources_path)
+    with open(sources_path, "r", encoding="utf-8") as f:
+        content = f.read()
+    if not (use_cache and caching_enabled()):
+        return parse_sources(content, workers=workers)
+
+    snapshot_path = _sources_snapshot_path(sources_path, content)
+    entries = _read_snapshot(snapshot_path)
+    if entries is None:
+        entries = parse_sources(content, workers=workers)
+        _write_snapshot(snapshot_path, entries, sources_path.name)
+    return entries
+
+
+if HAS_LIBYAML:
+    class StreamingLoader(yaml.cyaml.CParser, Composer, SafeConstructor, Resolver):
+        """libyaml's event parser with PyYAML's composer, so nodes can be
+        composed one at a time (CSafeLoader only composes whole documents)."""
+
+        def __init__(self, stream):
+            yaml.cyaml.CParser.__init__(self, stream)
+            Composer.__init__(self)
+            SafeConstructor.__init__(self)
+            Resolver.__init__(self)
+else:
+    StreamingLoader = PySafeLoader
+
+
+def iter_sources(sources_path: str | Path, loader=None) -> Iterator[Entry]:
+    """Yield the entries of a sources file one at a time, in file order.
+
+    The file is read as a stream of YAML events and each item of a top-level
+    sequence is composed and constructed on its own, so memory holds one
+    entry however large the file is. Yields exactly what load_sources()
+    returns (mappings with an `id`, as Entry records), without its snapshot
+    cache. `loader` must compose nodes in Python (StreamingLoader or
+    PySafeLoader).
+    """
     with open(sources_path, "r", encoding="utf-8") as f:
-        return parse_sources(f.read())
+        parser = (loader or StreamingLoader)(f)
+        try:
+            parser.get_event()  # StreamStart
+            while not parser.check_event(yaml.StreamEndEvent):
+                parser.get_event()  # DocumentStart
+                if parser.check_event(yaml.SequenceStartEvent):
+                    parser.get_event()
+                    while not parser.check_event(yaml.SequenceEndEvent):
+                        yield from _streamed_entry(parser, parser.compose_node(None, None))
+                    parser.get_event()
+                else:
+                    yield from _streamed_entry(parser, parser.compose_node(None, None))
+                parser.get_event()  # DocumentEnd
+                parser.anchors = {}
+        finally:
+            parser.dispose()
+
+
+def _streamed_entry(parser, node) -> Iterator[Entry]:
+    data = parser.construct_document(node)
+    if data and isinstance(data, dict) and "id" in data:
+        yield compact_entry(data)
 
 
 def parse_date(date_val) -> date | None:
@@ -51,6 +309,13 @@ def format_date(date_val) -> str:
     return str(date_val) if date_val else "N/A"
 
 
+def is_closed(entry: dict) -> bool:
+    """True if the entry is recorded as permanently closed or discontinued."""
+    if str(entry.get("status", "")).upper() == "CLOSED":
+        return True
+    return any("❌" in str(flag) for flag in entry.get("flags", []) or [])
+
+
 def get_default_sources_path() -> Path:
     """Return the default path to sources.yaml."""
     return Path(__file__).parent.parent / "data" / "sources.yaml"
@@ -160,7 +425,7 @@ def validate_entry(entry: dict) -> list[str]:
             )
 
     for program in entry.get("programs") or []:
-        if not isinstance(program, dict):
+        if not isinstance(program, Mapping):
             continue
         label = program.get("name", "<unnamed program>")
         for key in program:
@@ -173,14 +438,19 @@ def validate_entry(entry: dict) -> list[str]:
     return warnings
 
 
-def validate_all_entries(entries: list[dict], quiet: bool = False) -> list[str]:
-    """Validate all entries and print warnings to stderr. Returns all warnings."""
+def validate_all_entries(entries: Iterable[dict], quiet: bool = False) -> list[str]:
+    """Validate all entries and print warnings to stderr. Returns all warnings.
+
+    `entries` may be a stream (e.g. iter_sources()); each entry is validated
+    as it arrives and not kept.
+    """
     all_warnings = []
-    for entry in entries:
+    count = 0
+    for count, entry in enumerate(entries, 1):
         all_warnings.extend(validate_entry(entry))
 
     if all_warnings and not quiet:
-        print(f"Validation: {len(all_warnings)} warning(s) in {len(entries)} entries",
+        print(f"Validation: {len(all_warnings)} warning(s) in {count} entries",
               file=sys.stderr)
         for w in all_warnings:
             print(f"  WARNING: {w}", file=sys.stderr)
@@ -5,17 +5,29 @@ Validate all schedule strings in sources.yaml.
 Parses every schedule field and reports any that fail to produce
 a valid day or time. Run before calendar generation to catch issues.
 
+It also expands the next CONFLICT_HORIZON_DAYS of timed occurrences and
+reports programs that meet at the same place at overlapping times, usually a
+schedule string copied onto the wrong program. These overlaps are listed for
+review but do not fail the run, since separate rooms in one building often
+share an address.
+
 Usage:
     python validate_schedules.py
     python validate_schedules.py --sources /path/to/sources.yaml
 """
 
 import argparse
+import heapq
 import re
+from collections.abc import Iterable, Mapping
+from datetime import date, datetime, timedelta
 from pathlib import Path
+from typing import NamedTuple
 
+import derived_cache
 from utils import load_sources
-from generate_calendar import parse_date_string, parse_schedule
+from generate_calendar import parse_date_strings, parse_length_error, parse_schedule
+from occurrence_arrays import iter_catalog_schedules, schedule_occurrences
 
 # Schedules matching these patterns are intentionally vague and should not
 # block CI. They represent entries where the exact schedule is unknown or
@@ -28,8 +40,12 @@ VAGUE_PATTERNS = [
     r"^annual",
     r"^ongoing",
     r"^by appointment",
-    r"contact\b.*\b(schedule|dates?|time)",
-    r"check\b.*\b(website|calendar|facebook|meetup|eventbrite|library)",
+    # "word ... target" patterns start from the first "word" on each line. If any
+    # "word" has a later target, the first one does too, and committing to it
+    # (the atomic group) keeps a line of repeated words linear instead of
+    # rescanning the rest of the line from every occurrence.
+    r"(?m:^)(?>.*?contact\b).*\b(schedule|dates?|time)",
+    r"(?m:^)(?>.*?check\b).*\b(website|calendar|facebook|meetup|eventbrite|library)",
     r"dates?\s+vary",
     r"times?\s+vary",
     r"various\s+(dates|times|events|workshops)",
@@ -41,7 +57,7 @@ VAGUE_PATTERNS = [
     r"summer\s+(evenings?|mornings?)",  # "Summer evenings (various dates)"
     r"\(was seasonal\)",
     r"^weekend\s+mornings?\s+during",  # "Weekend mornings during planting season"
-    r"year-round\b.*\bcleanups",
+    r"(?m:^)(?>.*?year-round\b).*\bcleanups",
     r"exhibitions?\s+per\s+year",
     r"^24/7",
     r"^365 days",
@@ -58,6 +74,110 @@ def is_vague_schedule(schedule: str) -> bool:
     return bool(_vague_re.search(schedule.strip()))
 
 
+# Far enough ahead to see every weekly, biweekly and monthly rule meet at
+# least twice, short enough to keep the check cheap.
+CONFLICT_HORIZON_DAYS = 91
+
+# normalize_location() spells street words one way, so "SE 32nd Avenue" and
+# "SE 32nd Ave." group together.
+_LOCATION_WORDS = {
+    "avenue": "ave", "street": "st", "boulevard": "blvd", "road": "rd", "drive": "dr", "place": "pl",
+    "court": "ct", "lane": "ln", "parkway": "pkwy", "highway": "hwy", "terrace": "ter", "circle": "cir",
+    "suite": "ste", "north": "n", "south": "s", "east": "e", "west": "w", "northeast": "ne",
+    "northwest": "nw", "southeast": "se", "southwest": "sw", "mlk": "martin luther king",
+}
+_STREET_ADDRESS = re.compile(
+    r"\b\d+[a-z]?\s+(?:[nsew]{1,2}\s+)?(?:\w+\s+){0,4}?(?:ave|st|blvd|rd|dr|pl|ct|ln|pkwy|hwy|way|ter|cir)\b"
+)
+_ROOM = re.compile(r"\b(?:ste|room|rm|unit|floor)\s+\w+|\b\w+\s+room\b(?!\s+\w)")
+_REMOTE = re.compile(r"\b(?:online|virtual|zoom|remote|phone|telephone)\b")
+
+
+class Overlap(NamedTuple):
+    """Two schedules meeting at one location at overlapping times."""
+
+    location: str
+    first: str
+    second: str
+    count: int
+    start: datetime
+
+
+def normalize_location(text: str | None) -> str | None:
+    """A grouping key for a venue: its street address plus any room, else the cleaned text.
+
+    Returns None for empty or remote-only locations.
+    """
+    if not text or not isinstance(text, str):
+        return None
+    words = re.sub(r"[^\w\s]", " ", text.lower().replace("&", " and ")).split()
+    cleaned = " ".join(_LOCATION_WORDS.get(word, word) for word in words)
+    street = _STREET_ADDRESS.search(cleaned)
+    if not street:
+        return None if not cleaned or _REMOTE.search(cleaned) else cleaned
+    rooms = sorted(set(_ROOM.findall(cleaned)))
+    return street.group() + (" / " + ", ".join(rooms) if rooms else "")
+
+
+def find_overlaps(occurrences: Iterable[tuple[str, datetime, datetime, str, str | None]]) -> list[Overlap]:
+    """Pairs of labels whose (location, start, end, label, owner) occurrences overlap.
+
+    Occurrences with the same non-None owner never conflict with each other.
+    A sweep over each location's occurrences in start order keeps a heap of
+    those still running, so the cost is O(n log n) plus one step per
+    overlapping pair. Pairs are reported once, with how many times they
+    overlap and when they first do, ordered by location and then that time.
+    """
+    by_location: dict[str, list] = {}
+    for location, start, end, label, owner in occurrences:
+        by_location.setdefault(location, []).append((start, end, label, owner))
+    pairs: dict[tuple[str, str, str], list] = {}
+    for location, items in by_location.items():
+        items.sort(key=lambda item: (item[0], item[1]))
+        running = []  # heap of (end, position, label, owner); position breaks ties before owner is compared
+        for position, (start, end, label, owner) in enumerate(items):
+            while running and running[0][0] <= start:
+                heapq.heappop(running)
+            for _, _, other, other_owner in running:
+                if other != label and (owner is None or other_owner != owner):
+                    first, second = sorted((other, label))
+                    found = pairs.setdefault((location, first, second), [0, start])
+                    found[0] += 1
+            heapq.heappush(running, (end, position, label, owner))
+    overlaps = [Overlap(location, first, second, count, start)
+                for (location, first, second), (count, start) in pairs.items()]
+    return sorted(overlaps, key=lambda overlap: (overlap.location, overlap.start, overlap.first, overlap.second))
+
+
+def location_occurrences(entries: list[dict], today: date, days: int = CONFLICT_HORIZON_DAYS):
+    """(location key, start, end, label, owner) for every timed in-person occurrence in the next `days` days.
+
+    Programs meet at their own `location`, falling back to the entry's
+    `address`. Programs that fall back share the entry's id as their owner:
+    a venue listing its own meetings (the Alano Club's dozens of rooms) is
+    not a conflict, but another entry claiming the same slot there is.
+    Online programs (by `format` or name) and all-day dates hold no room
+    and are left out.
+    """
+    end = today + timedelta(days=days)
+    for index, program, resolved in iter_catalog_schedules(entries, today):
+        entry = entries[index]
+        if entry.get("location_type") in ("virtual", "online_service"):
+            continue
+        program = program or {}
+        if _REMOTE.search(f"{program.get('format') or ''} {program.get('name') or ''}".lower()):
+            continue
+        location = normalize_location(program.get("location") or entry.get("address"))
+        if not location:
+            continue
+        owner = None if program.get("location") else entry.get("id", "unknown")
+        if resolved["type"] == "fixed":
+            resolved = {"type": "fixed", "occurrences": [o for o in resolved["occurrences"] if not o["all_day"]]}
+        label = entry.get("id", "unknown") + (f" > {program.get('name', 'unnamed program')}" if program else "")
+        for start, finish in schedule_occurrences(resolved, today, end):
+            yield location, start, finish, label, owner
+
+
 def validate_schedules(sources_path: str) -> int:
     """Validate all schedule and date strings and report issues.
 
@@ -65,6 +185,7 @@ def validate_schedules(sources_path: str) -> int:
     Vague schedules are reported as info but don't count as failures.
     """
     entries = load_sources(sources_path)
+    today = date.today()
     hard_issues = 0
     vague_count = 0
     incomplete_count = 0
@@ -97,18 +218,23 @@ def validate_schedules(sources_path: str) -> int:
         items = [dates_value] if isinstance(dates_value, str) else dates_value
         if not isinstance(items, list):
             return
-        for item in items:
-            if not isinstance(item, str):
-                continue
-            checked += 1
-            start, _ = parse_date_string(item)
+        items = [item for item in items if isinstance(item, str)]
+        checked += len(items)
+        for item, (start, _) in zip(items, parse_date_strings(items, today=today)):
             if start is None:
                 hard_issues += 1
-                print(f"  [FAIL] {label}: unparseable date")
-                print(f"    Dates: \"{item}\"")
+                too_long = parse_length_error(item)
+                print(f"  [FAIL] {label}: {'date ' + too_long if too_long else 'unparseable date'}")
+                print(f"    Dates: \"{item[:200]}\"")
 
     def check_schedule(schedule_str, label):
         nonlocal hard_issues, vague_count, incomplete_count
+        too_long = parse_length_error(schedule_str)
+        if too_long:
+            hard_issues += 1
+            print(f"  [FAIL] {label}: schedule {too_long}")
+            print(f"    Schedule: \"{schedule_str[:200]}...\"")
+            return
         result = parse_schedule(schedule_str)
         problems = []
         has_day = bool(result.get("day"))
@@ -148,7 +274,7 @@ def validate_schedules(sources_path: str) -> int:
                 check_biweekly_anchor(entry, entry_id)
 
         for prog in entry.get("programs", []):
-            if not isinstance(prog, dict):
+            if not isinstance(prog, Mapping):
                 continue
             prog_name = prog.get("name", "unnamed program")
             # When a program pins specific dates, its `schedule` is only the
@@ -163,9 +289,14 @@ def validate_schedules(sources_path: str) -> int:
                 check_biweekly_anchor(prog, f"{entry_id} > {prog_name}",
                                       inherited_start=entry.get("schedule_start_date"))
 
+    overlaps = find_overlaps(location_occurrences(entries, today))
+    for overlap in overlaps:
+        print(f"  [overlap] {overlap.first} and {overlap.second} at \"{overlap.location}\": "
+              f"{overlap.count}x in the next {CONFLICT_HORIZON_DAYS} days, first {overlap.start:%a %Y-%m-%d %H:%M}")
+
     print(f"\nSchedule validation: {checked} checked, {hard_issues} failures, "
           f"{incomplete_count} incomplete, {vague_count} vague, "
-          f"{biweekly_unanchored} unanchored biweekly")
+          f"{biweekly_unanchored} unanchored biweekly, {len(overlaps)} overlapping pairs")
     if hard_issues:
         print(f"  {hard_issues} schedule(s) could not be parsed — fix data or update vague patterns")
     return hard_issues
@@ -179,7 +310,8 @@ def main():
     script_dir = Path(__file__).parent
     sources_path = str((script_dir / args.sources).resolve())
 
-    issues = validate_schedules(sources_path)
+    with derived_cache.session(sources_path):
+        issues = validate_schedules(sources_path)
     return 1 if issues > 0 else 0
 
 